@@ -8,7 +8,7 @@ and provide graceful degradation when services are experiencing issues.
 import time
 import threading
 from datetime import datetime, timedelta
-from typing import Optional, Callable, Any, Type, Dict
+from typing import Optional, Callable, Any, Type, Dict, List
 from dataclasses import dataclass
 from enum import Enum
 from loguru import logger
@@ -77,6 +77,9 @@ class CircuitBreaker:
         self.state_changes = 0
         self.total_requests = 0
         
+        # Called whenever the circuit opens, e.g. to make rate limiters back off
+        self.open_listeners: List[Callable[[str], None]] = []
+        
         # Thread safety
         self.lock = threading.Lock()
         
@@ -184,6 +187,26 @@ class CircuitBreaker:
             self.success_count = 0  # Reset success count
             self.last_state_change = datetime.now()
             self.state_changes += 1
+            self._notify_open()
+    
+    def add_open_listener(self, callback: Callable[[str], None]) -> None:
+        """
+        Register a callback invoked with a reason whenever the circuit opens.
+        
+        Args:
+            callback: Callable taking a short description of the trip
+        """
+        with self.lock:
+            if callback not in self.open_listeners:
+                self.open_listeners.append(callback)
+    
+    def _notify_open(self) -> None:
+        """Invoke the open listeners; their errors never affect the breaker."""
+        for callback in self.open_listeners:
+            try:
+                callback(f"circuit breaker open after {self.failure_count} failures")
+            except Exception as e:
+                logger.error(f"Circuit breaker open listener failed: {e}")
     
     def _transition_to_half_open(self) -> None:
         """Transition circuit breaker to half-open state."""
@@ -271,6 +294,7 @@ class CircuitBreaker:
             self.last_failure_time = datetime.now()
             self.last_state_change = datetime.now()
             self.state_changes += 1
+            self._notify_open()
     
     @property
     def is_closed(self) -> bool:
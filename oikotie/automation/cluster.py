@@ -37,6 +37,61 @@ class WorkItemStatus(Enum):
     RETRYING = "retrying"
 
 
+# Completed work is kept for a day
+COMPLETED_WORK_TTL = 86400
+
+# Pops up to ARGV[1] items from a node's queue into its active work hash in one
+# atomic step, so an item is never lost between the pop and the bookkeeping.
+# KEYS: node work queue, node active work; ARGV: count, started_at
+CLAIM_WORK_SCRIPT = """
+local claimed = {}
+for i = 1, tonumber(ARGV[1]) do
+    local data = redis.call("rpop", KEYS[1])
+    if not data then
+        break
+    end
+    local item = cjson.decode(data)
+    item["status"] = "in_progress"
+    item["started_at"] = ARGV[2]
+    data = cjson.encode(item)
+    redis.call("hset", KEYS[2], item["work_id"], data)
+    claimed[#claimed + 1] = data
+end
+return claimed
+"""
+
+# Moves completed items of one node from its active to its completed work hash.
+# KEYS: node active work, node completed work; ARGV: ttl, then work_id and item pairs
+COMPLETE_WORK_SCRIPT = """
+local completed = 0
+for i = 2, #ARGV, 2 do
+    redis.call("hdel", KEYS[1], ARGV[i])
+    redis.call("hset", KEYS[2], ARGV[i], ARGV[i + 1])
+    completed = completed + 1
+end
+redis.call("expire", KEYS[2], ARGV[1])
+return completed
+"""
+
+# Removes failed items of one node from its active work and schedules their retry,
+# or records them as failed when the retry time is empty.
+# KEYS: node active work, node failed work, retry queue;
+# ARGV: work_id, item and retry time triples
+FAIL_WORK_SCRIPT = """
+local failed = 0
+for i = 1, #ARGV, 3 do
+    redis.call("hdel", KEYS[1], ARGV[i])
+    if ARGV[i + 2] == "" then
+        redis.call("hset", KEYS[2], ARGV[i], ARGV[i + 1])
+        failed = failed + 1
+    else
+        redis.call("zadd", KEYS[3], ARGV[i + 2], ARGV[i + 1])
+    end
+end
+return failed
+"""
+
+
 @dataclass
 class WorkItem:
     """Represents a unit of work to be distributed across cluster nodes"""
@@ -146,6 +201,12 @@ class ClusterCoordinator:
         self.failed_work_key = "scraper:failed_work"
         self.node_health_key = "scraper:node_health"
         self.cluster_config_key = "scraper:cluster_config"
+        self.retry_queue_key = "scraper:retry_queue"
+        
+        # Work item scripts, sent by SHA after their first use
+        self._claim_script = self.redis.register_script(CLAIM_WORK_SCRIPT)
+        self._complete_script = self.redis.register_script(COMPLETE_WORK_SCRIPT)
+        self._fail_script = self.redis.register_script(FAIL_WORK_SCRIPT)
         
         # Health monitoring
         self._health_monitor_thread = None
@@ -366,7 +427,11 @@ class ClusterCoordinator:
     
     def get_work_for_node(self, node_id: str, count: int = 1) -> List[WorkItem]:
         """
-        Get work items assigned to a specific node.
+        Claim work items assigned to a specific node.
+        
+        Items are moved from the node's queue to its active work in one atomic
+        call, so an item claimed by a node that dies is redistributed from its
+        active work instead of being lost.
         
         Args:
             node_id: Node identifier
@@ -376,23 +441,16 @@ class ClusterCoordinator:
             List of work items
         """
         queue_key = f"{self.work_queue_key}:{node_id}"
+        active_key = f"{self.active_work_key}:{node_id}"
         work_items = []
         
         try:
-            for _ in range(count):
-                work_data = self.redis.rpop(queue_key)
-                if not work_data:
-                    break
-                
-                work_item = WorkItem.from_dict(json.loads(work_data))
-                work_item.status = WorkItemStatus.IN_PROGRESS
-                work_item.started_at = datetime.now(timezone.utc)
-                
-                # Move to active work tracking
-                active_key = f"{self.active_work_key}:{node_id}"
-                self.redis.hset(active_key, work_item.work_id, json.dumps(work_item.to_dict()))
-                
-                work_items.append(work_item)
+            claimed = self._claim_script(
+                keys=[queue_key, active_key],
+                args=[count, datetime.now(timezone.utc).isoformat()]
+            )
+            for work_data in claimed:
+                work_items.append(WorkItem.from_dict(json.loads(work_data)))
                 
         except redis.RedisError as e:
             logger.error(f"Redis error getting work for node {node_id}: {e}")
@@ -409,26 +467,42 @@ class ClusterCoordinator:
         Returns:
             True if successfully marked as completed
         """
-        try:
-            work_item.status = WorkItemStatus.COMPLETED
-            work_item.completed_at = datetime.now(timezone.utc)
-            
-            # Remove from active work
-            active_key = f"{self.active_work_key}:{work_item.assigned_node}"
-            self.redis.hdel(active_key, work_item.work_id)
-            
-            # Add to completed work
-            completed_key = f"{self.completed_work_key}:{work_item.assigned_node}"
-            self.redis.hset(completed_key, work_item.work_id, json.dumps(work_item.to_dict()))
+        return self.complete_work_items([work_item])
+    
+    def complete_work_items(self, work_items: List[WorkItem]) -> bool:
+        """
+        Mark a batch of work items as completed in one round trip.
+        
+        Args:
+            work_items: Completed work items
             
-            # Set expiration for completed work (24 hours)
-            self.redis.expire(completed_key, 86400)
+        Returns:
+            True if successfully marked as completed
+        """
+        completed_at = datetime.now(timezone.utc)
+        by_node: Dict[Optional[str], List[Any]] = {}
+        for work_item in work_items:
+            work_item.status = WorkItemStatus.COMPLETED
+            work_item.completed_at = completed_at
+            by_node.setdefault(work_item.assigned_node, []).extend(
+                [work_item.work_id, json.dumps(work_item.to_dict())]
+            )
+        
+        try:
+            pipe = self.redis.pipeline()
+            for node_id, args in by_node.items():
+                self._complete_script(
+                    keys=[f"{self.active_work_key}:{node_id}", f"{self.completed_work_key}:{node_id}"],
+                    args=[COMPLETED_WORK_TTL] + args,
+                    client=pipe
+                )
+            pipe.execute()
             
-            logger.debug(f"Marked work item {work_item.work_id} as completed")
+            logger.debug(f"Marked {len(work_items)} work items as completed")
             return True
             
         except redis.RedisError as e:
-            logger.error(f"Redis error completing work item {work_item.work_id}: {e}")
+            logger.error(f"Redis error completing {len(work_items)} work items: {e}")
             return False
     
     def fail_work_item(self, work_item: WorkItem, error_message: str) -> bool:
@@ -442,41 +516,61 @@ class ClusterCoordinator:
         Returns:
             True if successfully handled
         """
-        try:
+        return self.fail_work_items([work_item], error_message)
+    
+    def fail_work_items(self, work_items: List[WorkItem], error_message: str) -> bool:
+        """
+        Mark a batch of work items as failed in one round trip.
+        
+        Items with retries left are scheduled for retry with exponential
+        backoff; the others are recorded as failed permanently.
+        
+        Args:
+            work_items: Failed work items
+            error_message: Error description
+            
+        Returns:
+            True if successfully handled
+        """
+        now = time.time()
+        by_node: Dict[Optional[str], List[Any]] = {}
+        for work_item in work_items:
             work_item.error_message = error_message
             work_item.retry_count += 1
             
-            # Remove from active work
-            active_key = f"{self.active_work_key}:{work_item.assigned_node}"
-            self.redis.hdel(active_key, work_item.work_id)
-            
             if work_item.retry_count < work_item.max_retries:
                 # Retry with exponential backoff
                 work_item.status = WorkItemStatus.RETRYING
                 delay = min(300, 30 * (2 ** work_item.retry_count))  # Max 5 minutes
-                
-                # Schedule retry
-                retry_time = time.time() + delay
-                retry_key = f"scraper:retry_queue"
+                retry_time = now + delay
                 retry_data = {
                     'work_item': work_item.to_dict(),
                     'retry_time': retry_time
                 }
-                self.redis.zadd(retry_key, {json.dumps(retry_data): retry_time})
-                
+                args = [work_item.work_id, json.dumps(retry_data), repr(retry_time)]
                 logger.info(f"Scheduled retry for work item {work_item.work_id} in {delay} seconds")
             else:
                 # Max retries exceeded
                 work_item.status = WorkItemStatus.FAILED
-                failed_key = f"{self.failed_work_key}:{work_item.assigned_node}"
-                self.redis.hset(failed_key, work_item.work_id, json.dumps(work_item.to_dict()))
-                
+                args = [work_item.work_id, json.dumps(work_item.to_dict()), ""]
                 logger.error(f"Work item {work_item.work_id} failed permanently after {work_item.retry_count} retries")
             
+            by_node.setdefault(work_item.assigned_node, []).extend(args)
+        
+        try:
+            pipe = self.redis.pipeline()
+            for node_id, args in by_node.items():
+                self._fail_script(
+                    keys=[f"{self.active_work_key}:{node_id}", f"{self.failed_work_key}:{node_id}",
+                          self.retry_queue_key],
+                    args=args,
+                    client=pipe
+                )
+            pipe.execute()
             return True
             
         except redis.RedisError as e:
-            logger.error(f"Redis error failing work item {work_item.work_id}: {e}")
+            logger.error(f"Redis error failing {len(work_items)} work items: {e}")
             return False
     
     def process_retry_queue(self) -> List[WorkItem]:
@@ -486,7 +580,7 @@ class ClusterCoordinator:
         Returns:
             List of work items ready for retry
         """
-        retry_key = "scraper:retry_queue"
+        retry_key = self.retry_queue_key
         current_time = time.time()
         ready_items = []
         
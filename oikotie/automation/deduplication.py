@@ -251,10 +251,9 @@ class SmartDeduplicationManager:
             return {}
         
         try:
-            import duckdb
             url_data = {}
             
-            with duckdb.connect(str(self.db_manager.db_path), read_only=True) as con:
+            with self.db_manager.connections.connection() as con:
                 # Use parameterized query with IN clause for efficiency
                 placeholders = ','.join(['?' for _ in urls])
                 query = f"""
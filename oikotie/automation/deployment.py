@@ -524,11 +524,14 @@ class DeploymentManager:
     def _check_database_connection(self) -> bool:
         """Check database connectivity."""
         try:
-            import duckdb
+            from ..database.connection import get_reader_connection
             db_path = self.deployment_config.database_path if self.deployment_config else "data/real_estate.duckdb"
             
-            with duckdb.connect(db_path, read_only=True) as con:
+            con = get_reader_connection(db_path)
+            try:
                 con.execute("SELECT 1").fetchone()
+            finally:
+                con.close()
             return True
         except Exception:
             return False
@@ -6,13 +6,18 @@ batch processing, and intelligent workflow coordination.
 """
 
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Set
-from dataclasses import dataclass
+from typing import Any, Callable, List, Dict, Optional, Tuple, Set
+from dataclasses import dataclass, field
 from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
 import uuid
 from loguru import logger
 
 from ..database.manager import EnhancedDatabaseManager, ListingRecord, ExecutionMetadata
+from ..rate_control import AdaptiveLimiter, get_limiter
+from ..scraper import DETAIL_LIMITER, DETAIL_LIMITER_SETTINGS, ListingUnavailableError, get_webdriver_pool
 from .deduplication import SmartDeduplicationManager, DeduplicationSummary
 
 
@@ -23,6 +28,10 @@ class ListingPriority(Enum):
     LOW = "low"        # Retry attempts, maintenance
 
 
+# Dispatch order of batches in a processing plan
+PRIORITY_ORDER = {ListingPriority.HIGH: 0, ListingPriority.MEDIUM: 1, ListingPriority.LOW: 2}
+
+
 @dataclass
 class ListingBatch:
     """Represents a batch of listings for processing."""
@@ -46,6 +55,9 @@ class ProcessingStats:
     processing_time_seconds: float
     average_time_per_url: float
     error_rate: float
+    new_urls: int = 0
+    updated_urls: int = 0
+    url_times: Dict[str, float] = field(default_factory=dict)  # fetch seconds per URL
 
 
 class ListingManager:
@@ -55,7 +67,15 @@ class ListingManager:
                  db_manager: EnhancedDatabaseManager,
                  deduplication_manager: SmartDeduplicationManager,
                  batch_size: int = 100,
-                 max_concurrent_batches: int = 3):
+                 max_concurrent_batches: int = 3,
+                 max_workers: int = 5,
+                 city_workers: Optional[Dict[str, int]] = None,
+                 min_workers: int = 1,
+                 error_threshold: float = 0.3,
+                 requests_per_second: Optional[float] = None,
+                 save_batch_size: int = 25,
+                 driver_pool=None,
+                 detail_fetcher: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
         """
         Initialize listing manager.
         
@@ -64,18 +84,36 @@ class ListingManager:
             deduplication_manager: Smart deduplication manager instance
             batch_size: Default batch size for processing
             max_concurrent_batches: Maximum concurrent batches
+            max_workers: Detail workers per city, unless set in ``city_workers``
+            city_workers: Detail workers by city name
+            min_workers: Workers kept when the city's limiter backs off
+            error_threshold: Error rate above which the city's limiter backs off
+            requests_per_second: Starting pace of detail page loads per city (unpaced when None)
+            save_batch_size: Listings saved to the database per write
+            driver_pool: WebDriverPool lending browser sessions to the workers
+            detail_fetcher: Callable taking a listing summary and returning it with
+                details; by default the details page is scraped with a pooled browser
         """
         self.db_manager = db_manager
         self.deduplication_manager = deduplication_manager
         self.batch_size = batch_size
         self.max_concurrent_batches = max_concurrent_batches
+        self.max_workers = max_workers
+        self.city_workers = dict(city_workers or {})
+        self.min_workers = min_workers
+        self.error_threshold = error_threshold
+        self.requests_per_second = requests_per_second
+        self.save_batch_size = save_batch_size
+        self.driver_pool = driver_pool
+        self.detail_fetcher = detail_fetcher or self._fetch_details
         
         self.active_batches: Dict[str, ListingBatch] = {}
         self.processing_stats: Dict[str, ProcessingStats] = {}
         
         logger.info(f"Listing manager initialized: "
                    f"batch_size={batch_size}, "
-                   f"max_concurrent={max_concurrent_batches}")
+                   f"max_concurrent={max_concurrent_batches}, "
+                   f"max_workers={max_workers}")
     
     def create_processing_plan(self, 
                               urls: List[str], 
@@ -116,6 +154,11 @@ class ListingManager:
         """
         Execute a processing plan with intelligent batch management.
         
+        Up to ``max_concurrent_batches`` batches run at once, started in priority
+        order (HIGH, MEDIUM, LOW). Their workers share the city's adaptive
+        limiter, so concurrent batches of one city never exceed its detail
+        worker count and back off together when the site pushes back.
+        
         Args:
             batches: List of batches to process
             execution_id: Execution ID for tracking
@@ -137,30 +180,37 @@ class ListingManager:
             error_rate=0.0
         )
         
-        # Process batches in priority order
-        for batch in batches:
-            logger.info(f"Processing batch {batch.batch_id} "
-                       f"({batch.priority.value} priority, {len(batch.urls)} URLs)")
-            
-            batch_stats = self._process_batch(batch, execution_id)
-            
-            # Aggregate statistics
-            total_stats.processed_urls += batch_stats.processed_urls
-            total_stats.successful_urls += batch_stats.successful_urls
-            total_stats.failed_urls += batch_stats.failed_urls
-            total_stats.skipped_urls += batch_stats.skipped_urls
-            
-            # Store batch statistics
-            self.processing_stats[batch.batch_id] = batch_stats
+        # Dispatch batches in priority order; a lower priority batch only starts
+        # once every higher priority batch has been handed to a batch slot
+        ordered = sorted(batches, key=lambda batch: PRIORITY_ORDER[batch.priority])
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrent_batches),
+                                thread_name_prefix="listing-batch") as executor:
+            futures = {executor.submit(self._process_batch, batch, execution_id): batch for batch in ordered}
+            for future in as_completed(futures):
+                batch = futures[future]
+                batch_stats = future.result()
+                
+                # Aggregate statistics
+                total_stats.processed_urls += batch_stats.processed_urls
+                total_stats.successful_urls += batch_stats.successful_urls
+                total_stats.failed_urls += batch_stats.failed_urls
+                total_stats.skipped_urls += batch_stats.skipped_urls
+                total_stats.new_urls += batch_stats.new_urls
+                total_stats.updated_urls += batch_stats.updated_urls
+                total_stats.url_times.update(batch_stats.url_times)
+                
+                # Store batch statistics
+                self.processing_stats[batch.batch_id] = batch_stats
         
         # Calculate final statistics
         end_time = datetime.now()
         total_stats.processing_time_seconds = (end_time - start_time).total_seconds()
         
-        if total_stats.processed_urls > 0:
+        if total_stats.url_times:
             total_stats.average_time_per_url = (
-                total_stats.processing_time_seconds / total_stats.processed_urls
+                sum(total_stats.url_times.values()) / len(total_stats.url_times)
             )
+        if total_stats.processed_urls > 0:
             total_stats.error_rate = (
                 total_stats.failed_urls / total_stats.processed_urls
             )
@@ -357,6 +407,10 @@ class ListingManager:
         """
         Process a single batch of listings.
         
+        Details are fetched by a pool of workers limited by the city's
+        adaptive limiter and saved to the database every ``save_batch_size`` listings.
+        URLs not yet started when the batch is cancelled are counted as skipped.
+        
         Args:
             batch: Batch to process
             execution_id: Execution ID for tracking
@@ -364,59 +418,150 @@ class ListingManager:
         Returns:
             Processing statistics for the batch
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         # Mark batch as active
         self.active_batches[batch.batch_id] = batch
         
-        try:
-            # This is a placeholder for actual scraping logic
-            # In the real implementation, this would call the scraper
-            logger.info(f"Processing batch {batch.batch_id} with {len(batch.urls)} URLs")
+        stats = ProcessingStats(
+            total_urls=len(batch.urls),
+            processed_urls=0,
+            successful_urls=0,
+            failed_urls=0,
+            skipped_urls=0,
+            processing_time_seconds=0.0,
+            average_time_per_url=0.0,
+            error_rate=0.0
+        )
+        limiter = self.get_city_limiter(batch.city)
+        pending: List[Dict[str, Any]] = []
+        lock = threading.Lock()
+        
+        def fetch(url: str) -> None:
+            if batch.batch_id not in self.active_batches:
+                with lock:
+                    stats.skipped_urls += 1
+                return
             
-            # Simulate processing statistics
-            # In real implementation, this would come from actual scraping results
-            stats = ProcessingStats(
-                total_urls=len(batch.urls),
-                processed_urls=len(batch.urls),
-                successful_urls=int(len(batch.urls) * 0.9),  # 90% success rate simulation
-                failed_urls=int(len(batch.urls) * 0.1),     # 10% failure rate simulation
-                skipped_urls=0,
-                processing_time_seconds=0.0,
-                average_time_per_url=0.0,
-                error_rate=0.1
-            )
+            with limiter.slot(PRIORITY_ORDER[batch.priority]) as slot:
+                try:
+                    listing = self.detail_fetcher({'url': url})
+                    error = (listing.get('details') or {}).get('error')
+                    if error is not None:
+                        slot.fail(error, overloaded=False)
+                except ListingUnavailableError as e:
+                    # The site answered normally, so this tells the limiter nothing about load
+                    listing, error = None, str(e)
+                except Exception as e:
+                    listing, error = None, str(e)
+                    slot.fail(e)
+            elapsed = time.monotonic() - slot.started
             
-            end_time = datetime.now()
-            stats.processing_time_seconds = (end_time - start_time).total_seconds()
+            with lock:
+                stats.processed_urls += 1
+                stats.url_times[url] = elapsed
+                if error is not None:
+                    stats.failed_urls += 1
+                    logger.warning(f"Failed to fetch {url}: {error}")
+                    return
+                pending.append(listing)
+                if len(pending) < self.save_batch_size:
+                    return
+                to_save = pending[:]
+                pending.clear()
+            self._save_listings(to_save, batch.city, execution_id, stats, lock)
+        
+        try:
+            logger.info(f"Processing batch {batch.batch_id} with {len(batch.urls)} URLs "
+                       f"(up to {limiter.max_limit} workers)")
             
-            if stats.processed_urls > 0:
-                stats.average_time_per_url = stats.processing_time_seconds / stats.processed_urls
+            with ThreadPoolExecutor(max_workers=limiter.max_limit,
+                                    thread_name_prefix="listing-worker") as executor:
+                for future in [executor.submit(fetch, url) for url in batch.urls]:
+                    future.result()
+            self._save_listings(pending, batch.city, execution_id, stats, lock)
             
             logger.info(f"Batch {batch.batch_id} completed: "
                        f"{stats.successful_urls}/{stats.total_urls} successful")
             
-            return stats
-            
         except Exception as e:
             logger.error(f"Batch {batch.batch_id} failed: {e}")
             
-            # Return error statistics
-            end_time = datetime.now()
-            return ProcessingStats(
-                total_urls=len(batch.urls),
-                processed_urls=0,
-                successful_urls=0,
-                failed_urls=len(batch.urls),
-                skipped_urls=0,
-                processing_time_seconds=(end_time - start_time).total_seconds(),
-                average_time_per_url=0.0,
-                error_rate=1.0
-            )
+            # URLs whose listings were not saved count as failed
+            stats.failed_urls = stats.total_urls - stats.successful_urls - stats.skipped_urls
+            stats.processed_urls = stats.successful_urls + stats.failed_urls
         
         finally:
             # Remove from active batches
             self.active_batches.pop(batch.batch_id, None)
+        
+        stats.processing_time_seconds = time.perf_counter() - start_time
+        if stats.url_times:
+            stats.average_time_per_url = sum(stats.url_times.values()) / len(stats.url_times)
+        if stats.processed_urls > 0:
+            stats.error_rate = stats.failed_urls / stats.processed_urls
+        
+        return stats
+    
+    def _save_listings(self,
+                       listings: List[Dict[str, Any]],
+                       city: str,
+                       execution_id: str,
+                       stats: ProcessingStats,
+                       lock: threading.Lock) -> None:
+        """Upsert fetched listings and count them into the batch statistics."""
+        if not listings:
+            return
+        
+        try:
+            result = self.db_manager.upsert_with_deduplication(listings, city, execution_id, bulk=True)
+            saved = result.new_records + result.updated_records + result.skipped_records
+            new, updated = result.new_records, result.updated_records
+        except Exception as e:
+            logger.error(f"Failed to save {len(listings)} listings for {city}: {e}")
+            saved = new = updated = 0
+        
+        with lock:
+            stats.successful_urls += saved
+            stats.failed_urls += len(listings) - saved
+            stats.new_urls += new
+            stats.updated_urls += updated
+    
+    def _fetch_details(self, listing: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Scrape one listing's details page with a browser session from the pool.
+        
+        Browser errors raise inside the session, which recycles it. A listing
+        without a details grid (removed or 404) raises ``ListingUnavailableError``
+        only after the session is returned, so the browser is kept.
+        """
+        if self.driver_pool is None:
+            self.driver_pool = get_webdriver_pool()
+        with self.driver_pool.session() as scraper:
+            try:
+                return scraper.fetch_listing_details(listing)
+            except ListingUnavailableError as e:
+                unavailable = e
+        raise unavailable
+    
+    def get_city_limiter(self, city: str) -> AdaptiveLimiter:
+        """
+        Get the shared detail page limiter of a city.
+        
+        Args:
+            city: City name
+            
+        Returns:
+            AdaptiveLimiter allowing up to ``city_workers`` or ``max_workers`` fetches
+        """
+        workers = self.city_workers.get(city, self.max_workers)
+        settings = dict(DETAIL_LIMITER_SETTINGS,
+                        rate=self.requests_per_second,
+                        max_limit=workers,
+                        initial_limit=workers,
+                        min_limit=self.min_workers,
+                        target_error_rate=self.error_threshold)
+        return get_limiter(DETAIL_LIMITER, city, **settings)
     
     def _get_historical_average_time(self) -> float:
         """
@@ -25,6 +25,7 @@ try:
         Counter, Gauge, Histogram, Summary, CollectorRegistry, 
         generate_latest, CONTENT_TYPE_LATEST, start_http_server
     )
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
     PROMETHEUS_AVAILABLE = True
 except ImportError:
     logger.warning("prometheus_client not available - metrics export will be limited")
@@ -59,6 +60,8 @@ except ImportError:
 
 from .metrics import MetricsCollector, ExecutionMetrics, PerformanceMetrics, DataQualityMetrics
 from ..database.manager import EnhancedDatabaseManager
+from ..database.connection import add_acquire_observer, get_connection_stats
+from ..rate_control import get_limiter_stats
 
 
 @dataclass
@@ -91,6 +94,34 @@ class ApplicationMetrics:
     cache_hit_rate: float
 
 
+class RateLimiterCollector:
+    """Prometheus collector reading the adaptive rate limiters at scrape time."""
+    
+    GAUGES = [
+        ('scraper_limiter_concurrency_limit', 'Requests the limiter currently allows in flight', 'limit'),
+        ('scraper_limiter_in_flight', 'Requests currently in flight', 'in_flight'),
+        ('scraper_limiter_rate_per_second', 'Request starts allowed per second (0 when unpaced)', 'rate'),
+        ('scraper_limiter_throughput_limit_per_second', 'Effective throughput limit in requests per second', 'throughput_limit'),
+        ('scraper_limiter_latency_p95_seconds', 'p95 latency of recent requests', 'p95_latency'),
+        ('scraper_limiter_error_rate', 'Error rate of recent requests (0-1)', 'error_rate'),
+    ]
+    
+    def collect(self):
+        """Yield one sample per limiter for each limiter metric."""
+        stats = get_limiter_stats()
+        for name, documentation, attribute in self.GAUGES:
+            family = GaugeMetricFamily(name, documentation, labels=['limiter', 'city'])
+            for limiter in stats:
+                family.add_metric([limiter.name, limiter.city or ''], getattr(limiter, attribute) or 0.0)
+            yield family
+        
+        backoffs = CounterMetricFamily('scraper_limiter_backoffs', 'Times the limiter backed off',
+                                       labels=['limiter', 'city'])
+        for limiter in stats:
+            backoffs.add_metric([limiter.name, limiter.city or ''], limiter.backoffs)
+        yield backoffs
+
+
 class PrometheusMetricsExporter:
     """Prometheus-compatible metrics exporter."""
     
@@ -202,6 +233,16 @@ class PrometheusMetricsExporter:
             registry=self.registry
         )
         
+        self.database_connection_acquire = Histogram(
+            'scraper_database_connection_acquire_seconds',
+            'Latency of acquiring a cursor on the shared database connection',
+            registry=self.registry
+        )
+        add_acquire_observer(self._observe_connection_acquire)
+        
+        # Adaptive limiters of the scraper, geocoder and WFS clients, per city
+        self.registry.register(RateLimiterCollector())
+        
         logger.info("Prometheus metrics exporter initialized")
     
     def record_execution_start(self, city: str) -> None:
@@ -247,7 +288,8 @@ class PrometheusMetricsExporter:
         self.system_memory_percent.set(metrics.memory_percent)
         self.system_memory_used_mb.set(metrics.memory_used_mb)
         self.system_disk_usage_percent.set(metrics.disk_usage_percent)
-        
+        self.update_database_metrics()
+
         # Network counters (these should only increase)
         # Note: We need to track previous values to calculate deltas
         # For now, we'll set them directly (not ideal for counters)
@@ -263,6 +305,18 @@ class PrometheusMetricsExporter:
         if metrics.validation_errors:
             self.error_counter.labels(city=city, error_type='validation').inc(len(metrics.validation_errors))
     
+    def _observe_connection_acquire(self, db_path: str, seconds: float) -> None:
+        """Record a database connection acquire latency sample."""
+        self.database_connection_acquire.observe(seconds)
+    
+    def update_database_metrics(self) -> None:
+        """Update database connection metrics from the shared connection managers."""
+        if not PROMETHEUS_AVAILABLE:
+            return
+        
+        open_connections = sum(1 for stats in get_connection_stats() if stats['open'])
+        self.database_connections.set(open_connections)
+    
     def record_error(self, city: str, error_type: str, count: int = 1) -> None:
         """Record an error occurrence."""
         if not PROMETHEUS_AVAILABLE:
@@ -21,7 +21,8 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from ..database.manager import EnhancedDatabaseManager
-from ..scraper import OikotieScraper, worker_scrape_details
+from ..scraper import OikotieScraper, detail_limiter, worker_scrape_details
+from ..webdriver_pool import WebDriverPool
 from .cluster import ClusterCoordinator, WorkItem, WorkItemStatus, create_cluster_coordinator
 from .retry_manager import RetryManager, RetryConfiguration, FailureCategory
 from .data_governance import DataGovernanceManager, DataSource
@@ -143,6 +144,13 @@ class MultiCityScraperOrchestrator:
         self.city_configs = self._load_city_configurations()
         self.global_settings = self._load_global_settings()
         
+        # Browser sessions shared by the detail workers of every city, plus one for discovery
+        pool_size = max([c.max_detail_workers for c in self.city_configs] or [5]) + 1
+        parser_backend = self.global_settings.get('parser_backend')
+        self.driver_pool = WebDriverPool(
+            lambda: OikotieScraper(headless=True, parser_backend=parser_backend), max_size=pool_size
+        )
+        
         # Initialize core components
         self.db_manager = EnhancedDatabaseManager()
         self.data_governance = DataGovernanceManager(self.db_manager)
@@ -655,13 +663,20 @@ class MultiCityScraperOrchestrator:
         """
         scraper = None
         try:
-            # Initialize scraper
-            scraper = OikotieScraper(headless=True)
+            # Borrow a pooled browser session
+            scraper = self.driver_pool.checkout()
             
             # Phase 1: Discover listing URLs
             logger.info(f"Discovering listing URLs for {city_config.city}")
-            listing_summaries = scraper.get_all_listing_summaries(city_config.url)
+            listing_summaries = scraper.get_all_listing_summaries(
+                city_config.url,
+                max_workers=city_config.max_detail_workers,
+                rate_limit_seconds=city_config.rate_limit_seconds,
+                pool=self.driver_pool
+            )
             urls_discovered = len(listing_summaries)
+            self.driver_pool.checkin(scraper)
+            scraper = None
             
             if not listing_summaries:
                 logger.warning(f"No listings discovered for {city_config.city}")
@@ -680,10 +695,12 @@ class MultiCityScraperOrchestrator:
             # Split work into chunks for parallel processing
             max_workers = city_config.max_detail_workers
             chunks = [listing_summaries[i::max_workers] for i in range(max_workers)]
+            limiter = detail_limiter(city_config.city, max_workers)
             
             detailed_listings = []
             with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = [executor.submit(worker_scrape_details, chunk) for chunk in chunks]
+                futures = [executor.submit(worker_scrape_details, chunk, None, self.driver_pool, limiter)
+                           for chunk in chunks]
                 for future in as_completed(futures):
                     try:
                         chunk_results = future.result()
@@ -715,7 +732,7 @@ class MultiCityScraperOrchestrator:
             
         finally:
             if scraper:
-                scraper.close()
+                self.driver_pool.checkin(scraper, failed=True)
     
     def _load_city_configurations(self) -> List[CityConfig]:
         """Load city configurations from config file."""
@@ -787,6 +804,10 @@ class MultiCityScraperOrchestrator:
                     recovery_timeout=300,  # 5 minutes
                     expected_exception=Exception
                 )
+                # Slow down the city's detail page loads when its circuit opens
+                detail_limiter(city_config.city, city_config.max_detail_workers).watch(
+                    circuit_breakers[city_config.city]
+                )
         
         logger.info(f"Initialized circuit breakers for {len(circuit_breakers)} cities")
         return circuit_breakers
@@ -809,6 +830,9 @@ class MultiCityScraperOrchestrator:
         if self.cluster_coordinator:
             self.cluster_coordinator.coordinate_shutdown()
         
+        logger.info(f"Browser pool stats: {self.driver_pool.get_stats()}")
+        self.driver_pool.close()
+        
         logger.info("Multi-city orchestrator shutdown complete")
 
 
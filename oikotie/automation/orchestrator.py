@@ -19,6 +19,7 @@ from loguru import logger
 
 from ..database.manager import EnhancedDatabaseManager, ExecutionMetadata, ListingRecord
 from ..scraper import OikotieScraper, worker_scrape_details
+from ..webdriver_pool import WebDriverPool
 from .deduplication import SmartDeduplicationManager, DeduplicationSummary
 from .listing_manager import ListingManager, ProcessingStats, ListingBatch
 from .retry_manager import RetryManager, RetryConfiguration
@@ -86,6 +87,11 @@ class ScraperConfig:
     url: str
     listing_limit: Optional[int] = None
     max_detail_workers: int = 5
+    min_detail_workers: int = 1
+    detail_error_threshold: float = 0.3
+    max_summary_workers: int = 4
+    rate_limit_seconds: float = 1.0
+    parser_backend: Optional[str] = None
     staleness_threshold_hours: int = 24
     retry_limit: int = 3
     retry_delay_hours: int = 1
@@ -119,12 +125,6 @@ class EnhancedScraperOrchestrator:
             retry_delay_hours=config.retry_delay_hours
         )
         
-        self.listing_manager = ListingManager(
-            db_manager=self.db_manager,
-            deduplication_manager=self.deduplication_manager,
-            batch_size=config.batch_size
-        )
-        
         self.retry_manager = RetryManager(
             db_manager=self.db_manager,
             config=RetryConfiguration(
@@ -133,6 +133,24 @@ class EnhancedScraperOrchestrator:
             )
         )
         
+        # Browser sessions borrowed for discovery (summary workers plus the first-page session)
+        self.driver_pool = WebDriverPool(
+            lambda: OikotieScraper(headless=config.headless_browser, parser_backend=config.parser_backend),
+            max_size=max(config.max_summary_workers, config.max_detail_workers) + 1
+        )
+        
+        # Detail workers of the processing plan borrow from the same pool
+        self.listing_manager = ListingManager(
+            db_manager=self.db_manager,
+            deduplication_manager=self.deduplication_manager,
+            batch_size=config.batch_size,
+            max_workers=config.max_detail_workers,
+            min_workers=config.min_detail_workers,
+            error_threshold=config.detail_error_threshold,
+            requests_per_second=1.0 / config.rate_limit_seconds if config.rate_limit_seconds else None,
+            driver_pool=self.driver_pool
+        )
+        
         # Initialize metrics collector
         self.metrics_collector = MetricsCollector(self.db_manager)
         
@@ -224,7 +242,8 @@ class EnhancedScraperOrchestrator:
             
             # Update result with processing statistics
             result.urls_processed = processing_stats.processed_urls
-            result.listings_new = processing_stats.successful_urls  # Simplified for now
+            result.listings_new = processing_stats.new_urls
+            result.listings_updated = processing_stats.updated_urls
             result.listings_failed = processing_stats.failed_urls
             result.listings_skipped = processing_stats.skipped_urls
             
@@ -247,6 +266,7 @@ class EnhancedScraperOrchestrator:
             execution_metadata.completed_at = result.completed_at
             execution_metadata.listings_processed = result.urls_processed
             execution_metadata.listings_new = result.listings_new
+            execution_metadata.listings_updated = result.listings_updated
             execution_metadata.listings_failed = result.listings_failed
             execution_metadata.execution_time_seconds = int(result.execution_time_seconds)
             execution_metadata.memory_usage_mb = int(result.memory_usage_mb or 0)
@@ -271,6 +291,10 @@ class EnhancedScraperOrchestrator:
         finally:
             # Always track execution metadata
             self.db_manager.track_execution_metadata(execution_metadata)
+            
+            # Don't keep idle browsers around between daily runs
+            logger.debug(f"Browser pool stats: {self.driver_pool.get_stats()}")
+            self.driver_pool.close()
         
         return result
     
@@ -320,23 +344,21 @@ class EnhancedScraperOrchestrator:
             List of discovered listing URLs
         """
         try:
-            scraper = OikotieScraper(headless=self.config.headless_browser)
-            
-            try:
+            with self.driver_pool.session() as scraper:
                 # Get listing summaries
                 listing_summaries = scraper.get_all_listing_summaries(
                     self.config.url, 
-                    limit=self.config.listing_limit
+                    limit=self.config.listing_limit,
+                    max_workers=self.config.max_summary_workers,
+                    rate_limit_seconds=self.config.rate_limit_seconds,
+                    pool=self.driver_pool
                 )
                 
-                # Extract URLs
-                urls = [summary['url'] for summary in listing_summaries if summary.get('url')]
-                
-                logger.info(f"Discovered {len(urls)} listing URLs for {self.config.city}")
-                return urls
-                
-            finally:
-                scraper.close()
+            # Extract URLs
+            urls = [summary['url'] for summary in listing_summaries if summary.get('url')]
+            
+            logger.info(f"Discovered {len(urls)} listing URLs for {self.config.city}")
+            return urls
                 
         except Exception as e:
             logger.error(f"Failed to discover listing URLs: {e}")
@@ -356,8 +378,6 @@ class EnhancedScraperOrchestrator:
             Overall processing statistics
         """
         try:
-            # For now, use the listing manager's execution logic
-            # In a full implementation, this would integrate with the actual scraper
             return self.listing_manager.execute_processing_plan(batches, execution_id)
             
         except Exception as e:
@@ -504,12 +524,15 @@ class EnhancedScraperOrchestrator:
             }
 
 
-def create_orchestrator_from_task_config(task_config: Dict[str, Any]) -> EnhancedScraperOrchestrator:
+def create_orchestrator_from_task_config(task_config: Dict[str, Any],
+                                         global_settings: Optional[Dict[str, Any]] = None) -> EnhancedScraperOrchestrator:
     """
     Create an enhanced scraper orchestrator from a task configuration.
     
     Args:
         task_config: Task configuration dictionary
+        global_settings: ``global_settings`` of the configuration file, used for
+                         settings the task does not set (e.g. ``parser_backend``)
         
     Returns:
         Configured EnhancedScraperOrchestrator instance
@@ -519,6 +542,11 @@ def create_orchestrator_from_task_config(task_config: Dict[str, Any]) -> Enhance
         url=task_config.get('url', ''),
         listing_limit=task_config.get('listing_limit'),
         max_detail_workers=task_config.get('max_detail_workers', 5),
+        min_detail_workers=task_config.get('min_detail_workers', 1),
+        detail_error_threshold=task_config.get('detail_error_threshold', 0.3),
+        max_summary_workers=task_config.get('max_summary_workers', 4),
+        rate_limit_seconds=task_config.get('rate_limit_seconds', 1.0),
+        parser_backend=task_config.get('parser_backend', (global_settings or {}).get('parser_backend')),
         staleness_threshold_hours=task_config.get('staleness_threshold_hours', 24),
         retry_limit=task_config.get('retry_limit', 3),
         retry_delay_hours=task_config.get('retry_delay_hours', 1),
@@ -546,11 +574,12 @@ def load_config_and_create_orchestrators(config_path: str = 'config/config.json'
             config_data = json.load(f)
         
         tasks = config_data.get('tasks', [])
+        global_settings = config_data.get('global_settings', {})
         orchestrators = []
         
         for task in tasks:
             if task.get('enabled', False):
-                orchestrator = create_orchestrator_from_task_config(task)
+                orchestrator = create_orchestrator_from_task_config(task, global_settings)
                 orchestrators.append(orchestrator)
                 logger.info(f"Created orchestrator for {task.get('city')}")
         
@@ -215,10 +215,9 @@ class RetryManager:
             List of URLs ready for retry
         """
         try:
-            import duckdb
             current_time = datetime.now()
             
-            with duckdb.connect(str(self.db_manager.db_path), read_only=True) as con:
+            with self.db_manager.connections.connection() as con:
                 query = """
                     SELECT url
                     FROM listings 
@@ -260,10 +259,9 @@ class RetryManager:
             Dictionary with retry statistics
         """
         try:
-            import duckdb
             cutoff_time = datetime.now() - timedelta(hours=hours_back)
             
-            with duckdb.connect(str(self.db_manager.db_path), read_only=True) as con:
+            with self.db_manager.connections.connection() as con:
                 # Base query
                 base_query = """
                     FROM listings 
@@ -337,9 +335,7 @@ class RetryManager:
             True if reset successfully, False otherwise
         """
         try:
-            import duckdb
-            
-            with duckdb.connect(str(self.db_manager.db_path)) as con:
+            with self.db_manager.connections.connection() as con:
                 con.execute("""
                     UPDATE listings 
                     SET retry_count = 0, last_error = NULL
@@ -411,9 +407,7 @@ class RetryManager:
             execution_id: Execution ID for tracking
         """
         try:
-            import duckdb
-            
-            with duckdb.connect(str(self.db_manager.db_path)) as con:
+            with self.db_manager.connections.connection() as con:
                 con.execute("""
                     UPDATE listings 
                     SET retry_count = ?,
@@ -7,15 +7,18 @@ and failure recovery capabilities.
 """
 
 import asyncio
+import heapq
+import itertools
 import json
 import signal
 import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 from pathlib import Path
-from threading import Thread, Event, Lock
+from threading import Thread, Event, Lock, Condition
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 from .psutil_compat import psutil
 from croniter import croniter
@@ -23,6 +26,7 @@ from loguru import logger
 
 from .config import ScraperConfig, SchedulingConfig
 from .orchestrator import EnhancedScraperOrchestrator, ScrapingResult, ExecutionStatus
+from ..scraper import load_global_settings
 from .metrics import MetricsCollector
 from .alerting import AlertManager
 
@@ -93,74 +97,161 @@ class SchedulerStats:
     average_execution_time: float = 0.0
     success_rate: float = 0.0
     last_execution: Optional[datetime] = None
+    # Seconds between an execution's scheduled time and its start
+    average_scheduling_latency: float = 0.0
+    max_scheduling_latency: float = 0.0
+
+
+@dataclass
+class _QueueEntry:
+    """Queued execution with the ordering fields fixed at insertion"""
+    task: TaskExecution
+    priority: int
+    due: float
+    seq: int
+    removed: bool = False
 
 
 class TaskQueue:
-    """Thread-safe task queue with priority support"""
+    """
+    Thread-safe task queue with priority support.
     
-    def __init__(self):
-        self._queue: List[TaskExecution] = []
+    Executions wait in a heap ordered by scheduled time; once due they move to a
+    heap ordered by (priority, scheduled time), so ``get`` returns the most
+    important due execution in O(log n). Removal marks the entry through an
+    execution_id index and the heaps drop it lazily, and ``get`` can block on a
+    condition variable until the next execution is due.
+    """
+    
+    def __init__(self,
+                 priority_of: Optional[Callable[[str], Optional[TaskPriority]]] = None,
+                 on_put: Optional[Callable[[], None]] = None):
+        """
+        Args:
+            priority_of: Looks up the priority of a task_id; NORMAL when missing
+            on_put: Called after every put, e.g. to wake an event loop waiting on the queue
+        """
+        self._priority_of = priority_of
+        self._on_put = on_put
+        self._waiting: List[tuple] = []  # (due, seq, entry)
+        self._ready: List[tuple] = []    # (-priority, due, seq, entry)
+        self._entries: Dict[str, _QueueEntry] = {}
+        self._seq = itertools.count()
         self._lock = Lock()
-        self._condition = asyncio.Condition()
+        self._condition = Condition(self._lock)
     
-    def put(self, task: TaskExecution) -> None:
+    def put(self, task: TaskExecution, priority: Optional[TaskPriority] = None) -> None:
         """Add task to queue with priority ordering"""
-        with self._lock:
-            # Insert task based on priority and scheduled time
-            inserted = False
-            for i, existing_task in enumerate(self._queue):
-                existing_def = self._get_task_definition(existing_task.task_id)
-                new_def = self._get_task_definition(task.task_id)
-                
-                if (new_def and existing_def and 
-                    new_def.priority.value > existing_def.priority.value):
-                    self._queue.insert(i, task)
-                    inserted = True
-                    break
-                elif (task.scheduled_time < existing_task.scheduled_time and
-                      new_def and existing_def and
-                      new_def.priority.value == existing_def.priority.value):
-                    self._queue.insert(i, task)
-                    inserted = True
-                    break
+        if priority is None and self._priority_of is not None:
+            priority = self._priority_of(task.task_id)
+        priority = priority or TaskPriority.NORMAL
+        
+        with self._condition:
+            previous = self._entries.pop(task.execution_id, None)
+            if previous is not None:
+                previous.removed = True
             
-            if not inserted:
-                self._queue.append(task)
+            entry = _QueueEntry(task, priority.value, task.scheduled_time.timestamp(), next(self._seq))
+            self._entries[task.execution_id] = entry
+            heapq.heappush(self._waiting, (entry.due, entry.seq, entry))
+            # A new entry may be due sooner than the one waiters are sleeping for
+            self._condition.notify_all()
+        
+        if self._on_put is not None:
+            self._on_put()
+    
+    def _promote_due(self, now: float) -> None:
+        """Move executions that are due from the waiting heap to the ready heap"""
+        while self._waiting and self._waiting[0][0] <= now:
+            _, _, entry = heapq.heappop(self._waiting)
+            if not entry.removed:
+                heapq.heappush(self._ready, (-entry.priority, entry.due, entry.seq, entry))
+    
+    def _pop_ready(self) -> Optional[TaskExecution]:
+        while self._ready:
+            entry = heapq.heappop(self._ready)[-1]
+            if not entry.removed:
+                del self._entries[entry.task.execution_id]
+                return entry.task
+        return None
+    
+    def _next_due(self) -> Optional[float]:
+        while self._waiting and self._waiting[0][-1].removed:
+            heapq.heappop(self._waiting)
+        return self._waiting[0][0] if self._waiting else None
     
     def get(self, timeout: Optional[float] = None) -> Optional[TaskExecution]:
-        """Get next ready task from queue"""
+        """
+        Get next ready task from queue.
+        
+        Args:
+            timeout: Seconds to wait for a task to become due; without a timeout
+                     the call returns immediately
+        
+        Returns:
+            The highest-priority due task, or None if none became due in time
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._condition:
+            while True:
+                self._promote_due(time.time())
+                task = self._pop_ready()
+                if task is not None or deadline is None:
+                    return task
+                
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    return None
+                next_due = self._next_due()
+                if next_due is not None:
+                    wait = min(wait, max(0.0, next_due - time.time()))
+                self._condition.wait(wait)
+    
+    def next_due_time(self) -> Optional[datetime]:
+        """Scheduled time of the earliest queued task"""
         with self._lock:
-            current_time = datetime.now(timezone.utc)
-            
-            for i, task in enumerate(self._queue):
-                if task.scheduled_time <= current_time:
-                    return self._queue.pop(i)
-            
-            return None
+            while self._ready and self._ready[0][-1].removed:
+                heapq.heappop(self._ready)
+            if self._ready:
+                return datetime.now(timezone.utc)
+            next_due = self._next_due()
+            return datetime.fromtimestamp(next_due, timezone.utc) if next_due is not None else None
+    
+    def wake(self) -> None:
+        """Wake all threads blocked in ``get``, e.g. on shutdown"""
+        with self._condition:
+            self._condition.notify_all()
     
     def size(self) -> int:
         """Get queue size"""
         with self._lock:
-            return len(self._queue)
+            return len(self._entries)
     
     def get_pending_tasks(self) -> List[TaskExecution]:
-        """Get list of pending tasks"""
+        """Get list of pending tasks, soonest first"""
         with self._lock:
-            return self._queue.copy()
+            entries = sorted(self._entries.values(), key=lambda entry: (entry.due, -entry.priority, entry.seq))
+            return [entry.task for entry in entries]
     
     def remove_task(self, execution_id: str) -> bool:
         """Remove task from queue"""
-        with self._lock:
-            for i, task in enumerate(self._queue):
-                if task.execution_id == execution_id:
-                    self._queue.pop(i)
-                    return True
-            return False
+        with self._condition:
+            entry = self._entries.pop(execution_id, None)
+            if entry is None:
+                return False
+            entry.removed = True
+            self._condition.notify_all()
+            return True
     
-    def _get_task_definition(self, task_id: str) -> Optional[TaskDefinition]:
-        """Helper to get task definition (would be injected in real implementation)"""
-        # This would be injected from the scheduler
-        return None
+    def clear(self) -> List[TaskExecution]:
+        """Remove all tasks, returning them"""
+        with self._condition:
+            tasks = [entry.task for entry in self._entries.values()]
+            self._entries.clear()
+            self._waiting.clear()
+            self._ready.clear()
+            self._condition.notify_all()
+            return tasks
 
 
 class ResourceMonitor:
@@ -381,7 +472,21 @@ class TaskExecutor:
 
 
 class TaskScheduler:
-    """Main task scheduler with cron-like scheduling and execution management"""
+    """
+    Main task scheduler with cron-like scheduling and execution management.
+    
+    The scheduler core is one long-lived asyncio loop on a background thread.
+    Each enabled task's next cron fire time is computed once and kept in a
+    timer heap; the loop sleeps until the earliest timer or queued execution
+    is due (or until it is woken by a new execution or a finished task), and
+    runs up to ``concurrent_tasks`` executions at once under a semaphore.
+    """
+    
+    # Longest the loop sleeps without a deadline before rechecking stop flags
+    MAX_IDLE_WAIT = 30.0
+    
+    # Scheduling latencies kept for the statistics
+    LATENCY_SAMPLES = 1000
     
     def __init__(self, 
                  config: ScraperConfig,
@@ -392,8 +497,13 @@ class TaskScheduler:
         self.metrics_collector = metrics_collector
         self.alert_manager = alert_manager
         
+        # Event loop state, set while the scheduler runs
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop_timeout = 30.0
+        
         # Core components
-        self.task_queue = TaskQueue()
+        self.task_queue = TaskQueue(priority_of=self._get_task_priority, on_put=self._wake)
         self.resource_monitor = ResourceMonitor()
         self.task_executor = TaskExecutor(self.resource_monitor)
         
@@ -402,27 +512,42 @@ class TaskScheduler:
         self.execution_history: List[TaskExecution] = []
         self.running = False
         self.scheduler_thread: Optional[Thread] = None
-        self.executor_thread: Optional[Thread] = None
         self.stop_event = Event()
         
+        # Next cron fire time per task, with a heap of (fire timestamp, seq, task_id)
+        self._crons: Dict[str, croniter] = {}
+        self._next_fire: Dict[str, float] = {}
+        self._timers: List[tuple] = []
+        self._timer_seq = itertools.count()
+        self._timer_lock = Lock()
+        
         # Statistics
         self.stats = SchedulerStats()
         self.stats_lock = Lock()
+        self._scheduling_latencies: deque = deque(maxlen=self.LATENCY_SAMPLES)
         
         # Emergency stop
         self.emergency_stop = Event()
         
         logger.info("Task scheduler initialized")
     
+    def _get_task_priority(self, task_id: str) -> Optional[TaskPriority]:
+        """Priority of a task definition, used to order the task queue"""
+        task_def = self.task_definitions.get(task_id)
+        return task_def.priority if task_def else None
+    
     def add_task(self, task_definition: TaskDefinition) -> None:
         """Add a task definition to the scheduler"""
         self.task_definitions[task_definition.task_id] = task_definition
+        if self.running:
+            self._arm_timer(task_definition)
         logger.info(f"Added task: {task_definition.name} ({task_definition.task_id})")
     
     def remove_task(self, task_id: str) -> bool:
         """Remove a task definition"""
         if task_id in self.task_definitions:
             del self.task_definitions[task_id]
+            self._disarm_timer(task_id)
             logger.info(f"Removed task: {task_id}")
             return True
         return False
@@ -431,6 +556,8 @@ class TaskScheduler:
         """Enable a task"""
         if task_id in self.task_definitions:
             self.task_definitions[task_id].enabled = True
+            if self.running:
+                self._arm_timer(self.task_definitions[task_id])
             logger.info(f"Enabled task: {task_id}")
             return True
         return False
@@ -439,6 +566,7 @@ class TaskScheduler:
         """Disable a task"""
         if task_id in self.task_definitions:
             self.task_definitions[task_id].enabled = False
+            self._disarm_timer(task_id)
             logger.info(f"Disabled task: {task_id}")
             return True
         return False
@@ -476,13 +604,14 @@ class TaskScheduler:
         self.stop_event.clear()
         self.emergency_stop.clear()
         
-        # Start scheduler thread
-        self.scheduler_thread = Thread(target=self._scheduler_loop, daemon=True)
-        self.scheduler_thread.start()
+        # Fire times are computed from now on, so missed runs are not replayed
+        for task_def in list(self.task_definitions.values()):
+            if task_def.enabled:
+                self._arm_timer(task_def)
         
-        # Start executor thread
-        self.executor_thread = Thread(target=self._executor_loop, daemon=True)
-        self.executor_thread.start()
+        # Start the event loop thread
+        self.scheduler_thread = Thread(target=lambda: asyncio.run(self._run()), daemon=True)
+        self.scheduler_thread.start()
         
         # Register signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -491,20 +620,20 @@ class TaskScheduler:
         logger.info("Task scheduler started")
     
     def stop(self, timeout: int = 30) -> None:
-        """Stop the scheduler gracefully"""
+        """Stop the scheduler gracefully, letting running tasks finish for up to ``timeout`` seconds"""
         if not self.running:
             return
         
         logger.info("Stopping task scheduler...")
+        self._stop_timeout = timeout
         self.running = False
         self.stop_event.set()
+        self._wake()
+        self.task_queue.wake()
         
-        # Wait for threads to finish
+        # Wait for the loop to finish
         if self.scheduler_thread and self.scheduler_thread.is_alive():
-            self.scheduler_thread.join(timeout=timeout)
-        
-        if self.executor_thread and self.executor_thread.is_alive():
-            self.executor_thread.join(timeout=timeout)
+            self.scheduler_thread.join(timeout=timeout + 5)
         
         # Cancel any active executions
         active_executions = self.task_executor.get_active_executions()
@@ -517,6 +646,7 @@ class TaskScheduler:
         """Emergency stop all tasks immediately"""
         logger.critical("EMERGENCY STOP activated - stopping all tasks immediately")
         self.emergency_stop.set()
+        self._wake()
         
         # Cancel all active executions
         active_executions = self.task_executor.get_active_executions()
@@ -524,10 +654,8 @@ class TaskScheduler:
             self.task_executor.cancel_execution(execution.execution_id)
         
         # Clear task queue
-        while self.task_queue.size() > 0:
-            task = self.task_queue.get()
-            if task:
-                task.status = TaskStatus.CANCELLED
+        for task in self.task_queue.clear():
+            task.status = TaskStatus.CANCELLED
         
         # Send alert
         if self.alert_manager:
@@ -542,98 +670,178 @@ class TaskScheduler:
         logger.info(f"Received signal {signum}, initiating graceful shutdown")
         self.stop()
     
-    def _scheduler_loop(self) -> None:
-        """Main scheduler loop that generates task executions"""
-        logger.info("Scheduler loop started")
+    def _wake(self) -> None:
+        """Wake the event loop to re-evaluate its deadlines; safe from any thread"""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            pass  # The loop has already closed
+    
+    def _arm_timer(self, task_def: TaskDefinition, after: Optional[datetime] = None) -> None:
+        """Compute a task's next cron fire time and push it on the timer heap"""
+        try:
+            cron = croniter(task_def.cron_expression, after or datetime.now(timezone.utc))
+            fire_time = cron.get_next(datetime)
+        except Exception as e:
+            logger.error(f"Error computing schedule for task {task_def.task_id}: {e}")
+            return
         
-        while self.running and not self.stop_event.is_set():
-            try:
-                if self.emergency_stop.is_set():
-                    break
+        with self._timer_lock:
+            self._crons[task_def.task_id] = cron
+            self._push_timer(task_def.task_id, fire_time.timestamp())
+        self._wake()
+    
+    def _push_timer(self, task_id: str, fire_ts: float) -> None:
+        self._next_fire[task_id] = fire_ts
+        heapq.heappush(self._timers, (fire_ts, next(self._timer_seq), task_id))
+    
+    def _disarm_timer(self, task_id: str) -> None:
+        """Forget a task's fire time; its heap entry is dropped when it surfaces"""
+        with self._timer_lock:
+            self._crons.pop(task_id, None)
+            self._next_fire.pop(task_id, None)
+    
+    def _next_timer(self) -> Optional[float]:
+        """Earliest live fire timestamp, dropping stale heap entries"""
+        while self._timers:
+            fire_ts, _, task_id = self._timers[0]
+            if self._next_fire.get(task_id) == fire_ts:
+                return fire_ts
+            heapq.heappop(self._timers)
+        return None
+    
+    def _fire_due_timers(self, now: float) -> None:
+        """Queue an execution for every timer that is due and advance its cron"""
+        with self._timer_lock:
+            while True:
+                fire_ts = self._next_timer()
+                if fire_ts is None or fire_ts > now:
+                    return
+                _, _, task_id = heapq.heappop(self._timers)
+                task_def = self.task_definitions.get(task_id)
+                cron = self._crons.get(task_id)
+                if task_def is None or not task_def.enabled or cron is None:
+                    self._next_fire.pop(task_id, None)
+                    continue
                 
-                current_time = datetime.now(timezone.utc)
+                task_execution = TaskExecution(
+                    execution_id=str(uuid.uuid4()),
+                    task_id=task_id,
+                    status=TaskStatus.QUEUED,
+                    scheduled_time=datetime.fromtimestamp(fire_ts, timezone.utc)
+                )
+                self.task_queue.put(task_execution)
+                logger.info(f"Scheduled task: {task_def.name} for {task_execution.scheduled_time}")
                 
-                # Check each task definition for scheduling
-                for task_id, task_def in self.task_definitions.items():
-                    if not task_def.enabled:
-                        continue
+                # Advance the same croniter; fire times missed while the loop was busy are skipped
+                next_ts = cron.get_next(datetime).timestamp()
+                skipped = 0
+                while next_ts <= now:
+                    next_ts = cron.get_next(datetime).timestamp()
+                    skipped += 1
+                if skipped:
+                    logger.warning(f"Skipped {skipped} missed run(s) of task {task_def.name}")
+                self._push_timer(task_id, next_ts)
+    
+    def _seconds_until_next_deadline(self, slots_free: bool) -> float:
+        """Time until the next timer or, when a slot is free, the next queued execution"""
+        deadlines = []
+        with self._timer_lock:
+            next_timer = self._next_timer()
+        if next_timer is not None:
+            deadlines.append(next_timer)
+        if slots_free:
+            next_due = self.task_queue.next_due_time()
+            if next_due is not None:
+                deadlines.append(next_due.timestamp())
+        
+        if not deadlines:
+            return self.MAX_IDLE_WAIT
+        return min(max(0.0, min(deadlines) - time.time()), self.MAX_IDLE_WAIT)
+    
+    async def _run(self) -> None:
+        """Scheduler core: fire cron timers and start due executions as slots free up"""
+        logger.info("Scheduler loop started")
+        self._wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(1, self.scheduling_config.concurrent_tasks))
+        running: Set[asyncio.Task] = set()
+        
+        try:
+            while self.running and not self.stop_event.is_set() and not self.emergency_stop.is_set():
+                try:
+                    # Anything that wakes the loop from here on is seen by the next wait
+                    self._wakeup.clear()
+                    self._fire_due_timers(time.time())
                     
-                    # Check if task should be scheduled
-                    if self._should_schedule_task(task_def, current_time):
-                        execution_id = str(uuid.uuid4())
-                        
-                        # Calculate next execution time
-                        cron = croniter(task_def.cron_expression, current_time)
-                        next_time = cron.get_next(datetime)
+                    # Start due executions while slots are free
+                    while not semaphore.locked():
+                        task_execution = self.task_queue.get()
+                        if task_execution is None:
+                            break
                         
-                        task_execution = TaskExecution(
-                            execution_id=execution_id,
-                            task_id=task_id,
-                            status=TaskStatus.QUEUED,
-                            scheduled_time=next_time
-                        )
+                        task_def = self.task_definitions.get(task_execution.task_id)
+                        if not task_def or not task_def.enabled:
+                            logger.warning(f"Task definition not found or disabled: {task_execution.task_id}")
+                            continue
                         
-                        self.task_queue.put(task_execution)
-                        logger.info(f"Scheduled task: {task_def.name} for {next_time}")
-                
-                # Update statistics
-                self._update_stats()
-                
-                # Sleep for a short interval
-                time.sleep(60)  # Check every minute
-                
-            except Exception as e:
-                logger.error(f"Error in scheduler loop: {e}")
-                time.sleep(10)
+                        await semaphore.acquire()
+                        task = asyncio.create_task(self._run_execution(task_execution, task_def, semaphore))
+                        running.add(task)
+                        task.add_done_callback(running.discard)
+                    
+                    # Update statistics
+                    self._update_stats()
+                    
+                    timeout = self._seconds_until_next_deadline(slots_free=not semaphore.locked())
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    
+                except Exception as e:
+                    logger.error(f"Error in scheduler loop: {e}")
+                    await asyncio.sleep(10)
+            
+            # Let running tasks finish on a graceful stop
+            if running and not self.emergency_stop.is_set():
+                await asyncio.wait(running, timeout=self._stop_timeout)
+        finally:
+            self._loop = None
+            self._wakeup = None
         
         logger.info("Scheduler loop ended")
     
-    def _executor_loop(self) -> None:
-        """Main executor loop that processes queued tasks"""
-        logger.info("Executor loop started")
-        
-        while self.running and not self.stop_event.is_set():
-            try:
-                if self.emergency_stop.is_set():
-                    break
-                
-                # Get next ready task
-                task_execution = self.task_queue.get()
-                if not task_execution:
-                    time.sleep(5)
-                    continue
-                
-                # Get task definition
-                task_def = self.task_definitions.get(task_execution.task_id)
-                if not task_def or not task_def.enabled:
-                    logger.warning(f"Task definition not found or disabled: {task_execution.task_id}")
-                    continue
-                
-                # Check concurrent task limits
-                active_count = len(self.task_executor.get_active_executions())
-                if active_count >= self.scheduling_config.concurrent_tasks:
-                    # Put task back in queue for later
-                    task_execution.scheduled_time = datetime.now(timezone.utc) + timedelta(minutes=1)
-                    self.task_queue.put(task_execution)
-                    time.sleep(10)
-                    continue
-                
-                # Create orchestrator for the task
-                orchestrator = self._create_orchestrator_for_task(task_def)
-                if not orchestrator:
-                    logger.error(f"Failed to create orchestrator for task: {task_execution.task_id}")
-                    task_execution.status = TaskStatus.FAILED
-                    task_execution.error_message = "Failed to create orchestrator"
-                    continue
-                
-                # Execute task asynchronously
-                asyncio.run(self._execute_task_async(task_execution, task_def, orchestrator))
-                
-            except Exception as e:
-                logger.error(f"Error in executor loop: {e}")
-                time.sleep(10)
-        
-        logger.info("Executor loop ended")
+    async def _run_execution(self,
+                             task_execution: TaskExecution,
+                             task_def: TaskDefinition,
+                             semaphore: asyncio.Semaphore) -> None:
+        """Run one execution in its concurrency slot"""
+        try:
+            self._record_scheduling_latency(time.time() - task_execution.scheduled_time.timestamp())
+            
+            # Create orchestrator for the task
+            orchestrator = self._create_orchestrator_for_task(task_def)
+            if not orchestrator:
+                logger.error(f"Failed to create orchestrator for task: {task_execution.task_id}")
+                task_execution.status = TaskStatus.FAILED
+                task_execution.error_message = "Failed to create orchestrator"
+                return
+            
+            await self._execute_task_async(task_execution, task_def, orchestrator)
+        finally:
+            semaphore.release()
+            # A free slot may let the next due execution start
+            if self._wakeup is not None:
+                self._wakeup.set()
+    
+    def _record_scheduling_latency(self, latency: float) -> None:
+        """Record how late an execution started relative to its scheduled time"""
+        with self.stats_lock:
+            self._scheduling_latencies.append(max(0.0, latency))
     
     async def _execute_task_async(self, 
                                  task_execution: TaskExecution,
@@ -672,20 +880,6 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error executing task {task_execution.task_id}: {e}")
     
-    def _should_schedule_task(self, task_def: TaskDefinition, current_time: datetime) -> bool:
-        """Check if a task should be scheduled based on cron expression"""
-        try:
-            cron = croniter(task_def.cron_expression, current_time)
-            next_time = cron.get_next(datetime)
-            
-            # Check if we're within the scheduling window (1 minute tolerance)
-            time_diff = abs((next_time - current_time).total_seconds())
-            return time_diff <= 60
-            
-        except Exception as e:
-            logger.error(f"Error checking schedule for task {task_def.task_id}: {e}")
-            return False
-    
     def _schedule_retry(self, failed_execution: TaskExecution, task_def: TaskDefinition) -> None:
         """Schedule a retry for a failed task"""
         retry_delay = task_def.retry_delay * (2 ** failed_execution.retry_count)  # Exponential backoff
@@ -702,6 +896,11 @@ class TaskScheduler:
         self.task_queue.put(retry_execution)
         logger.info(f"Scheduled retry for task {task_def.name} in {retry_delay}s (attempt {retry_execution.retry_count + 1})")
     
+    def _global_settings(self) -> Dict[str, Any]:
+        """``global_settings`` of the configuration file the scheduler config was loaded from"""
+        config_files = [source[len("file:"):] for source in self.config.loaded_from if source.startswith("file:")]
+        return load_global_settings(config_files[-1]) if config_files else load_global_settings()
+    
     def _create_orchestrator_for_task(self, task_def: TaskDefinition) -> Optional[EnhancedScraperOrchestrator]:
         """Create orchestrator instance for a task"""
         try:
@@ -717,6 +916,7 @@ class TaskScheduler:
                         max_detail_workers=task_config.max_detail_workers,
                         staleness_threshold_hours=task_config.staleness_hours,
                         retry_limit=task_config.retry_count,
+                        parser_backend=self._global_settings().get('parser_backend'),
                         headless_browser=True
                     )
                     
@@ -856,6 +1056,10 @@ class TaskScheduler:
     def _update_stats(self) -> None:
         """Update scheduler statistics"""
         with self.stats_lock:
+            if self._scheduling_latencies:
+                self.stats.average_scheduling_latency = sum(self._scheduling_latencies) / len(self._scheduling_latencies)
+                self.stats.max_scheduling_latency = max(self._scheduling_latencies)
+            
             self.stats.total_tasks = len(self.task_definitions)
             self.stats.active_tasks = len(self.task_executor.get_active_executions())
             self.stats.queued_tasks = self.task_queue.size()
@@ -321,8 +321,7 @@ def _load_report_config(config_file: Optional[str], output_dir: str,
 def _get_all_cities(db_manager: EnhancedDatabaseManager) -> List[str]:
     """Get list of all cities with execution data."""
     try:
-        import duckdb
-        with duckdb.connect(str(db_manager.db_path), read_only=True) as con:
+        with db_manager.connections.connection() as con:
             result = con.execute("""
                 SELECT DISTINCT city FROM scraping_executions 
                 WHERE city IS NOT NULL 
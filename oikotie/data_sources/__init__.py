@@ -7,8 +7,11 @@ combines multiple sources for optimal data access.
 """
 
 from .base import GeoDataSource
+from .wfs_client import WFSClient
 from .wms_source import WMSDataSource
 from .geopackage_source import GeoPackageDataSource
+from .tile_cache import GeoTileCache
+from .address_tiles import AddressTileCache
 from .unified_manager import UnifiedDataManager, create_helsinki_manager, QueryType, DataSourcePriority
 
 __all__ = [
@@ -18,5 +21,8 @@ __all__ = [
     'UnifiedDataManager',
     'create_helsinki_manager',
     'QueryType',
-    'DataSourcePriority'
+    'DataSourcePriority',
+    'AddressTileCache',
+    'GeoTileCache',
+    'WFSClient'
 ]
@@ -0,0 +1,176 @@
+"""
+Tiled address cache for the national WFS address service.
+
+Address queries are answered from fixed, globally aligned tiles. Each tile is
+downloaded once with WFS ``startIndex`` paging and stored as a GeoParquet tile,
+so any bbox or attribute filter over an already fetched area is served locally
+and WFS traffic grows with the number of tiles rather than the number of lookups.
+"""
+
+import logging
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import geopandas as gpd
+import pandas as pd
+
+from .tile_cache import GeoTileCache
+
+
+class AddressTileCache:
+    """
+    GeoParquet tile cache in front of a paginated address source.
+
+    Tiles are ``tile_size`` degree squares indexed by ``floor(coordinate / tile_size)``,
+    so a tile's key never depends on the query that first needed it. The source
+    must provide ``fetch_address_page(bbox, start_index, count)`` raising on errors,
+    as ``WMSDataSource`` does. Tiles are stored in a ``GeoTileCache``, which may be
+    shared with other kinds of data so that they all live under one size bound.
+    """
+
+    NAMESPACE = "addresses"
+
+    def __init__(
+        self,
+        source,
+        cache_dir: str = "data/cache/address_tiles",
+        tile_size: float = 0.02,
+        page_size: int = 1000,
+        ttl: timedelta = timedelta(days=7),
+        max_pages: int = 100,
+        tiles: Optional[GeoTileCache] = None
+    ):
+        """
+        Initialize the tile cache.
+
+        Args:
+            source: Address source with a ``fetch_address_page`` method
+            cache_dir: Directory for the tile files (unused when ``tiles`` is given)
+            tile_size: Tile edge length in degrees (unused when ``tiles`` is given)
+            page_size: Features requested per WFS page
+            ttl: Age after which a tile is downloaded again
+            max_pages: Safety bound on pages fetched for one tile
+            tiles: Shared tile store to keep the address tiles in
+        """
+        self.source = source
+        self.tiles = tiles or GeoTileCache(cache_dir, tile_size=tile_size, ttl=ttl)
+        self.cache_dir = self.tiles.cache_dir
+        self.tile_size = self.tiles.tile_size
+        self.page_size = page_size
+        self.ttl = ttl
+        self.max_pages = max_pages
+        self.logger = logging.getLogger(__name__)
+
+        self._stats = {'tiles_downloaded': 0, 'tiles_from_disk': 0, 'wfs_requests': 0}
+
+    def tiles_for_bbox(self, bbox: Tuple[float, float, float, float]) -> List[Tuple[int, int]]:
+        """Indexes of the tiles covering a bbox, row by row."""
+        return self.tiles.tiles_for_bbox(bbox)
+
+    def tile_bbox(self, tile: Tuple[int, int]) -> Tuple[float, float, float, float]:
+        """Bounding box of a tile."""
+        return self.tiles.tile_bbox(tile)
+
+    def tile_path(self, tile: Tuple[int, int]) -> Path:
+        """File holding a tile's addresses."""
+        return self.tiles.tile_path(self.NAMESPACE, tile)
+
+    def _download_pages(self, bbox: Tuple[float, float, float, float]) -> Iterator[gpd.GeoDataFrame]:
+        """Pages of a bbox's addresses, requested until a short page signals the end."""
+        for page in range(self.max_pages):
+            self._stats['wfs_requests'] += 1
+            gdf = self.source.fetch_address_page(bbox, start_index=page * self.page_size, count=self.page_size)
+            if len(gdf) > 0:
+                yield gdf
+            if len(gdf) < self.page_size:
+                return
+        self.logger.warning(f"Stopped paging address tile {bbox} after {self.max_pages} pages")
+
+    def _download_tile(self, bbox: Tuple[float, float, float, float]) -> gpd.GeoDataFrame:
+        pages = list(self._download_pages(bbox))
+        if pages:
+            gdf = gpd.GeoDataFrame(pd.concat(pages, ignore_index=True), geometry='geometry', crs=pages[0].crs)
+        else:
+            gdf = gpd.GeoDataFrame({'geometry': gpd.GeoSeries([], crs=self.source.target_crs)})
+        self._stats['tiles_downloaded'] += 1
+        self.logger.info(f"Cached address tile {bbox} with {len(gdf)} addresses in {len(pages) or 1} page(s)")
+        return gdf
+
+    def get_tile(self, tile: Tuple[int, int]) -> gpd.GeoDataFrame:
+        """
+        Addresses of one tile, downloading the tile if it is missing or expired.
+
+        Args:
+            tile: Tile index as (column, row)
+
+        Returns:
+            GeoDataFrame with the tile's address points
+        """
+        downloaded = self._stats['tiles_downloaded']
+        gdf = self.tiles.get_tile(self.NAMESPACE, tile, self._download_tile, ttl=self.ttl, cache_empty=True)
+        if self._stats['tiles_downloaded'] == downloaded:
+            self._stats['tiles_from_disk'] += 1
+        return gdf
+
+    def query(
+        self,
+        bbox: Tuple[float, float, float, float],
+        limit: Optional[int] = None,
+        **filters
+    ) -> gpd.GeoDataFrame:
+        """
+        Addresses inside a bbox, read from the covering tiles.
+
+        Args:
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+            limit: Maximum number of records to return
+            **filters: Exact, case-insensitive column filters such as ``postal_code``
+
+        Returns:
+            GeoDataFrame with the matching address points
+        """
+        tiles = [self.get_tile(tile) for tile in self.tiles_for_bbox(bbox)]
+        tiles = [gdf for gdf in tiles if len(gdf) > 0]
+        if not tiles:
+            return gpd.GeoDataFrame(columns=['geometry'])
+
+        gdf = gpd.GeoDataFrame(pd.concat(tiles, ignore_index=True), geometry='geometry', crs=tiles[0].crs)
+        # Points on a shared tile edge are returned by both tiles
+        if 'inspire_id_local' in gdf.columns:
+            gdf = gdf.drop_duplicates(subset='inspire_id_local')
+        gdf = gdf.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
+
+        gdf = filter_addresses(gdf, filters)
+        if limit:
+            gdf = gdf.head(limit)
+        return gdf.reset_index(drop=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Download and disk read counters, plus the number of stored tiles."""
+        stats = dict(self._stats)
+        stats['stored_tiles'] = self.tiles.get_stats(self.NAMESPACE)['stored_tiles']
+        return stats
+
+    def clear(self, older_than: Optional[timedelta] = None) -> int:
+        """
+        Delete stored tiles.
+
+        Args:
+            older_than: Only delete tiles older than this. If None, delete all tiles.
+
+        Returns:
+            Number of tiles deleted
+        """
+        return self.tiles.clear(older_than, namespace=self.NAMESPACE)
+
+
+def filter_addresses(gdf: gpd.GeoDataFrame, filters: Dict[str, Any]) -> gpd.GeoDataFrame:
+    """Keep the rows whose columns equal the given values, ignoring case; unknown columns match nothing."""
+    for column, value in filters.items():
+        if value is None:
+            continue
+        if column not in gdf.columns:
+            return gdf.iloc[0:0]
+        gdf = gdf[gdf[column].astype(str).str.casefold() == str(value).casefold()]
+    return gdf
@@ -13,6 +13,18 @@ from shapely.geometry import Point, Polygon
 import fiona
 from datetime import datetime
 
+try:
+    import pyogrio
+    PYOGRIO_AVAILABLE = True
+except ImportError:
+    PYOGRIO_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
 from .base import GeoDataSource
 
 
@@ -108,6 +120,7 @@ class GeoPackageDataSource(GeoDataSource):
         # Get available layers
         self._layers = None
         self._layer_info = {}
+        self._native_crs_cache = {}
         self._scan_layers()
         
         # Update metadata
@@ -139,6 +152,100 @@ class GeoPackageDataSource(GeoDataSource):
             print(f"Error scanning GeoPackage layers: {e}")
             self._layers = []
     
+    def _native_crs(self, layer: str):
+        """CRS the layer is stored in, read once per layer."""
+        if layer not in self._native_crs_cache:
+            crs = None
+            if PYOGRIO_AVAILABLE:
+                try:
+                    crs = pyogrio.read_info(str(self.gpkg_path), layer=layer).get("crs")
+                except Exception as e:
+                    print(f"Could not read CRS of layer '{layer}': {e}")
+            self._native_crs_cache[layer] = crs or self._metadata.get("native_crs", "EPSG:3067")
+        return self._native_crs_cache[layer]
+    
+    def _native_bbox(self, bbox: Tuple[float, float, float, float], native_crs) -> Tuple[float, float, float, float]:
+        """Convert a bbox from the target CRS to a layer's native CRS."""
+        bbox_gdf = gpd.GeoDataFrame(
+            [{'geometry': gpd.GeoSeries.from_xy([bbox[0], bbox[2]], [bbox[1], bbox[3]]).union_all().envelope}],
+            crs=self.target_crs
+        )
+        return bbox_gdf.to_crs(native_crs).geometry[0].bounds
+    
+    def _read_layer(
+        self,
+        layer: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None
+    ) -> gpd.GeoDataFrame:
+        """
+        Read the features of a layer that fall within a bbox.
+        
+        The bbox is pushed down to the GeoPackage R-tree so only candidate
+        features are decoded, then refined with ``.cx`` exactly as a full
+        layer read would be. Without a bbox the limit is pushed down too.
+        
+        Args:
+            layer: Layer name in the GeoPackage
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat) in target CRS
+            limit: Maximum number of records to return
+            columns: Optional layer columns to read (all columns by default)
+            where: Optional SQL attribute filter
+            
+        Returns:
+            GeoDataFrame in the layer's native CRS, in feature order
+        """
+        if not PYOGRIO_AVAILABLE:
+            return self._read_full_layer(layer, bbox, limit, columns, where)
+        
+        bbox_native = self._native_bbox(bbox, self._native_crs(layer)) if bbox is not None else None
+        gdf = gpd.read_file(
+            str(self.gpkg_path),
+            layer=layer,
+            engine="pyogrio",
+            bbox=bbox_native,
+            columns=columns,
+            where=where,
+            max_features=limit if bbox is None else None,
+            use_arrow=ARROW_AVAILABLE,
+            fid_as_index=True
+        )
+        
+        # The R-tree matches feature envelopes; keep the exact bbox semantics
+        if bbox_native is not None and len(gdf) > 0:
+            gdf = gdf.cx[bbox_native[0]:bbox_native[2], bbox_native[1]:bbox_native[3]]
+        
+        gdf = gdf.sort_index().reset_index(drop=True)
+        if limit is not None and len(gdf) > limit:
+            gdf = gdf.head(limit)
+        
+        return gdf
+    
+    def _read_full_layer(
+        self,
+        layer: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        limit: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None
+    ) -> gpd.GeoDataFrame:
+        """Read a whole layer and filter it in memory (used without pyogrio)."""
+        gdf = gpd.read_file(str(self.gpkg_path), layer=layer, where=where)
+        if columns is not None:
+            gdf = gdf[[col for col in columns if col in gdf.columns] + [gdf.geometry.name]]
+        
+        if bbox is not None and len(gdf) > 0:
+            bbox_native = self._native_bbox(bbox, gdf.crs)
+            gdf = gdf.cx[bbox_native[0]:bbox_native[2], bbox_native[1]:bbox_native[3]]
+        
+        gdf = gdf.reset_index(drop=True)
+        if limit is not None and len(gdf) > limit:
+            gdf = gdf.head(limit)
+        
+        return gdf
+    
     def fetch_buildings(
         self,
         bbox: Optional[Tuple[float, float, float, float]] = None,
@@ -159,24 +266,8 @@ class GeoPackageDataSource(GeoDataSource):
             print("Warning: 'rakennus' layer not found in GeoPackage")
             return gpd.GeoDataFrame(columns=['geometry'] + list(self.BUILDING_COLUMN_MAPPING.values()))
         
-        # Read the layer
-        gdf = gpd.read_file(str(self.gpkg_path), layer="rakennus")
-        
-        # Apply bbox filter if provided (convert bbox to native CRS first)
-        if bbox is not None and len(gdf) > 0:
-            # Convert bbox from target CRS to native CRS
-            bbox_gdf = gpd.GeoDataFrame(
-                [{'geometry': gpd.GeoSeries.from_xy([bbox[0], bbox[2]], [bbox[1], bbox[3]]).unary_union.envelope}],
-                crs=self.target_crs
-            )
-            bbox_native = bbox_gdf.to_crs(gdf.crs).geometry[0].bounds
-            
-            # Filter by bbox
-            gdf = gdf.cx[bbox_native[0]:bbox_native[2], bbox_native[1]:bbox_native[3]]
-        
-        # Apply limit if provided
-        if limit is not None and len(gdf) > limit:
-            gdf = gdf.head(limit)
+        # Read only the features within the bbox
+        gdf = self._read_layer("rakennus", bbox, limit)
         
         # Standardize column names
         gdf = self.standardize_columns(gdf, self.BUILDING_COLUMN_MAPPING)
@@ -206,24 +297,8 @@ class GeoPackageDataSource(GeoDataSource):
             print("Warning: 'osoitepiste' layer not found in GeoPackage")
             return gpd.GeoDataFrame(columns=['geometry'] + list(self.ADDRESS_COLUMN_MAPPING.values()))
         
-        # Read the layer
-        gdf = gpd.read_file(str(self.gpkg_path), layer="osoitepiste")
-        
-        # Apply bbox filter if provided
-        if bbox is not None and len(gdf) > 0:
-            # Convert bbox from target CRS to native CRS
-            bbox_gdf = gpd.GeoDataFrame(
-                [{'geometry': gpd.GeoSeries.from_xy([bbox[0], bbox[2]], [bbox[1], bbox[3]]).unary_union.envelope}],
-                crs=self.target_crs
-            )
-            bbox_native = bbox_gdf.to_crs(gdf.crs).geometry[0].bounds
-            
-            # Filter by bbox
-            gdf = gdf.cx[bbox_native[0]:bbox_native[2], bbox_native[1]:bbox_native[3]]
-        
-        # Apply limit if provided
-        if limit is not None and len(gdf) > limit:
-            gdf = gdf.head(limit)
+        # Read only the features within the bbox
+        gdf = self._read_layer("osoitepiste", bbox, limit)
         
         # Standardize column names
         gdf = self.standardize_columns(gdf, self.ADDRESS_COLUMN_MAPPING)
@@ -238,7 +313,9 @@ class GeoPackageDataSource(GeoDataSource):
         layer_name: str,
         bbox: Optional[Tuple[float, float, float, float]] = None,
         limit: Optional[int] = None,
-        column_mapping: Optional[Dict[str, str]] = None
+        column_mapping: Optional[Dict[str, str]] = None,
+        columns: Optional[List[str]] = None,
+        where: Optional[str] = None
     ) -> gpd.GeoDataFrame:
         """
         Fetch data from any layer in the GeoPackage.
@@ -248,6 +325,8 @@ class GeoPackageDataSource(GeoDataSource):
             bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat) in target CRS
             limit: Maximum number of records to fetch
             column_mapping: Optional column name mapping dictionary
+            columns: Optional layer columns to read (all columns by default)
+            where: Optional SQL attribute filter evaluated in the GeoPackage
             
         Returns:
             GeoDataFrame with geometries and attributes
@@ -255,24 +334,8 @@ class GeoPackageDataSource(GeoDataSource):
         if layer_name not in self._layers:
             raise ValueError(f"Layer '{layer_name}' not found. Available layers: {', '.join(self._layers[:10])}...")
         
-        # Read the layer
-        gdf = gpd.read_file(str(self.gpkg_path), layer=layer_name)
-        
-        # Apply bbox filter if provided
-        if bbox is not None and len(gdf) > 0:
-            # Convert bbox from target CRS to native CRS
-            bbox_gdf = gpd.GeoDataFrame(
-                [{'geometry': gpd.GeoSeries.from_xy([bbox[0], bbox[2]], [bbox[1], bbox[3]]).unary_union.envelope}],
-                crs=self.target_crs
-            )
-            bbox_native = bbox_gdf.to_crs(gdf.crs).geometry[0].bounds
-            
-            # Filter by bbox
-            gdf = gdf.cx[bbox_native[0]:bbox_native[2], bbox_native[1]:bbox_native[3]]
-        
-        # Apply limit if provided
-        if limit is not None and len(gdf) > limit:
-            gdf = gdf.head(limit)
+        # Read only the features within the bbox
+        gdf = self._read_layer(layer_name, bbox, limit, columns=columns, where=where)
         
         # Apply column mapping if provided
         if column_mapping:
@@ -0,0 +1,349 @@
+"""
+GeoParquet tile cache for geodata query results.
+
+Query results are stored per fixed, globally aligned tile instead of per query,
+so overlapping bboxes share tiles and any bbox is assembled from the tiles it
+intersects. Tiles are GeoParquet files read through a memory map with only the
+requested columns, and the cache directory is kept under a size bound by
+evicting the least recently used files.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+import weakref
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import geopandas as gpd
+import pandas as pd
+import pyarrow.parquet as pq
+import shapely
+
+# Loads the features of a tile bbox from the underlying source
+TileLoader = Callable[[Tuple[float, float, float, float]], gpd.GeoDataFrame]
+
+
+class GeoTileCache:
+    """
+    Size-bounded GeoParquet cache of geodata tiles.
+
+    Tiles are ``tile_size`` degree squares indexed by ``floor(coordinate / tile_size)``
+    and stored per namespace (for example ``buildings`` or ``layer_tieviiva``).
+    A tile expires ``ttl`` after it was written; reading it refreshes its access
+    time, and when the stored files exceed ``max_bytes`` the least recently read
+    ones are deleted.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/tiles",
+        tile_size: float = 0.02,
+        ttl: timedelta = timedelta(hours=24),
+        max_bytes: int = 512 * 1024 * 1024
+    ):
+        """
+        Initialize the tile cache.
+
+        Args:
+            cache_dir: Directory for the tile files
+            tile_size: Tile edge length in degrees
+            ttl: Age after which a tile is loaded again
+            max_bytes: Upper bound on the total size of stored tiles
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.tile_size = tile_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger(__name__)
+
+        # A tile's lock lives while a thread holds or waits for it
+        self._locks: "weakref.WeakValueDictionary[Path, threading.Lock]" = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._stats = {'hits': 0, 'loads': 0, 'evictions': 0}
+
+    def tiles_for_bbox(self, bbox: Tuple[float, float, float, float]) -> List[Tuple[int, int]]:
+        """Indexes of the tiles covering a bbox, row by row."""
+        min_x, min_y, max_x, max_y = bbox
+        first_col, first_row = math.floor(min_x / self.tile_size), math.floor(min_y / self.tile_size)
+        last_col = max(first_col, math.ceil(max_x / self.tile_size) - 1)
+        last_row = max(first_row, math.ceil(max_y / self.tile_size) - 1)
+        return [(col, row) for row in range(first_row, last_row + 1) for col in range(first_col, last_col + 1)]
+
+    def tile_bbox(self, tile: Tuple[int, int]) -> Tuple[float, float, float, float]:
+        """Bounding box of a tile."""
+        col, row = tile
+        return (
+            round(col * self.tile_size, 9),
+            round(row * self.tile_size, 9),
+            round((col + 1) * self.tile_size, 9),
+            round((row + 1) * self.tile_size, 9),
+        )
+
+    def tile_path(self, namespace: str, tile: Tuple[int, int]) -> Path:
+        """File holding a tile of a namespace."""
+        col, row = tile
+        return self.cache_dir / f"{namespace}__{self.tile_size:g}_{col}_{row}.parquet"
+
+    def entry_path(self, namespace: str, key: str) -> Path:
+        """File holding an untiled entry of a namespace, such as a query without a bbox."""
+        return self.cache_dir / f"{namespace}__{key}.parquet"
+
+    def _lock(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+            return lock
+
+    def _read(self, path: Path, columns: Optional[List[str]], ttl: timedelta) -> Optional[gpd.GeoDataFrame]:
+        """A stored file if it exists and is fresh, with only the requested columns."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if datetime.now() - datetime.fromtimestamp(stat.st_mtime) > ttl:
+            return None
+
+        try:
+            if columns is not None:
+                available = pq.read_schema(path, memory_map=True).names
+                columns = [col for col in available if col in columns or col == 'geometry']
+            gdf = gpd.read_parquet(path, columns=columns, memory_map=True)
+        except Exception as e:
+            self.logger.warning(f"Failed to read cached tile {path.name}: {e}")
+            return None
+
+        # The access time orders eviction; the modification time stays the write time
+        os.utime(path, (time.time(), stat.st_mtime))
+        self._stats['hits'] += 1
+        return gdf
+
+    def _write(self, path: Path, gdf: gpd.GeoDataFrame):
+        """Store a frame atomically, then enforce the size bound."""
+        # Write to a temporary file first so readers never see a partial tile
+        tmp_path = path.with_suffix('.tmp')
+        gdf.to_parquet(tmp_path, index=False)
+        tmp_path.replace(path)
+        self.evict(keep=path)
+
+    def _get(
+        self,
+        path: Path,
+        load: Callable[[], gpd.GeoDataFrame],
+        columns: Optional[List[str]],
+        ttl: Optional[timedelta],
+        cache_empty: bool
+    ) -> gpd.GeoDataFrame:
+        with self._lock(path):
+            gdf = self._read(path, columns, ttl or self.ttl)
+            if gdf is not None:
+                return gdf
+
+            gdf = load()
+            self._stats['loads'] += 1
+            if len(gdf) > 0 or cache_empty:
+                try:
+                    self._write(path, gdf)
+                except Exception as e:
+                    self.logger.warning(f"Failed to cache tile {path.name}: {e}")
+
+        return select_columns(gdf, columns)
+
+    def get_tile(
+        self,
+        namespace: str,
+        tile: Tuple[int, int],
+        loader: TileLoader,
+        columns: Optional[List[str]] = None,
+        ttl: Optional[timedelta] = None,
+        cache_empty: bool = False
+    ) -> gpd.GeoDataFrame:
+        """
+        Features of one tile, loading and storing the tile if it is missing or expired.
+
+        Args:
+            namespace: Kind of data the tile holds
+            tile: Tile index as (column, row)
+            loader: Function returning the features of a tile bbox; errors propagate
+                    and leave nothing stored
+            columns: Columns to read (all columns by default); geometry is always read
+            ttl: Expiry for this namespace (the cache default when None)
+            cache_empty: Whether a tile without features is stored
+
+        Returns:
+            GeoDataFrame with the tile's features
+        """
+        tile_bbox = self.tile_bbox(tile)
+        return self._get(self.tile_path(namespace, tile), lambda: loader(tile_bbox), columns, ttl, cache_empty)
+
+    def get_entry(
+        self,
+        namespace: str,
+        key: str,
+        load: Callable[[], gpd.GeoDataFrame],
+        columns: Optional[List[str]] = None,
+        ttl: Optional[timedelta] = None,
+        cache_empty: bool = False
+    ) -> gpd.GeoDataFrame:
+        """
+        An untiled entry, loading and storing it if it is missing or expired.
+
+        Args:
+            namespace: Kind of data the entry holds
+            key: Identifier of the entry within the namespace
+            load: Function returning the entry's features
+            columns: Columns to read (all columns by default); geometry is always read
+            ttl: Expiry for this entry (the cache default when None)
+            cache_empty: Whether an entry without features is stored
+
+        Returns:
+            GeoDataFrame with the entry's features
+        """
+        return self._get(self.entry_path(namespace, key), load, columns, ttl, cache_empty)
+
+    def query(
+        self,
+        namespace: str,
+        bbox: Tuple[float, float, float, float],
+        loader: TileLoader,
+        columns: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        unique_by: Optional[str] = None,
+        ttl: Optional[timedelta] = None,
+        cache_empty: bool = False
+    ) -> gpd.GeoDataFrame:
+        """
+        Features intersecting a bbox, assembled from the covering tiles.
+
+        Args:
+            namespace: Kind of data to query
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+            loader: Function returning the features of a tile bbox
+            columns: Columns to read (all columns by default); geometry is always read
+            limit: Maximum number of records to return; tiles are read in order
+                   only until that many features have been found
+            unique_by: Column identifying a feature; without it, features spanning
+                       several tiles are recognised by identical rows
+            ttl: Expiry for this namespace (the cache default when None)
+            cache_empty: Whether tiles without features are stored
+
+        Returns:
+            GeoDataFrame with the features intersecting the bbox
+        """
+        if unique_by is not None and columns is not None and unique_by not in columns:
+            columns = list(columns) + [unique_by]
+        tiles, gdf = [], None
+        for tile in self.tiles_for_bbox(bbox):
+            tile_gdf = self.get_tile(namespace, tile, loader, columns, ttl, cache_empty)
+            if len(tile_gdf) == 0:
+                continue
+            tiles.append(tile_gdf.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]])
+            gdf = None
+            # A small limit is usually met by the first tiles; skip loading the rest
+            if limit and sum(len(part) for part in tiles) >= limit:
+                gdf = self._combine(tiles, unique_by)
+                if len(gdf) >= limit:
+                    break
+        if not tiles:
+            return gpd.GeoDataFrame(columns=['geometry'])
+
+        if gdf is None:
+            gdf = self._combine(tiles, unique_by)
+        if limit:
+            gdf = gdf.head(limit)
+        return gdf.reset_index(drop=True)
+
+    def _combine(self, tiles: List[gpd.GeoDataFrame], unique_by: Optional[str]) -> gpd.GeoDataFrame:
+        gdf = gpd.GeoDataFrame(pd.concat(tiles, ignore_index=True), geometry=tiles[0].geometry.name, crs=tiles[0].crs)
+        # Features on a shared tile edge are returned by each tile they touch
+        if len(tiles) > 1:
+            gdf = gdf[~self._duplicated(gdf, unique_by)]
+        return gdf
+
+    @staticmethod
+    def _duplicated(gdf: gpd.GeoDataFrame, unique_by: Optional[str]) -> pd.Series:
+        if unique_by is not None and unique_by in gdf.columns:
+            return gdf[unique_by].duplicated()
+        rows = gdf.drop(columns=gdf.geometry.name).astype(str)
+        rows['__wkb'] = shapely.to_wkb(gdf.geometry.values)
+        return pd.util.hash_pandas_object(rows, index=False).duplicated()
+
+    def _stored_files(self, namespace: Optional[str] = None) -> List[Path]:
+        pattern = f"{namespace}__*.parquet" if namespace else "*__*.parquet"
+        return list(self.cache_dir.glob(pattern))
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Delete the least recently read files until the cache fits ``max_bytes``.
+
+        Args:
+            keep: File that must not be evicted, such as the one just written
+
+        Returns:
+            Number of files deleted
+        """
+        with self._evict_lock:
+            entries = []
+            for path in self._stored_files():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+
+        if evicted:
+            self._stats['evictions'] += evicted
+            self.logger.info(f"Evicted {evicted} cached tiles to stay under {self.max_bytes / 1024 ** 2:.0f} MB")
+        return evicted
+
+    def get_stats(self, namespace: Optional[str] = None) -> Dict[str, Any]:
+        """Hit, load and eviction counters, plus the number and size of stored files."""
+        files = self._stored_files(namespace)
+        stats = dict(self._stats)
+        stats['stored_tiles'] = len(files)
+        stats['stored_bytes'] = sum(path.stat().st_size for path in files if path.exists())
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+    def clear(self, older_than: Optional[timedelta] = None, namespace: Optional[str] = None) -> int:
+        """
+        Delete stored files.
+
+        Args:
+            older_than: Only delete files older than this. If None, delete all files.
+            namespace: Only delete files of this namespace. If None, delete every namespace.
+
+        Returns:
+            Number of files deleted
+        """
+        cleared = 0
+        for path in self._stored_files(namespace):
+            age = datetime.now() - datetime.fromtimestamp(path.stat().st_mtime)
+            if older_than is None or age > older_than:
+                path.unlink(missing_ok=True)
+                cleared += 1
+        return cleared
+
+
+def select_columns(gdf: gpd.GeoDataFrame, columns: Optional[List[str]]) -> gpd.GeoDataFrame:
+    """Keep the given columns and the geometry; all columns when ``columns`` is None."""
+    if columns is None or len(gdf) == 0:
+        return gdf
+    return gdf[[col for col in gdf.columns if col in columns or col == gdf.geometry.name]]
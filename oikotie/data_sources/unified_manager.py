@@ -6,19 +6,25 @@ data source based on query type, combines data from multiple sources when
 beneficial, and handles caching and fallback strategies.
 """
 
-from typing import Optional, Dict, Any, List, Tuple, Union
+from typing import Optional, Dict, Any, List, Tuple, Union, Callable
 import geopandas as gpd
 import pandas as pd
 from pathlib import Path
 from datetime import datetime, timedelta
 import logging
 from enum import Enum
-import hashlib
-import pickle
+import asyncio
+import functools
+import inspect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from .base import GeoDataSource
 from .wms_source import WMSDataSource
 from .geopackage_source import GeoPackageDataSource
+from .address_tiles import AddressTileCache, filter_addresses
+from .tile_cache import GeoTileCache, select_columns
 
 
 class QueryType(Enum):
@@ -32,6 +38,10 @@ class QueryType(Enum):
     COMBINED = "combined"
 
 
+# Address attributes that fetch_addresses filters on locally
+ADDRESS_FILTER_FIELDS = ('street_name', 'postal_code')
+
+
 class DataSourcePriority(Enum):
     """Priority levels for data source selection."""
     PRIMARY = 1
@@ -47,12 +57,19 @@ class UnifiedDataManager:
     and fallback strategies for optimal geodata access.
     """
     
+    # Default area for address queries without a bbox
+    HELSINKI_BBOX = (24.88, 60.15, 25.09, 60.26)
+    
     def __init__(
         self,
         geopackage_path: Optional[str] = None,
         cache_dir: Optional[str] = None,
         cache_ttl_hours: int = 24,
-        enable_logging: bool = True
+        enable_logging: bool = True,
+        cache_max_mb: int = 512,
+        tile_size: float = 0.02,
+        first_result_wins: bool = False,
+        max_workers: int = 4
     ):
         """
         Initialize the unified data manager.
@@ -62,6 +79,11 @@ class UnifiedDataManager:
             cache_dir: Directory for caching query results
             cache_ttl_hours: Cache time-to-live in hours
             enable_logging: Enable detailed logging
+            cache_max_mb: Size bound of the tile cache; least recently used tiles are evicted beyond it
+            tile_size: Edge length of cache tiles in degrees
+            first_result_wins: Keep the first non-empty building result instead of
+                               waiting for more preferred sources, cancelling the rest
+            max_workers: Threads for local source reads run alongside WFS requests
         """
         self.cache_dir = Path(cache_dir) if cache_dir else Path("data/cache")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
@@ -76,6 +98,28 @@ class UnifiedDataManager:
         self.sources = {}
         self._initialize_sources(geopackage_path)
         
+        # Sources are queried concurrently: local reads in threads, WFS requests async
+        self.first_result_wins = first_result_wins
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="geodata-source")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._latency: Dict[str, Dict[str, Any]] = {}
+        self._latency_lock = threading.Lock()
+        
+        # Query results are cached as GeoParquet tiles under one size bound
+        self.tile_cache = GeoTileCache(
+            self.cache_dir / "tiles",
+            tile_size=tile_size,
+            ttl=self.cache_ttl,
+            max_bytes=cache_max_mb * 1024 * 1024
+        )
+        
+        # National addresses are served from the same tiles, downloaded page by page
+        self.address_tiles = None
+        if "wms" in self.sources:
+            self.address_tiles = AddressTileCache(self.sources["wms"], tiles=self.tile_cache)
+        
         # Source selection rules
         self._source_rules = self._define_source_rules()
         
@@ -84,6 +128,9 @@ class UnifiedDataManager:
             "manager_created": datetime.now().isoformat(),
             "cache_dir": str(self.cache_dir),
             "cache_ttl_hours": cache_ttl_hours,
+            "cache_max_mb": cache_max_mb,
+            "tile_size": tile_size,
+            "first_result_wins": first_result_wins,
             "sources_available": list(self.sources.keys())
         }
     
@@ -146,52 +193,32 @@ class UnifiedDataManager:
             ]
         }
     
-    def _get_cache_key(self, query_type: QueryType, bbox: Optional[Tuple], limit: Optional[int], **kwargs) -> str:
-        """Generate cache key for query parameters with enhanced specificity."""
-        cache_data = {
-            "query_type": query_type.value,
-            "bbox": tuple(round(x, 6) for x in bbox) if bbox else None,  # Round bbox for consistency
-            "limit": limit,
-            **kwargs
-        }
-        
-        # Include all kwargs to ensure unique keys for different parameters
-        cache_str = str(sorted(cache_data.items()))
-        cache_key = hashlib.md5(cache_str.encode()).hexdigest()
-        
-        # Log cache key generation for debugging
-        self.logger.debug(f"Generated cache key {cache_key[:8]}... for: {cache_data}")
-        
-        return cache_key
-    
-    def _get_from_cache(self, cache_key: str) -> Optional[gpd.GeoDataFrame]:
-        """Retrieve data from cache if available and not expired."""
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
-        
-        if not cache_file.exists():
-            return None
-        
-        # Check if cache is expired
-        file_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-        if file_age > self.cache_ttl:
-            cache_file.unlink()  # Remove expired cache
-            return None
+    def _cached_query(
+        self,
+        namespace: str,
+        bbox: Optional[Tuple],
+        limit: Optional[int],
+        load: Callable[[Optional[Tuple], Optional[int]], gpd.GeoDataFrame],
+        columns: Optional[List[str]] = None
+    ) -> gpd.GeoDataFrame:
+        """
+        Query results served from the tile cache.
         
-        try:
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
-        except Exception as e:
-            self.logger.warning(f"Failed to load cache {cache_key}: {e}")
-            return None
-    
-    def _save_to_cache(self, cache_key: str, data: gpd.GeoDataFrame):
-        """Save data to cache."""
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
-        try:
-            with open(cache_file, 'wb') as f:
-                pickle.dump(data, f)
-        except Exception as e:
-            self.logger.warning(f"Failed to save cache {cache_key}: {e}")
+        A bbox is assembled from the tiles it intersects, each loaded once with
+        ``load(tile_bbox, None)``; a query without a bbox is stored as a single
+        entry per limit. Empty results are stored too, so sea and park tiles
+        are not loaded again: ``load`` must raise when its sources failed
+        rather than return an empty frame.
+        """
+        if bbox is None:
+            return self.tile_cache.get_entry(
+                namespace, f"all_{limit or 'unlimited'}", lambda: load(None, limit), columns=columns,
+                cache_empty=True
+            )
+        return self.tile_cache.query(
+            namespace, bbox, lambda tile_bbox: load(tile_bbox, None), columns=columns, limit=limit,
+            cache_empty=True
+        )
     
     def _select_source(self, query_type: QueryType) -> List[Tuple[str, DataSourcePriority]]:
         """
@@ -220,29 +247,26 @@ class UnifiedDataManager:
         bbox: Optional[Tuple[float, float, float, float]] = None,
         limit: Optional[int] = None,
         use_cache: bool = True,
-        combine_sources: bool = False
+        combine_sources: bool = False,
+        columns: Optional[List[str]] = None
     ) -> gpd.GeoDataFrame:
         """
         Fetch building data using optimal source selection.
         
+        Cached buildings are kept in tiles, so overlapping bboxes share the
+        tiles they have in common and only missing tiles hit the sources.
+        
         Args:
             bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
             limit: Maximum number of records to fetch
             use_cache: Whether to use cached results
             combine_sources: Whether to combine data from multiple sources
+            columns: Columns to return besides the geometry (all columns by default)
             
         Returns:
             GeoDataFrame with building geometries and attributes
         """
         query_type = QueryType.BUILDING_POLYGONS
-        cache_key = self._get_cache_key(query_type, bbox, limit, combine_sources=combine_sources)
-        
-        # Try cache first
-        if use_cache:
-            cached_data = self._get_from_cache(cache_key)
-            if cached_data is not None:
-                self.logger.info(f"Returning cached building data (key: {cache_key[:8]})")
-                return cached_data
         
         # Get source selection
         source_priorities = self._select_source(query_type)
@@ -251,64 +275,163 @@ class UnifiedDataManager:
             self.logger.error("No available sources for building data")
             return gpd.GeoDataFrame(columns=['geometry'])
         
-        result_gdf = None
-        
-        if combine_sources and len(source_priorities) > 1:
-            # Combine data from multiple sources
-            result_gdf = self._fetch_buildings_combined(bbox, limit, source_priorities)
-        else:
+        def load(load_bbox: Optional[Tuple], load_limit: Optional[int]) -> gpd.GeoDataFrame:
+            if combine_sources and len(source_priorities) > 1:
+                # Combine data from multiple sources
+                return self._fetch_buildings_combined(load_bbox, load_limit, source_priorities)
             # Use primary source with fallback
-            result_gdf = self._fetch_buildings_with_fallback(bbox, limit, source_priorities)
+            return self._fetch_buildings_with_fallback(load_bbox, load_limit, source_priorities)
         
-        # Cache the result
-        if use_cache and result_gdf is not None and len(result_gdf) > 0:
-            self._save_to_cache(cache_key, result_gdf)
+        try:
+            if use_cache:
+                namespace = "buildings_combined" if combine_sources else "buildings"
+                result_gdf = self._cached_query(namespace, bbox, limit, load, columns)
+            else:
+                result_gdf = select_columns(load(bbox, limit), columns)
+        except Exception as e:
+            self.logger.error(f"Error fetching buildings: {e}")
+            result_gdf = None
         
         return result_gdf if result_gdf is not None else gpd.GeoDataFrame(columns=['geometry'])
     
+    def _record_latency(self, source_name: str, seconds: float, failed: bool):
+        """Update a source's latency counters with one finished fetch."""
+        elapsed_ms = seconds * 1000
+        with self._latency_lock:
+            stats = self._latency.setdefault(
+                source_name, {"calls": 0, "errors": 0, "last_ms": None, "mean_ms": None}
+            )
+            stats["calls"] += 1
+            if failed:
+                stats["errors"] += 1
+            stats["last_ms"] = round(elapsed_ms, 1)
+            mean_ms = stats["mean_ms"] if stats["mean_ms"] is not None else elapsed_ms
+            stats["mean_ms"] = round(mean_ms + (elapsed_ms - mean_ms) / stats["calls"], 1)
+    
+    def _run_async(self, coroutine) -> Any:
+        """
+        Run a coroutine on the manager's event loop and wait for its result.
+        
+        The loop runs in one long-lived background thread with the source
+        threads as its default executor, so fetches work from any caller,
+        including threads already running an event loop, and a bbox loaded
+        tile by tile does not create a loop per tile.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(self._executor)
+                self._loop_thread = threading.Thread(target=loop.run_forever, name="geodata-loop", daemon=True)
+                self._loop_thread.start()
+                self._loop = loop
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+    
+    def close(self):
+        """Stop the background event loop and the source threads."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._loop_thread.join()
+            loop.close()
+        self._executor.shutdown(wait=False)
+    
+    async def _fetch_source_buildings(
+        self,
+        source_name: str,
+        bbox: Optional[Tuple],
+        limit: Optional[int]
+    ) -> Tuple[str, Optional[gpd.GeoDataFrame]]:
+        """One source's buildings, or None if the source failed."""
+        source = self.sources[source_name]
+        started = time.perf_counter()
+        try:
+            fetch_async = getattr(source, 'fetch_buildings_async', None)
+            if inspect.iscoroutinefunction(fetch_async):
+                data = await fetch_async(bbox=bbox, limit=limit)
+            else:
+                loop = asyncio.get_running_loop()
+                data = await loop.run_in_executor(
+                    self._executor, functools.partial(source.fetch_buildings, bbox=bbox, limit=limit)
+                )
+        except Exception as e:
+            self._record_latency(source_name, time.perf_counter() - started, failed=True)
+            self.logger.error(f"Error fetching buildings from {source_name}: {e}")
+            return source_name, None
+        
+        self._record_latency(source_name, time.perf_counter() - started, failed=False)
+        return source_name, data
+    
+    async def _gather_buildings(
+        self,
+        bbox: Optional[Tuple],
+        limit: Optional[int],
+        source_names: List[str],
+        accept: Callable[[str, Optional[gpd.GeoDataFrame]], bool]
+    ):
+        """
+        Fetch buildings from several sources at once, passing each result to
+        ``accept`` as it arrives. Once ``accept`` returns True the remaining
+        fetches are cancelled; a thread already reading a local source finishes
+        in the background and its result is dropped.
+        """
+        tasks = [
+            asyncio.create_task(self._fetch_source_buildings(name, bbox, limit))
+            for name in source_names
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                source_name, data = await next_result
+                if accept(source_name, data):
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
     def _fetch_buildings_combined(
         self,
         bbox: Optional[Tuple],
         limit: Optional[int],
         source_priorities: List[Tuple[str, DataSourcePriority]]
     ) -> gpd.GeoDataFrame:
-        """Fetch buildings from multiple sources and combine intelligently."""
-        combined_data = []
-        total_fetched = 0
+        """
+        Fetch buildings from all sources concurrently and merge them as they arrive.
         
-        for source_name, priority in source_priorities:
-            if limit and total_fetched >= limit:
-                break
+        Raises RuntimeError when no source returned buildings and any of them
+        failed, so the failure is not mistaken for an empty area.
+        """
+        priorities = dict(source_priorities)
+        result = None
+        failed = []
+        
+        def accept(source_name: str, data: Optional[gpd.GeoDataFrame]) -> bool:
+            nonlocal result
+            if data is None:
+                failed.append(source_name)
+            if data is None or len(data) == 0:
+                return False
             
-            remaining_limit = limit - total_fetched if limit else None
+            # Add source metadata
+            data['data_source'] = source_name
+            data['source_priority'] = priorities[source_name].value
+            self.logger.info(f"Fetched {len(data)} buildings from {source_name}")
             
-            try:
-                source = self.sources[source_name]
-                data = source.fetch_buildings(bbox=bbox, limit=remaining_limit)
-                
-                if len(data) > 0:
-                    # Add source metadata
-                    data['data_source'] = source_name
-                    data['source_priority'] = priority.value
-                    combined_data.append(data)
-                    total_fetched += len(data)
-                    
-                    self.logger.info(f"Fetched {len(data)} buildings from {source_name}")
-                
-            except Exception as e:
-                self.logger.error(f"Error fetching buildings from {source_name}: {e}")
-        
-        if not combined_data:
-            return gpd.GeoDataFrame(columns=['geometry'])
-        
-        # Combine all data
-        result = gpd.concat(combined_data, ignore_index=True)
+            if result is None:
+                result = data
+            else:
+                # If we have overlapping data, prioritize by source priority
+                combined = pd.concat([result, data], ignore_index=True)
+                result = self._deduplicate_buildings(gpd.GeoDataFrame(combined, geometry='geometry', crs=result.crs))
+            return self.first_result_wins
         
-        # If we have overlapping data, prioritize by source priority
-        if len(combined_data) > 1:
-            result = self._deduplicate_buildings(result)
+        self._run_async(self._gather_buildings(bbox, limit, list(priorities), accept))
         
-        return result
+        if result is None:
+            if failed:
+                raise RuntimeError(f"No buildings and failed sources: {', '.join(failed)}")
+            return gpd.GeoDataFrame(columns=['geometry'])
+        return result.head(limit).reset_index(drop=True) if limit else result
     
     def _fetch_buildings_with_fallback(
         self,
@@ -316,28 +439,54 @@ class UnifiedDataManager:
         limit: Optional[int],
         source_priorities: List[Tuple[str, DataSourcePriority]]
     ) -> gpd.GeoDataFrame:
-        """Fetch buildings with fallback strategy."""
-        for source_name, priority in source_priorities:
-            try:
-                source = self.sources[source_name]
-                data = source.fetch_buildings(bbox=bbox, limit=limit)
-                
-                if len(data) > 0:
-                    data['data_source'] = source_name
-                    self.logger.info(f"Successfully fetched {len(data)} buildings from {source_name}")
-                    return data
-                else:
-                    self.logger.warning(f"No buildings found in {source_name}")
-                    
-            except Exception as e:
-                self.logger.error(f"Error fetching buildings from {source_name}: {e}")
+        """
+        Fetch buildings with fallback strategy.
+        
+        All sources are queried at once and the most preferred non-empty result
+        is returned as soon as every source ahead of it has answered, so a failing
+        primary source no longer adds its latency to the fallback's. With
+        ``first_result_wins`` the first non-empty result is returned instead.
+        Raises RuntimeError when no source returned buildings and any of them
+        failed, so the failure is not mistaken for an empty area.
+        """
+        order = [source_name for source_name, _ in source_priorities]
+        results: Dict[str, Optional[gpd.GeoDataFrame]] = {}
+        chosen = None
+        
+        def accept(source_name: str, data: Optional[gpd.GeoDataFrame]) -> bool:
+            nonlocal chosen
+            results[source_name] = data
+            if data is not None and len(data) == 0:
+                self.logger.warning(f"No buildings found in {source_name}")
+            
+            if self.first_result_wins and data is not None and len(data) > 0:
+                chosen = source_name
+                return True
+            for name in order:
+                if name not in results:
+                    return False
+                if results[name] is not None and len(results[name]) > 0:
+                    chosen = name
+                    return True
+            return False
+        
+        self._run_async(self._gather_buildings(bbox, limit, order, accept))
+        
+        if chosen is None:
+            failed = [name for name in order if results.get(name) is None]
+            if failed:
+                raise RuntimeError(f"No buildings and failed sources: {', '.join(failed)}")
+            return gpd.GeoDataFrame(columns=['geometry'])
         
-        return gpd.GeoDataFrame(columns=['geometry'])
+        data = results[chosen]
+        data['data_source'] = chosen
+        self.logger.info(f"Successfully fetched {len(data)} buildings from {chosen}")
+        return data
     
     def _deduplicate_buildings(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """Remove duplicate buildings, preferring higher priority sources."""
-        # Sort by source priority (lower numbers = higher priority)
-        gdf_sorted = gdf.sort_values('source_priority')
+        # Sort by source priority (lower numbers = higher priority), keeping arrival order within a source
+        gdf_sorted = gdf.sort_values('source_priority', kind='stable', ignore_index=True)
         
         # For buildings, we could deduplicate by spatial proximity
         # For now, just return the sorted data
@@ -353,6 +502,12 @@ class UnifiedDataManager:
         """
         Fetch address data using optimal source selection.
         
+        Addresses are cached in tiles: national WMS addresses are downloaded
+        page by page into the address tiles, so repeated queries over the same
+        area do not hit the WFS again. ``street_name`` and ``postal_code`` keyword
+        arguments filter the result locally and are not part of any cache key;
+        other keyword arguments are ignored.
+        
         Args:
             bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
             limit: Maximum number of records to fetch
@@ -362,14 +517,7 @@ class UnifiedDataManager:
             GeoDataFrame with address points and attributes
         """
         query_type = QueryType.ADDRESSES
-        cache_key = self._get_cache_key(query_type, bbox, limit, **kwargs)
-        
-        # Try cache first
-        if use_cache:
-            cached_data = self._get_from_cache(cache_key)
-            if cached_data is not None:
-                self.logger.info(f"Returning cached address data (key: {cache_key[:8]})")
-                return cached_data
+        filters = {field: kwargs[field] for field in ADDRESS_FILTER_FIELDS if kwargs.get(field)}
         
         # Get source selection
         source_priorities = self._select_source(query_type)
@@ -381,20 +529,42 @@ class UnifiedDataManager:
         # Use primary source with fallback
         for source_name, priority in source_priorities:
             try:
+                if source_name == "wms" and use_cache and self.address_tiles is not None:
+                    # The tiles are the cache for this source
+                    data = self.address_tiles.query(bbox or self.HELSINKI_BBOX, limit=limit, **filters)
+                    if len(data) > 0:
+                        data['data_source'] = source_name
+                        self.logger.info(f"Returning {len(data)} addresses from {source_name} tiles")
+                        return data
+                    self.logger.warning(f"No addresses found in {source_name}")
+                    continue
+                
                 source = self.sources[source_name]
-                data = source.fetch_addresses(bbox=bbox, limit=limit)
                 
-                if len(data) > 0:
-                    data['data_source'] = source_name
-                    self.logger.info(f"Successfully fetched {len(data)} addresses from {source_name}")
-                    
-                    # Cache the result
-                    if use_cache:
-                        self._save_to_cache(cache_key, data)
-                    
+                def load(load_bbox: Optional[Tuple], load_limit: Optional[int],
+                         source=source, source_name=source_name) -> gpd.GeoDataFrame:
+                    if source_name == "wms":
+                        # Raises on request errors, unlike fetch_addresses
+                        data = source.fetch_address_page(load_bbox or self.HELSINKI_BBOX, count=load_limit)
+                    else:
+                        data = source.fetch_addresses(bbox=load_bbox, limit=load_limit)
+                    if len(data) > 0:
+                        data['data_source'] = source_name
                     return data
+                
+                # The unfiltered result is cached
+                if use_cache:
+                    data = self._cached_query(f"addresses_{source_name}", bbox, limit, load)
                 else:
-                    self.logger.warning(f"No addresses found in {source_name}")
+                    data = load(bbox, limit)
+                
+                if len(data) > 0:
+                    self.logger.info(f"Successfully fetched {len(data)} addresses from {source_name}")
+                    data = filter_addresses(data, filters)
+                    if len(data) > 0:
+                        return data
+                
+                self.logger.warning(f"No addresses found in {source_name}")
                     
             except Exception as e:
                 self.logger.error(f"Error fetching addresses from {source_name}: {e}")
@@ -406,7 +576,8 @@ class UnifiedDataManager:
         layer_name: str,
         bbox: Optional[Tuple[float, float, float, float]] = None,
         limit: Optional[int] = None,
-        use_cache: bool = True
+        use_cache: bool = True,
+        columns: Optional[List[str]] = None
     ) -> gpd.GeoDataFrame:
         """
         Fetch topographic layer data (only available from GeoPackage).
@@ -416,6 +587,7 @@ class UnifiedDataManager:
             bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
             limit: Maximum number of records to fetch
             use_cache: Whether to use cached results
+            columns: Layer columns to return besides the geometry (all columns by default)
             
         Returns:
             GeoDataFrame with layer geometries and attributes
@@ -424,28 +596,24 @@ class UnifiedDataManager:
             self.logger.error("GeoPackage source not available for topographic layers")
             return gpd.GeoDataFrame(columns=['geometry'])
         
-        query_type = QueryType.TOPOGRAPHIC_LAYERS
-        cache_key = self._get_cache_key(query_type, bbox, limit, layer_name=layer_name)
+        source = self.sources["geopackage"]
         
-        # Try cache first
-        if use_cache:
-            cached_data = self._get_from_cache(cache_key)
-            if cached_data is not None:
-                self.logger.info(f"Returning cached {layer_name} data (key: {cache_key[:8]})")
-                return cached_data
+        def load(load_bbox: Optional[Tuple], load_limit: Optional[int],
+                 load_columns: Optional[List[str]] = None) -> gpd.GeoDataFrame:
+            data = source.fetch_layer(layer_name, bbox=load_bbox, limit=load_limit, columns=load_columns)
+            if len(data) > 0:
+                data['data_source'] = 'geopackage'
+            return data
         
         try:
-            source = self.sources["geopackage"]
-            data = source.fetch_layer(layer_name, bbox=bbox, limit=limit)
+            # Tiles hold every column; uncached reads only decode the requested ones
+            if use_cache:
+                data = self._cached_query(f"layer_{layer_name}", bbox, limit, load, columns)
+            else:
+                data = load(bbox, limit, columns)
             
             if len(data) > 0:
-                data['data_source'] = 'geopackage'
                 self.logger.info(f"Successfully fetched {len(data)} records from {layer_name}")
-                
-                # Cache the result
-                if use_cache:
-                    self._save_to_cache(cache_key, data)
-                
                 return data
             else:
                 self.logger.warning(f"No data found in layer {layer_name}")
@@ -459,12 +627,17 @@ class UnifiedDataManager:
         """
         Get status and metadata for all data sources.
         
+        Each entry includes the source's building fetch latency so far (call
+        and error counts, last and mean milliseconds), or None before its first fetch.
+        
         Returns:
             Dictionary with status information for each source
         """
         status = {}
         
         for source_name, source in self.sources.items():
+            with self._latency_lock:
+                latency = dict(self._latency[source_name]) if source_name in self._latency else None
             try:
                 is_available = source.test_connection()
                 metadata = source.get_metadata()
@@ -472,6 +645,7 @@ class UnifiedDataManager:
                 status[source_name] = {
                     "available": is_available,
                     "metadata": metadata,
+                    "latency": latency,
                     "last_tested": datetime.now().isoformat()
                 }
                 
@@ -479,6 +653,7 @@ class UnifiedDataManager:
                 status[source_name] = {
                     "available": False,
                     "error": str(e),
+                    "latency": latency,
                     "last_tested": datetime.now().isoformat()
                 }
         
@@ -510,7 +685,7 @@ class UnifiedDataManager:
     
     def clear_cache(self, older_than_hours: Optional[int] = None):
         """
-        Clear cached data.
+        Clear cached data, including pickle files left by earlier versions.
         
         Args:
             older_than_hours: Only clear cache older than this many hours.
@@ -533,6 +708,9 @@ class UnifiedDataManager:
                 except Exception as e:
                     self.logger.warning(f"Failed to clear cache file {cache_file}: {e}")
         
+        older_than = timedelta(hours=older_than_hours) if older_than_hours is not None else None
+        cleared_count += self.tile_cache.clear(older_than)
+        
         self.logger.info(f"Cleared {cleared_count} cache files")
     
     def get_metadata(self) -> Dict[str, Any]:
@@ -545,7 +723,10 @@ class UnifiedDataManager:
         metadata = self._metadata.copy()
         metadata['sources_status'] = self.get_source_status()
         metadata['available_layers'] = self.get_available_layers()
-        metadata['cache_files_count'] = len(list(self.cache_dir.glob("*.pkl")))
+        metadata['tile_cache'] = self.tile_cache.get_stats()
+        metadata['cache_files_count'] = metadata['tile_cache']['stored_tiles']
+        if self.address_tiles is not None:
+            metadata['address_tiles'] = self.address_tiles.get_stats()
         
         return metadata
 
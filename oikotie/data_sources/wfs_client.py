@@ -0,0 +1,323 @@
+"""
+Paging WFS client for GeoJSON feature services.
+
+Features are requested page by page with WFS 2.0 ``startIndex``/``count`` paging
+and parsed from the response stream as they arrive, so a large area is neither
+truncated at the server's page size nor held in memory as one JSON document.
+All requests share one pooled ``httpx.Client``, retry transient failures
+with exponential backoff and pass through an adaptive limiter per host, so
+concurrent queries against one service slow down together when it pushes back.
+"""
+
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import geopandas as gpd
+import httpx
+import pandas as pd
+
+from ..rate_control import OVERLOAD_STATUS_CODES, AdaptiveLimiter, get_limiter
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = OVERLOAD_STATUS_CODES
+
+# Settings of the shared per-host limiters
+WFS_LIMITER_SETTINGS = {'max_limit': 4, 'initial_limit': 2, 'target_p95': 10.0}
+
+_FEATURES_START = re.compile(r'"features"\s*:\s*\[')
+
+
+class FeatureStreamParser:
+    """
+    Incremental parser for the ``features`` array of a GeoJSON FeatureCollection.
+
+    Text is fed in arbitrary pieces; every complete feature object is returned
+    as soon as its closing brace has been received.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_features = False
+        self.finished = False
+
+    def feed(self, text: str) -> List[Dict[str, Any]]:
+        """Parse a piece of the response, returning the features it completed."""
+        self._buffer += text
+        features = []
+
+        if not self._in_features:
+            match = _FEATURES_START.search(self._buffer)
+            if match is None:
+                return features
+            self._buffer = self._buffer[match.end():]
+            self._in_features = True
+
+        pos = 0
+        length = len(self._buffer)
+        while not self.finished:
+            while pos < length and self._buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == length:
+                break
+            if self._buffer[pos] == ']':
+                self.finished = True
+                break
+            try:
+                feature, pos = self._decoder.raw_decode(self._buffer, pos)
+            except json.JSONDecodeError:
+                # The feature continues in the next piece
+                break
+            features.append(feature)
+
+        self._buffer = self._buffer[pos:]
+        return features
+
+    def close(self):
+        """Check that the features array was complete."""
+        if not self._in_features:
+            raise ValueError(f"WFS response is not a GeoJSON feature collection: {self._buffer[:200]!r}")
+        if not self.finished:
+            raise ValueError("WFS response ended inside the features array")
+
+
+class WFSClient:
+    """
+    WFS 2.0 GetFeature client with paging, streaming parsing and retries.
+
+    One client holds one connection pool; create it once per process or data
+    source and close it (or use it as a context manager) when done.
+    """
+
+    def __init__(
+        self,
+        page_size: int = 1000,
+        max_pages: int = 1000,
+        timeout: float = 30.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        client: Optional[httpx.Client] = None,
+        limiter: Optional[AdaptiveLimiter] = None
+    ):
+        """
+        Initialize the WFS client.
+
+        Args:
+            page_size: Features requested per GetFeature request
+            max_pages: Safety bound on requests made for one query
+            timeout: Request timeout in seconds
+            retries: Retries of a failed request before giving up
+            backoff: Delay before the first retry in seconds, doubled for each further retry
+            client: Shared HTTP client; a pooled client is created when None
+            limiter: Limiter for all requests; the shared limiter of each host when None
+        """
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.retries = retries
+        self.backoff = backoff
+        self.client = client or httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            follow_redirects=True
+        )
+        self.limiter = limiter
+        self.logger = logging.getLogger(__name__)
+        self._stats = {'requests': 0, 'retries': 0, 'features': 0}
+
+    def close(self):
+        """Close the underlying connection pool."""
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def feature_params(
+        type_name: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        bbox_crs: str = "EPSG:4326",
+        srs_name: str = "EPSG:4326"
+    ) -> Dict[str, str]:
+        """GetFeature parameters for a feature type, without paging."""
+        params = {
+            'service': 'WFS',
+            'version': '2.0.0',
+            'request': 'GetFeature',
+            'typeName': type_name,
+            'srsName': srs_name,
+            'outputFormat': 'application/json'
+        }
+        if bbox is not None:
+            params['bbox'] = f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]},{bbox_crs}"
+        return params
+
+    def limiter_for(self, url: str) -> AdaptiveLimiter:
+        """Limiter applied to requests to ``url``."""
+        return self.limiter or get_limiter(f"wfs:{urlsplit(url).netloc}", **WFS_LIMITER_SETTINGS)
+
+    def _stream_page(self, url: str, params: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+        """Features of one GetFeature response, parsed as the body arrives."""
+        self._stats['requests'] += 1
+        parser = FeatureStreamParser()
+        request = self.client.build_request("GET", url, params=params)
+        # The limiter covers the request up to the response headers, not the consumer's pace
+        with self.limiter_for(url).slot():
+            response = self.client.send(request, stream=True)
+            try:
+                response.raise_for_status()
+            except httpx.HTTPStatusError:
+                response.close()
+                raise
+        try:
+            for text in response.iter_text():
+                yield from parser.feed(text)
+        finally:
+            response.close()
+        parser.close()
+
+    def iter_features(
+        self,
+        url: str,
+        type_name: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        bbox_crs: str = "EPSG:4326",
+        srs_name: str = "EPSG:4326",
+        limit: Optional[int] = None,
+        start_index: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        GeoJSON features of a query, requested page by page until a short page.
+
+        A failed request is retried from the first feature not yet yielded, so
+        a retry never repeats or skips features.
+
+        Args:
+            url: WFS endpoint
+            type_name: Feature type to query
+            bbox: Bounding box in ``bbox_crs`` coordinates
+            bbox_crs: CRS of the bounding box
+            srs_name: CRS of the returned geometries
+            limit: Maximum number of features (all features when None)
+            start_index: Index of the first feature (``startIndex``)
+
+        Yields:
+            GeoJSON feature dictionaries
+        """
+        params = self.feature_params(type_name, bbox, bbox_crs, srs_name)
+        next_index = start_index
+        failures = 0
+
+        for _ in range(self.max_pages + self.retries):
+            count = self.page_size if limit is None else min(self.page_size, start_index + limit - next_index)
+            if count <= 0:
+                return
+
+            page_params = dict(params, count=str(count))
+            if next_index:
+                page_params['startIndex'] = str(next_index)
+
+            received = 0
+            try:
+                for feature in self._stream_page(url, page_params):
+                    received += 1
+                    yield feature
+            except (httpx.TransportError, httpx.HTTPStatusError, ValueError) as e:
+                next_index += received
+                self._stats['features'] += received
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                if failures >= self.retries or (status is not None and status not in RETRY_STATUS_CODES):
+                    raise
+                delay = self.backoff * 2 ** failures
+                failures += 1
+                self._stats['retries'] += 1
+                self.logger.warning(f"Retrying {type_name} page at index {next_index} in {delay:.1f}s: {e}")
+                time.sleep(delay)
+                continue
+
+            next_index += received
+            self._stats['features'] += received
+            failures = 0
+            if received < count:
+                return
+
+        self.logger.warning(f"Stopped paging {type_name} after {self.max_pages} pages")
+
+    def iter_chunks(
+        self,
+        url: str,
+        type_name: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        bbox_crs: str = "EPSG:4326",
+        srs_name: str = "EPSG:4326",
+        limit: Optional[int] = None,
+        start_index: int = 0,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Features of a query as GeoDataFrame chunks of at most ``chunk_size`` rows.
+
+        Args:
+            url: WFS endpoint
+            type_name: Feature type to query
+            bbox: Bounding box in ``bbox_crs`` coordinates
+            bbox_crs: CRS of the bounding box
+            srs_name: CRS of the returned geometries
+            limit: Maximum number of features (all features when None)
+            start_index: Index of the first feature (``startIndex``)
+            chunk_size: Features per chunk (the page size by default)
+
+        Yields:
+            GeoDataFrames in ``srs_name``
+        """
+        chunk_size = chunk_size or self.page_size
+        features = []
+        for feature in self.iter_features(url, type_name, bbox, bbox_crs, srs_name, limit, start_index):
+            features.append(feature)
+            if len(features) >= chunk_size:
+                yield gpd.GeoDataFrame.from_features(features, crs=srs_name)
+                features = []
+        if features:
+            yield gpd.GeoDataFrame.from_features(features, crs=srs_name)
+
+    def fetch(
+        self,
+        url: str,
+        type_name: str,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        bbox_crs: str = "EPSG:4326",
+        srs_name: str = "EPSG:4326",
+        limit: Optional[int] = None,
+        start_index: int = 0
+    ) -> gpd.GeoDataFrame:
+        """
+        All features of a query in one GeoDataFrame; raises on request errors.
+
+        Args:
+            url: WFS endpoint
+            type_name: Feature type to query
+            bbox: Bounding box in ``bbox_crs`` coordinates
+            bbox_crs: CRS of the bounding box
+            srs_name: CRS of the returned geometries
+            limit: Maximum number of features (all features when None)
+            start_index: Index of the first feature (``startIndex``)
+
+        Returns:
+            GeoDataFrame in ``srs_name``, empty when the query matched nothing
+        """
+        chunks = list(self.iter_chunks(url, type_name, bbox, bbox_crs, srs_name, limit, start_index))
+        if not chunks:
+            return gpd.GeoDataFrame(columns=['geometry'], geometry='geometry', crs=srs_name)
+        if len(chunks) == 1:
+            return chunks[0]
+        return gpd.GeoDataFrame(pd.concat(chunks, ignore_index=True), geometry='geometry', crs=srs_name)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Request, retry and feature counters."""
+        return dict(self._stats)
@@ -5,9 +5,10 @@ This module provides access to geodata through Web Map Services (WMS),
 specifically the Finnish national geodata services.
 """
 
+import asyncio
 import sys
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Iterator, Tuple
 import geopandas as gpd
 import pandas as pd
 from shapely.geometry import Point, Polygon, box
@@ -18,6 +19,7 @@ import xml.etree.ElementTree as ET
 from datetime import datetime
 
 from .base import GeoDataSource
+from .wfs_client import WFSClient
 
 
 class WMSDataSource(GeoDataSource):
@@ -64,15 +66,25 @@ class WMSDataSource(GeoDataSource):
         "bbox": "bbox"
     }
     
-    def __init__(self, name: str = "Finnish National WMS", crs: str = "EPSG:4326"):
+    # Area queried when no bbox is given
+    HELSINKI_BBOX = (24.88, 60.15, 25.09, 60.26)
+    
+    def __init__(
+        self,
+        name: str = "Finnish National WMS",
+        crs: str = "EPSG:4326",
+        wfs: Optional[WFSClient] = None
+    ):
         """
         Initialize WMS data source.
         
         Args:
             name: Human-readable name for the data source
             crs: Target coordinate reference system (default: EPSG:4326)
+            wfs: Paging WFS client to share; a new pooled client is created when None
         """
         super().__init__(name, crs)
+        self.wfs = wfs or WFSClient()
         
         # WFS endpoints (using same endpoints as prepare_national_geodata.py)
         self.address_wfs_url = "https://paikkatiedot.ymparisto.fi/geoserver/ryhti_inspire_ad/wms"
@@ -85,6 +97,87 @@ class WMSDataSource(GeoDataSource):
             "native_crs": "EPSG:4326"  # WFS returns data in EPSG:4326
         })
     
+    # INSPIRE building attribute names and their standardized equivalents
+    INSPIRE_BUILDING_MAPPING = {
+        'inspireId_localId': 'inspire_id_local',
+        'inspireId_versionId': 'inspire_id_version',
+        'inspireId_namespace': 'inspire_id_namespace',
+        'externalReference_informationSystem': 'ext_ref_info_system',
+        'externalReference_informationSystemName': 'ext_ref_info_system_name',
+        'externalReference_reference': 'ext_ref_reference',
+        'beginLifespanVersion': 'lifespan_start_version',
+        'endLifespanVersion': 'lifespan_end_version',
+        'conditionOfConstruction': 'construction_condition',
+        'currentUse_percentage': 'current_use_percentage',
+        'dateOfConstruction': 'construction_date',
+        'dateOfDemolition': 'demolition_date',
+        'currentUse_currentUse': 'current_use',
+        'elevation_elevationReference': 'elevation_reference',
+        'elevation_elevationValue': 'elevation_value',
+        'heightAboveGround_value': 'height_above_ground',
+        'numberOfFloorsAboveGround': 'floors_above_ground',
+        'geometry2D_referenceGeometry': 'is_2d_reference_geometry',
+        'geometry2D_horizontalGeometryReference': 'horizontal_geometry_reference',
+    }
+    
+    def _standardize_buildings(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Standardized names and target CRS for INSPIRE buildings."""
+        # Standardize column names
+        gdf = self.standardize_columns(gdf, self.INSPIRE_BUILDING_MAPPING)
+        
+        # Transform to target CRS if needed
+        return self.transform_to_target_crs(gdf)
+    
+    def _standardize_addresses(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+        """Standardized names and target CRS for INSPIRE addresses."""
+        # Standardize column names
+        gdf = self.standardize_columns(gdf, self.INSPIRE_ADDRESS_MAPPING)
+        
+        # Transform to target CRS if needed
+        return self.transform_to_target_crs(gdf)
+    
+    def iter_buildings(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        limit: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Stream building data from WFS in chunks, paging through the whole area.
+        
+        Args:
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+            limit: Maximum number of records to fetch (all records when None)
+            chunk_size: Records per chunk (the WFS page size by default)
+            
+        Yields:
+            GeoDataFrames with building geometries and attributes
+        """
+        for chunk in self.wfs.iter_chunks(self.building_wfs_url, 'BU.Building', bbox=bbox or self.HELSINKI_BBOX,
+                                          limit=limit, chunk_size=chunk_size):
+            yield self._standardize_buildings(chunk)
+    
+    def iter_addresses(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        limit: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[gpd.GeoDataFrame]:
+        """
+        Stream address points from WFS in chunks, paging through the whole area.
+        
+        Args:
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+            limit: Maximum number of records to fetch (all records when None)
+            chunk_size: Records per chunk (the WFS page size by default)
+            
+        Yields:
+            GeoDataFrames with address points and attributes
+        """
+        for chunk in self.wfs.iter_chunks(self.address_wfs_url, 'AD.Address', bbox=bbox or self.HELSINKI_BBOX,
+                                          limit=limit, chunk_size=chunk_size):
+            yield self._standardize_addresses(chunk)
+    
     def fetch_buildings(
         self,
         bbox: Optional[Tuple[float, float, float, float]] = None,
@@ -93,6 +186,9 @@ class WMSDataSource(GeoDataSource):
         """
         Fetch building data from WFS.
         
+        Large areas are paged through, so the result is not truncated at the
+        server's page size.
+        
         Args:
             bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
             limit: Maximum number of records to fetch
@@ -100,68 +196,13 @@ class WMSDataSource(GeoDataSource):
         Returns:
             GeoDataFrame with building geometries and attributes
         """
-        if bbox is None:
-            # Default to Helsinki area
-            bbox = (24.88, 60.15, 25.09, 60.26)
-        
-        # Prepare WFS GetFeature request parameters
-        params = {
-            'service': 'WFS',
-            'version': '2.0.0',
-            'request': 'GetFeature',
-            'typeName': 'BU.Building',
-            'bbox': f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]},EPSG:4326",
-            'srsName': 'EPSG:4326',
-            'outputFormat': 'application/json'
-        }
-        
-        if limit:
-            params['count'] = str(limit)
-        
         try:
-            # Make the request
-            response = httpx.get(self.building_wfs_url, params=params, timeout=30.0)
-            response.raise_for_status()
-            
-            data = response.json()
+            gdf = self._fetch_buildings(bbox, limit)
             
-            if not data.get("features"):
+            if gdf.empty:
                 print("No building features found in the specified bounding box.")
                 return gpd.GeoDataFrame(columns=['geometry'])
             
-            # Create GeoDataFrame from features
-            gdf = gpd.GeoDataFrame.from_features(data["features"])
-            gdf.set_crs("EPSG:4326", inplace=True)
-            
-            # Update column mapping for INSPIRE data
-            inspire_building_mapping = {
-                'inspireId_localId': 'inspire_id_local',
-                'inspireId_versionId': 'inspire_id_version',
-                'inspireId_namespace': 'inspire_id_namespace',
-                'externalReference_informationSystem': 'ext_ref_info_system',
-                'externalReference_informationSystemName': 'ext_ref_info_system_name',
-                'externalReference_reference': 'ext_ref_reference',
-                'beginLifespanVersion': 'lifespan_start_version',
-                'endLifespanVersion': 'lifespan_end_version',
-                'conditionOfConstruction': 'construction_condition',
-                'currentUse_percentage': 'current_use_percentage',
-                'dateOfConstruction': 'construction_date',
-                'dateOfDemolition': 'demolition_date',
-                'currentUse_currentUse': 'current_use',
-                'elevation_elevationReference': 'elevation_reference',
-                'elevation_elevationValue': 'elevation_value',
-                'heightAboveGround_value': 'height_above_ground',
-                'numberOfFloorsAboveGround': 'floors_above_ground',
-                'geometry2D_referenceGeometry': 'is_2d_reference_geometry',
-                'geometry2D_horizontalGeometryReference': 'horizontal_geometry_reference',
-            }
-            
-            # Standardize column names
-            gdf = self.standardize_columns(gdf, inspire_building_mapping)
-            
-            # Transform to target CRS if needed
-            gdf = self.transform_to_target_crs(gdf)
-            
             return gdf
             
         except httpx.HTTPError as e:
@@ -171,13 +212,68 @@ class WMSDataSource(GeoDataSource):
             print(f"Error fetching building data: {e}")
             return gpd.GeoDataFrame(columns=['geometry'])
     
+    async def fetch_buildings_async(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        limit: Optional[int] = None
+    ) -> gpd.GeoDataFrame:
+        """
+        Fetch building data from WFS without blocking the event loop.
+        
+        The query is paged through the shared WFS client in a worker thread, so
+        it gets the same retries and per-host limiter as ``fetch_buildings``.
+        Unlike ``fetch_buildings`` this raises on request errors, so callers
+        running several sources at once can tell a failed source from an empty one.
+        
+        Args:
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+            limit: Maximum number of records to fetch
+            
+        Returns:
+            GeoDataFrame with building geometries and attributes
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._fetch_buildings, bbox, limit)
+    
+    def _fetch_buildings(
+        self,
+        bbox: Optional[Tuple[float, float, float, float]],
+        limit: Optional[int]
+    ) -> gpd.GeoDataFrame:
+        """Buildings of a query paged from WFS; raises on request errors."""
+        gdf = self.wfs.fetch(self.building_wfs_url, 'BU.Building', bbox=bbox or self.HELSINKI_BBOX, limit=limit)
+        if gdf.empty:
+            return gpd.GeoDataFrame(columns=['geometry'], geometry='geometry', crs=self.target_crs)
+        return self._standardize_buildings(gdf)
+    
+    # INSPIRE address attribute names and their standardized equivalents
+    INSPIRE_ADDRESS_MAPPING = {
+        'inspireId_localId': 'inspire_id_local',
+        'inspireId_namespace': 'inspire_id_namespace',
+        'beginLifespanVersion': 'lifespan_start_version',
+        'endLifespanVersion': 'lifespan_end_version',
+        'component_ThoroughfareName': 'street_name',
+        'component_PostalDescriptor': 'postal_code',
+        'component_AdminUnitName_1': 'admin_unit_1',
+        'component_AdminUnitName_4': 'admin_unit_4',
+        'locator_designator_addressNumber': 'address_number',
+        'locator_designator_addressNumberExtension': 'address_number_extension',
+        'locator_designator_addressNumberExtension2ndExtension': 'address_number_extension_2',
+        'locator_level': 'locator_level',
+        'position_specification': 'position_specification',
+        'position_method': 'position_method',
+        'position_default': 'is_position_default',
+        'building': 'building_id_reference',
+        'parcel': 'parcel_id_reference',
+    }
+    
     def fetch_addresses(
         self,
         bbox: Optional[Tuple[float, float, float, float]] = None,
         limit: Optional[int] = None
     ) -> gpd.GeoDataFrame:
         """
-        Fetch address point data from WFS.
+        Fetch address point data from WFS, paging through the whole area.
         
         Args:
             bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
@@ -186,65 +282,11 @@ class WMSDataSource(GeoDataSource):
         Returns:
             GeoDataFrame with address points and attributes
         """
-        if bbox is None:
-            # Default to Helsinki area
-            bbox = (24.88, 60.15, 25.09, 60.26)
-        
-        # Prepare WFS GetFeature request parameters
-        params = {
-            'service': 'WFS',
-            'version': '2.0.0',
-            'request': 'GetFeature',
-            'typeName': 'AD.Address',
-            'bbox': f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]},EPSG:4326",
-            'srsName': 'EPSG:4326',
-            'outputFormat': 'application/json'
-        }
-        
-        if limit:
-            params['count'] = str(limit)
-        
         try:
-            # Make the request
-            response = httpx.get(self.address_wfs_url, params=params, timeout=30.0)
-            response.raise_for_status()
-            
-            data = response.json()
+            gdf = self.fetch_address_page(bbox or self.HELSINKI_BBOX, count=limit)
             
-            if not data.get("features"):
+            if gdf.empty:
                 print("No address features found in the specified bounding box.")
-                return gpd.GeoDataFrame(columns=['geometry'])
-            
-            # Create GeoDataFrame from features
-            gdf = gpd.GeoDataFrame.from_features(data["features"])
-            gdf.set_crs("EPSG:4326", inplace=True)
-            
-            # Update column mapping for INSPIRE data
-            inspire_address_mapping = {
-                'inspireId_localId': 'inspire_id_local',
-                'inspireId_namespace': 'inspire_id_namespace',
-                'beginLifespanVersion': 'lifespan_start_version',
-                'endLifespanVersion': 'lifespan_end_version',
-                'component_ThoroughfareName': 'street_name',
-                'component_PostalDescriptor': 'postal_code',
-                'component_AdminUnitName_1': 'admin_unit_1',
-                'component_AdminUnitName_4': 'admin_unit_4',
-                'locator_designator_addressNumber': 'address_number',
-                'locator_designator_addressNumberExtension': 'address_number_extension',
-                'locator_designator_addressNumberExtension2ndExtension': 'address_number_extension_2',
-                'locator_level': 'locator_level',
-                'position_specification': 'position_specification',
-                'position_method': 'position_method',
-                'position_default': 'is_position_default',
-                'building': 'building_id_reference',
-                'parcel': 'parcel_id_reference',
-            }
-            
-            # Standardize column names
-            gdf = self.standardize_columns(gdf, inspire_address_mapping)
-            
-            # Transform to target CRS if needed
-            gdf = self.transform_to_target_crs(gdf)
             
             return gdf
             
@@ -255,6 +297,32 @@ class WMSDataSource(GeoDataSource):
             print(f"Error fetching address data: {e}")
             return gpd.GeoDataFrame(columns=['geometry'])
     
+    def fetch_address_page(
+        self,
+        bbox: Tuple[float, float, float, float],
+        start_index: int = 0,
+        count: Optional[int] = None
+    ) -> gpd.GeoDataFrame:
+        """
+        Fetch one page of address points with WFS 2.0 paging.
+        
+        Unlike ``fetch_addresses`` this raises on request errors (after the WFS
+        client's retries), so callers that persist the result never mistake a
+        failed request for an empty area.
+        
+        Args:
+            bbox: Bounding box as (min_lon, min_lat, max_lon, max_lat)
+            start_index: Index of the first feature to return (``startIndex``)
+            count: Maximum number of features in the page (all remaining features when None)
+            
+        Returns:
+            GeoDataFrame with the page's address points, empty past the last page
+        """
+        gdf = self.wfs.fetch(self.address_wfs_url, 'AD.Address', bbox=bbox, limit=count, start_index=start_index)
+        if gdf.empty:
+            return gpd.GeoDataFrame(columns=['geometry'], geometry='geometry', crs=self.target_crs)
+        return self._standardize_addresses(gdf)
+    
     def get_metadata(self) -> Dict[str, Any]:
         """
         Get metadata about the WFS data source.
@@ -5,8 +5,15 @@ This package provides database management utilities, schema definitions,
 and migration capabilities for the DuckDB-based analytics database.
 """
 
+from .connection import (
+    DatabaseConnectionManager, get_connection_manager, get_database_connection, get_reader_connection
+)
 from .manager import EnhancedDatabaseManager
 from .schema import DatabaseSchema
 from .migrations import MigrationManager
 
-__all__ = ['EnhancedDatabaseManager', 'DatabaseSchema', 'MigrationManager']
\ No newline at end of file
+__all__ = [
+    'EnhancedDatabaseManager', 'DatabaseSchema', 'MigrationManager',
+    'DatabaseConnectionManager', 'get_connection_manager', 'get_database_connection',
+    'get_reader_connection',
+]
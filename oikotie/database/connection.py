@@ -0,0 +1,214 @@
+"""
+Shared DuckDB connection management for the Oikotie database layer.
+
+DuckDB allows a single writer per database file, and reopening the file for every
+query pays the cost of loading the catalog each time. This module keeps one
+long-lived writer connection per database file for the whole process and hands out
+per-thread cursors created with ``con.cursor()``. Readers in other processes, such
+as the dashboards, open the file read-only with ``get_reader_connection`` instead,
+so they never hold the writer lock.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import duckdb
+from loguru import logger
+
+
+# Callbacks notified with the acquire latency (seconds) of every connection checkout
+_acquire_observers: List[Callable[[str, float], None]] = []
+
+
+class DatabaseConnectionManager:
+    """Owns the process-wide writer connection and per-thread cursors for one database file."""
+
+    def __init__(self, db_path: str = "data/real_estate.duckdb"):
+        self.db_path = str(db_path)
+        self._connection: Optional[duckdb.DuckDBPyConnection] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._generation = 0
+
+        # Acquire latency statistics
+        self._stats_lock = threading.Lock()
+        self._acquisitions = 0
+        self._cursors_created = 0
+        self._total_acquire_seconds = 0.0
+        self._max_acquire_seconds = 0.0
+        self._recent_acquire_seconds = deque(maxlen=1000)
+
+    def _get_writer(self) -> duckdb.DuckDBPyConnection:
+        """Open the writer connection on first use."""
+        if self._connection is None:
+            with self._lock:
+                if self._connection is None:
+                    if self.db_path != ":memory:":
+                        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+                    self._connection = duckdb.connect(self.db_path)
+                    logger.debug(f"Opened shared DuckDB connection: {self.db_path}")
+        return self._connection
+
+    def _thread_cursor(self) -> duckdb.DuckDBPyConnection:
+        """Return the calling thread's cursor, creating it if needed."""
+        cursor = getattr(self._local, 'cursor', None)
+        if cursor is None or getattr(self._local, 'generation', None) != self._generation:
+            writer = self._get_writer()
+            cursor = writer.cursor()
+            self._local.cursor = cursor
+            self._local.generation = self._generation
+            self._local.depth = 0
+            with self._stats_lock:
+                self._cursors_created += 1
+        return cursor
+
+    def _record_acquire(self, seconds: float) -> None:
+        with self._stats_lock:
+            self._acquisitions += 1
+            self._total_acquire_seconds += seconds
+            self._max_acquire_seconds = max(self._max_acquire_seconds, seconds)
+            self._recent_acquire_seconds.append(seconds)
+        for observer in _acquire_observers:
+            try:
+                observer(self.db_path, seconds)
+            except Exception as e:
+                logger.debug(f"Connection acquire observer failed: {e}")
+
+    @contextmanager
+    def connection(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow the calling thread's cursor.
+
+        Like closing a dedicated connection, leaving the outermost block rolls back
+        any transaction that was begun but not committed.
+        """
+        start = time.perf_counter()
+        cursor = self._thread_cursor()
+        self._record_acquire(time.perf_counter() - start)
+
+        self._local.depth += 1
+        try:
+            yield cursor
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                try:
+                    cursor.rollback()
+                except duckdb.Error:
+                    pass  # No open transaction
+
+    @contextmanager
+    def transaction(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow the thread's cursor inside a transaction that commits on success."""
+        with self.connection() as con:
+            con.begin()
+            try:
+                yield con
+                con.commit()
+            except Exception:
+                con.rollback()
+                raise
+
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """Create a dedicated cursor for long-lived owners; the caller closes it."""
+        start = time.perf_counter()
+        cursor = self._get_writer().cursor()
+        self._record_acquire(time.perf_counter() - start)
+        with self._stats_lock:
+            self._cursors_created += 1
+        return cursor
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the writer connection is currently open."""
+        return self._connection is not None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get connection-acquire latency statistics."""
+        with self._stats_lock:
+            recent = sorted(self._recent_acquire_seconds)
+            p95 = recent[int(0.95 * (len(recent) - 1))] if recent else 0.0
+            return {
+                'db_path': self.db_path,
+                'open': self._connection is not None,
+                'acquisitions': self._acquisitions,
+                'cursors_created': self._cursors_created,
+                'avg_acquire_ms': (self._total_acquire_seconds / self._acquisitions * 1000) if self._acquisitions else 0.0,
+                'p95_acquire_ms': p95 * 1000,
+                'max_acquire_ms': self._max_acquire_seconds * 1000,
+            }
+
+    def close(self) -> None:
+        """Close the writer connection; threads get fresh cursors on next use."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                self._generation += 1
+                logger.debug(f"Closed shared DuckDB connection: {self.db_path}")
+
+
+_managers: Dict[str, DatabaseConnectionManager] = {}
+_managers_lock = threading.Lock()
+
+
+def _registry_key(db_path: str) -> str:
+    db_path = str(db_path)
+    return db_path if db_path == ":memory:" else str(Path(db_path).resolve())
+
+
+def get_connection_manager(db_path: str = "data/real_estate.duckdb") -> DatabaseConnectionManager:
+    """Get the process-wide connection manager for a database file."""
+    key = _registry_key(db_path)
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = DatabaseConnectionManager(db_path)
+            _managers[key] = manager
+        return manager
+
+
+def get_database_connection(db_path: str = "data/real_estate.duckdb") -> duckdb.DuckDBPyConnection:
+    """Get a dedicated cursor on the shared connection for a database file."""
+    return get_connection_manager(db_path).cursor()
+
+
+def get_reader_connection(db_path: str = "data/real_estate.duckdb",
+                          read_only: bool = True) -> duckdb.DuckDBPyConnection:
+    """Get a connection for a reader that the caller closes.
+
+    With ``read_only`` the file is opened read-only, so the reader neither takes
+    DuckDB's exclusive writer lock nor keeps any lock after ``close()``. When this
+    process already holds the shared writer connection for the file, a cursor on it
+    is returned instead, as DuckDB does not open one file with two configurations.
+    """
+    if read_only:
+        with _managers_lock:
+            manager = _managers.get(_registry_key(db_path))
+        if manager is None or not manager.is_open:
+            return duckdb.connect(str(db_path), read_only=True)
+    return get_connection_manager(db_path).cursor()
+
+
+def get_connection_stats() -> List[Dict[str, float]]:
+    """Get acquire latency statistics for every managed database."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    return [manager.get_stats() for manager in managers]
+
+
+def add_acquire_observer(callback: Callable[[str, float], None]) -> None:
+    """Register a callback receiving ``(db_path, seconds)`` for each connection checkout."""
+    if callback not in _acquire_observers:
+        _acquire_observers.append(callback)
+
+
+def close_all_connections() -> None:
+    """Close every shared connection held by this process."""
+    with _managers_lock:
+        managers = list(_managers.values())
+    for manager in managers:
+        manager.close()
@@ -5,12 +5,13 @@ This module provides coordinate validation functions for Helsinki and Espoo,
 ensuring that property listings have valid coordinates within city boundaries.
 """
 
-import duckdb
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 from loguru import logger
 from enum import Enum
 
+from .connection import get_connection_manager
+
 
 class ValidationStatus(Enum):
     """Coordinate validation status"""
@@ -49,6 +50,7 @@ class CoordinateValidator:
     
     def __init__(self, db_path: str = "data/real_estate.duckdb"):
         self.db_path = db_path
+        self.connections = get_connection_manager(db_path)
         self.city_bounds = self._define_city_bounds()
     
     def _define_city_bounds(self) -> Dict[str, CityBounds]:
@@ -153,7 +155,7 @@ class CoordinateValidator:
         }
         
         try:
-            with duckdb.connect(self.db_path) as con:
+            with self.connections.connection() as con:
                 # Get listings that need validation
                 listings = con.execute("""
                     SELECT url, city, latitude, longitude 
@@ -214,7 +216,7 @@ class CoordinateValidator:
     def get_validation_summary(self) -> Dict[str, Dict]:
         """Get validation summary by city"""
         try:
-            with duckdb.connect(self.db_path, read_only=True) as con:
+            with self.connections.connection() as con:
                 summary = {}
                 
                 # Get validation statistics by city
@@ -253,7 +255,7 @@ class CoordinateValidator:
     def get_invalid_coordinates(self, city: Optional[str] = None, limit: int = 100) -> List[Dict]:
         """Get listings with invalid coordinates"""
         try:
-            with duckdb.connect(self.db_path, read_only=True) as con:
+            with self.connections.connection() as con:
                 query = """
                     SELECT url, city, address, latitude, longitude, coordinate_validation_error
                     FROM listings 
@@ -6,7 +6,6 @@ staleness detection, and automation-specific features while maintaining
 compatibility with the existing scraper architecture.
 """
 
-import json
 import time
 import uuid
 import threading
@@ -14,11 +13,13 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
 from pathlib import Path
-import duckdb
+import pandas as pd
 from loguru import logger
 
+from .connection import get_connection_manager
 from .schema import DatabaseSchema
 from .migrations import MigrationManager
+from ..utils.listing_normalizer import NORMALIZED_COLUMNS, normalize_listing_details, to_python_rows
 
 
 @dataclass
@@ -97,6 +98,14 @@ class EnhancedDatabaseManager:
     
     _instances = {}
     _lock = threading.Lock()
+
+    # Column order of the staged rows applied by the bulk upsert path
+    _BULK_UPSERT_COLUMNS = [
+        'source', 'city', 'title', 'address', 'postal_code', 'listing_type',
+        'price_eur', 'size_m2', 'rooms', 'year_built', 'overview',
+        'full_description', 'other_details_json', 'scraped_at', 'url',
+        'execution_id', 'last_check_ts', 'data_quality_score',
+    ]
     
     def __new__(cls, db_path: str = "data/real_estate.duckdb"):
         """Implement singleton pattern per database path to prevent connection conflicts."""
@@ -114,9 +123,9 @@ class EnhancedDatabaseManager:
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        self.connections = get_connection_manager(str(self.db_path))
         self.schema = DatabaseSchema(str(self.db_path))
         self.migration_manager = MigrationManager(str(self.db_path))
-        self._connection_lock = threading.Lock()
         
         logger.info(f"Enhanced database manager initialized: {self.db_path}")
         self._initialize_database()
@@ -142,16 +151,15 @@ class EnhancedDatabaseManager:
             raise
     
     def get_connection(self):
-        """Get a database connection for direct queries."""
-        with self._connection_lock:
-            return duckdb.connect(str(self.db_path))
+        """Get a cursor on the shared connection for direct queries."""
+        return self.connections.cursor()
     
     def get_stale_listings(self, staleness_threshold: timedelta = timedelta(hours=24)) -> List[ListingRecord]:
         """Get listings that need re-scraping based on staleness threshold."""
         cutoff_time = datetime.now() - staleness_threshold
         
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 query = """
                     SELECT url, source, city, title, address, postal_code, listing_type,
                            price_eur, size_m2, rooms, year_built, overview, full_description,
@@ -193,7 +201,7 @@ class EnhancedDatabaseManager:
         cutoff_time = datetime.now() - staleness_threshold
         
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 result = con.execute("""
                     SELECT last_check_ts, retry_count, deleted_ts
                     FROM listings 
@@ -230,12 +238,21 @@ class EnhancedDatabaseManager:
             logger.error(f"Failed to check if listing should be skipped: {e}")
             return False
     
-    def upsert_with_deduplication(self, listings: List[Dict], city_name: str, execution_id: str) -> UpsertResult:
-        """Insert or update listings with smart deduplication."""
+    def upsert_with_deduplication(self, listings: List[Dict], city_name: str, execution_id: str,
+                                  bulk: bool = False) -> UpsertResult:
+        """Insert or update listings with smart deduplication.
+
+        With ``bulk=True`` the cleaned rows are staged as a DataFrame and applied
+        with a single set-based ``INSERT ... ON CONFLICT DO UPDATE`` statement
+        instead of one statement per listing.
+        """
         if not listings:
             logger.warning("No listings provided for upsert")
             return UpsertResult(0, 0, 0, 0, 0, [])
-        
+
+        if bulk:
+            return self._bulk_upsert(listings, city_name, execution_id)
+
         result = UpsertResult(
             total_processed=len(listings),
             new_records=0,
@@ -246,7 +263,7 @@ class EnhancedDatabaseManager:
         )
         
         try:
-            with duckdb.connect(str(self.db_path)) as con:
+            with self.connections.connection() as con:
                 con.begin()
                 
                 # Get existing URLs for the city
@@ -257,7 +274,12 @@ class EnhancedDatabaseManager:
                     ).fetchall()
                 )
                 
-                for listing in listings:
+                # Parse the typed columns for the whole batch in one vectorized pass
+                normalized = to_python_rows(normalize_listing_details(
+                    [listing.get('details') or {} for listing in listings]
+                ))
+                
+                for listing, row in zip(listings, normalized):
                     try:
                         url = listing.get('url')
                         if not url:
@@ -276,19 +298,9 @@ class EnhancedDatabaseManager:
                         quality_score = self._calculate_quality_score(listing, details)
                         
                         # Prepare data
-                        address = details.get('sijainti')
-                        postal_code = self._extract_postal_code(address) if address else None
-                        
-                        core_data = {
-                            'price_eur': self._clean_and_convert(details.get('velaton_hinta') or details.get('myyntihinta'), 'float'),
-                            'size_m2': self._clean_and_convert(details.get('asuinpinta-ala'), 'float'),
-                            'rooms': self._clean_and_convert(details.get('huoneita'), 'int'),
-                            'year_built': self._clean_and_convert(details.get('rakennusvuosi'), 'int'),
-                        }
-                        
-                        # Prepare other details
-                        core_keys = ['sijainti', 'rakennuksen_tyyppi', 'velaton_hinta', 'myyntihinta', 'asuinpinta-ala', 'huoneita', 'rakennusvuosi']
-                        other_details = {k: v for k, v in details.items() if k not in core_keys}
+                        address = row['address']
+                        postal_code = row['postal_code']
+                        core_data = {key: row[key] for key in ('price_eur', 'size_m2', 'rooms', 'year_built')}
                         
                         current_time = datetime.now()
                         
@@ -296,10 +308,10 @@ class EnhancedDatabaseManager:
                             # Update existing record
                             update_params = [
                                 listing.get('source'), city_name, listing.get('title'),
-                                address, postal_code, details.get('rakennuksen_tyyppi'),
+                                address, postal_code, row['listing_type'],
                                 core_data['price_eur'], core_data['size_m2'], core_data['rooms'], core_data['year_built'],
                                 listing.get('overview'), listing.get('full_description'),
-                                json.dumps(other_details, ensure_ascii=False),
+                                row['other_details_json'],
                                 current_time,  # scraped_at
                                 execution_id,
                                 current_time,  # last_check_ts
@@ -324,10 +336,10 @@ class EnhancedDatabaseManager:
                             # Insert new record
                             insert_params = [
                                 listing.get('source'), city_name, listing.get('title'),
-                                address, postal_code, details.get('rakennuksen_tyyppi'),
+                                address, postal_code, row['listing_type'],
                                 core_data['price_eur'], core_data['size_m2'], core_data['rooms'], core_data['year_built'],
                                 listing.get('overview'), listing.get('full_description'),
-                                json.dumps(other_details, ensure_ascii=False),
+                                row['other_details_json'],
                                 current_time,  # scraped_at
                                 url, execution_id, current_time,  # last_check_ts
                                 1,  # check_count
@@ -357,13 +369,123 @@ class EnhancedDatabaseManager:
         except Exception as e:
             logger.error(f"Upsert operation failed: {e}")
             result.errors.append(f"Database operation failed: {str(e)}")
-            
+
         return result
-    
+
+    def _bulk_upsert(self, listings: List[Dict], city_name: str, execution_id: str) -> UpsertResult:
+        """Apply listings with one set-based upsert statement."""
+        result = UpsertResult(
+            total_processed=len(listings),
+            new_records=0,
+            updated_records=0,
+            skipped_records=0,
+            failed_records=0,
+            errors=[]
+        )
+
+        current_time = datetime.now()
+        rows = {}
+        for listing in listings:
+            url = listing.get('url')
+            if not url:
+                result.failed_records += 1
+                result.errors.append("Missing URL in listing")
+                continue
+
+            details = listing.get('details', {})
+            if 'error' in details:
+                result.failed_records += 1
+                result.errors.append(f"Listing error: {details.get('error')}")
+                continue
+
+            # A URL can only be upserted once per statement; the last occurrence wins
+            if url in rows:
+                result.skipped_records += 1
+            rows[url] = listing
+
+        if not rows:
+            return result
+
+        staged = self._stage_listings(list(rows.values()), city_name, execution_id, current_time)
+
+        try:
+            with self.connections.connection() as con:
+                con.begin()
+                con.register('staged_listings', staged)
+
+                existing_count = con.execute("""
+                    SELECT COUNT(*) FROM staged_listings s JOIN listings l ON l.url = s.url
+                """).fetchone()[0]
+
+                con.execute("""
+                    INSERT INTO listings (
+                        source, city, title, address, postal_code, listing_type,
+                        price_eur, size_m2, rooms, year_built, overview,
+                        full_description, other_details_json, scraped_at, url,
+                        execution_id, last_check_ts, check_count, data_quality_score,
+                        insert_ts
+                    )
+                    SELECT source, city, title, address, postal_code, listing_type,
+                           CAST(price_eur AS FLOAT), CAST(size_m2 AS FLOAT),
+                           CAST(rooms AS INTEGER), CAST(year_built AS INTEGER), overview,
+                           full_description, other_details_json, CAST(scraped_at AS TIMESTAMP), url,
+                           execution_id, CAST(last_check_ts AS TIMESTAMP), 1,
+                           CAST(data_quality_score AS REAL), CURRENT_TIMESTAMP
+                    FROM staged_listings
+                    ON CONFLICT (url) DO UPDATE SET
+                        source=EXCLUDED.source, city=EXCLUDED.city, title=EXCLUDED.title,
+                        address=EXCLUDED.address, postal_code=EXCLUDED.postal_code,
+                        listing_type=EXCLUDED.listing_type, price_eur=EXCLUDED.price_eur,
+                        size_m2=EXCLUDED.size_m2, rooms=EXCLUDED.rooms, year_built=EXCLUDED.year_built,
+                        overview=EXCLUDED.overview, full_description=EXCLUDED.full_description,
+                        other_details_json=EXCLUDED.other_details_json, scraped_at=EXCLUDED.scraped_at,
+                        execution_id=EXCLUDED.execution_id, last_check_ts=EXCLUDED.last_check_ts,
+                        check_count=listings.check_count + 1,
+                        data_quality_score=EXCLUDED.data_quality_score,
+                        updated_ts=NOW(), deleted_ts=NULL,
+                        last_error=NULL, retry_count=0
+                """)
+
+                con.unregister('staged_listings')
+                con.commit()
+
+            result.updated_records = existing_count
+            result.new_records = len(rows) - existing_count
+            logger.success(f"Bulk upsert completed: {result.new_records} new, {result.updated_records} updated, {result.failed_records} failed")
+
+        except Exception as e:
+            logger.error(f"Bulk upsert operation failed: {e}")
+            result.failed_records += len(rows)
+            result.errors.append(f"Database operation failed: {str(e)}")
+
+        return result
+
+    def _stage_listings(self, listings: List[Dict], city_name: str,
+                        execution_id: str, current_time: datetime) -> pd.DataFrame:
+        """Build the cleaned rows in ``_BULK_UPSERT_COLUMNS`` order as a DataFrame."""
+        normalized = normalize_listing_details([listing.get('details', {}) for listing in listings])
+        staged = pd.DataFrame({
+            'source': [listing.get('source') for listing in listings],
+            'city': city_name,
+            'title': [listing.get('title') for listing in listings],
+            'overview': [listing.get('overview') for listing in listings],
+            'full_description': [listing.get('full_description') for listing in listings],
+            'scraped_at': current_time,
+            'url': [listing.get('url') for listing in listings],
+            'execution_id': execution_id,
+            'last_check_ts': current_time,
+            'data_quality_score': [
+                self._calculate_quality_score(listing, listing.get('details', {})) for listing in listings
+            ],
+        })
+        for column in NORMALIZED_COLUMNS:
+            staged[column] = normalized[column].to_numpy()
+        return staged[self._BULK_UPSERT_COLUMNS]
+
     def track_execution_metadata(self, metadata: ExecutionMetadata) -> None:
         """Track scraping execution metadata."""
         try:
-            with duckdb.connect(str(self.db_path)) as con:
+            with self.connections.connection() as con:
                 con.execute("""
                     INSERT OR REPLACE INTO scraping_executions (
                         execution_id, started_at, completed_at, status, city,
@@ -386,7 +508,7 @@ class EnhancedDatabaseManager:
     def get_data_quality_metrics(self) -> DataQualityReport:
         """Generate comprehensive data quality assessment."""
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 # Get basic counts
                 total_result = con.execute("SELECT COUNT(*) FROM listings WHERE deleted_ts IS NULL").fetchone()
                 total_listings = total_result[0] if total_result else 0
@@ -461,7 +583,7 @@ class EnhancedDatabaseManager:
         cleanup_stats = {}
         
         try:
-            with duckdb.connect(str(self.db_path)) as con:
+            with self.connections.connection() as con:
                 # Clean up old execution records
                 result = con.execute("""
                     DELETE FROM scraping_executions 
@@ -527,46 +649,10 @@ class EnhancedDatabaseManager:
         
         return score / max_score if max_score > 0 else 0.0
     
-    def _clean_and_convert(self, value_str: str, target_type: str) -> Optional[Any]:
-        """Clean and convert string values to appropriate types."""
-        if not value_str:
-            return None
-        
-        try:
-            # Remove thousands separators and find first number
-            cleaned_str = value_str.replace('\u00a0', '').replace(' ', '')
-            import re
-            match = re.search(r'[\d,.]+', cleaned_str)
-            if not match:
-                return None
-            
-            # Convert comma to dot for float conversion
-            num_str = match.group(0).replace(',', '.')
-            
-            if target_type == 'float':
-                return float(num_str)
-            elif target_type == 'int':
-                return int(float(num_str))
-            else:
-                return num_str
-                
-        except (ValueError, TypeError):
-            return None
-    
-    def _extract_postal_code(self, address: str) -> Optional[str]:
-        """Extract postal code from address string."""
-        if not address:
-            return None
-        
-        import re
-        # Finnish postal codes are 5 digits
-        match = re.search(r'\b\d{5}\b', address)
-        return match.group(0) if match else None
-    
     def get_execution_history(self, city: Optional[str] = None, limit: int = 50) -> List[ExecutionMetadata]:
         """Get execution history with optional city filter."""
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 query = """
                     SELECT execution_id, started_at, completed_at, status, city,
                            listings_processed, listings_new, listings_updated,
@@ -614,7 +700,7 @@ class EnhancedDatabaseManager:
     def get_latest_execution(self, city: str, report_date: datetime) -> Optional[Dict[str, Any]]:
         """Get the latest execution for a city on or before the report date."""
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 result = con.execute("""
                     SELECT execution_id, started_at, completed_at, status, city,
                            listings_processed, listings_new, listings_updated,
@@ -651,7 +737,7 @@ class EnhancedDatabaseManager:
     def get_data_quality_metrics(self, city: str, execution_id: str) -> Dict[str, Any]:
         """Get data quality metrics for a specific city and execution."""
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 # Get total addresses for the city
                 total_result = con.execute("""
                     SELECT COUNT(*) FROM listings 
@@ -720,7 +806,7 @@ class EnhancedDatabaseManager:
         # This is a simplified implementation
         # In a full system, this would query a separate error log table
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 result = con.execute("""
                     SELECT error_summary FROM scraping_executions 
                     WHERE execution_id = ? AND error_summary IS NOT NULL
@@ -743,7 +829,7 @@ class EnhancedDatabaseManager:
     def get_execution_history_by_date_range(self, city: str, start_date: datetime = None, end_date: datetime = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Get execution history for a city within a date range."""
         try:
-            with duckdb.connect(str(self.db_path), read_only=True) as con:
+            with self.connections.connection() as con:
                 # Build query based on provided parameters
                 query = """
                     SELECT execution_id, started_at, completed_at, status,
@@ -10,9 +10,10 @@ import hashlib
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass
 from datetime import datetime
-import duckdb
 from loguru import logger
 
+from .connection import get_connection_manager
+
 
 @dataclass
 class Migration:
@@ -29,13 +30,14 @@ class MigrationManager:
     
     def __init__(self, db_path: str = "data/real_estate.duckdb"):
         self.db_path = db_path
+        self.connections = get_connection_manager(db_path)
         self.migrations = self._define_migrations()
         self._ensure_migration_table()
     
     def _ensure_migration_table(self) -> None:
         """Ensure the migration tracking table exists."""
         try:
-            with duckdb.connect(self.db_path) as con:
+            with self.connections.connection() as con:
                 con.execute("""
                     CREATE TABLE IF NOT EXISTS schema_migrations (
                         version VARCHAR(50) PRIMARY KEY,
@@ -200,7 +202,7 @@ class MigrationManager:
     def get_applied_migrations(self) -> List[str]:
         """Get list of applied migration versions."""
         try:
-            with duckdb.connect(self.db_path, read_only=True) as con:
+            with self.connections.connection() as con:
                 result = con.execute("SELECT version FROM schema_migrations ORDER BY version").fetchall()
                 return [row[0] for row in result]
         except Exception as e:
@@ -217,7 +219,7 @@ class MigrationManager:
         logger.info(f"Applying migration {migration.version}: {migration.description}")
         
         try:
-            with duckdb.connect(self.db_path) as con:
+            with self.connections.connection() as con:
                 # Start transaction
                 con.begin()
                 
@@ -259,7 +261,7 @@ class MigrationManager:
         logger.info(f"Rolling back migration {migration.version}: {migration.description}")
         
         try:
-            with duckdb.connect(self.db_path) as con:
+            with self.connections.connection() as con:
                 # Start transaction
                 con.begin()
                 
@@ -355,7 +357,7 @@ class MigrationManager:
         logger.info("Validating migration integrity")
         
         try:
-            with duckdb.connect(self.db_path, read_only=True) as con:
+            with self.connections.connection() as con:
                 applied_migrations = con.execute("""
                     SELECT version, checksum FROM schema_migrations
                 """).fetchall()
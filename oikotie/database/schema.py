@@ -12,6 +12,8 @@ import duckdb
 import threading
 from loguru import logger
 
+from .connection import get_connection_manager
+
 # Global lock for spatial extension initialization
 _spatial_init_lock = threading.Lock()
 _spatial_initialized = set()
@@ -31,6 +33,7 @@ class DatabaseSchema:
     
     def __init__(self, db_path: str = "data/real_estate.duckdb"):
         self.db_path = db_path
+        self.connections = get_connection_manager(db_path)
         self.schemas = self._define_schemas()
     
     def _define_schemas(self) -> Dict[str, TableSchema]:
@@ -214,7 +217,7 @@ class DatabaseSchema:
         logger.info("Creating enhanced database schema for automation system")
         
         try:
-            with duckdb.connect(self.db_path) as con:
+            with self.connections.connection() as con:
                 # Enable spatial extension with thread safety
                 try:
                     con.execute("INSTALL spatial;")
@@ -262,7 +265,7 @@ class DatabaseSchema:
         table_info = {}
         
         try:
-            with duckdb.connect(self.db_path, read_only=True) as con:
+            with self.connections.connection() as con:
                 for table_name in self.schemas.keys():
                     try:
                         # Check if table exists
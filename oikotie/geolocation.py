@@ -2,13 +2,17 @@ import duckdb
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import time
-import random
 
 from geopy.geocoders import Nominatim
 from loguru import logger
 
+from .rate_control import get_limiter
+
 DB_PATH = Path("data/real_estate.duckdb")
 
+# Nominatim's usage policy allows one request at a time and at most one per second
+GEOCODER_LIMITER_SETTINGS = {'max_limit': 1, 'rate': 0.6, 'max_rate': 1.0, 'jitter': 0.3, 'target_p95': 5.0}
+
 
 def get_db_connection():
     """Establishes and returns a connection to the DuckDB database."""
@@ -36,11 +40,12 @@ def setup_database_tables():
 
 
 def geocode_location(geolocator, query, location_type, max_retries=3):
-    """Geocodes a single location query with retry logic."""
+    """Geocodes a single location query with retry logic, paced by the shared Nominatim limiter."""
+    limiter = get_limiter("nominatim", **GEOCODER_LIMITER_SETTINGS)
     for attempt in range(max_retries):
         try:
-            time.sleep(random.uniform(1.1, 2.5))  # Be respectful with a random delay
-            location = geolocator.geocode(query, timeout=10)
+            with limiter.slot():
+                location = geolocator.geocode(query, timeout=10)
             if location:
                 return query, location.latitude, location.longitude
             else:
@@ -12,11 +12,14 @@ from typing import Dict, List, Tuple, Optional, Any, Union
 from pathlib import Path
 import json
 import duckdb
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 from shapely.geometry import Point, Polygon
 from loguru import logger
 
+from oikotie.geospatial.matching import BuildingMatchEngine
+
 # Constants
 DB_PATH = Path("data/real_estate.duckdb")
 CACHE_DIR = Path("data/cache")
@@ -133,6 +136,7 @@ class GeospatialIntegrator(ABC):
         self.city = city
         self.data_governance = DataGovernanceManager(city)
         self.coordinate_bounds = self._get_coordinate_bounds()
+        self.match_engine = BuildingMatchEngine()
     
     def _get_coordinate_bounds(self) -> Tuple[float, float, float, float]:
         """Get coordinate bounds for the city from config"""
@@ -189,18 +193,119 @@ class GeospatialIntegrator(ABC):
         """
         pass
     
-    @abstractmethod
     def match_listings_to_buildings(self, listings_df: pd.DataFrame) -> pd.DataFrame:
         """
         Match listings to building footprints.
         
+        Fetches the city's buildings around the listings once and matches all
+        listings with ``self.match_engine``; subclasses only need to provide
+        ``fetch_building_data``.
+        
         Args:
             listings_df: DataFrame with listings data including lat/lon coordinates
             
         Returns:
             DataFrame with added building match information
         """
-        pass
+        if listings_df.empty:
+            logger.warning("No listings to match to buildings")
+            return listings_df
+        
+        # Ensure required columns exist
+        required_cols = ['latitude', 'longitude', 'address']
+        missing_cols = [col for col in required_cols if col not in listings_df.columns]
+        
+        if missing_cols:
+            logger.error(f"Missing required columns in listings data: {missing_cols}")
+            return listings_df
+        
+        # Create a copy to avoid modifying the original
+        result_df = listings_df.copy()
+        
+        # Add columns for building match results
+        result_df['building_match'] = False
+        result_df['building_id'] = None
+        result_df['match_type'] = None
+        result_df['geospatial_quality_score'] = 0.0
+        
+        # Get bounding box from listings
+        min_lat = listings_df['latitude'].min() - 0.01
+        max_lat = listings_df['latitude'].max() + 0.01
+        min_lon = listings_df['longitude'].min() - 0.01
+        max_lon = listings_df['longitude'].max() + 0.01
+        
+        bbox = (min_lon, min_lat, max_lon, max_lat)
+        
+        # Fetch building data for the area
+        buildings_gdf = self.fetch_building_data(bbox)
+        
+        if buildings_gdf.empty:
+            logger.warning("No building data available for matching")
+            return result_df
+        
+        try:
+            matches = self.match_engine.match(result_df['latitude'], result_df['longitude'], buildings_gdf)
+            
+            # Assign all results column-wise
+            matched = matches['building_match'].to_numpy()
+            result_df['building_match'] = matched
+            result_df['building_id'] = matches['building_id'].to_numpy()
+            result_df['match_type'] = matches['match_type'].to_numpy()
+            result_df['geospatial_quality_score'] = np.where(
+                matched,
+                self.calculate_quality_scores(result_df['latitude'], result_df['longitude'], matched),
+                0.0
+            )
+            
+            # Update database with matches
+            self._update_database_with_building_matches(result_df)
+            
+            # Log statistics
+            match_count = result_df['building_match'].sum()
+            match_rate = (match_count / len(result_df)) * 100
+            logger.success(f"Matched {match_count}/{len(result_df)} listings to buildings ({match_rate:.1f}%)")
+            
+            return result_df
+            
+        except Exception as e:
+            logger.error(f"Error matching listings to buildings: {e}")
+            return result_df
+    
+    def _update_database_with_building_matches(self, result_df: pd.DataFrame):
+        """Update database with building match results"""
+        # Filter to only matched listings
+        matched_df = result_df[result_df['building_match'] == True]
+        
+        if matched_df.empty:
+            logger.warning("No building matches to update in database")
+            return
+        
+        try:
+            if 'url' in matched_df.columns:
+                listing_urls = matched_df['url']
+            elif 'id' in matched_df.columns:
+                listing_urls = matched_df['id']
+            else:
+                listing_urls = pd.Series([f"unknown_{idx}" for idx in matched_df.index], index=matched_df.index)
+            
+            matches = [
+                {
+                    'listing_url': listing_url,
+                    'building_id': building_id,
+                    'match_type': match_type,
+                    'quality_score': quality_score
+                }
+                for listing_url, building_id, match_type, quality_score in zip(
+                    listing_urls, matched_df['building_id'], matched_df['match_type'],
+                    matched_df['geospatial_quality_score']
+                )
+            ]
+            
+            # Update database
+            self.update_database_with_matches(matches)
+            
+        except Exception as e:
+            logger.error(f"Error updating database with building matches: {e}")
     
     def calculate_quality_score(self, listing: Dict[str, Any], match_result: Dict[str, Any]) -> float:
         """
@@ -230,6 +335,31 @@ class GeospatialIntegrator(ABC):
         
         return min(1.0, max(0.0, score))
     
+    def calculate_quality_scores(self, latitudes, longitudes, building_match,
+                                 address_components_match=False) -> np.ndarray:
+        """
+        Column-wise ``calculate_quality_score`` for many listings at once.
+        
+        Args:
+            latitudes: Listing latitudes
+            longitudes: Listing longitudes
+            building_match: Whether each listing matched a building
+            address_components_match: Whether each listing's address components matched
+            
+        Returns:
+            Array of quality scores between 0.0 and 1.0
+        """
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        min_lon, min_lat, max_lon, max_lat = self.coordinate_bounds
+        in_bounds = (min_lat <= latitudes) & (latitudes <= max_lat) & (min_lon <= longitudes) & (longitudes <= max_lon)
+        
+        score = (0.5
+                 + 0.2 * in_bounds
+                 + 0.2 * np.broadcast_to(np.asarray(building_match, dtype=bool), latitudes.shape)
+                 + 0.1 * np.broadcast_to(np.asarray(address_components_match, dtype=bool), latitudes.shape))
+        return np.clip(score, 0.0, 1.0)
+    
     def update_database_with_matches(self, matches: List[Dict[str, Any]]):
         """
         Update database with building match results.
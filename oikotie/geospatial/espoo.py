@@ -16,7 +16,7 @@ from pathlib import Path
 import pandas as pd
 import geopandas as gpd
 import osmnx as ox
-from shapely.geometry import Point, Polygon, shape
+from shapely.geometry import Polygon, shape
 from geopy.geocoders import Nominatim
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from loguru import logger
@@ -662,179 +662,6 @@ class EspooGeospatialIntegrator(GeospatialIntegrator):
             logger.error(f"Error fetching OSM buildings: {e}")
             return gpd.GeoDataFrame()
     
-    def match_listings_to_buildings(self, listings_df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Match listings to building footprints.
-        
-        Args:
-            listings_df: DataFrame with listings data including lat/lon coordinates
-            
-        Returns:
-            DataFrame with added building match information
-        """
-        if listings_df.empty:
-            logger.warning("No listings to match to buildings")
-            return listings_df
-        
-        # Ensure required columns exist
-        required_cols = ['latitude', 'longitude', 'address']
-        missing_cols = [col for col in required_cols if col not in listings_df.columns]
-        
-        if missing_cols:
-            logger.error(f"Missing required columns in listings data: {missing_cols}")
-            return listings_df
-        
-        # Create a copy to avoid modifying the original
-        result_df = listings_df.copy()
-        
-        # Add columns for building match results
-        result_df['building_match'] = False
-        result_df['building_id'] = None
-        result_df['match_type'] = None
-        result_df['geospatial_quality_score'] = 0.0
-        
-        # Get bounding box from listings
-        min_lat = listings_df['latitude'].min() - 0.01
-        max_lat = listings_df['latitude'].max() + 0.01
-        min_lon = listings_df['longitude'].min() - 0.01
-        max_lon = listings_df['longitude'].max() + 0.01
-        
-        bbox = (min_lon, min_lat, max_lon, max_lat)
-        
-        # Fetch building data for the area
-        buildings_gdf = self.fetch_building_data(bbox)
-        
-        if buildings_gdf.empty:
-            logger.warning("No building data available for matching")
-            return result_df
-        
-        # Convert listings to GeoDataFrame for spatial operations
-        listings_gdf = gpd.GeoDataFrame(
-            result_df,
-            geometry=gpd.points_from_xy(result_df['longitude'], result_df['latitude']),
-            crs="EPSG:4326"
-        )
-        
-        # Perform spatial join to find which buildings contain which listings
-        try:
-            joined = gpd.sjoin(listings_gdf, buildings_gdf, how='left', predicate='within')
-            
-            # Update match results
-            for idx, row in joined.iterrows():
-                if pd.notna(row.get('index_right')):
-                    # Found a building match
-                    result_df.loc[idx, 'building_match'] = True
-                    result_df.loc[idx, 'building_id'] = row.get('building_id', str(row['index_right']))
-                    result_df.loc[idx, 'match_type'] = 'within_polygon'
-                    
-                    # Calculate quality score
-                    match_result = {
-                        'building_match': True,
-                        'address_components_match': False  # We don't have address components in buildings yet
-                    }
-                    
-                    listing_info = {
-                        'latitude': row['latitude'],
-                        'longitude': row['longitude']
-                    }
-                    
-                    quality_score = self.calculate_quality_score(listing_info, match_result)
-                    result_df.loc[idx, 'geospatial_quality_score'] = quality_score
-            
-            # For listings without a direct polygon match, find nearest building
-            unmatched = result_df[result_df['building_match'] == False].index
-            
-            if len(unmatched) > 0:
-                logger.info(f"Finding nearest buildings for {len(unmatched)} unmatched listings")
-                
-                for idx in unmatched:
-                    point = Point(result_df.loc[idx, 'longitude'], result_df.loc[idx, 'latitude'])
-                    
-                    # Convert to a projected CRS for accurate distance calculation
-                    # EPSG:3067 is the Finnish national grid system
-                    try:
-                        point_proj = gpd.GeoSeries([point], crs="EPSG:4326").to_crs("EPSG:3067")[0]
-                        buildings_proj = buildings_gdf.to_crs("EPSG:3067")
-                        buildings_proj['distance'] = buildings_proj.geometry.distance(point_proj)
-                        
-                        # Get nearest building
-                        nearest_idx = buildings_proj['distance'].idxmin()
-                        nearest = buildings_gdf.loc[nearest_idx]
-                        distance = buildings_proj.loc[nearest_idx, 'distance'] / 100000  # Convert to decimal degrees (approximate)
-                    except Exception as e:
-                        logger.warning(f"Error in projected distance calculation: {e}, falling back to geographic")
-                        # Fallback to geographic distance if projection fails
-                        buildings_gdf['distance'] = buildings_gdf.geometry.distance(point)
-                        nearest = buildings_gdf.loc[buildings_gdf['distance'].idxmin()]
-                        distance = nearest['distance']
-                    
-                    # If within 50 meters, consider it a match
-                    if distance < 0.0005:  # ~50 meters in decimal degrees
-                        result_df.loc[idx, 'building_match'] = True
-                        result_df.loc[idx, 'building_id'] = nearest.get('building_id', str(nearest.name))
-                        result_df.loc[idx, 'match_type'] = 'near_polygon'
-                        
-                        # Calculate quality score
-                        match_result = {
-                            'building_match': True,
-                            'address_components_match': False
-                        }
-                        
-                        listing_info = {
-                            'latitude': result_df.loc[idx, 'latitude'],
-                            'longitude': result_df.loc[idx, 'longitude']
-                        }
-                        
-                        quality_score = self.calculate_quality_score(listing_info, match_result)
-                        result_df.loc[idx, 'geospatial_quality_score'] = quality_score
-            
-            # Update database with matches
-            self._update_database_with_building_matches(result_df)
-            
-            # Log statistics
-            match_count = result_df['building_match'].sum()
-            match_rate = (match_count / len(result_df)) * 100
-            logger.success(f"Matched {match_count}/{len(result_df)} listings to buildings ({match_rate:.1f}%)")
-            
-            return result_df
-            
-        except Exception as e:
-            logger.error(f"Error matching listings to buildings: {e}")
-            return result_df
-    
-    def _update_database_with_building_matches(self, result_df: pd.DataFrame):
-        """Update database with building match results"""
-        # Filter to only matched listings
-        matched_df = result_df[result_df['building_match'] == True].copy()
-        
-        if matched_df.empty:
-            logger.warning("No building matches to update in database")
-            return
-        
-        try:
-            # Prepare match data
-            matches = []
-            for idx, row in matched_df.iterrows():
-                if 'url' in row:
-                    listing_url = row['url']
-                elif 'id' in row:
-                    listing_url = row['id']
-                else:
-                    listing_url = f"unknown_{idx}"
-                
-                matches.append({
-                    'listing_url': listing_url,
-                    'building_id': row['building_id'],
-                    'match_type': row['match_type'],
-                    'quality_score': row['geospatial_quality_score']
-                })
-            
-            # Update database
-            self.update_database_with_matches(matches)
-            
-        except Exception as e:
-            logger.error(f"Error updating database with building matches: {e}")
-    
     def validate_spatial_data(self, listings_df: pd.DataFrame) -> pd.DataFrame:
         """
         Validate spatial data quality for Espoo listings.
@@ -0,0 +1,114 @@
+"""
+Listing-to-building matching engine for Oikotie Real Estate Analytics Platform.
+
+This module provides the bulk spatial matching shared by all city integrators:
+listings inside a footprint are matched with one spatial join and the rest with
+one nearest-building join under a metric distance limit.
+"""
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+from loguru import logger
+
+
+class BuildingMatchEngine:
+    """
+    Matches listing points to building footprints in bulk.
+
+    Listings within a footprint get match type ``within_polygon``; the rest are
+    joined to their nearest footprint with ``sjoin_nearest`` in a projected CRS
+    and get ``near_polygon`` when it is closer than ``max_distance_m``. Buildings
+    are reprojected once per call, whatever the number of listings.
+    """
+
+    def __init__(self, max_distance_m: float = 50.0, projected_crs: str = "EPSG:3067"):
+        """
+        Initialize the engine.
+
+        Args:
+            max_distance_m: Distance in meters below which the nearest building is a match
+            projected_crs: Metric CRS for distances (EPSG:3067 is the Finnish national grid)
+        """
+        self.max_distance_m = max_distance_m
+        self.projected_crs = projected_crs
+
+    @staticmethod
+    def _building_ids(buildings_gdf: gpd.GeoDataFrame) -> np.ndarray:
+        """Building identifiers, falling back to the index label as a string."""
+        if 'building_id' in buildings_gdf.columns:
+            ids = buildings_gdf['building_id']
+            return ids.where(ids.notna(), buildings_gdf.index.astype(str)).to_numpy(dtype=object)
+        return buildings_gdf.index.astype(str).to_numpy(dtype=object)
+
+    def match(self, latitudes, longitudes, buildings_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+        """
+        Match points to buildings.
+
+        Args:
+            latitudes: Point latitudes (EPSG:4326)
+            longitudes: Point longitudes (EPSG:4326)
+            buildings_gdf: Building polygons with an optional ``building_id`` column
+
+        Returns:
+            DataFrame with one row per point, in input order, holding ``building_match``,
+            ``building_id``, ``match_type`` and ``distance_m`` (0.0 within a footprint,
+            NaN when there is no match)
+        """
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        points = gpd.GeoDataFrame(geometry=gpd.points_from_xy(longitudes, latitudes), crs="EPSG:4326")
+        count = len(points)
+        building_match = np.zeros(count, dtype=bool)
+        building_pos = np.full(count, -1, dtype=np.int64)
+        match_type = np.full(count, None, dtype=object)
+        distance_m = np.full(count, np.nan)
+
+        valid = np.isfinite(latitudes) & np.isfinite(longitudes)
+        if count == 0 or buildings_gdf.empty or not valid.any():
+            return self._result(building_match, building_pos, match_type, distance_m, buildings_gdf)
+
+        # Positional indexes keep the joins independent of the callers' index labels
+        buildings = buildings_gdf.reset_index(drop=True)
+        if buildings.crs is None:
+            buildings = buildings.set_crs("EPSG:4326")
+
+        # Step 1: listings inside a footprint, first building in input order wins
+        inside = gpd.sjoin(points[valid], buildings[['geometry']].to_crs(points.crs), how='inner', predicate='within')
+        inside = inside.reset_index().groupby('index')['index_right'].min()
+        building_match[inside.index] = True
+        building_pos[inside.index] = inside.to_numpy()
+        match_type[inside.index] = 'within_polygon'
+        distance_m[inside.index] = 0.0
+
+        # Step 2: nearest footprint for the rest, with both layers projected once
+        remaining = valid & ~building_match
+        if remaining.any():
+            points_proj = points[remaining].to_crs(self.projected_crs)
+            buildings_proj = buildings[['geometry']].to_crs(self.projected_crs)
+            nearest = gpd.sjoin_nearest(
+                points_proj, buildings_proj, how='inner',
+                max_distance=self.max_distance_m, distance_col='distance_m'
+            )
+            nearest = nearest.reset_index().sort_values(['index', 'index_right']).drop_duplicates('index')
+            nearest = nearest[nearest['distance_m'] < self.max_distance_m]
+            positions = nearest['index'].to_numpy()
+            building_match[positions] = True
+            building_pos[positions] = nearest['index_right'].to_numpy()
+            match_type[positions] = 'near_polygon'
+            distance_m[positions] = nearest['distance_m'].to_numpy()
+
+        logger.debug(f"Matched {int(building_match.sum())}/{count} points to {len(buildings)} buildings")
+        return self._result(building_match, building_pos, match_type, distance_m, buildings_gdf)
+
+    def _result(self, building_match, building_pos, match_type, distance_m,
+                buildings_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
+        building_id = np.full(len(building_match), None, dtype=object)
+        if building_match.any():
+            building_id[building_match] = self._building_ids(buildings_gdf)[building_pos[building_match]]
+        return pd.DataFrame({
+            'building_match': building_match,
+            'building_id': building_id,
+            'match_type': match_type,
+            'distance_m': distance_m,
+        })
@@ -0,0 +1,120 @@
+"""
+Pooled async HTTP fetching for listing detail pages.
+
+Detail pages are static HTML, so they can be fetched over a shared
+``httpx.AsyncClient`` connection pool instead of a full browser page load per
+listing. Requests are paced by a token bucket per host and, when given, by
+the city's shared ``AdaptiveLimiter``, which backs off on 429/5xx responses and
+timeouts like the browser path does.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from .rate_control import AdaptiveLimiter
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class TokenBucket:
+    """Async token bucket allowing ``rate`` requests per second with bursts of ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1.0:
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1.0
+
+
+# Responses for listings that no longer exist; not failed requests for the limiter
+MISSING_PAGE_STATUS_CODES = {404, 410}
+
+
+class HttpDetailFetcher:
+    """Fetches many pages concurrently over one keep-alive connection pool."""
+
+    def __init__(self, cookies: Optional[Dict[str, str]] = None, user_agent: Optional[str] = None,
+                 max_connections: int = 10, requests_per_second: Optional[float] = 1.0, burst: int = 1,
+                 timeout: float = 20.0, http2: bool = True, limiter: Optional[AdaptiveLimiter] = None):
+        self.cookies = cookies or {}
+        self.headers = {'User-Agent': user_agent} if user_agent else {}
+        self.max_connections = max_connections
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.timeout = timeout
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.limiter = limiter
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket_for(self, url: str) -> Optional[TokenBucket]:
+        """The host's token bucket, or None when ``requests_per_second`` leaves requests unpaced."""
+        if not self.requests_per_second:
+            return None
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.requests_per_second, self.burst)
+        return self._buckets[host]
+
+    async def _fetch_one(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str,
+                         on_page: Callable[[str, Optional[str], Optional[str]], None]) -> None:
+        async with semaphore:
+            bucket = self._bucket_for(url)
+            if bucket is not None:
+                await bucket.acquire()
+            # The limiter blocks its caller, so wait for it off the event loop
+            started = await asyncio.to_thread(self.limiter.acquire) if self.limiter else None
+            failure = None
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                html, error = response.text, None
+            except httpx.HTTPError as e:
+                logger.error(f"HTTP fetch failed for {url}: {e}")
+                html, error = None, str(e)
+                missing = isinstance(e, httpx.HTTPStatusError) and e.response.status_code in MISSING_PAGE_STATUS_CODES
+                failure = None if missing else e
+            finally:
+                if self.limiter:
+                    self.limiter.release(started, error=failure)
+        on_page(url, html, error)
+
+    async def fetch_pages_async(self, urls: List[str],
+                                on_page: Callable[[str, Optional[str], Optional[str]], None]) -> None:
+        """Fetch ``urls`` and call ``on_page(url, html, error)`` as each one completes."""
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_connections)
+        semaphore = asyncio.Semaphore(self.max_connections)
+        self._buckets = {}  # Buckets hold loop-bound locks; start fresh for each event loop
+        async with httpx.AsyncClient(http2=self.http2, limits=limits, cookies=self.cookies,
+                                     headers=self.headers, timeout=self.timeout,
+                                     follow_redirects=True) as client:
+            await asyncio.gather(*(self._fetch_one(client, semaphore, url, on_page) for url in urls))
+
+    def fetch_pages(self, urls: List[str],
+                    on_page: Callable[[str, Optional[str], Optional[str]], None]) -> None:
+        """Blocking wrapper around :meth:`fetch_pages_async` for worker threads."""
+        asyncio.run(self.fetch_pages_async(urls, on_page))
@@ -0,0 +1,177 @@
+"""
+Pluggable HTML parser backends for Oikotie listing pages.
+
+Every backend implements the same extraction logic (summary cards, pagination,
+detail rows, overview and description) and must produce identical output; the
+golden-file tests in ``tests/test_listing_parsers.py`` enforce this. The backend
+is selected by name with ``get_listing_parser``.
+"""
+
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from loguru import logger
+
+try:
+    import lxml.etree
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+OIKOTIE_BASE_URL = 'https://asunnot.oikotie.fi'
+
+DEFAULT_PARSER_BACKEND = 'beautifulsoup'
+
+
+def normalize_key(key_text):
+    return key_text.strip().lower().replace(' ', '_').replace('ä', 'a').replace('ö', 'o')
+
+
+def _page_count_from_text(text):
+    match = re.search(r'(\d+)\s*/\s*(\d+)', text)
+    if match:
+        return int(match.group(2))
+    numbers = [int(n) for n in re.findall(r'\b\d+\b', text)]
+    return max(numbers) if numbers else None
+
+
+class BeautifulSoupListingParser:
+    """Reference backend using BeautifulSoup with the pure-Python ``html.parser``."""
+    name = 'beautifulsoup'
+
+    def parse(self, page):
+        """Build a document from page HTML (already parsed soups are passed through)."""
+        return page if isinstance(page, BeautifulSoup) else BeautifulSoup(page, 'html.parser')
+
+    def parse_summaries(self, page):
+        listings = []
+        for card in self.parse(page).select('a.ot-card-v2'):
+            url = urljoin(OIKOTIE_BASE_URL, card.get('href', ''))
+            title_elem = card.select_one('.card-v2-text-container__text strong')
+            if title_elem and url:
+                listings.append({'source': 'oikotie', 'url': url, 'title': title_elem.get_text(strip=True)})
+        return listings
+
+    def parse_page_count(self, page):
+        pagination = self.parse(page).select_one('[class*="pagination"]')
+        return _page_count_from_text(pagination.get_text(' ', strip=True)) if pagination is not None else None
+
+    def parse_details(self, page):
+        soup = self.parse(page)
+        details = {}
+        for item in soup.select('.info-table__row, .key-value-items__item, .details-grid__item dl'):
+            key_elem = item.select_one('dt, .info-table__title, .key-value-items__title')
+            value_elem = item.select_one('dd, .info-table__value, .key-value-items__value')
+            if key_elem and value_elem:
+                key = normalize_key(key_elem.get_text(strip=True))
+                value = value_elem.get_text(strip=True, separator='\n').replace('\u00a0', ' ').strip()
+                if key: details[key] = value
+        overview = self._paragraphs(soup, 'div.listing-overview')
+        full_description = self._paragraphs(soup, 'div[class*="listing-description"]')
+        return details, overview, full_description
+
+    def is_js_only(self, page):
+        return self.parse(page).select_one('.details-grid, .info-table, .key-value-items') is None
+
+    def _paragraphs(self, soup, selector):
+        element = soup.select_one(selector)
+        return '\n\n'.join([p.get_text(strip=True) for p in element.find_all('p', recursive=False)]) if element else ""
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlListingParser:
+    """libxml2-based backend using precompiled XPath equivalents of the CSS selectors."""
+    name = 'lxml'
+
+    # Text as BeautifulSoup sees it: no script/style contents
+    _TEXT = lxml.etree.XPath('.//text()[not(ancestor::script) and not(ancestor::style)]') if LXML_AVAILABLE else None
+
+    def __init__(self):
+        xpath = lxml.etree.XPath
+        self._cards = xpath(f"//a[{_has_class('ot-card-v2')}]")
+        self._card_title = xpath(f"(.//*[{_has_class('card-v2-text-container__text')}]//strong)[1]")
+        self._pagination = xpath("(//*[contains(@class, 'pagination')])[1]")
+        self._detail_items = xpath(
+            f"//*[{_has_class('info-table__row')} or {_has_class('key-value-items__item')}]"
+            f" | //*[{_has_class('details-grid__item')}]//dl"
+        )
+        self._item_key = xpath(f"(.//*[self::dt or {_has_class('info-table__title')} or {_has_class('key-value-items__title')}])[1]")
+        self._item_value = xpath(f"(.//*[self::dd or {_has_class('info-table__value')} or {_has_class('key-value-items__value')}])[1]")
+        self._overview = xpath(f"(//div[{_has_class('listing-overview')}])[1]")
+        self._description = xpath("(//div[contains(@class, 'listing-description')])[1]")
+        self._detail_containers = xpath(
+            f"(//*[{_has_class('details-grid')} or {_has_class('info-table')} or {_has_class('key-value-items')}])[1]"
+        )
+
+    def parse(self, page):
+        if isinstance(page, BeautifulSoup):
+            page = str(page)
+        if not isinstance(page, str):
+            return page
+        if not page.strip():
+            page = '<html></html>'
+        try:
+            return lxml.html.document_fromstring(page)
+        except ValueError:
+            # Unicode strings with an XML encoding declaration must be passed as bytes
+            return lxml.html.document_fromstring(page.encode('utf-8'))
+
+    def _text(self, element, separator=''):
+        return separator.join(s for s in (t.strip() for t in self._TEXT(element)) if s)
+
+    def parse_summaries(self, page):
+        listings = []
+        for card in self._cards(self.parse(page)):
+            url = urljoin(OIKOTIE_BASE_URL, card.get('href', ''))
+            title_elem = self._card_title(card)
+            if title_elem and url:
+                listings.append({'source': 'oikotie', 'url': url, 'title': self._text(title_elem[0])})
+        return listings
+
+    def parse_page_count(self, page):
+        pagination = self._pagination(self.parse(page))
+        return _page_count_from_text(self._text(pagination[0], ' ')) if pagination else None
+
+    def parse_details(self, page):
+        doc = self.parse(page)
+        details = {}
+        for item in self._detail_items(doc):
+            key_elem, value_elem = self._item_key(item), self._item_value(item)
+            if key_elem and value_elem:
+                key = normalize_key(self._text(key_elem[0]))
+                value = self._text(value_elem[0], '\n').replace('\u00a0', ' ').strip()
+                if key: details[key] = value
+        overview = self._paragraphs(self._overview(doc))
+        full_description = self._paragraphs(self._description(doc))
+        return details, overview, full_description
+
+    def is_js_only(self, page):
+        return not self._detail_containers(self.parse(page))
+
+    def _paragraphs(self, found):
+        if not found:
+            return ""
+        return '\n\n'.join([self._text(p) for p in found[0] if p.tag == 'p'])
+
+
+PARSER_BACKENDS = {
+    'beautifulsoup': BeautifulSoupListingParser,
+    'lxml': LxmlListingParser,
+}
+
+
+def get_listing_parser(name=None):
+    """Create the parser backend ``name``, falling back to BeautifulSoup if it is unavailable."""
+    name = name or DEFAULT_PARSER_BACKEND
+    if name == 'lxml' and not LXML_AVAILABLE:
+        logger.warning("lxml is not installed; using the BeautifulSoup parser backend")
+        name = DEFAULT_PARSER_BACKEND
+    if name not in PARSER_BACKENDS:
+        logger.warning(f"Unknown parser backend '{name}'; using {DEFAULT_PARSER_BACKEND}")
+        name = DEFAULT_PARSER_BACKEND
+    return PARSER_BACKENDS[name]()
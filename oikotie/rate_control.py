@@ -0,0 +1,339 @@
+"""
+Adaptive concurrency and rate control for outbound requests.
+
+An ``AdaptiveLimiter`` bounds how many requests run at once and, optionally,
+how many start per second. Both limits follow AIMD (additive increase,
+multiplicative decrease): they grow a little with every success while the
+p95 latency and error rate of recent requests stay under target, and are cut
+by ``decrease`` on overload signals - 429/5xx responses, timeouts, an open
+circuit breaker - or when the error rate exceeds its target. One cut is made
+per round of requests: failures of requests started before the last cut do
+not cut again.
+
+Limiters are shared by name and city through :func:`get_limiter`, so the
+scraper, geocoder and WFS clients hitting one service back off together, and
+:func:`get_limiter_stats` reports every live limiter for metrics export.
+"""
+
+import random
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+from loguru import logger
+
+# Responses that mean the service is overloaded or rate limiting us
+OVERLOAD_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Overload exceptions of optional dependencies, matched by name to avoid importing them
+OVERLOAD_EXCEPTION_NAMES = {
+    'TimeoutException',            # selenium
+    'CircuitBreakerOpenException',
+    'GeocoderTimedOut',            # geopy
+    'GeocoderRateLimited',
+    'GeocoderUnavailable',
+}
+
+
+def is_overload(error: Union[BaseException, int, None]) -> bool:
+    """True for a status code or exception that calls for backing off."""
+    if isinstance(error, int):
+        return error in OVERLOAD_STATUS_CODES
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in OVERLOAD_STATUS_CODES
+    if isinstance(error, (TimeoutError, httpx.TimeoutException)):
+        return True
+    return error is not None and any(cls.__name__ in OVERLOAD_EXCEPTION_NAMES for cls in type(error).__mro__)
+
+
+@dataclass
+class LimiterStats:
+    """Snapshot of an adaptive limiter."""
+    name: str
+    city: Optional[str]
+    limit: float
+    max_limit: int
+    in_flight: int
+    rate: Optional[float]           # requests started per second, None when unpaced
+    p95_latency: float              # seconds, over the recent window
+    error_rate: float               # over the recent window
+    throughput_limit: float         # requests per second the current limits allow
+    requests: int
+    backoffs: int
+
+
+class Slot:
+    """A request admitted by a limiter; mark it failed before the ``with`` block ends."""
+
+    def __init__(self, started: float):
+        self.started = started
+        self.error: Optional[Any] = None
+        self.overloaded = False
+
+    def fail(self, error: Any = None, overloaded: Optional[bool] = None):
+        """
+        Record the request as failed.
+
+        Args:
+            error: Exception or status code describing the failure
+            overloaded: Whether to back off; derived from ``error`` when None
+        """
+        self.error = error if error is not None else 'failed'
+        self.overloaded = is_overload(error) if overloaded is None else overloaded
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency and rate limiter shared by the workers calling one service."""
+
+    # Requests per second added per ``rate`` successes, i.e. about per second at full pace
+    RATE_STEP = 0.1
+
+    def __init__(self,
+                 name: str,
+                 city: Optional[str] = None,
+                 max_limit: int = 10,
+                 min_limit: int = 1,
+                 initial_limit: Optional[int] = None,
+                 rate: Optional[float] = None,
+                 min_rate: Optional[float] = None,
+                 max_rate: Optional[float] = None,
+                 jitter: float = 0.0,
+                 target_p95: float = 10.0,
+                 target_error_rate: float = 0.1,
+                 decrease: float = 0.5,
+                 window: int = 50):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Service or client the limiter protects
+            city: City the limiter is scoped to, if any
+            max_limit: Most requests allowed in flight
+            min_limit: Fewest requests allowed in flight after backing off
+            initial_limit: Starting concurrency (``min_limit`` when None)
+            rate: Starting requests per second; requests are not paced when None
+            min_rate: Lowest rate after backing off (a tenth of ``rate`` by default)
+            max_rate: Highest rate (four times ``rate`` by default)
+            jitter: Random fraction added to the interval between requests, so
+                    requests never start faster than ``rate``
+            target_p95: p95 latency in seconds above which limits stop growing
+            target_error_rate: Error rate above which limits are cut
+            decrease: Factor applied to the limits when backing off
+            window: Number of recent requests the latency and error rate cover
+        """
+        self.name = name
+        self.city = city
+        self._condition = threading.Condition()
+        self._waiting = Counter()
+        self._latencies = deque(maxlen=window)
+        self._failures = deque(maxlen=window)
+        self._next_start = 0.0
+        self._last_backoff = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.backoffs = 0
+        self.limit = float(initial_limit or min_limit)
+        self.configure(max_limit=max_limit, min_limit=min_limit, rate=rate, min_rate=min_rate, max_rate=max_rate,
+                       jitter=jitter, target_p95=target_p95, target_error_rate=target_error_rate,
+                       decrease=decrease)
+        _limiters.add(self)
+
+    def configure(self, **settings):
+        """
+        Change limiter settings, keeping the learned limits within the new bounds.
+
+        Accepts the keyword arguments of the constructor except ``name``,
+        ``city`` and ``window``.
+        """
+        with self._condition:
+            initial_limit = settings.pop('initial_limit', None)
+            if initial_limit:
+                self.limit = float(initial_limit)
+            for key, value in settings.items():
+                setattr(self, key, value)
+
+            self.max_limit = max(1, self.max_limit)
+            self.min_limit = max(1, min(self.min_limit, self.max_limit))
+            self.limit = min(max(self.limit, self.min_limit), self.max_limit)
+            if self.rate is not None:
+                if self.min_rate is None:
+                    self.min_rate = self.rate / 10
+                if self.max_rate is None:
+                    self.max_rate = self.rate * 4
+                self.rate = min(max(self.rate, self.min_rate), self.max_rate)
+            self._condition.notify_all()
+
+    def _blocked(self, rank: int) -> bool:
+        return self.in_flight >= int(self.limit) or any(self._waiting[r] for r in range(rank))
+
+    def acquire(self, rank: int = 0) -> float:
+        """
+        Wait for a free slot and the request's turn in the pacing schedule.
+
+        Args:
+            rank: Priority of the request; free slots go to the lowest rank waiting
+
+        Returns:
+            Start time of the request, to be passed to :meth:`release`
+        """
+        with self._condition:
+            self._waiting[rank] += 1
+            while self._blocked(rank):
+                self._condition.wait()
+            self._waiting[rank] -= 1
+            self.in_flight += 1
+
+            start = now = time.monotonic()
+            if self.rate:
+                start = max(now, self._next_start)
+                interval = 1.0 / self.rate
+                if self.jitter:
+                    interval *= random.uniform(1, 1 + self.jitter)
+                self._next_start = start + interval
+            self._condition.notify_all()
+
+        if start > now:
+            time.sleep(start - now)
+        return start
+
+    def release(self, started: float, error: Any = None, overloaded: Optional[bool] = None):
+        """
+        Free a slot and adapt the limits to the outcome of the request.
+
+        Args:
+            started: Start time returned by :meth:`acquire`
+            error: Exception or status code if the request failed
+            overloaded: Whether the failure calls for backing off; derived from ``error`` when None
+        """
+        latency = time.monotonic() - started
+        failed = error is not None
+        if overloaded is None:
+            overloaded = is_overload(error)
+
+        with self._condition:
+            self.in_flight -= 1
+            self.requests += 1
+            self._latencies.append(latency)
+            self._failures.append(failed)
+
+            error_rate = sum(self._failures) / len(self._failures)
+            if overloaded or (failed and error_rate > self.target_error_rate):
+                if started >= self._last_backoff:
+                    self._backoff(f"{error!r}" if overloaded else f"error rate {error_rate:.0%}")
+            elif not failed and self._p95() <= self.target_p95 and error_rate <= self.target_error_rate:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                if self.rate:
+                    self.rate = min(self.max_rate, self.rate + self.RATE_STEP / self.rate)
+            self._condition.notify_all()
+
+    def backoff(self, reason: str = "requested"):
+        """Cut the limits now, e.g. when a circuit breaker opens."""
+        with self._condition:
+            self._backoff(reason)
+            self._condition.notify_all()
+
+    def _backoff(self, reason: str):
+        self._last_backoff = time.monotonic()
+        self.backoffs += 1
+        self.limit = max(self.min_limit, self.limit * self.decrease)
+        if self.rate:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+        logger.warning(f"{self._label()} backing off ({reason}): "
+                       f"limit={self.limit:.1f}, rate={self.rate or 0:.2f}/s")
+
+    @contextmanager
+    def slot(self, rank: int = 0) -> Iterator[Slot]:
+        """
+        Run a request inside the limits.
+
+        An exception raised in the block is recorded as a failure and re-raised;
+        failures that do not raise are recorded with :meth:`Slot.fail`.
+        """
+        slot = Slot(self.acquire(rank))
+        try:
+            yield slot
+        except BaseException as e:
+            self.release(slot.started, error=e)
+            raise
+        self.release(slot.started, error=slot.error, overloaded=slot.overloaded if slot.error is not None else False)
+
+    def watch(self, circuit_breaker):
+        """Back off whenever ``circuit_breaker`` opens."""
+        circuit_breaker.add_open_listener(self.backoff)
+
+    def _p95(self) -> float:
+        if not self._latencies:
+            return 0.0
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    def _label(self) -> str:
+        return f"{self.name} ({self.city})" if self.city else self.name
+
+    def get_stats(self) -> LimiterStats:
+        """Current limits and recent latency and error rate."""
+        with self._condition:
+            latencies = list(self._latencies)
+            throughput = int(self.limit) / (sum(latencies) / len(latencies)) if latencies and sum(latencies) else 0.0
+            if self.rate:
+                throughput = min(throughput, self.rate) if throughput else self.rate
+            return LimiterStats(
+                name=self.name,
+                city=self.city,
+                limit=self.limit,
+                max_limit=self.max_limit,
+                in_flight=self.in_flight,
+                rate=self.rate,
+                p95_latency=self._p95(),
+                error_rate=sum(self._failures) / len(self._failures) if self._failures else 0.0,
+                throughput_limit=throughput,
+                requests=self.requests,
+                backoffs=self.backoffs
+            )
+
+
+# Every live limiter, for metrics export
+_limiters: "weakref.WeakSet[AdaptiveLimiter]" = weakref.WeakSet()
+_shared: Dict[Tuple[str, Optional[str]], AdaptiveLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def get_limiter(name: str, city: Optional[str] = None, **settings) -> AdaptiveLimiter:
+    """
+    Get the shared limiter for a service and city, creating it on first use.
+
+    Settings given for an existing limiter are applied with
+    :meth:`AdaptiveLimiter.configure`, keeping the limits it has learned:
+    ``initial_limit`` and ``rate`` only apply until it has handled a request
+    or backed off, so a limiter created early with defaults, e.g. to watch a
+    circuit breaker, still starts at the limits of its first real user.
+
+    Args:
+        name: Service or client name
+        city: City the limiter is scoped to, if any
+        **settings: AdaptiveLimiter constructor arguments
+
+    Returns:
+        AdaptiveLimiter instance
+    """
+    with _shared_lock:
+        limiter = _shared.get((name, city))
+        if limiter is None:
+            limiter = _shared[(name, city)] = AdaptiveLimiter(name, city, **settings)
+            return limiter
+    if limiter.requests or limiter.backoffs:
+        settings.pop('initial_limit', None)
+        settings.pop('rate', None)
+    if settings:
+        limiter.configure(**settings)
+    return limiter
+
+
+def get_limiter_stats() -> List[LimiterStats]:
+    """Stats of every live limiter."""
+    return [limiter.get_stats() for limiter in list(_limiters)]
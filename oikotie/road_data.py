@@ -1,15 +1,19 @@
 import duckdb
 from pathlib import Path
 from loguru import logger
-import requests
-import geopandas as gpd
+import httpx
 from shapely.geometry import mapping
 
+from oikotie.data_sources.wfs_client import WFSClient
+
 DB_PATH = Path("output/real_estate.duckdb")
 
 # WFS endpoint for Digiroad data
 WFS_URL = "https://www.paikkatietohakemisto.fi/wfs/digiroad"
 
+# BBOX for Uusimaa region to limit the request
+UUSIMAA_BBOX = (24.0, 60.0, 26.0, 60.5)
+
 def get_db_connection():
     """Establishes and returns a connection to the DuckDB database."""
     return duckdb.connect(database=str(DB_PATH), read_only=False)
@@ -37,50 +41,38 @@ def download_and_store_road_data():
             return
 
     logger.info("Downloading road data via WFS...")
-    
-    # Parameters for the WFS GetFeature request
-    params = {
-        'service': 'WFS',
-        'version': '2.0.0',
-        'request': 'GetFeature',
-        'typeName': 'dr_tieosoiteviiva', # Layer name for road addresses
-        'outputFormat': 'application/json',
-        'srsName': 'EPSG:3067',
-        # BBOX for Uusimaa region to limit the request
-        'bbox': '24.0,60.0,26.0,60.5,EPSG:4326' 
-    }
 
     try:
-        response = requests.get(WFS_URL, params=params)
-        response.raise_for_status()
-        geojson_data = response.json()
+        loaded = 0
+        with WFSClient() as wfs, get_db_connection() as con:
+            con.execute("INSTALL spatial; LOAD spatial;")
+            # A failed download leaves no partial table behind
+            con.execute("BEGIN TRANSACTION")
 
-        if not geojson_data or 'features' not in geojson_data or not geojson_data['features']:
-            logger.warning("No road features returned from WFS request.")
-            return
+            # Road addresses are paged from the WFS and stored chunk by chunk
+            for gdf in wfs.iter_chunks(WFS_URL, 'dr_tieosoiteviiva', bbox=UUSIMAA_BBOX, srs_name='EPSG:3067'):
+                # The 'id' can be derived from properties, e.g., 'link_id' or another unique identifier
+                # Here we will use the 'id' field from the properties if it exists, otherwise generate one
+                if 'id' not in gdf.columns:
+                    gdf['id'] = range(loaded, loaded + len(gdf))
 
-        logger.info(f"Downloaded {len(geojson_data['features'])} road features.")
+                # Convert geometries to WKB (Well-Known Binary) for storage
+                gdf['geom_wkb'] = gdf['geometry'].apply(lambda g: g.wkb)
 
-        # Use GeoPandas to simplify processing
-        gdf = gpd.GeoDataFrame.from_features(geojson_data['features'])
-        
-        # Prepare data for insertion
-        # The 'id' can be derived from properties, e.g., 'link_id' or another unique identifier
-        # Here we will use the 'id' field from the properties if it exists, otherwise generate one
-        if 'id' not in gdf.columns:
-            gdf['id'] = range(len(gdf))
+                records_to_insert = gdf[['id', 'geom_wkb']].values.tolist()
+                con.executemany("INSERT INTO roads (id, geom) VALUES (?, ?)", records_to_insert)
+                loaded += len(records_to_insert)
+                logger.info(f"Downloaded {loaded} road features so far.")
 
-        # Convert geometries to WKB (Well-Known Binary) for storage
-        gdf['geom_wkb'] = gdf['geometry'].apply(lambda g: g.wkb)
-        
-        records_to_insert = gdf[['id', 'geom_wkb']].values.tolist()
+            con.execute("COMMIT")
 
-        with get_db_connection() as con:
-            con.execute("INSTALL spatial; LOAD spatial;")
-            con.executemany("INSERT INTO roads (id, geom) VALUES (?, ?)", records_to_insert)
-            logger.success(f"Successfully loaded {len(records_to_insert)} roads into the database.")
+        if loaded == 0:
+            logger.warning("No road features returned from WFS request.")
+            return
+
+        logger.success(f"Successfully loaded {loaded} roads into the database.")
 
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         logger.critical(f"Failed to download road data from WFS: {e}")
     except Exception as e:
         logger.critical(f"An unexpected error occurred during road data processing: {e}")
@@ -1,7 +1,8 @@
 import json
 import time
 import re
-from urllib.parse import urljoin
+import math
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from pathlib import Path
 import random
 from selenium import webdriver
@@ -9,13 +10,19 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from loguru import logger
 import duckdb
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import queue
-from .utils import extract_postal_code
+import threading
+from .utils.listing_normalizer import normalize_listing_details, to_python_rows
+from .database.connection import get_connection_manager
+from .http_fetcher import HttpDetailFetcher
+from .rate_control import get_limiter
+from .webdriver_pool import WebDriverPool
+from .listing_parsers import OIKOTIE_BASE_URL, get_listing_parser
 
 # --- Loguru Configuration ---
 logger.remove()
@@ -28,20 +35,63 @@ USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36'
 ]
 
-def normalize_key(key_text):
-    return key_text.strip().lower().replace(' ', '_').replace('ä', 'a').replace('ö', 'o')
+# Unfinished streaming runs younger than this are resumed instead of restarted
+RESUME_MAX_AGE_HOURS = 24
+
+# Detail page loads of a city share one adaptive limiter, paced with human-like jitter
+DETAIL_LIMITER = "listing_details"
+DETAIL_LIMITER_SETTINGS = {'rate': 0.8, 'min_rate': 0.1, 'max_rate': 2.0, 'jitter': 0.4, 'target_p95': 15.0}
+
+class ListingUnavailableError(Exception):
+    """A details page loaded without a details grid, e.g. a removed listing; not a browser or overload failure."""
+
+def detail_limiter(city=None, max_workers=None, rate=None):
+    """Return the shared detail page limiter of ``city``, allowing up to ``max_workers`` page loads at once.
+
+    A ``rate`` (requests per second) replaces the default pacing and is also the most the limiter grows to.
+    """
+    settings = dict(DETAIL_LIMITER_SETTINGS)
+    if max_workers:
+        settings.update(max_limit=max_workers, initial_limit=max_workers)
+    if rate:
+        settings.update(rate=rate, max_rate=rate)
+    return get_limiter(DETAIL_LIMITER, city, **settings)
+
+class RateLimiter:
+    """Spaces requests shared by several threads at least ``interval_seconds`` apart."""
+    def __init__(self, interval_seconds):
+        self.interval_seconds = interval_seconds
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval_seconds
+        if slot > now:
+            time.sleep(slot - now)
+
+def summary_page_url(url, page):
+    """Return the URL of results page ``page`` for a search URL."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key != 'pagination']
+    if page > 1:
+        query.append(('pagination', str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
 
 class DatabaseManager:
     # This class is robust and does not need changes.
     def __init__(self, db_path="data/real_estate.duckdb"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connections = get_connection_manager(str(self.db_path))
         logger.info(f"Database will be stored at: {self.db_path}")
         self.create_table()
 
     def create_table(self):
         try:
-            with duckdb.connect(str(self.db_path)) as con:
+            with self.connections.connection() as con:
                 con.execute("""
                     CREATE TABLE IF NOT EXISTS listings (
                         url VARCHAR PRIMARY KEY, 
@@ -86,13 +136,78 @@ class DatabaseManager:
         except (ValueError, TypeError):
             return None
 
+    def _upsert_listings(self, con, listings, city_name, existing_urls):
+        """Upsert listings on an open transaction. Returns (scraped_urls, upsert_count)."""
+        scraped_urls = set()
+        upsert_count = 0
+
+        valid_listings = []
+        for listing in listings:
+            url = listing.get('url')
+            if not url:
+                continue
+            
+            scraped_urls.add(url)
+            details = listing.get('details', {})
+            if not details or 'error' in details:
+                continue
+            valid_listings.append(listing)
+
+        # Parse the typed columns for the whole batch in one vectorized pass
+        normalized = to_python_rows(normalize_listing_details([listing['details'] for listing in valid_listings]))
+        scraped_at = time.strftime('%Y-%m-%d %H:%M:%S')
+
+        for listing, row in zip(valid_listings, normalized):
+            url = listing['url']
+            params = (
+                listing.get('source'), city_name, listing.get('title'),
+                row['address'], row['postal_code'], row['listing_type'],
+                row['price_eur'], row['size_m2'], row['rooms'], row['year_built'],
+                listing.get('overview'), listing.get('full_description'),
+                row['other_details_json'],
+                scraped_at,
+                url
+            )
+
+            if url in existing_urls:
+                # UPDATE existing record
+                update_query = """
+                    UPDATE listings 
+                    SET source=?, city=?, title=?, address=?, postal_code=?, listing_type=?, 
+                        price_eur=?, size_m2=?, rooms=?, year_built=?, overview=?, 
+                        full_description=?, other_details_json=?, scraped_at=?,
+                        updated_ts=NOW(), deleted_ts=NULL
+                    WHERE url=?"""
+                con.execute(update_query, params)
+            else:
+                # INSERT new record
+                insert_query = """
+                    INSERT INTO listings (
+                        source, city, title, address, postal_code, listing_type, 
+                        price_eur, size_m2, rooms, year_built, overview, 
+                        full_description, other_details_json, scraped_at, url, insert_ts
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NOW())"""
+                con.execute(insert_query, params)
+            
+            upsert_count += 1
+
+        return scraped_urls, upsert_count
+
+    def _soft_delete(self, con, urls_to_delete, city_name):
+        if urls_to_delete:
+            logger.info(f"Marking {len(urls_to_delete)} listings as deleted for city: {city_name}.")
+            # Use a list of tuples for executemany
+            delete_params = [(url,) for url in urls_to_delete]
+            con.executemany("UPDATE listings SET deleted_ts = NOW() WHERE url = ?", delete_params)
+
     def save_listings(self, listings, city_name):
         if not listings:
             logger.warning("No listings provided to save.")
             return
 
         try:
-            with duckdb.connect(str(self.db_path)) as con:
+            # Uncommitted work is rolled back when the connection block exits
+            with self.connections.connection() as con:
                 # Start a transaction
                 con.begin()
 
@@ -103,70 +218,11 @@ class DatabaseManager:
                     ).fetchall()
                 )
                 
-                scraped_urls = set()
-                upsert_count = 0
-
-                for listing in listings:
-                    url = listing.get('url')
-                    if not url:
-                        continue
-                    
-                    scraped_urls.add(url)
-                    details = listing.get('details', {})
-                    if not details or 'error' in details:
-                        continue
-
-                    address = details.get('sijainti')
-                    postal_code = extract_postal_code(address) if address else None
-                    
-                    core_data = {
-                        'price_eur': self._clean_and_convert(details.get('velaton_hinta') or details.get('myyntihinta'), 'float'),
-                        'size_m2': self._clean_and_convert(details.get('asuinpinta-ala'), 'float'),
-                        'rooms': self._clean_and_convert(details.get('huoneita'), 'int'),
-                        'year_built': self._clean_and_convert(details.get('rakennusvuosi'), 'int'),
-                    }
-                    core_keys = ['sijainti', 'rakennuksen_tyyppi', 'velaton_hinta', 'myyntihinta', 'asuinpinta-ala', 'huoneita', 'rakennusvuosi']
-                    other_details = {k: v for k, v in details.items() if k not in core_keys}
-                    
-                    params = (
-                        listing.get('source'), city_name, listing.get('title'),
-                        address, postal_code, details.get('rakennuksen_tyyppi'),
-                        core_data['price_eur'], core_data['size_m2'], core_data['rooms'], core_data['year_built'],
-                        listing.get('overview'), listing.get('full_description'),
-                        json.dumps(other_details, ensure_ascii=False), 
-                        time.strftime('%Y-%m-%d %H:%M:%S'), # scraped_at
-                        url
-                    )
-
-                    if url in existing_urls_in_db:
-                        # UPDATE existing record
-                        update_query = """
-                            UPDATE listings 
-                            SET source=?, city=?, title=?, address=?, postal_code=?, listing_type=?, 
-                                price_eur=?, size_m2=?, rooms=?, year_built=?, overview=?, 
-                                full_description=?, other_details_json=?, scraped_at=?,
-                                updated_ts=NOW(), deleted_ts=NULL
-                            WHERE url=?"""
-                        con.execute(update_query, params)
-                    else:
-                        # INSERT new record
-                        insert_query = """
-                            INSERT INTO listings (
-                                source, city, title, address, postal_code, listing_type, 
-                                price_eur, size_m2, rooms, year_built, overview, 
-                                full_description, other_details_json, scraped_at, url, insert_ts
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NOW())"""
-                        con.execute(insert_query, params)
-                    
-                    upsert_count += 1
+                scraped_urls, upsert_count = self._upsert_listings(con, listings, city_name, existing_urls_in_db)
 
                 # Soft delete listings that are no longer on the site
                 urls_to_delete = existing_urls_in_db - scraped_urls
-                if urls_to_delete:
-                    logger.info(f"Marking {len(urls_to_delete)} listings as deleted for city: {city_name}.")
-                    # Use a list of tuples for executemany
-                    delete_params = [(url,) for url in urls_to_delete]
-                    con.executemany("UPDATE listings SET deleted_ts = NOW() WHERE url = ?", delete_params)
+                self._soft_delete(con, urls_to_delete, city_name)
 
                 # Commit the transaction
                 con.commit()
@@ -174,15 +230,62 @@ class DatabaseManager:
 
         except duckdb.Error as e:
             logger.critical(f"A database error occurred: {e}. Rolling back transaction.")
-            if 'con' in locals() and con:
-                con.rollback()
             self._save_to_fallback_json(listings, city_name)
         except Exception as e:
             logger.critical(f"An unexpected error occurred during database operations: {e}")
-            if 'con' in locals() and con:
-                con.rollback()
             self._save_to_fallback_json(listings, city_name)
 
+    def save_listings_batch(self, listings, city_name):
+        """Upsert one micro-batch without soft-deleting listings missing from it.
+
+        Returns True if the batch was committed; on failure the batch is written to
+        the fallback JSON file and False is returned.
+        """
+        if not listings:
+            return True
+
+        try:
+            with self.connections.transaction() as con:
+                batch_urls = [listing['url'] for listing in listings if listing.get('url')]
+                existing_urls = set(
+                    row[0] for row in con.execute(
+                        "SELECT url FROM listings WHERE url IN (SELECT UNNEST(?))", [batch_urls]
+                    ).fetchall()
+                )
+                _, upsert_count = self._upsert_listings(con, listings, city_name, existing_urls)
+            logger.debug(f"Flushed batch of {upsert_count} listings for {city_name}.")
+            return True
+        except Exception as e:
+            logger.critical(f"Failed to save batch of {len(listings)} listings for {city_name}: {e}")
+            self._save_to_fallback_json(listings, city_name)
+            return False
+
+    def soft_delete_missing(self, city_name, scraped_urls):
+        """Soft-delete active listings of a city that were not seen in this scrape."""
+        try:
+            with self.connections.transaction() as con:
+                existing_urls_in_db = set(
+                    row[0] for row in con.execute(
+                        "SELECT url FROM listings WHERE city = ? AND deleted_ts IS NULL", [city_name]
+                    ).fetchall()
+                )
+                urls_to_delete = existing_urls_in_db - set(scraped_urls)
+                self._soft_delete(con, urls_to_delete, city_name)
+            logger.success(f"Soft-deleted {len(urls_to_delete)} listings for {city_name}.")
+            return len(urls_to_delete)
+        except Exception as e:
+            logger.critical(f"Failed to reconcile deleted listings for {city_name}: {e}")
+            return 0
+
+    def get_urls_scraped_since(self, city_name, since):
+        """Get URLs of a city that were saved at or after ``since`` ('%Y-%m-%d %H:%M:%S')."""
+        with self.connections.connection() as con:
+            return set(
+                row[0] for row in con.execute(
+                    "SELECT url FROM listings WHERE city = ? AND scraped_at >= ?", [city_name, since]
+                ).fetchall()
+            )
+
     def _save_to_fallback_json(self, listings, city_name):
         """Saves listings to a JSON file if the database operation fails."""
         fallback_dir = Path("output/failed_saves")
@@ -224,17 +327,39 @@ class DatabaseManager:
             logger.error(f"Failed to load or process JSON file {file_path}: {e}")
 
 
+_webdriver_pools = {}
+_webdriver_pools_lock = threading.Lock()
+
+def get_webdriver_pool(headless=True, max_size=5):
+    """Get the process-wide browser session pool (``max_size`` applies on first use)."""
+    with _webdriver_pools_lock:
+        if headless not in _webdriver_pools:
+            _webdriver_pools[headless] = WebDriverPool(lambda: OikotieScraper(headless=headless), max_size=max_size)
+        return _webdriver_pools[headless]
+
+def close_webdriver_pools():
+    """Close the idle sessions of every browser pool."""
+    with _webdriver_pools_lock:
+        pools = list(_webdriver_pools.values())
+    for pool in pools:
+        pool.close()
+
 class OikotieScraper:
     """Represents a single scraping session with one browser instance."""
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, init_driver=True, parser_backend=None):
         self.headless = headless
-        self.driver, self.wait = self._init_driver()
+        self.parser = get_listing_parser(parser_backend)
+        self.user_agent = random.choice(USER_AGENTS)
+        self._cookies_accepted = False
+        self.pages_loaded = 0
+        # Without a driver the instance can only parse already fetched HTML
+        self.driver, self.wait = self._init_driver() if init_driver else (None, None)
 
     def _init_driver(self):
         logger.debug("Initializing new Chrome WebDriver instance...")
         chrome_options = Options()
         if self.headless: chrome_options.add_argument('--headless')
-        chrome_options.add_argument(f'user-agent={random.choice(USER_AGENTS)}')
+        chrome_options.add_argument(f'user-agent={self.user_agent}')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
@@ -260,15 +385,48 @@ class OikotieScraper:
             self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.CSS_SELECTOR, "iframe[id^='sp_message_iframe']")))
             self.wait.until(EC.element_to_be_clickable((By.XPATH, "//button[text()='Hyväksy kaikki']"))).click()
             self.driver.switch_to.default_content()
+            self._cookies_accepted = True
         except TimeoutException:
             logger.warning("Cookie banner not found or handled.")
             self.driver.switch_to.default_content()
 
-    def get_all_listing_summaries(self, url, limit=None):
-        logger.info(f"Initiating sequential summary scrape (limit: {limit or 'all'})...")
+    def _load(self, url):
         self.driver.get(url)
+        self.pages_loaded += 1
+
+    def warm_up(self, url=OIKOTIE_BASE_URL):
+        """Accept the cookie banner once so later page loads in this session skip it."""
+        self._load(url)
         self._accept_cookies()
-        
+
+    def get_cookies(self):
+        """Return the browser session's cookies (e.g. after consent) as a name/value dict."""
+        return {cookie['name']: cookie['value'] for cookie in self.driver.get_cookies()}
+
+    def get_all_listing_summaries(self, url, limit=None, max_workers=1, rate_limit_seconds=None, pool=None):
+        """Scrape listing summaries from every results page.
+
+        With ``max_workers > 1`` the page count is read from the first page and the
+        remaining pages are loaded by URL by workers borrowing sessions from ``pool``
+        and sharing one rate limiter. Otherwise (or if the page count cannot be read) pages are
+        walked sequentially with the "Seuraava" button.
+        """
+        logger.info(f"Initiating summary scrape (limit: {limit or 'all'}, workers: {max_workers})...")
+        self._load(url)
+        if not self._cookies_accepted:
+            self._accept_cookies()
+        self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[class*="cards-v2"]')))
+
+        page = self.parser.parse(self.driver.page_source)
+        page_count = self._parse_page_count(page)
+        if max_workers > 1 and page_count:
+            first_page = self._parse_listing_summaries(page)
+            return self._scrape_summary_pages_parallel(url, first_page, page_count, limit, max_workers,
+                                                       rate_limit_seconds, pool or get_webdriver_pool(self.headless))
+        return self._click_through_summaries(limit)
+
+    def _click_through_summaries(self, limit=None):
+        """Walk the results pages one at a time from the currently loaded first page."""
         all_summaries = []
         page_num = 1
         
@@ -276,8 +434,7 @@ class OikotieScraper:
             logger.info(f"Scraping summary page {page_num}...")
             self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[class*="cards-v2"]')))
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            summaries = self._parse_listing_summaries(soup)
+            summaries = self._parse_listing_summaries(self.driver.page_source)
             
             if not summaries:
                 logger.warning(f"No new listings found on page {page_num}. Ending scrape.")
@@ -299,44 +456,99 @@ class OikotieScraper:
         
         return all_summaries[:limit] if limit else all_summaries
 
-    def get_single_listing_details(self, listing_summary):
+    def _scrape_summary_pages_parallel(self, url, first_page, page_count, limit, max_workers, rate_limit_seconds, pool):
+        """Fetch result pages 2..N concurrently and merge them in page order."""
+        if limit and first_page:
+            page_count = min(page_count, math.ceil(limit / len(first_page)))
+        page_urls = [summary_page_url(url, page) for page in range(2, page_count + 1)]
+        logger.info(f"Found {page_count} summary pages; fetching {len(page_urls)} more with {max_workers} workers...")
+
+        pages = {}
+        if page_urls:
+            rate_limiter = RateLimiter(rate_limit_seconds if rate_limit_seconds is not None else 1.0)
+            # This session may itself be borrowed from the pool, so leave one slot for it
+            worker_count = min(max_workers, len(page_urls), pool.max_size - 1)
+            if worker_count < 1:
+                for page_url in page_urls:
+                    rate_limiter.wait()
+                    pages[page_url] = self._scrape_summary_page(page_url)
+            else:
+                chunks = [page_urls[i::worker_count] for i in range(worker_count)]
+                with ThreadPoolExecutor(max_workers=worker_count) as executor:
+                    futures = [executor.submit(worker_scrape_summaries, chunk, rate_limiter, pool) for chunk in chunks]
+                    for future in as_completed(futures):
+                        pages.update(future.result())
+
+        # Listings can shift between pages while scraping; keep the first occurrence of each URL
+        all_summaries, seen_urls = [], set()
+        for summaries in [first_page] + [pages.get(page_url, []) for page_url in page_urls]:
+            for summary in summaries:
+                if summary['url'] not in seen_urls:
+                    seen_urls.add(summary['url'])
+                    all_summaries.append(summary)
+        return all_summaries[:limit] if limit else all_summaries
+
+    def _scrape_summary_page(self, page_url):
+        """Load one results page by URL and parse its summary cards."""
+        self._load(page_url)
+        if not self._cookies_accepted:
+            self._accept_cookies()
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'div[class*="cards-v2"]')))
+        except TimeoutException:
+            logger.warning(f"No listing cards found on {page_url}")
+            return []
+        return self._parse_listing_summaries(self.driver.page_source)
+
+    def get_single_listing_details(self, listing_summary, limiter=None):
+        """Scrape a details page paced by ``limiter``; failures are recorded in ``details['error']``.
+
+        Browser errors are recorded too and then re-raised, so the session they broke is recycled.
+        """
+        with (limiter or detail_limiter()).slot() as slot:
+            try:
+                self.fetch_listing_details(listing_summary)
+            except ListingUnavailableError as e:
+                # A removed listing is not a failed request for the limiter
+                logger.warning(f"Listing unavailable: {listing_summary.get('url')}")
+                listing_summary['details'] = {"error": str(e)}
+            except WebDriverException as e:
+                logger.error(f"Browser failed on {listing_summary.get('url')}: {e}")
+                listing_summary['details'] = {"error": str(e)}
+                raise
+            except Exception as e:
+                slot.fail(e)
+                logger.error(f"Failed to process {listing_summary.get('url')}: {e}")
+                listing_summary['details'] = {"error": str(e)}
+        return listing_summary
+
+    def fetch_listing_details(self, listing_summary):
+        """Load and parse a details page into ``listing_summary`` without pacing; raises on failure.
+
+        A page that loads but never shows the details grid raises ``ListingUnavailableError``.
+        """
+        self._load(listing_summary['url'])
         try:
-            time.sleep(random.uniform(2.0, 5.0)) # Longer, more human-like delay
-            self.driver.get(listing_summary['url'])
             self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, "details-grid")))
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            details, overview, description = self._parse_oikotie_details_page(soup)
-            listing_summary.update({'details': details, 'overview': overview, 'full_description': description})
-        except Exception as e:
-            logger.error(f"Failed to process {listing_summary.get('url')}: {e}")
-            listing_summary['details'] = {"error": str(e)}
+        except TimeoutException as e:
+            raise ListingUnavailableError(f"No details grid on {listing_summary['url']}") from e
+        details, overview, description = self._parse_oikotie_details_page(self.driver.page_source)
+        listing_summary.update({'details': details, 'overview': overview, 'full_description': description})
         return listing_summary
 
-    def _parse_listing_summaries(self, soup):
-        listings = []
-        for card in soup.select('a.ot-card-v2'):
-            url = urljoin('https://asunnot.oikotie.fi', card.get('href', ''))
-            title_elem = card.select_one('.card-v2-text-container__text strong')
-            if title_elem and url:
-                listings.append({'source': 'oikotie', 'url': url, 'title': title_elem.get_text(strip=True)})
-        return listings
-
-    def _parse_oikotie_details_page(self, soup):
-        details, overview, full_description = {}, "", ""
-        for item in soup.select('.info-table__row, .key-value-items__item, .details-grid__item dl'):
-            key_elem = item.select_one('dt, .info-table__title, .key-value-items__title')
-            value_elem = item.select_one('dd, .info-table__value, .key-value-items__value')
-            if key_elem and value_elem:
-                key = normalize_key(key_elem.get_text(strip=True))
-                value = value_elem.get_text(strip=True, separator='\n').replace('\u00a0', ' ').strip()
-                if key: details[key] = value
-        overview = self._get_text_from_element(soup, 'div.listing-overview')
-        full_description = self._get_text_from_element(soup, 'div[class*="listing-description"]')
-        return details, overview, full_description
-        
-    def _get_text_from_element(self, soup, selector):
-        element = soup.select_one(selector)
-        return '\n\n'.join([p.get_text(strip=True) for p in element.find_all('p', recursive=False)]) if element else ""
+    def _parse_listing_summaries(self, page):
+        return self.parser.parse_summaries(page)
+
+    def _parse_oikotie_details_page(self, page):
+        return self.parser.parse_details(page)
+
+    def _parse_page_count(self, page):
+        """Read the total number of result pages from the pagination, or None if absent."""
+        return self.parser.parse_page_count(page)
+
+    def _is_js_only_page(self, page):
+        """True when the static HTML has none of the detail containers, i.e. it needs a browser to render."""
+        return self.parser.is_js_only(page)
 
     def _go_to_next_page(self):
         try:
@@ -347,18 +559,134 @@ class OikotieScraper:
         except NoSuchElementException: return False
         return False
 
-def worker_scrape_details(listing_summaries_chunk):
-    """Worker target. Creates one browser session to process a chunk of URLs."""
-    scraper = OikotieScraper(headless=True)
+def worker_scrape_details(listing_summaries_chunk, result_queue=None, pool=None, limiter=None):
+    """Worker target. Borrows one pooled browser session to process a chunk of URLs.
+
+    Page loads are paced by ``limiter`` (the shared detail limiter by default).
+    If a ``result_queue`` is given, each result is pushed onto it as soon as it is
+    scraped (blocking while the queue is full) instead of being returned at the end.
+    A browser error fails the session, which the pool recycles, and the rest of
+    the chunk continues in a new one.
+    """
+    pool = pool or get_webdriver_pool()
     results = []
-    try:
-        for summary in listing_summaries_chunk:
-            logger.info(f"Worker processing: {summary['url']}")
-            results.append(scraper.get_single_listing_details(summary))
-    finally:
-        scraper.close()
+    remaining = deque(listing_summaries_chunk)
+    while remaining:
+        pending = len(remaining)
+        try:
+            with pool.session() as scraper:
+                while remaining:
+                    summary = remaining.popleft()
+                    logger.info(f"Worker processing: {summary['url']}")
+                    try:
+                        scraper.get_single_listing_details(summary, limiter)
+                    finally:
+                        if result_queue is not None:
+                            result_queue.put(summary)
+                        else:
+                            results.append(summary)
+        except WebDriverException as e:
+            if len(remaining) == pending:
+                raise  # No session could be started
+            logger.warning(f"Replacing failed browser session ({len(remaining)} listings left): {e}")
     return results
 
+def worker_scrape_details_http(listing_summaries, cookies=None, result_queue=None, pool=None,
+                               parser_backend=None, limiter=None, **fetcher_options):
+    """Fetch and parse detail pages over pooled HTTP instead of a browser.
+
+    Requests, and the Selenium re-scrapes of pages whose static HTML has no detail
+    containers, are paced by ``limiter`` when given.
+    Results are pushed onto ``result_queue`` if given, otherwise returned.
+    """
+    parser = get_listing_parser(parser_backend)
+    summaries_by_url = {summary['url']: summary for summary in listing_summaries}
+    results, needs_browser = [], []
+
+    def handle_page(url, html, error):
+        summary = summaries_by_url[url]
+        if error:
+            summary['details'] = {"error": error}
+        else:
+            page = parser.parse(html)
+            if parser.is_js_only(page):
+                needs_browser.append(summary)
+                return
+            details, overview, description = parser.parse_details(page)
+            summary.update({'details': details, 'overview': overview, 'full_description': description})
+        if result_queue is not None:
+            result_queue.put(summary)
+        else:
+            results.append(summary)
+
+    HttpDetailFetcher(cookies=cookies, limiter=limiter, **fetcher_options).fetch_pages(list(summaries_by_url),
+                                                                                      handle_page)
+
+    if needs_browser:
+        logger.info(f"{len(needs_browser)} pages need JavaScript; falling back to Selenium.")
+        results.extend(worker_scrape_details(needs_browser, result_queue, pool, limiter))
+    return results
+
+
+class StreamingListingWriter:
+    """Writer thread that drains a bounded queue and saves listings in micro-batches.
+
+    A batch is flushed when it reaches ``batch_size`` listings or when
+    ``flush_interval`` seconds have passed since the previous flush.
+    """
+    _STOP = object()
+
+    def __init__(self, db_manager, city_name, batch_size=50, flush_interval=10.0, max_queue_size=None):
+        self.db_manager = db_manager
+        self.city_name = city_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue_size or batch_size * 4)
+        self.saved_count = 0
+        self.failed_batches = 0
+        self._thread = threading.Thread(target=self._run, name=f"listing-writer-{city_name}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def put(self, listing):
+        self.queue.put(listing)
+
+    def close(self):
+        """Flush the remaining listings and stop the writer thread."""
+        self.queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        if self.db_manager.save_listings_batch(batch, self.city_name):
+            self.saved_count += len(batch)
+            logger.info(f"Streamed {self.saved_count} listings to the database for {self.city_name}")
+        else:
+            self.failed_batches += 1
+
 def load_config(config_path='config/config.json'):
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -367,23 +695,37 @@ def load_config(config_path='config/config.json'):
         logger.critical(f"Error loading config file '{config_path}': {e}")
         return []
 
-def worker_scrape_summaries(page_urls_chunk):
-    """Worker target for scraping a chunk of summary pages."""
-    scraper = OikotieScraper(headless=True)
-    results = []
+def load_global_settings(config_path='config/config.json'):
     try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('global_settings', {})
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not load global settings from '{config_path}': {e}")
+        return {}
+
+def worker_scrape_summaries(page_urls_chunk, rate_limiter=None, pool=None):
+    """Worker target for scraping a chunk of summary pages. Returns {page_url: summaries}."""
+    results = {}
+    with (pool or get_webdriver_pool()).session() as scraper:
         for page_url in page_urls_chunk:
+            if rate_limiter is not None:
+                rate_limiter.wait()
             logger.info(f"Summary worker processing: {page_url}")
-            results.extend(scraper._scrape_summary_page(page_url))
-    finally:
-        scraper.close()
+            results[page_url] = scraper._scrape_summary_page(page_url)
     return results
 
 class ScraperOrchestrator:
     """Manages the entire scraping workflow for all tasks."""
     def __init__(self, config_path='config/config.json'):
         self.tasks = load_config(config_path)
+        self.parser_backend = load_global_settings(config_path).get("parser_backend")
         self.db_manager = DatabaseManager()
+        self.checkpoint_dir = Path("output/checkpoints")
+        # Browser sessions are reused across phases and tasks; one extra slot for the summary session
+        pool_size = max([max(t.get("max_detail_workers", 5), t.get("max_summary_workers", 5)) for t in self.tasks] or [5]) + 1
+        self.driver_pool = WebDriverPool(
+            lambda: OikotieScraper(headless=True, parser_backend=self.parser_backend), max_size=pool_size
+        )
 
     def run(self):
         if not self.tasks:
@@ -402,25 +744,27 @@ class ScraperOrchestrator:
             logger.info(f"--- Starting task for city: {city} ---")
             
             try:
-                # Phase 1: Scrape summaries sequentially for stability
-                summary_scraper = OikotieScraper(headless=True)
-                listing_summaries = summary_scraper.get_all_listing_summaries(url, limit=limit)
-                summary_scraper.close()
+                # Phase 1: Scrape summary pages by URL across a worker pool
+                with self.driver_pool.session() as summary_scraper:
+                    listing_summaries = summary_scraper.get_all_listing_summaries(
+                        url, limit=limit,
+                        max_workers=task.get("max_summary_workers", max_workers),
+                        rate_limit_seconds=task.get("rate_limit_seconds", 1.0),
+                        pool=self.driver_pool,
+                    )
+                    # The HTTP fetcher reuses this session's consent cookies and user agent
+                    session = (summary_scraper.get_cookies(), summary_scraper.user_agent)
 
                 if not listing_summaries:
                     logger.warning(f"No listings found for {city}. Task finished.")
                     continue
 
+                if task.get("streaming_save", False):
+                    self._scrape_details_streaming(city, listing_summaries, max_workers, task, session)
+                    continue
+
                 # Phase 2: Scrape details in parallel
-                logger.info(f"Distributing {len(listing_summaries)} URLs to {max_workers} detail workers...")
-                detail_chunks = [listing_summaries[i::max_workers] for i in range(max_workers)]
-                
-                detailed_listings = []
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = [executor.submit(worker_scrape_details, chunk) for chunk in detail_chunks]
-                    for future in as_completed(futures):
-                        detailed_listings.extend(future.result())
-                        logger.info(f"Detail scraping progress: {len(detailed_listings)}/{len(listing_summaries)}")
+                detailed_listings = self._scrape_details(listing_summaries, max_workers, task, session)
                 
                 # Phase 3: Save results to database
                 self.db_manager.save_listings(detailed_listings, city)
@@ -430,6 +774,96 @@ class ScraperOrchestrator:
             finally:
                 logger.info(f"--- Task for city: {city} finished ---")
 
+        logger.info(f"Browser pool stats: {self.driver_pool.get_stats()}")
+        self.driver_pool.close()
+
+    def _scrape_details(self, listing_summaries, max_workers, task, session=(None, None), result_queue=None):
+        """Scrape detail pages with the task's fetch_mode ("selenium" or "http")."""
+        if task.get("fetch_mode", "selenium") == "http":
+            cookies, user_agent = session
+            logger.info(f"Fetching {len(listing_summaries)} detail pages over HTTP...")
+            max_connections = task.get("http_max_connections", 10)
+            requests_per_second = task.get("http_requests_per_second")
+            if requests_per_second is None:
+                rate_limit_seconds = task.get("rate_limit_seconds", 1.0)
+                requests_per_second = 1.0 / rate_limit_seconds if rate_limit_seconds else None
+            return worker_scrape_details_http(
+                listing_summaries, cookies, result_queue, self.driver_pool,
+                parser_backend=self.parser_backend,
+                limiter=detail_limiter(task.get("city"), max_connections, requests_per_second),
+                user_agent=user_agent,
+                max_connections=max_connections,
+                requests_per_second=requests_per_second,
+                burst=task.get("http_burst", 1),
+            )
+
+        logger.info(f"Distributing {len(listing_summaries)} URLs to {max_workers} detail workers...")
+        detail_chunks = [listing_summaries[i::max_workers] for i in range(max_workers)]
+        limiter = detail_limiter(task.get("city"), max_workers)
+
+        detailed_listings = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(worker_scrape_details, chunk, result_queue, self.driver_pool, limiter)
+                       for chunk in detail_chunks]
+            for future in as_completed(futures):
+                detailed_listings.extend(future.result())
+                if result_queue is None:
+                    logger.info(f"Detail scraping progress: {len(detailed_listings)}/{len(listing_summaries)}")
+        return detailed_listings
+
+    def _scrape_details_streaming(self, city, listing_summaries, max_workers, task, session=(None, None)):
+        """Scrape details and save them incrementally, resuming an interrupted run."""
+        run_started_at = self._start_or_resume_run(city)
+        already_saved = self.db_manager.get_urls_scraped_since(city, run_started_at)
+        pending = [summary for summary in listing_summaries if summary['url'] not in already_saved]
+        if already_saved:
+            logger.info(f"Resuming {city}: {len(listing_summaries) - len(pending)} listings already saved in this run.")
+
+        writer = StreamingListingWriter(
+            self.db_manager, city,
+            batch_size=task.get("stream_batch_size", 50),
+            flush_interval=task.get("stream_flush_seconds", 10.0),
+        ).start()
+
+        logger.info(f"Scraping {len(pending)} listings with streaming save...")
+        try:
+            self._scrape_details(pending, max_workers, task, session, writer.queue)
+        finally:
+            writer.close()
+
+        # Reconcile soft deletes only once every batch of the run has been persisted
+        if writer.failed_batches:
+            logger.error(f"{writer.failed_batches} batches failed for {city}; skipping soft-delete reconciliation.")
+            return
+        self.db_manager.soft_delete_missing(city, {summary['url'] for summary in listing_summaries})
+        self._complete_run(city)
+
+    def _checkpoint_path(self, city):
+        return self.checkpoint_dir / f"scrape_{city}.json"
+
+    def _start_or_resume_run(self, city):
+        """Return the start time of the current run, reusing an unfinished recent run."""
+        path = self._checkpoint_path(city)
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    started_at = json.load(f)['started_at']
+                age_hours = (time.time() - time.mktime(time.strptime(started_at, '%Y-%m-%d %H:%M:%S'))) / 3600
+                if age_hours < RESUME_MAX_AGE_HOURS:
+                    return started_at
+                logger.info(f"Checkpoint for {city} is {age_hours:.1f}h old; starting a new run.")
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+
+        started_at = time.strftime('%Y-%m-%d %H:%M:%S')
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'city': city, 'started_at': started_at}, f)
+        return started_at
+
+    def _complete_run(self, city):
+        self._checkpoint_path(city).unlink(missing_ok=True)
+
 
 def main():
     orchestrator = ScraperOrchestrator()
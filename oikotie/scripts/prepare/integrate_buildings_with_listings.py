@@ -11,6 +11,7 @@ import sys
 from pathlib import Path
 from datetime import datetime
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from shapely.geometry import Point
 import folium
@@ -22,6 +23,7 @@ sys.path.insert(0, str(project_root))
 
 from oikotie.data_sources.unified_manager import UnifiedDataManager
 from oikotie.visualization.utils.data_loader import DataLoader
+from oikotie.utils.listing_building_matches import match_to_buildings
 
 
 def load_listings_from_database(limit: int = None) -> gpd.GeoDataFrame:
@@ -88,53 +90,25 @@ def perform_spatial_matching(
     """
     print(f"🔍 Performing spatial matching with {len(listings_gdf)} listings and {len(buildings_gdf)} buildings")
     
-    matches = []
+    bulk = match_to_buildings(listings_gdf.geometry, buildings_gdf, buffer_distance)
+    building_labels = buildings_gdf.index.to_numpy()
+    data_sources = (buildings_gdf['data_source'].to_numpy(dtype=object) if 'data_source' in buildings_gdf.columns
+                    else np.full(len(buildings_gdf), 'Unknown', dtype=object))
+    addresses = listings_gdf['address'] if 'address' in listings_gdf.columns else pd.Series('Unknown', index=listings_gdf.index)
     
-    for idx, listing in listings_gdf.iterrows():
-        point = listing.geometry
-        
-        # Direct contains check
-        containing = buildings_gdf[buildings_gdf.contains(point)]
-        if not containing.empty:
-            building_idx = containing.index[0]
-            matches.append({
-                'listing_idx': idx,
-                'building_idx': building_idx,
-                'match_type': 'direct',
-                'distance': 0.0,
-                'address': listing.get('address', 'Unknown'),
-                'building_data_source': containing.iloc[0].get('data_source', 'Unknown')
-            })
-            continue
-        
-        # Buffer search for nearby buildings
-        buffered = point.buffer(buffer_distance)
-        intersecting = buildings_gdf[buildings_gdf.intersects(buffered)]
-        
-        if not intersecting.empty:
-            # Find closest building
-            distances = intersecting.geometry.distance(point)
-            closest_idx = distances.idxmin()
-            closest_distance = distances.min()
-            
-            matches.append({
-                'listing_idx': idx,
-                'building_idx': closest_idx,
-                'match_type': 'buffer',
-                'distance': closest_distance,
-                'address': listing.get('address', 'Unknown'),
-                'building_data_source': intersecting.loc[closest_idx].get('data_source', 'Unknown')
-            })
-        else:
-            # No match found
-            matches.append({
-                'listing_idx': idx,
-                'building_idx': None,
-                'match_type': 'no_match',
-                'distance': None,
-                'address': listing.get('address', 'Unknown'),
-                'building_data_source': None
-            })
+    matches = []
+    for idx, address, building_pos, match_type, distance in zip(
+        listings_gdf.index, addresses, bulk['building_pos'], bulk['match_type'], bulk['distance']
+    ):
+        matched = building_pos >= 0
+        matches.append({
+            'listing_idx': idx,
+            'building_idx': building_labels[building_pos] if matched else None,
+            'match_type': match_type if matched else 'no_match',
+            'distance': distance if matched else None,
+            'address': address,
+            'building_data_source': data_sources[building_pos] if matched else None
+        })
     
     return matches
 
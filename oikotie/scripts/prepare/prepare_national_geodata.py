@@ -1,7 +1,7 @@
-import geopandas as gpd
 from pathlib import Path
 import duckdb
 from oikotie.wms import WMSClient
+from oikotie.data_sources.wfs_client import WFSClient
 
 # --- Configuration ---
 ADDRESS_WMS_URL = "https://paikkatiedot.ymparisto.fi/geoserver/ryhti_inspire_ad/wms"
@@ -12,6 +12,9 @@ DB_PATH = Path("data/real_estate.duckdb")
 # Create output directory if it doesn't exist
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# One pooled, paging WFS client serves both layers
+wfs = WFSClient()
+
 def fetch_and_process_addresses(bbox, crs="EPSG:4326"):
     """
     Fetches address data for a given bounding box, processes it, and saves it.
@@ -19,31 +22,14 @@ def fetch_and_process_addresses(bbox, crs="EPSG:4326"):
     print("--- Fetching Address Data ---")
     client = WMSClient(ADDRESS_WMS_URL)
     
-    # Fetch data using WFS GetFeature
-    params = {
-        'service': 'WFS',
-        'version': '2.0.0',
-        'request': 'GetFeature',
-        'typeName': 'AD.Address',
-        'bbox': f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]},{crs}",
-        'srsName': crs,
-        'outputFormat': 'application/json'
-    }
-    
+    # Fetch data using paged WFS GetFeature requests
     # OWSLib doesn't have great WFS 2.0.0 support, so we'll use httpx directly
-    import httpx
-    response = httpx.get(ADDRESS_WMS_URL, params=params)
-    response.raise_for_status()
+    gdf = wfs.fetch(ADDRESS_WMS_URL, 'AD.Address', bbox=bbox, bbox_crs=crs, srs_name=crs)
     
-    data = response.json()
-    
-    if not data.get("features"):
+    if gdf.empty:
         print("No address features found in the specified bounding box.")
         return
 
-    gdf = gpd.GeoDataFrame.from_features(data["features"])
-    gdf.set_crs(crs, inplace=True)
-
     # --- Standardize Column Names ---
     column_mapping = {
         'inspireId_localId': 'inspire_id_local',
@@ -85,30 +71,13 @@ def fetch_and_process_buildings(bbox, crs="EPSG:4326"):
     """
     print("--- Fetching Building Data ---")
     
-    # Fetch data using WFS GetFeature
-    params = {
-        'service': 'WFS',
-        'version': '2.0.0',
-        'request': 'GetFeature',
-        'typeName': 'BU.Building',
-        'bbox': f"{bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]},{crs}",
-        'srsName': crs,
-        'outputFormat': 'application/json'
-    }
-    
-    import httpx
-    response = httpx.get(BUILDING_WMS_URL, params=params)
-    response.raise_for_status()
-    
-    data = response.json()
+    # Fetch data using paged WFS GetFeature requests
+    gdf = wfs.fetch(BUILDING_WMS_URL, 'BU.Building', bbox=bbox, bbox_crs=crs, srs_name=crs)
 
-    if not data.get("features"):
+    if gdf.empty:
         print("No building features found in the specified bounding box.")
         return
 
-    gdf = gpd.GeoDataFrame.from_features(data["features"])
-    gdf.set_crs(crs, inplace=True)
-
     # --- Standardize Column Names ---
     column_mapping = {
         'inspireId_localId': 'inspire_id_local',
@@ -24,6 +24,7 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from oikotie.visualization.utils.data_loader import DataLoader
+from oikotie.utils.listing_building_matches import match_to_buildings
 
 
 def load_all_listings_from_database() -> gpd.GeoDataFrame:
@@ -133,62 +134,28 @@ def find_buildings_for_listings(listings_gdf: gpd.GeoDataFrame, buffer_distance:
     
     print(f"🔍 Performing spatial matching...")
     
-    for idx, listing in listings_gdf.iterrows():
-        point = listing.geometry
-        
-        # Direct contains check
-        containing = buildings_gdf[buildings_gdf.contains(point)]
-        if not containing.empty:
-            building_idx = containing.index[0]
-            building_feature_id = containing.iloc[0]['feature_id']
+    bulk = match_to_buildings(listings_gdf.geometry, buildings_gdf, buffer_distance)
+    building_labels = buildings_gdf.index.to_numpy()
+    feature_ids = buildings_gdf['feature_id'].to_numpy(dtype=object)
+    
+    for (idx, listing), building_pos, match_type, distance in zip(
+        listings_gdf.iterrows(), bulk['building_pos'], bulk['match_type'], bulk['distance']
+    ):
+        matched = building_pos >= 0
+        building_feature_id = feature_ids[building_pos] if matched else None
+        if matched:
             related_building_ids.add(building_feature_id)
-            
-            matches.append({
-                'listing_idx': idx,
-                'building_idx': building_idx,
-                'building_feature_id': building_feature_id,
-                'match_type': 'direct',
-                'distance': 0.0,
-                'address': listing.get('address', 'Unknown'),
-                'price': listing.get('price', 0),
-                'listing_type': listing.get('listing_type', 'Unknown')
-            })
-            continue
         
-        # Buffer search for nearby buildings
-        buffered = point.buffer(buffer_distance)
-        intersecting = buildings_gdf[buildings_gdf.intersects(buffered)]
-        
-        if not intersecting.empty:
-            # Find closest building
-            distances = intersecting.geometry.distance(point)
-            closest_idx = distances.idxmin()
-            closest_distance = distances.min()
-            building_feature_id = intersecting.loc[closest_idx]['feature_id']
-            related_building_ids.add(building_feature_id)
-            
-            matches.append({
-                'listing_idx': idx,
-                'building_idx': closest_idx,
-                'building_feature_id': building_feature_id,
-                'match_type': 'buffer',
-                'distance': closest_distance,
-                'address': listing.get('address', 'Unknown'),
-                'price': listing.get('price', 0),
-                'listing_type': listing.get('listing_type', 'Unknown')
-            })
-        else:
-            # No match found
-            matches.append({
-                'listing_idx': idx,
-                'building_idx': None,
-                'building_feature_id': None,
-                'match_type': 'no_match',
-                'distance': None,
-                'address': listing.get('address', 'Unknown'),
-                'price': listing.get('price', 0),
-                'listing_type': listing.get('listing_type', 'Unknown')
-            })
+        matches.append({
+            'listing_idx': idx,
+            'building_idx': building_labels[building_pos] if matched else None,
+            'building_feature_id': building_feature_id,
+            'match_type': match_type if matched else 'no_match',
+            'distance': distance if matched else None,
+            'address': listing.get('address', 'Unknown'),
+            'price': listing.get('price', 0),
+            'listing_type': listing.get('listing_type', 'Unknown')
+        })
     
     # Filter buildings to only those with relationships
     related_buildings_gdf = buildings_gdf[buildings_gdf['feature_id'].isin(related_building_ids)]
@@ -5,6 +5,8 @@ Contains utility functions and classes for spatial processing, data analysis, an
 
 import re
 from .enhanced_spatial_matching import EnhancedSpatialMatcher
+from .listing_normalizer import normalize_listing_details
+from .listing_building_matches import ListingBuildingMatchService
 
 def extract_postal_code(address):
     """Extract postal code from address string."""
@@ -13,4 +15,4 @@ def extract_postal_code(address):
     match = re.search(r'\b(\d{5})\b', address)
     return match.group(1) if match else None
 
-__all__ = ['EnhancedSpatialMatcher', 'extract_postal_code']
+__all__ = ['EnhancedSpatialMatcher', 'ListingBuildingMatchService', 'extract_postal_code', 'normalize_listing_details']
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Blocked address index for fuzzy geocoding
+Holds the normalized components of an address source in columnar arrays and
+narrows a query down to a small candidate set before any similarity scoring
+"""
+
+import math
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+
+def street_key(street: str) -> str:
+    """Blocking key of a normalized street name: the words before the house number, without the city."""
+    words = []
+    for word in street.split():
+        if any(ch.isdigit() for ch in word):
+            break
+        if not word.startswith('helsin'):
+            words.append(word)
+    return ' '.join(words)
+
+
+def street_trigrams(street: str) -> List[str]:
+    """Character trigrams of a street name, padded so short names still produce some."""
+    if not street:
+        return []
+    padded = f"  {street} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+class AddressIndex:
+    """
+    Address points of one source, indexed for candidate blocking.
+
+    Rows are blocked by postal code, by the first four characters of the street
+    key (see ``street_key``) and by street key trigrams. ``candidates`` returns
+    the union of the postal code and prefix blocks plus every row sharing at
+    least ``min_trigram_overlap`` of the query street's trigrams, in source order.
+    """
+
+    def __init__(
+        self,
+        addresses_gdf: gpd.GeoDataFrame,
+        address_field: str,
+        normalizer,
+        preprocess: Callable[[str], str],
+        min_trigram_overlap: float = 0.5
+    ):
+        """
+        Build the index.
+
+        Args:
+            addresses_gdf: Address points with ``address_field`` and coordinates
+            address_field: Column holding the full address text
+            normalizer: AddressNormalizer used for queries as well
+            preprocess: Function preparing text for matching (multi-line handling)
+            min_trigram_overlap: Fraction of query trigrams a row must share to be a candidate
+        """
+        self.min_trigram_overlap = min_trigram_overlap
+
+        if 'latitude' in addresses_gdf.columns:
+            latitude = pd.to_numeric(addresses_gdf['latitude'], errors='coerce').to_numpy(dtype=float)
+            longitude = pd.to_numeric(addresses_gdf['longitude'], errors='coerce').to_numpy(dtype=float)
+        else:
+            latitude = addresses_gdf.geometry.y.to_numpy(dtype=float)
+            longitude = addresses_gdf.geometry.x.to_numpy(dtype=float)
+        raw = addresses_gdf[address_field]
+        valid = raw.notna().to_numpy() & ~np.isnan(latitude) & ~np.isnan(longitude)
+
+        columns = {'clean': [], 'street_name': [], 'street_normalized': [],
+                   'street_number': [], 'postal_code': []}
+        rows = []
+        for position in np.flatnonzero(valid):
+            normalized = normalizer.normalize_address(str(raw.iloc[position]).lower().strip())
+            clean = preprocess(normalized)
+            if not clean:
+                continue
+            components = normalizer.extract_components(clean)
+            columns['clean'].append(clean)
+            columns['street_name'].append(components['street_name'])
+            columns['street_normalized'].append(
+                normalizer.normalize_address(components['street_name']) if components['street_name'] else ''
+            )
+            columns['street_number'].append(components['street_number'])
+            columns['postal_code'].append(components['postal_code'])
+            rows.append(position)
+
+        self.clean = np.array(columns['clean'], dtype=object)
+        self.street_name = np.array(columns['street_name'], dtype=object)
+        self.street_normalized = np.array(columns['street_normalized'], dtype=object)
+        self.street_number = np.array(columns['street_number'], dtype=object)
+        self.postal_code = np.array(columns['postal_code'], dtype=object)
+        self.latitude = latitude[rows]
+        self.longitude = longitude[rows]
+
+        keys = [street_key(street) for street in columns['street_normalized']]
+        self._by_postal_code = self._postings(
+            (code, i) for i, code in enumerate(columns['postal_code']) if code
+        )
+        self._by_prefix = self._postings(
+            (key[:4], i) for i, key in enumerate(keys) if len(key) >= 4
+        )
+        self._by_trigram = self._postings(
+            (trigram, i) for i, key in enumerate(keys) for trigram in set(street_trigrams(key))
+        )
+
+    @staticmethod
+    def _postings(pairs: Iterable) -> Dict[str, np.ndarray]:
+        postings = defaultdict(list)
+        for key, row in pairs:
+            postings[key].append(row)
+        return {key: np.array(rows, dtype=np.int64) for key, rows in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.clean)
+
+    def candidates(self, postal_code: str, street_normalized: str) -> np.ndarray:
+        """Row numbers worth scoring for a query with these components, in ascending order."""
+        empty = np.empty(0, dtype=np.int64)
+        blocks = [self._by_postal_code.get(postal_code, empty) if postal_code else empty]
+        key = street_key(street_normalized)
+        if len(key) >= 4:
+            blocks.append(self._by_prefix.get(key[:4], empty))
+
+        trigrams = set(street_trigrams(key))
+        postings = [self._by_trigram[t] for t in trigrams if t in self._by_trigram]
+        if postings:
+            shared = np.bincount(np.concatenate(postings), minlength=len(self))
+            required = max(1, math.ceil(len(trigrams) * self.min_trigram_overlap))
+            blocks.append(np.flatnonzero(shared >= required))
+
+        return np.unique(np.concatenate(blocks))
+
+    def select(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Precomputed columns of the given rows, as expected by batched similarity scoring."""
+        return {
+            'clean': self.clean[rows],
+            'street_name': self.street_name[rows],
+            'street_normalized': self.street_normalized[rows],
+            'street_number': self.street_number[rows],
+            'postal_code': self.postal_code[rows],
+        }
@@ -4,20 +4,36 @@ Enhanced Geocoding Service with Unified Data Manager Integration
 Provides high-accuracy address geocoding using multiple data sources with intelligent fallback
 """
 
-import duckdb
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from typing import Tuple, Optional, Dict, List, NamedTuple, Union, Any
+from typing import Tuple, Optional, Dict, List, NamedTuple, Union, Any, Callable
 from geopy.geocoders import Nominatim
 from shapely.geometry import Point
 from pathlib import Path
 import re
 import logging
+import threading
+import time
 from datetime import datetime
 import hashlib
+from collections import Counter
 
 # Import the unified manager
 from oikotie.data_sources import UnifiedDataManager, create_helsinki_manager
+from oikotie.database.connection import get_connection_manager
+from oikotie.geolocation import GEOCODER_LIMITER_SETTINGS
+from oikotie.rate_control import get_limiter
+from oikotie.utils.address_index import AddressIndex
+from oikotie.utils.geocoding_cache import GeocodingCache
+from oikotie.utils.string_similarity import levenshtein_distance, levenshtein_similarities
+
+
+# Quality assigned to Nominatim results
+NOMINATIM_QUALITY = 0.6
+
+# Stages of batch geocoding, in the order they are tried
+BATCH_STAGES = ['cache', 'database_exact', 'wms_national', 'geopackage_local', 'database_fuzzy', 'nominatim']
 
 
 class GeocodeResult(NamedTuple):
@@ -57,6 +73,13 @@ class AddressNormalizer:
         
         # Postal code pattern for Helsinki area
         self.helsinki_postal_pattern = re.compile(r'^00\d{3}$')
+        
+        # Whole-word street type patterns, compiled once and applied in mapping order
+        self.street_type_patterns = [
+            (re.compile(r'\b' + re.escape(variant) + r'\b'), standard)
+            for standard, variants in self.street_type_mappings.items()
+            for variant in variants
+        ]
     
     def normalize_address(self, address: str) -> str:
         """
@@ -81,12 +104,9 @@ class AddressNormalizer:
         for abbrev, full in self.abbreviations.items():
             normalized = normalized.replace(abbrev, full)
         
-        # Normalize street types
-        for standard, variants in self.street_type_mappings.items():
-            for variant in variants:
-                # Match whole words to avoid partial replacements
-                pattern = r'\b' + re.escape(variant) + r'\b'
-                normalized = re.sub(pattern, standard, normalized)
+        # Normalize street types (whole words only, to avoid partial replacements)
+        for pattern, standard in self.street_type_patterns:
+            normalized = pattern.sub(standard, normalized)
         
         # Clean up street numbers (ensure space between name and number)
         normalized = re.sub(r'([a-zäöå])(\d)', r'\1 \2', normalized)
@@ -150,7 +170,8 @@ class UnifiedGeocodingService:
         geopackage_path: str = "data/helsinki_topographic_data.gpkg",
         db_path: str = "data/real_estate.duckdb",
         cache_dir: str = "data/cache/geocoding",
-        enable_logging: bool = True
+        enable_logging: bool = True,
+        cache_ttl_seconds: Optional[Dict[str, float]] = None
     ):
         """
         Initialize the unified geocoding service.
@@ -160,8 +181,10 @@ class UnifiedGeocodingService:
             db_path: Path to DuckDB database
             cache_dir: Directory for geocoding cache
             enable_logging: Enable detailed logging
+            cache_ttl_seconds: Cached result expiry per result source (None for the defaults)
         """
         self.db_path = db_path
+        self.connections = get_connection_manager(db_path)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
@@ -170,6 +193,11 @@ class UnifiedGeocodingService:
             logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
+        # Geocoding results live in a single cache store; import legacy per-address JSON files once
+        self.cache = GeocodingCache(str(self.cache_dir / "geocoding_cache.sqlite"), source_ttl_seconds=cache_ttl_seconds)
+        if len(self.cache) == 0 and any(self.cache_dir.glob("*.json")):
+            self.cache.import_json_dir(str(self.cache_dir))
+        
         # Initialize unified data manager
         self.manager = create_helsinki_manager(
             geopackage_path=geopackage_path,
@@ -179,12 +207,20 @@ class UnifiedGeocodingService:
         # Initialize address normalizer
         self.normalizer = AddressNormalizer()
         
-        # Initialize fallback geocoder
+        # Initialize fallback geocoder, paced by the limiter every Nominatim client shares
         self.nominatim = Nominatim(user_agent="oikotie_unified_geocoding")
+        self.nominatim_limiter = get_limiter("nominatim", **GEOCODER_LIMITER_SETTINGS)
         
         # Helsinki bounding box for filtering
         self.helsinki_bbox = (24.7, 60.1, 25.3, 60.3)  # (min_lon, min_lat, max_lon, max_lat)
         
+        # Address indexes are built once per source and shared by all lookups
+        self._address_indexes: Dict[str, AddressIndex] = {}
+        self._address_index_lock = threading.Lock()
+        
+        # Per-stage hit counts and timings of the last batch_geocode_addresses call
+        self.last_batch_stats: Dict[str, Any] = {}
+        
         self.logger.info("Unified geocoding service initialized successfully")
     
     def geocode_address(
@@ -251,30 +287,12 @@ class UnifiedGeocodingService:
     def _geocode_with_wms_addresses(self, original: str, normalized: str) -> Optional[GeocodeResult]:
         """Geocode using WMS national address data with targeted approach."""
         try:
-            # Extract components for targeted query
-            components = self.normalizer.extract_components(normalized)
-            
-            # Create address-specific cache key for targeted caching
-            address_cache_params = {
-                "address_query": normalized,
-                "street_name": components.get('street_name', ''),
-                "postal_code": components.get('postal_code', '')
-            }
-            
-            # Fetch addresses from WMS within Helsinki bbox with address-specific caching
-            addresses_gdf = self.manager.fetch_addresses(
-                bbox=self.helsinki_bbox,
-                limit=5000,  # Reduced limit for better performance
-                use_cache=True,
-                **address_cache_params  # Pass address-specific parameters for unique cache key
-            )
-            
-            if addresses_gdf.empty:
-                self.logger.debug("No WMS addresses available")
+            address_index = self._get_address_index('wms_national')
+            if address_index is None:
                 return None
             
             # Find best match
-            best_match = self._find_best_address_match(normalized, addresses_gdf, 'wms_national')
+            best_match = self._find_best_address_match(normalized, address_index, 'wms_national')
             return best_match
             
         except Exception as e:
@@ -284,19 +302,12 @@ class UnifiedGeocodingService:
     def _geocode_with_geopackage_addresses(self, original: str, normalized: str) -> Optional[GeocodeResult]:
         """Geocode using GeoPackage local address data."""
         try:
-            # Fetch addresses from GeoPackage
-            addresses_gdf = self.manager.fetch_topographic_layer(
-                "osoitepiste",  # Address points layer
-                bbox=self.helsinki_bbox,
-                use_cache=True
-            )
-            
-            if addresses_gdf.empty:
-                self.logger.debug("No GeoPackage addresses available")
+            address_index = self._get_address_index('geopackage_local')
+            if address_index is None:
                 return None
             
             # Find best match
-            best_match = self._find_best_address_match(normalized, addresses_gdf, 'geopackage_local')
+            best_match = self._find_best_address_match(normalized, address_index, 'geopackage_local')
             return best_match
             
         except Exception as e:
@@ -306,77 +317,97 @@ class UnifiedGeocodingService:
     def _geocode_from_database(self, original: str, normalized: str) -> Optional[GeocodeResult]:
         """Geocode using existing database records with enhanced multi-line address handling."""
         try:
-            with duckdb.connect(self.db_path) as conn:
-                # Try exact match first with normalized address
-                result = conn.execute("""
-                    SELECT address, lat, lon
-                    FROM address_locations
-                    WHERE LOWER(TRIM(REPLACE(REPLACE(address, '\n', ' '), ',', ' '))) = ?
-                    AND lat IS NOT NULL
-                    AND lon IS NOT NULL
-                    LIMIT 1
-                """, [normalized]).fetchone()
-                
-                if result:
-                    address, lat, lon = result
-                    return GeocodeResult(
-                        latitude=lat,
-                        longitude=lon,
-                        confidence=0.95,  # High confidence for exact match
-                        source='database_exact',
-                        method='exact_match',
-                        original_address=original,
-                        normalized_address=normalized,
-                        quality_score=0.95
-                    )
-                
-                # Try component-based matching for better results
-                results = conn.execute("""
-                    SELECT address, lat, lon
-                    FROM address_locations
-                    WHERE lat IS NOT NULL
-                    AND lon IS NOT NULL
-                    AND TRIM(address) != ''
-                    LIMIT 100
-                """).fetchall()
-                
-                if results:
-                    # Score each result using enhanced similarity
-                    best_score = 0
-                    best_result = None
-                    
-                    for address, lat, lon in results:
-                        # Preprocess database address to handle multi-line format
-                        db_address_processed = self._preprocess_address_for_matching(address)
-                        score = self._calculate_text_similarity(normalized, db_address_processed)
-                        
-                        if score > best_score and score > 0.6:  # Lower threshold for database matches
-                            best_score = score
-                            best_result = (address, lat, lon)
-                    
-                    if best_result and best_score > 0.6:
-                        return GeocodeResult(
-                            latitude=best_result[1],
-                            longitude=best_result[2],
-                            confidence=best_score * 0.85,  # Slightly reduced for database fuzzy match
-                            source='database_fuzzy',
-                            method='enhanced_fuzzy_match',
-                            original_address=original,
-                            normalized_address=normalized,
-                            quality_score=best_score * 0.85
-                        )
+            # Try exact match first with normalized address
+            exact = self._database_exact_matches([normalized])
+            if normalized in exact:
+                lat, lon = exact[normalized]
+                return self._database_exact_result(original, normalized, lat, lon)
+            
+            # Try component-based matching for better results
+            return self._database_fuzzy_match(original, normalized, self._database_fuzzy_candidates())
             
         except Exception as e:
             self.logger.error(f"Database geocoding error for {original}: {e}")
         
         return None
     
+    def _database_exact_matches(self, normalized_addresses: List[str]) -> Dict[str, Tuple[float, float]]:
+        """Look up many normalized addresses in ``address_locations`` with one join."""
+        if not normalized_addresses:
+            return {}
+        with self.connections.connection() as conn:
+            rows = conn.execute("""
+                SELECT q.normalized, a.lat, a.lon
+                FROM (SELECT unnest(?::VARCHAR[]) AS normalized) q
+                JOIN address_locations a
+                  ON LOWER(TRIM(REPLACE(REPLACE(a.address, '\n', ' '), ',', ' '))) = q.normalized
+                WHERE a.lat IS NOT NULL
+                AND a.lon IS NOT NULL
+                QUALIFY row_number() OVER (PARTITION BY q.normalized) = 1
+            """, [list(normalized_addresses)]).fetchall()
+        return {normalized: (lat, lon) for normalized, lat, lon in rows}
+    
+    def _database_exact_result(self, original: str, normalized: str, lat: float, lon: float) -> GeocodeResult:
+        return GeocodeResult(
+            latitude=lat,
+            longitude=lon,
+            confidence=0.95,  # High confidence for exact match
+            source='database_exact',
+            method='exact_match',
+            original_address=original,
+            normalized_address=normalized,
+            quality_score=0.95
+        )
+    
+    def _database_fuzzy_candidates(self) -> List[Tuple[str, float, float]]:
+        """Load the database addresses used for fuzzy matching."""
+        with self.connections.connection() as conn:
+            return conn.execute("""
+                SELECT address, lat, lon
+                FROM address_locations
+                WHERE lat IS NOT NULL
+                AND lon IS NOT NULL
+                AND TRIM(address) != ''
+                LIMIT 100
+            """).fetchall()
+    
+    def _database_fuzzy_match(
+        self,
+        original: str,
+        normalized: str,
+        candidates: List[Tuple[str, float, float]]
+    ) -> Optional[GeocodeResult]:
+        """Best fuzzy match among database candidate rows."""
+        if not candidates:
+            return None
+        
+        # Score all candidates at once using enhanced similarity (handles multi-line addresses)
+        scores = self._calculate_text_similarities(normalized, [address for address, _, _ in candidates])
+        best = int(np.argmax(scores))
+        best_score = float(scores[best])
+        best_result = candidates[best]
+        
+        if best_score > 0.6:  # Lower threshold for database matches
+            return GeocodeResult(
+                latitude=best_result[1],
+                longitude=best_result[2],
+                confidence=best_score * 0.85,  # Slightly reduced for database fuzzy match
+                source='database_fuzzy',
+                method='enhanced_fuzzy_match',
+                original_address=original,
+                normalized_address=normalized,
+                quality_score=best_score * 0.85
+            )
+        
+        return None
+    
     def _geocode_with_nominatim(self, original: str, normalized: str) -> Optional[GeocodeResult]:
         """Geocode using Nominatim as final fallback."""
         try:
             # Try with city context
             query_with_city = f"{original}, Helsinki, Finland"
-            location = self.nominatim.geocode(query_with_city, timeout=10)
+            with self.nominatim_limiter.slot():
+                location = self.nominatim.geocode(query_with_city, timeout=10)
             
             if location:
                 # Verify the result is in Helsinki area
@@ -384,12 +415,12 @@ class UnifiedGeocodingService:
                     return GeocodeResult(
                         latitude=location.latitude,
                         longitude=location.longitude,
-                        confidence=0.6,  # Lower confidence for external API
+                        confidence=NOMINATIM_QUALITY,  # Lower confidence for external API
                         source='nominatim',
                         method='external_api',
                         original_address=original,
                         normalized_address=normalized,
-                        quality_score=0.6
+                        quality_score=NOMINATIM_QUALITY
                     )
             
         except Exception as e:
@@ -397,24 +428,48 @@ class UnifiedGeocodingService:
         
         return None
     
-    def _find_best_address_match(
-        self,
-        normalized_query: str,
-        addresses_gdf: gpd.GeoDataFrame,
-        source_name: str
-    ) -> Optional[GeocodeResult]:
-        """Find the best matching address in a GeoDataFrame."""
+    def _get_address_index(self, source_name: str) -> Optional[AddressIndex]:
+        """Get the address index of a source, fetching and indexing its addresses on first use."""
+        with self._address_index_lock:
+            if source_name in self._address_indexes:
+                return self._address_indexes[source_name]
+            
+            if source_name == 'wms_national':
+                # Index every address in the Helsinki bbox; the address tiles
+                # make this one download per tile, and a row limit would keep
+                # only the tiles first in row order
+                addresses_gdf = self.manager.fetch_addresses(
+                    bbox=self.helsinki_bbox,
+                    use_cache=True
+                )
+            else:
+                # Fetch address points layer from GeoPackage
+                addresses_gdf = self.manager.fetch_topographic_layer(
+                    "osoitepiste",
+                    bbox=self.helsinki_bbox,
+                    use_cache=True
+                )
+            
+            if addresses_gdf.empty:
+                self.logger.debug(f"No {source_name} addresses available")
+                return None
+            
+            address_index = self._build_address_index(addresses_gdf, source_name)
+            if address_index is not None:
+                self.logger.info(f"Indexed {len(address_index)} {source_name} addresses")
+                self._address_indexes[source_name] = address_index
+            return address_index
+    
+    def clear_address_indexes(self):
+        """Drop the address indexes so they are rebuilt from fresh source data."""
+        with self._address_index_lock:
+            self._address_indexes.clear()
+    
+    def _build_address_index(self, addresses_gdf: gpd.GeoDataFrame, source_name: str) -> Optional[AddressIndex]:
+        """Index the addresses of a GeoDataFrame for fuzzy matching."""
         if addresses_gdf.empty:
             return None
         
-        best_score = 0
-        best_match = None
-        
-        # Extract coordinates from geometry if needed
-        if 'latitude' not in addresses_gdf.columns and 'geometry' in addresses_gdf.columns:
-            addresses_gdf['latitude'] = addresses_gdf.geometry.y
-            addresses_gdf['longitude'] = addresses_gdf.geometry.x
-        
         # Determine address field based on source type
         address_field = None
         
@@ -424,14 +479,14 @@ class UnifiedGeocodingService:
             
             if 'street_name' in addresses_gdf.columns:
                 # Build clean, normalized address from components
-                addresses_gdf['full_address'] = (
+                addresses_gdf = addresses_gdf.assign(full_address=(
                     addresses_gdf['street_name'].fillna('').astype(str) + ' ' +
                     addresses_gdf['address_number'].fillna('').astype(str) + ' ' +
                     addresses_gdf['postal_code'].fillna('').astype(str) + ' ' +
                     addresses_gdf['admin_unit_4'].fillna('').astype(str)
-                ).str.strip()
+                ).str.strip())
                 address_field = 'full_address'
-                self.logger.debug(f"Built WMS addresses, sample: {addresses_gdf['full_address'].iloc[0] if not addresses_gdf.empty else 'No data'}")
+                self.logger.debug(f"Built WMS addresses, sample: {addresses_gdf['full_address'].iloc[0]}")
             else:
                 self.logger.warning(f"WMS data missing street_name field. Available: {list(addresses_gdf.columns)}")
                 # Try alternative field names that might exist
@@ -455,25 +510,40 @@ class UnifiedGeocodingService:
             self.logger.warning(f"No address field found in {source_name} data. Available columns: {list(addresses_gdf.columns)}")
             return None
         
-        # Score each address
-        for idx, row in addresses_gdf.iterrows():
-            if pd.isna(row[address_field]) or pd.isna(row['latitude']) or pd.isna(row['longitude']):
-                continue
-            
-            candidate_address = str(row[address_field]).lower().strip()
-            normalized_candidate = self.normalizer.normalize_address(candidate_address)
-            
-            # Calculate similarity score
-            score = self._calculate_text_similarity(normalized_query, normalized_candidate)
-            
-            if score > best_score and score > 0.6:  # Minimum threshold
-                best_score = score
-                best_match = row
+        return AddressIndex(addresses_gdf, address_field, self.normalizer, self._preprocess_address_for_matching)
+    
+    def _find_best_address_match(
+        self,
+        normalized_query: str,
+        addresses: Union[AddressIndex, gpd.GeoDataFrame],
+        source_name: str
+    ) -> Optional[GeocodeResult]:
+        """Find the best matching address in an address index (or a GeoDataFrame, indexed on the fly)."""
+        address_index = addresses
+        if not isinstance(addresses, AddressIndex):
+            address_index = self._build_address_index(addresses, source_name)
+        if address_index is None or len(address_index) == 0:
+            return None
+        
+        clean_query = self._preprocess_address_for_matching(normalized_query)
+        if not clean_query:
+            return None
+        query_components = self._prepare_components(clean_query)
         
-        if best_match is not None:
+        # Score only the candidates sharing a postal code or street name features with the query
+        rows = address_index.candidates(query_components['postal_code'], query_components['street_normalized'])
+        if len(rows) == 0:
+            return None
+        scores = self._score_candidates(clean_query, query_components, address_index.select(rows))
+        
+        # First candidate with the highest score, above the minimum threshold
+        best = int(np.argmax(scores))
+        best_score = float(scores[best])
+        if best_score > 0.6:
+            best_row = rows[best]
             return GeocodeResult(
-                latitude=float(best_match['latitude']),
-                longitude=float(best_match['longitude']),
+                latitude=float(address_index.latitude[best_row]),
+                longitude=float(address_index.longitude[best_row]),
                 confidence=best_score,
                 source=source_name,
                 method='address_matching',
@@ -491,88 +561,123 @@ class UnifiedGeocodingService:
         """
         if not text1 or not text2:
             return 0.0
+        return float(self._calculate_text_similarities(text1, [text2])[0])
+    
+    def _calculate_text_similarities(self, text: str, candidates: List[str]) -> np.ndarray:
+        """Similarity of ``text`` to every candidate address, scored in one batch."""
+        scores = np.zeros(len(candidates))
+        clean_text = self._preprocess_address_for_matching(text) if text else ""
+        if not clean_text:
+            return scores
+        
+        # Preprocess candidates - handle multi-line addresses
+        clean_candidates = [self._preprocess_address_for_matching(c) if c else "" for c in candidates]
+        positions = [i for i, clean in enumerate(clean_candidates) if clean]
+        if not positions:
+            return scores
+        
+        prepared = [self._prepare_components(clean_candidates[i]) for i in positions]
+        columns = {key: np.array([c[key] for c in prepared], dtype=object)
+                   for key in ('street_name', 'street_normalized', 'street_number', 'postal_code')}
+        columns['clean'] = np.array([clean_candidates[i] for i in positions], dtype=object)
+        
+        scores[positions] = self._score_candidates(clean_text, self._prepare_components(clean_text), columns)
+        return scores
+    
+    def _prepare_components(self, clean_text: str) -> Dict[str, str]:
+        """Extract components of a preprocessed address, including the normalized street name."""
+        components = self.normalizer.extract_components(clean_text)
+        street_name = components['street_name']
+        components['street_normalized'] = self.normalizer.normalize_address(street_name) if street_name else ''
+        return components
+    
+    def _score_candidates(self, clean_query: str, query: Dict[str, str], candidates: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Score a preprocessed query against preprocessed candidates.
         
-        # Preprocess both texts - handle multi-line addresses
-        clean_text1 = self._preprocess_address_for_matching(text1)
-        clean_text2 = self._preprocess_address_for_matching(text2)
-        
-        # Extract components for component-wise matching
-        components1 = self.normalizer.extract_components(clean_text1)
-        components2 = self.normalizer.extract_components(clean_text2)
-        
-        # Debug logging for component analysis
-        self.logger.debug(f"Text1 components: {components1}")
-        self.logger.debug(f"Text2 components: {components2}")
+        Args:
+            clean_query: Preprocessed query address
+            query: Components of the query from ``_prepare_components``
+            candidates: Equally long arrays 'clean', 'street_name', 'street_normalized',
+                'street_number' and 'postal_code' (see ``AddressIndex.select``)
+            
+        Returns:
+            Similarity score of every candidate, from 0.0 to 1.0
+        """
+        clean = candidates['clean']
+        street_names = candidates['street_name']
+        streets = candidates['street_normalized']
+        postal_codes = candidates['postal_code']
         
         # 1. Postal code matching (critical for Helsinki addresses)
-        postal_score = self._calculate_postal_code_similarity(components1, components2)
+        postal_score = np.array([
+            self._calculate_postal_code_similarity(query, {'postal_code': code}) for code in postal_codes
+        ])
         
         # 2. Street name similarity (most important for address matching)
-        street_score = self._calculate_enhanced_street_similarity(
-            components1['street_name'], 
-            components2['street_name']
-        )
+        query_street = query['street_normalized']
+        has_streets = np.array([bool(query['street_name']) and bool(name) for name in street_names], dtype=bool)
+        street_score = levenshtein_similarities(query_street, streets)
+        if len(query_street) >= 4:
+            # Bonus for partial matches (e.g., "mannerheimintie" in both)
+            same_prefix = np.array([len(street) >= 4 and street[:4] == query_street[:4] for street in streets], dtype=bool)
+            street_score = np.where(same_prefix, np.minimum(1.0, street_score + 0.1), street_score)
+        # Handle abbreviated street types (e.g., "katu" vs "k")
+        query_base = self._extract_street_base_name(query_street)
+        if len(query_base) > 3:
+            variants = np.array([self._extract_street_base_name(street) == query_base for street in streets], dtype=bool)
+        else:
+            variants = np.zeros(len(streets), dtype=bool)
+        street_score = np.where(variants, 0.95, street_score)
+        street_score = np.where(streets == query_street, 1.0, street_score)
+        street_score = np.where(has_streets, street_score, 0.1)
         
         # 3. Street number similarity (important for exact address matching)
-        number_score = self._calculate_number_similarity(
-            components1['street_number'], 
-            components2['street_number']
-        )
+        number_score = np.array([
+            self._calculate_number_similarity(query['street_number'], number) for number in candidates['street_number']
+        ])
         
         # 4. Overall text similarity using multiple algorithms
-        levenshtein_score = self._calculate_levenshtein_similarity(clean_text1, clean_text2)
-        jaccard_score = self._calculate_jaccard_similarity(clean_text1, clean_text2)
+        levenshtein_score = levenshtein_similarities(clean_query, clean)
+        query_tokens = set(clean_query.split())
+        jaccard_score = np.array([self._token_jaccard(query_tokens, set(text.split())) for text in clean])
         
         # 5. Bonus for exact component matches
-        exact_match_bonus = 0.0
-        if components1['street_name'] and components2['street_name']:
-            if components1['street_name'] == components2['street_name']:
-                exact_match_bonus += 0.2
-        if components1['postal_code'] and components2['postal_code']:
-            if components1['postal_code'] == components2['postal_code']:
-                exact_match_bonus += 0.15
+        exact_match_bonus = np.zeros(len(clean))
+        exact_match_bonus += np.where(has_streets & (street_names == query['street_name']), 0.2, 0.0)
+        if query['postal_code']:
+            exact_match_bonus += np.where(postal_codes == query['postal_code'], 0.15, 0.0)
         
         # Enhanced weighted combination with postal code priority
-        if postal_score >= 0.9:  # Exact postal code match - high confidence
-            final_score = (
-                postal_score * 0.35 +      # Postal code: 35% weight
-                street_score * 0.40 +      # Street name: 40% weight  
-                number_score * 0.15 +      # Street number: 15% weight
-                levenshtein_score * 0.05 + # Levenshtein: 5% weight
-                jaccard_score * 0.05 +     # Jaccard: 5% weight
-                exact_match_bonus          # Bonus for exact matches
-            )
-        elif postal_score >= 0.7:  # Good postal code match - medium confidence  
-            final_score = (
-                postal_score * 0.25 +      # Postal code: 25% weight
-                street_score * 0.45 +      # Street name: 45% weight
-                number_score * 0.20 +      # Street number: 20% weight
-                levenshtein_score * 0.05 + # Levenshtein: 5% weight
-                jaccard_score * 0.05 +     # Jaccard: 5% weight
-                exact_match_bonus * 0.8    # Reduced bonus
-            )
-        else:  # Poor/no postal code match - lower overall confidence
-            final_score = (
-                postal_score * 0.15 +      # Postal code: 15% weight
-                street_score * 0.50 +      # Street name: 50% weight
-                number_score * 0.25 +      # Street number: 25% weight
-                levenshtein_score * 0.05 + # Levenshtein: 5% weight
-                jaccard_score * 0.05 +     # Jaccard: 5% weight
-                exact_match_bonus * 0.6    # Further reduced bonus
-            )
+        final_score = np.select(
+            [postal_score >= 0.9, postal_score >= 0.7],
+            [
+                # Exact postal code match - high confidence
+                postal_score * 0.35 + street_score * 0.40 + number_score * 0.15 +
+                levenshtein_score * 0.05 + jaccard_score * 0.05 + exact_match_bonus,
+                # Good postal code match - medium confidence
+                postal_score * 0.25 + street_score * 0.45 + number_score * 0.20 +
+                levenshtein_score * 0.05 + jaccard_score * 0.05 + exact_match_bonus * 0.8,
+            ],
+            # Poor/no postal code match - lower overall confidence
+            postal_score * 0.15 + street_score * 0.50 + number_score * 0.25 +
+            levenshtein_score * 0.05 + jaccard_score * 0.05 + exact_match_bonus * 0.6
+        )
         
         # Apply penalty for very different lengths (indicates mismatch)
-        length_ratio = min(len(clean_text1), len(clean_text2)) / max(len(clean_text1), len(clean_text2))
-        if length_ratio < 0.5:  # Very different lengths
-            final_score *= 0.8
+        lengths = np.fromiter((len(text) for text in clean), dtype=np.int64, count=len(clean))
+        length_ratio = np.minimum(lengths, len(clean_query)) / np.maximum(lengths, len(clean_query))
+        final_score = np.where(length_ratio < 0.5, final_score * 0.8, final_score)
         
-        result = min(1.0, max(0.0, final_score))
+        result = np.minimum(1.0, np.maximum(0.0, final_score))
         
-        # Enhanced logging for debugging
-        self.logger.debug(f"Similarity calculation: '{clean_text1}' vs '{clean_text2}'")
-        self.logger.debug(f"  Postal: {postal_score:.3f}, Street: {street_score:.3f}, Number: {number_score:.3f}")
-        self.logger.debug(f"  Levenshtein: {levenshtein_score:.3f}, Jaccard: {jaccard_score:.3f}")
-        self.logger.debug(f"  Final score: {result:.3f}")
+        # Per-candidate details are only formatted when debug logging is on
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i, text in enumerate(clean):
+                self.logger.debug(f"Similarity calculation: '{clean_query}' vs '{text}'")
+                self.logger.debug(f"  Postal: {postal_score[i]:.3f}, Street: {street_score[i]:.3f}, Number: {number_score[i]:.3f}")
+                self.logger.debug(f"  Levenshtein: {levenshtein_score[i]:.3f}, Jaccard: {jaccard_score[i]:.3f}")
+                self.logger.debug(f"  Final score: {result[i]:.3f}")
         
         return result
     
@@ -600,37 +705,12 @@ class UnifiedGeocodingService:
         if not text1 or not text2:
             return 0.0
         
-        # Simple Levenshtein distance implementation
         if text1 == text2:
             return 1.0
         
-        len1, len2 = len(text1), len(text2)
-        if len1 == 0 or len2 == 0:
-            return 0.0
-        
-        # Create distance matrix
-        distances = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        
-        # Initialize first row and column
-        for i in range(len1 + 1):
-            distances[i][0] = i
-        for j in range(len2 + 1):
-            distances[0][j] = j
-        
-        # Calculate distances
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                cost = 0 if text1[i-1] == text2[j-1] else 1
-                distances[i][j] = min(
-                    distances[i-1][j] + 1,      # deletion
-                    distances[i][j-1] + 1,      # insertion
-                    distances[i-1][j-1] + cost  # substitution
-                )
-        
         # Convert distance to similarity (0-1 scale)
-        max_len = max(len1, len2)
-        distance = distances[len1][len2]
-        similarity = 1.0 - (distance / max_len)
+        max_len = max(len(text1), len(text2))
+        similarity = 1.0 - (levenshtein_distance(text1, text2) / max_len)
         
         return max(0.0, similarity)
     
@@ -639,9 +719,10 @@ class UnifiedGeocodingService:
         if not text1 or not text2:
             return 0.0
         
-        tokens1 = set(text1.split())
-        tokens2 = set(text2.split())
-        
+        return self._token_jaccard(set(text1.split()), set(text2.split()))
+    
+    def _token_jaccard(self, tokens1: set, tokens2: set) -> float:
+        """Jaccard similarity of two token sets."""
         if not tokens1 or not tokens2:
             return 0.0
         
@@ -674,9 +755,13 @@ class UnifiedGeocodingService:
             return 0.1
         
         # Normalize both street names
-        norm1 = self.normalizer.normalize_address(street1)
-        norm2 = self.normalizer.normalize_address(street2)
-        
+        return self._normalized_street_similarity(
+            self.normalizer.normalize_address(street1),
+            self.normalizer.normalize_address(street2)
+        )
+    
+    def _normalized_street_similarity(self, norm1: str, norm2: str) -> float:
+        """Street name similarity of already normalized street names."""
         if norm1 == norm2:
             return 1.0  # Exact match
         
@@ -751,15 +836,12 @@ class UnifiedGeocodingService:
         """Get geocoding result from cache with enhanced key generation."""
         # Create more specific cache key that preserves address uniqueness
         cache_key = self._generate_specific_cache_key(normalized_address)
-        cache_file = self.cache_dir / f"{cache_key}.json"
         
         try:
-            if cache_file.exists():
-                import json
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.logger.debug(f"Cache hit for key: {cache_key[:8]}... (address: {normalized_address})")
-                    return GeocodeResult(**data)
+            data = self.cache.get(cache_key)
+            if data:
+                self.logger.debug(f"Cache hit for key: {cache_key[:8]}... (address: {normalized_address})")
+                return GeocodeResult(**data)
         except Exception as e:
             self.logger.debug(f"Cache read error: {e}")
         
@@ -769,13 +851,10 @@ class UnifiedGeocodingService:
         """Cache geocoding result with enhanced key generation."""
         # Create more specific cache key that preserves address uniqueness
         cache_key = self._generate_specific_cache_key(normalized_address)
-        cache_file = self.cache_dir / f"{cache_key}.json"
         
         try:
-            import json
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(result._asdict(), f, ensure_ascii=False, indent=2)
-                self.logger.debug(f"Cached result for key: {cache_key[:8]}... (address: {normalized_address})")
+            self.cache.put(cache_key, result._asdict())
+            self.logger.debug(f"Cached result for key: {cache_key[:8]}... (address: {normalized_address})")
         except Exception as e:
             self.logger.debug(f"Cache write error: {e}")
     
@@ -810,44 +889,126 @@ class UnifiedGeocodingService:
         # Generate hash of the unique key
         cache_key = hashlib.md5(unique_key.encode('utf-8')).hexdigest()
         
-        self.logger.debug(f"Generated cache key: {cache_key[:8]}... for components: {key_components}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Generated cache key: {cache_key[:8]}... for components: {key_components}")
         
         return cache_key
     
     def batch_geocode_addresses(
         self,
         addresses: List[str],
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        quality_threshold: float = 0.7
     ) -> Dict[str, Optional[GeocodeResult]]:
         """
         Geocode multiple addresses efficiently.
         
+        Addresses are resolved in stages over the whole batch: one cache lookup, one
+        exact join against ``address_locations``, one indexed fuzzy pass over the WMS
+        and GeoPackage address sets, the database fuzzy candidates, and finally the
+        rate-limited Nominatim queue for whatever is left. Hit counts and timings
+        per stage are kept in ``last_batch_stats``.
+        
         Args:
             addresses: List of address strings to geocode
-            progress_callback: Optional callback function for progress updates
+            progress_callback: Optional callback called as ``(index, total, address)``
+                               once per input address, with a 0-based index and
+                               ``total = len(addresses)``; addresses are reported when
+                               resolved, and the unresolved ones after the last stage
+            quality_threshold: Minimum quality score to accept result
             
         Returns:
             Dictionary mapping addresses to GeocodeResult objects
         """
-        results = {}
-        total = len(addresses)
+        results: Dict[str, Optional[GeocodeResult]] = {address: None for address in addresses}
+        total = len(results)
+        stats = {stage: {'hits': 0, 'seconds': 0.0} for stage in BATCH_STAGES}
+        occurrences = Counter(addresses)
+        reported = 0
         
         self.logger.info(f"Starting batch geocoding of {total} addresses")
         
-        for i, address in enumerate(addresses):
-            if progress_callback:
-                progress_callback(i, total, address)
-            
-            result = self.geocode_address(address)
-            results[address] = result
-            
-            if i % 50 == 0:  # Log progress every 50 addresses
-                success_count = sum(1 for r in results.values() if r is not None)
-                success_rate = (success_count / (i + 1)) * 100
-                self.logger.info(f"Progress: {i+1}/{total} ({success_rate:.1f}% success rate)")
+        # Addresses that normalize the same are resolved once
+        pending: Dict[str, List[str]] = {}
+        for address in results:
+            if address and address.strip():
+                pending.setdefault(self.normalizer.normalize_address(address.strip()), []).append(address)
+        
+        def report(address: str):
+            nonlocal reported
+            for _ in range(occurrences[address]):
+                if progress_callback:
+                    progress_callback(reported, len(addresses), address)
+                reported += 1
+        
+        def resolve(normalized: str, result: GeocodeResult, stage: str):
+            for address in pending.pop(normalized):
+                results[address] = result._replace(original_address=address.strip())
+                report(address)
+            stats[stage]['hits'] += 1
+        
+        def run_stage(stage: str, resolve_stage: Callable[[], Dict[str, GeocodeResult]]):
+            if not pending:
+                return
+            start = time.perf_counter()
+            try:
+                found = resolve_stage()
+            except Exception as e:
+                self.logger.error(f"Batch geocoding stage {stage} failed: {e}")
+                found = {}
+            accepted = {n: r for n, r in found.items() if r is not None and r.quality_score >= quality_threshold}
+            for normalized, result in accepted.items():
+                resolve(normalized, result, stage)
+            if stage != 'cache':
+                self.cache.put_many({self._generate_specific_cache_key(n): r._asdict() for n, r in accepted.items()})
+            stats[stage]['seconds'] = time.perf_counter() - start
+            self.logger.info(f"Batch stage {stage}: {len(accepted)} resolved, {len(pending)} remaining "
+                             f"({stats[stage]['seconds']:.2f}s)")
+        
+        def from_cache():
+            keys = {normalized: self._generate_specific_cache_key(normalized) for normalized in pending}
+            cached = self.cache.get_many(keys.values())
+            return {n: GeocodeResult(**cached[key]) for n, key in keys.items() if key in cached}
+        
+        def from_database_exact():
+            exact = self._database_exact_matches(list(pending))
+            return {n: self._database_exact_result(n, n, lat, lon) for n, (lat, lon) in exact.items()}
+        
+        def from_address_index(source_name: str):
+            address_index = self._get_address_index(source_name)
+            if address_index is None:
+                return {}
+            return {n: self._find_best_address_match(n, address_index, source_name) for n in pending}
+        
+        def from_database_fuzzy():
+            candidates = self._database_fuzzy_candidates()
+            return {n: self._database_fuzzy_match(n, n, candidates) for n in pending}
+        
+        def from_nominatim():
+            if NOMINATIM_QUALITY < quality_threshold:
+                # Nominatim results could never be accepted at this threshold
+                return {}
+            return {n: self._geocode_with_nominatim(addresses_[0].strip(), n) for n, addresses_ in list(pending.items())}
+        
+        run_stage('cache', from_cache)
+        run_stage('database_exact', from_database_exact)
+        run_stage('wms_national', lambda: from_address_index('wms_national'))
+        run_stage('geopackage_local', lambda: from_address_index('geopackage_local'))
+        run_stage('database_fuzzy', from_database_fuzzy)
+        run_stage('nominatim', from_nominatim)
+        for address in results:
+            if results[address] is None:
+                report(address)
         
         success_count = sum(1 for r in results.values() if r is not None)
-        final_success_rate = (success_count / total) * 100
+        final_success_rate = (success_count / total) * 100 if total else 0.0
+        self.last_batch_stats = {
+            'total': total,
+            'unique_normalized': sum(stage['hits'] for stage in stats.values()) + len(pending),
+            'geocoded': success_count,
+            'failed': total - success_count,
+            'stages': stats,
+        }
         
         self.logger.info(f"Batch geocoding complete: {success_count}/{total} "
                         f"addresses geocoded ({final_success_rate:.1f}% success rate)")
@@ -872,7 +1033,7 @@ class UnifiedGeocodingService:
         self.logger.info(f"Starting geocoding quality validation (sample size: {sample_size})")
         
         # Get sample addresses from database
-        with duckdb.connect(self.db_path) as conn:
+        with self.connections.connection() as conn:
             sample_addresses = conn.execute(f"""
                 SELECT address, lat, lon
                 FROM address_locations
@@ -985,6 +1146,7 @@ class UnifiedGeocodingService:
                 "data_sources": source_status,
                 "available_layers": available_layers,
                 "cache_directory": str(self.cache_dir),
+                "cache": self.cache.get_stats(),
                 "helsinki_bbox": self.helsinki_bbox,
                 "timestamp": datetime.now().isoformat()
             }
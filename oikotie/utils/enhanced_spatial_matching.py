@@ -6,6 +6,7 @@ Fixes boundary precision issues identified in spatial logic investigation
 
 import geopandas as gpd
 import pandas as pd
+import shapely
 from shapely.geometry import Point
 import numpy as np
 from typing import Dict, List, Tuple, Optional
@@ -75,13 +76,13 @@ class EnhancedSpatialMatcher:
         print("🌍 Converting coordinate systems...")
         conversion_start = time.time()
         
-        # Convert points to target projected CRS
-        points_proj = points_gdf.copy()
+        # Convert points to target projected CRS (inputs are only read, so no copies)
+        points_proj = points_gdf
         if points_proj.crs != self.target_crs:
             points_proj = points_proj.to_crs(self.target_crs)
         
         # Convert buildings to target projected CRS  
-        buildings_proj = buildings_gdf.copy()
+        buildings_proj = buildings_gdf
         if buildings_proj.crs != self.target_crs:
             buildings_proj = buildings_proj.to_crs(self.target_crs)
         
@@ -93,72 +94,81 @@ class EnhancedSpatialMatcher:
         print("🎯 Performing enhanced spatial matching...")
         matching_start = time.time()
         
-        results = []
-        
-        for idx, point_row in points_proj.iterrows():
-            point_geom = point_row.geometry
-            point_id = point_row[point_id_col]
-            
-            # Find potential matches using spatial index
-            potential_matches = buildings_proj[buildings_proj.geometry.intersects(
-                point_geom.buffer(self.tolerance_m)
-            )]
-            
-            if len(potential_matches) == 0:
-                # No matches within tolerance
-                results.append({
-                    point_id_col: point_id,
-                    building_id_col: None,
-                    'match_type': 'no_match',
-                    'distance_m': np.inf,
-                    'is_direct_match': False,
-                    'is_tolerance_match': False
-                })
-                self.stats['no_matches'] += 1
-                continue
-            
-            # Calculate distances to all potential matches
-            distances = potential_matches.geometry.distance(point_geom)
-            closest_idx = distances.idxmin()
-            closest_distance = distances.loc[closest_idx]
-            closest_building = potential_matches.loc[closest_idx]
-            
-            # Determine match type
-            is_direct_match = closest_building.geometry.contains(point_geom)
-            is_tolerance_match = closest_distance <= self.tolerance_m
-            
-            if is_direct_match:
-                match_type = 'direct_contains'
-                self.stats['direct_matches'] += 1
-            elif is_tolerance_match:
-                match_type = 'tolerance_buffer'
-                self.stats['tolerance_matches'] += 1
-            else:
-                match_type = 'no_match'
-                self.stats['no_matches'] += 1
-            
-            results.append({
-                point_id_col: point_id,
-                building_id_col: closest_building[building_id_col] if is_tolerance_match else None,
-                'match_type': match_type,
-                'distance_m': closest_distance,
-                'is_direct_match': is_direct_match,
-                'is_tolerance_match': is_tolerance_match
-            })
+        results_df = self._match_nearest(points_proj, buildings_proj, point_id_col, building_id_col)
         
         matching_time = time.time() - matching_start
         self.stats['matching_time'] = matching_time
         
         total_time = time.time() - start_time
         
-        # Create results DataFrame
-        results_df = pd.DataFrame(results)
-        
         # Print results summary
         self._print_matching_summary(results_df, total_time)
         
         return results_df
     
+    def _match_nearest(self,
+                       points_proj: gpd.GeoDataFrame,
+                       buildings_proj: gpd.GeoDataFrame,
+                       point_id_col: str,
+                       building_id_col: str) -> pd.DataFrame:
+        """
+        Match every point to its nearest building within tolerance in one bulk query
+        
+        Uses the buildings' STRtree ``nearest`` query with ``max_distance`` (what
+        ``sjoin_nearest`` runs on), so the cost is O(points × log buildings)
+        instead of a scan over all buildings per point. Among equally near
+        buildings the first one in ``buildings_proj`` order wins.
+        """
+        point_geoms = points_proj.geometry.values
+        building_geoms = buildings_proj.geometry.values
+        count = len(points_proj)
+        
+        nearest_building = np.full(count, -1, dtype=np.int64)
+        distances = np.full(count, np.inf)
+        if count and len(buildings_proj):
+            (point_pos, building_pos), pair_distances = buildings_proj.sindex.nearest(
+                point_geoms,
+                max_distance=self.tolerance_m,
+                return_distance=True,
+                return_all=True
+            )
+            # Keep the lowest building position per point when several are equally near
+            order = np.lexsort((building_pos, point_pos))
+            point_pos, building_pos, pair_distances = point_pos[order], building_pos[order], pair_distances[order]
+            first = np.unique(point_pos, return_index=True)[1]
+            nearest_building[point_pos[first]] = building_pos[first]
+            distances[point_pos[first]] = pair_distances[first]
+        
+        has_candidate = nearest_building >= 0
+        is_tolerance_match = distances <= self.tolerance_m
+        is_direct_match = np.zeros(count, dtype=bool)
+        is_direct_match[has_candidate] = shapely.contains(
+            np.asarray(building_geoms)[nearest_building[has_candidate]],
+            np.asarray(point_geoms)[has_candidate]
+        )
+        
+        match_type = np.select(
+            [is_direct_match, is_tolerance_match],
+            ['direct_contains', 'tolerance_buffer'],
+            default='no_match'
+        )
+        building_ids = buildings_proj[building_id_col].to_numpy(dtype=object)
+        matched_ids = np.full(count, None, dtype=object)
+        matched_ids[is_tolerance_match] = building_ids[nearest_building[is_tolerance_match]]
+        
+        self.stats['direct_matches'] = int(is_direct_match.sum())
+        self.stats['tolerance_matches'] = int((is_tolerance_match & ~is_direct_match).sum())
+        self.stats['no_matches'] = count - self.stats['direct_matches'] - self.stats['tolerance_matches']
+        
+        return pd.DataFrame({
+            point_id_col: points_proj[point_id_col].to_numpy(),
+            building_id_col: matched_ids.tolist(),
+            'match_type': match_type,
+            'distance_m': distances,
+            'is_direct_match': is_direct_match,
+            'is_tolerance_match': is_tolerance_match
+        })
+    
     def validate_boundary_cases(self, 
                                test_addresses: List[Dict],
                                buildings_gdf: gpd.GeoDataFrame) -> pd.DataFrame:
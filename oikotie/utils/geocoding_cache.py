@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Single-file geocoding result cache
+Stores geocoding results in one SQLite file behind an in-process LRU, with
+batch get/put, per-source expiry and hit/miss counters. ``import_json_dir``
+migrates the former one-JSON-file-per-address cache.
+
+SQLite rather than DuckDB: lookups are single-key point reads from many
+threads and processes, which SQLite in WAL mode serves in microseconds.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+# Result fields stored per entry (the fields of GeocodeResult)
+RESULT_FIELDS = ['latitude', 'longitude', 'confidence', 'source', 'method',
+                 'original_address', 'normalized_address', 'quality_score']
+
+# Seconds a cached result stays valid, by result source; unlisted sources never expire
+DEFAULT_SOURCE_TTL_SECONDS = {
+    'nominatim': 30 * 24 * 3600,
+    'database_fuzzy': 7 * 24 * 3600,
+}
+
+
+class GeocodingCache:
+    """Geocoding results keyed by cache key, in a SQLite file with an LRU in front."""
+
+    # Keys per ``IN (...)`` lookup, below SQLite's bound parameter limit
+    LOOKUP_CHUNK_SIZE = 500
+
+    def __init__(
+        self,
+        db_path: str = "data/cache/geocoding/geocoding_cache.sqlite",
+        source_ttl_seconds: Optional[Dict[str, float]] = None,
+        lru_size: int = 10000
+    ):
+        """
+        Open (and create if needed) the cache store.
+
+        Args:
+            db_path: SQLite file holding the cache table
+            source_ttl_seconds: Expiry per result source, defaults to DEFAULT_SOURCE_TTL_SECONDS
+            lru_size: Number of entries kept in memory
+        """
+        self.db_path = str(db_path)
+        self._local = threading.local()
+        self.source_ttl_seconds = dict(DEFAULT_SOURCE_TTL_SECONDS if source_ttl_seconds is None else source_ttl_seconds)
+        self.lru_size = lru_size
+
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'memory_hits': 0, 'store_hits': 0, 'misses': 0, 'expired': 0, 'puts': 0}
+
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        with self.connection() as con:
+            con.execute("""
+                CREATE TABLE IF NOT EXISTS geocoding_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    latitude REAL,
+                    longitude REAL,
+                    confidence REAL,
+                    source TEXT,
+                    method TEXT,
+                    original_address TEXT,
+                    normalized_address TEXT,
+                    quality_score REAL,
+                    cached_at REAL
+                ) WITHOUT ROWID
+            """)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """The calling thread's connection, committing on success and rolling back on error."""
+        con = getattr(self._local, 'connection', None)
+        if con is None:
+            con = sqlite3.connect(self.db_path, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            con.execute("PRAGMA mmap_size=268435456")
+            self._local.connection = con
+        with con:
+            yield con
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        con = getattr(self._local, 'connection', None)
+        if con is not None:
+            con.close()
+            self._local.connection = None
+
+    def _is_expired(self, source: str, cached_at: float, now: float) -> bool:
+        ttl = self.source_ttl_seconds.get(source)
+        return ttl is not None and now - cached_at > ttl
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._lru[key] = entry
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get one cached result, or None."""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the cached results of many keys, reading the store in chunked IN queries; misses are left out."""
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found: Dict[str, Dict[str, Any]] = {}
+        pending: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                entry = self._lru.get(key)
+                if entry is not None and not self._is_expired(entry[0]['source'], entry[1], now):
+                    self._lru.move_to_end(key)
+                    found[key] = dict(entry[0])
+                    self._stats['memory_hits'] += 1
+                else:
+                    self._lru.pop(key, None)
+                    pending.append(key)
+
+        rows = []
+        if pending:
+            try:
+                with self.connection() as con:
+                    for start in range(0, len(pending), self.LOOKUP_CHUNK_SIZE):
+                        chunk = pending[start:start + self.LOOKUP_CHUNK_SIZE]
+                        rows += con.execute(f"""
+                            SELECT cache_key, {', '.join(RESULT_FIELDS)}, cached_at
+                            FROM geocoding_cache
+                            WHERE cache_key IN ({', '.join('?' * len(chunk))})
+                        """, chunk).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Geocoding cache read failed: {e}")
+
+        with self._lock:
+            for row in rows:
+                key, values, cached_at = row[0], dict(zip(RESULT_FIELDS, row[1:-1])), row[-1]
+                if self._is_expired(values['source'], cached_at, now):
+                    self._stats['expired'] += 1
+                    continue
+                self._remember(key, (values, cached_at))
+                found[key] = dict(values)
+                self._stats['store_hits'] += 1
+            self._stats['misses'] += sum(1 for key in pending if key not in found)
+
+        return found
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache one result (a GeocodeResult as a dict)."""
+        self.put_many({key: result})
+
+    def put_many(self, results: Dict[str, Dict[str, Any]], cached_at: Optional[Dict[str, float]] = None) -> int:
+        """
+        Cache many results in one transaction, replacing existing entries.
+
+        Args:
+            results: Result dicts keyed by cache key
+            cached_at: Optional caching time per key (epoch seconds), defaults to now
+
+        Returns:
+            Number of entries written
+        """
+        if not results:
+            return 0
+        now = time.time()
+        times = {key: (cached_at or {}).get(key, now) for key in results}
+        rows = [
+            (key, *(result.get(field) for field in RESULT_FIELDS), times[key])
+            for key, result in results.items()
+        ]
+
+        try:
+            # One transaction for the whole batch
+            with self.connection() as con:
+                con.executemany(f"""
+                    INSERT OR REPLACE INTO geocoding_cache (cache_key, {', '.join(RESULT_FIELDS)}, cached_at)
+                    VALUES ({', '.join('?' * (len(RESULT_FIELDS) + 2))})
+                """, rows)
+        except sqlite3.Error as e:
+            logger.warning(f"Geocoding cache write failed: {e}")
+            return 0
+
+        with self._lock:
+            for key, result in results.items():
+                self._remember(key, ({field: result.get(field) for field in RESULT_FIELDS}, times[key]))
+            self._stats['puts'] += len(results)
+        return len(results)
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from the store; returns how many were removed."""
+        now = time.time()
+        removed = 0
+        with self.connection() as con:
+            for source, ttl in self.source_ttl_seconds.items():
+                if ttl is None:
+                    continue
+                removed += con.execute(
+                    "DELETE FROM geocoding_cache WHERE source = ? AND cached_at < ?", [source, now - ttl]
+                ).rowcount
+        with self._lock:
+            self._lru.clear()
+        return removed
+
+    def __len__(self) -> int:
+        with self.connection() as con:
+            return con.execute("SELECT COUNT(*) FROM geocoding_cache").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_entries'] = len(self._lru)
+        lookups = stats['memory_hits'] + stats['store_hits'] + stats['misses']
+        stats['hits'] = stats['memory_hits'] + stats['store_hits']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['stored_entries'] = len(self)
+        stats['db_path'] = self.db_path
+        return stats
+
+    def import_json_dir(self, directory: str, remove: bool = False, batch_size: int = 5000) -> Dict[str, int]:
+        """
+        Import a legacy cache directory of ``<cache_key>.json`` files.
+
+        The file name is the cache key and the file's modification time becomes the
+        caching time, so expiry continues where it left off.
+
+        Args:
+            directory: Directory with the JSON files
+            remove: Delete each file once it has been imported
+            batch_size: Entries written per statement
+
+        Returns:
+            Counts of imported and failed files
+        """
+        counts = {'imported': 0, 'failed': 0}
+        files = sorted(Path(directory).glob('*.json'))
+        for start in range(0, len(files), batch_size):
+            batch, times, imported_files = {}, {}, []
+            for path in files[start:start + batch_size]:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                    if not all(field in data for field in RESULT_FIELDS):
+                        raise ValueError("not a geocoding result")
+                    batch[path.stem] = data
+                    times[path.stem] = path.stat().st_mtime
+                    imported_files.append(path)
+                except Exception as e:
+                    logger.warning(f"Skipping geocoding cache file {path.name}: {e}")
+                    counts['failed'] += 1
+            written = self.put_many(batch, cached_at=times)
+            counts['imported'] += written
+            if remove and written:
+                for path in imported_files:
+                    path.unlink(missing_ok=True)
+        logger.info(f"Imported {counts['imported']} geocoding cache files ({counts['failed']} failed) from {directory}")
+        return counts
+
+
+def main():
+    """Migrate a JSON-file geocoding cache directory into the single-file store."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument('--json-dir', default='data/cache/geocoding', help='Directory of legacy <key>.json files')
+    parser.add_argument('--db', default=None, help='Cache store (default: <json-dir>/geocoding_cache.sqlite)')
+    parser.add_argument('--remove', action='store_true', help='Delete JSON files after importing them')
+    args = parser.parse_args()
+
+    cache = GeocodingCache(args.db or str(Path(args.json_dir) / 'geocoding_cache.sqlite'))
+    counts = cache.import_json_dir(args.json_dir, remove=args.remove)
+    print(f"Imported {counts['imported']} entries ({counts['failed']} failed); "
+          f"store now holds {len(cache)} entries")
+
+
+if __name__ == "__main__":
+    main()
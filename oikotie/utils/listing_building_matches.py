@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Cached listing-to-building matching for dashboards and scripts
+Matches every listing to the building containing it, or else to the nearest
+building within a buffer, in bulk STRtree queries. Results are stored in the
+``listing_building_matches`` table per (listings snapshot, buildings snapshot)
+pair, so a dashboard render only recomputes when either input has changed.
+Only the most recent snapshot pairs are kept. The table lives in its own DuckDB
+file next to the listings database and is opened only for the duration of a
+read or write, so a dashboard never holds the listings database writer lock.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import duckdb
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+from loguru import logger
+
+from ..database.connection import get_reader_connection
+
+# Buffer around a listing searched for the nearest building, in degrees (~100 m)
+DEFAULT_BUFFER_DEG = 0.001
+
+# Approximate meters per degree used to report buffer match distances
+METERS_PER_DEGREE = 111000
+
+# File holding the matches table, next to the listings database
+MATCHES_DB_NAME = "listing_building_matches.duckdb"
+
+# Identifies the matching rules; stored with every row so rule changes never serve stale matches
+MATCH_METHOD = "contains+nearest_deg"
+
+
+def match_to_buildings(points: gpd.GeoSeries, buildings_gdf: gpd.GeoDataFrame,
+                       buffer_distance: float = DEFAULT_BUFFER_DEG) -> pd.DataFrame:
+    """
+    Match points to buildings in two bulk spatial index queries.
+
+    A point inside one or more buildings is a ``direct`` match with the first of
+    them; otherwise the nearest building within ``buffer_distance`` (in the
+    points' units) is a ``buffer`` match. Among equally near buildings the first
+    one in ``buildings_gdf`` order wins.
+
+    Args:
+        points: Listing points, in the CRS of ``buildings_gdf``
+        buildings_gdf: Building polygons
+        buffer_distance: Search distance for ``buffer`` matches
+
+    Returns:
+        DataFrame aligned with ``points`` holding ``building_pos`` (row position in
+        ``buildings_gdf``, -1 without a match), ``match_type`` (direct/buffer/none)
+        and ``distance`` (0.0 for direct matches, inf without a match)
+    """
+    count = len(points)
+    building_pos = np.full(count, -1, dtype=np.int64)
+    distance = np.full(count, np.inf)
+    direct = np.zeros(count, dtype=bool)
+    geometries = np.asarray(points.values)
+    valid = ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+
+    if count and len(buildings_gdf) and valid.any():
+        tree = buildings_gdf.sindex
+
+        # Points inside a building: lowest building position per point
+        point_pos, inside_pos = tree.query(geometries[valid], predicate='within')
+        point_pos = np.flatnonzero(valid)[point_pos]
+        order = np.lexsort((inside_pos, point_pos))
+        point_pos, inside_pos = point_pos[order], inside_pos[order]
+        first = np.unique(point_pos, return_index=True)[1]
+        building_pos[point_pos[first]] = inside_pos[first]
+        distance[point_pos[first]] = 0.0
+        direct[point_pos[first]] = True
+
+        # Nearest building within the buffer for the rest
+        remaining = np.flatnonzero(valid & (building_pos < 0))
+        if len(remaining):
+            (point_pos, near_pos), near_distance = tree.nearest(
+                geometries[remaining], max_distance=buffer_distance, return_distance=True, return_all=True
+            )
+            order = np.lexsort((near_pos, point_pos))
+            point_pos, near_pos, near_distance = point_pos[order], near_pos[order], near_distance[order]
+            first = np.unique(point_pos, return_index=True)[1]
+            building_pos[remaining[point_pos[first]]] = near_pos[first]
+            distance[remaining[point_pos[first]]] = near_distance[first]
+
+    match_type = np.where(direct, 'direct', np.where(building_pos >= 0, 'buffer', 'none'))
+    return pd.DataFrame({'building_pos': building_pos, 'match_type': match_type, 'distance': distance},
+                        index=points.index)
+
+
+def listings_snapshot_version(listings_df: pd.DataFrame, id_col: str = 'id') -> str:
+    """Content version of the listing rows and coordinates being matched."""
+    hashed = pd.util.hash_pandas_object(listings_df[[id_col, 'latitude', 'longitude']], index=False)
+    return hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()[:16]
+
+
+def buildings_snapshot_version(buildings_gdf: gpd.GeoDataFrame) -> str:
+    """Content version of building geometries and the attributes shown with matches."""
+    digest = hashlib.sha1(b''.join(shapely.to_wkb(np.asarray(buildings_gdf.geometry.values))))
+    attributes = [col for col in ('osm_id', 'name', 'fclass') if col in buildings_gdf.columns]
+    if attributes:
+        hashed = pd.util.hash_pandas_object(buildings_gdf[attributes].astype(str), index=False)
+        digest.update(hashed.to_numpy().tobytes())
+    return digest.hexdigest()[:16]
+
+
+def file_snapshot_version(path: str, bbox: Optional[Tuple[float, float, float, float]] = None) -> str:
+    """Version of buildings read from a file (and cropped to ``bbox``), without hashing the geometries."""
+    stat = Path(path).stat()
+    version = f"{Path(path).name}:{stat.st_size}:{stat.st_mtime_ns}"
+    return f"{version}:{','.join(f'{value:g}' for value in bbox)}" if bbox else version
+
+
+class ListingBuildingMatchService:
+    """
+    Listing-to-building matches computed once per pair of input snapshots.
+
+    Matches are looked up in memory, then in the ``listing_building_matches``
+    table of the matches database, and only computed (and stored) when neither
+    has the pair. Storing a
+    pair drops the stored pairs of the same method beyond the ``keep_snapshots``
+    most recent, and the memory holds at most ``memo_size`` pairs.
+    """
+
+    def __init__(self, db_path: str = "data/real_estate.duckdb", buffer_distance: float = DEFAULT_BUFFER_DEG,
+                 keep_snapshots: int = 4, memo_size: int = 8, matches_db_path: Optional[str] = None):
+        """
+        Initialize the service.
+
+        Args:
+            db_path: Listings database; the matches database is kept next to it
+            buffer_distance: Search distance for buffer matches, in degrees
+            keep_snapshots: Snapshot pairs kept in the table per method, so a few
+                            dashboards with different listing filters do not evict each other
+            memo_size: Snapshot pairs kept in memory, least recently used dropped first
+            matches_db_path: DuckDB file holding the matches table; defaults to
+                             ``MATCHES_DB_NAME`` next to ``db_path``, and nothing is
+                             stored for an in-memory ``db_path``
+        """
+        self.db_path = db_path
+        if matches_db_path is None and db_path != ":memory:":
+            matches_db_path = str(Path(db_path).with_name(MATCHES_DB_NAME))
+        self.matches_db_path = matches_db_path
+        self.buffer_distance = buffer_distance
+        self.method = f"{MATCH_METHOD}:{buffer_distance:g}"
+        self.keep_snapshots = keep_snapshots
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[Tuple[str, str], pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'table_hits': 0, 'computed': 0}
+
+    @staticmethod
+    def _ensure_table(con) -> None:
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS listing_building_matches (
+                listings_version VARCHAR NOT NULL,
+                buildings_version VARCHAR NOT NULL,
+                method VARCHAR NOT NULL,
+                listing_row INTEGER NOT NULL,
+                listing_id VARCHAR,
+                building_pos INTEGER,
+                building_id VARCHAR,
+                match_type VARCHAR,
+                distance_m DOUBLE,
+                computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (listings_version, buildings_version, method, listing_row)
+            )
+        """)
+
+    def _load(self, listings_version: str, buildings_version: str, expected_rows: int) -> Optional[pd.DataFrame]:
+        """Stored matches of a snapshot pair, or None unless all rows are present."""
+        if self.matches_db_path is None or not Path(self.matches_db_path).exists():
+            return None
+        try:
+            con = get_reader_connection(self.matches_db_path)
+            try:
+                stored = con.execute("""
+                    SELECT listing_row, building_pos, match_type, distance_m
+                    FROM listing_building_matches
+                    WHERE listings_version = ? AND buildings_version = ? AND method = ?
+                    ORDER BY listing_row
+                """, [listings_version, buildings_version, self.method]).df()
+            finally:
+                con.close()
+        except Exception as e:
+            logger.warning(f"Could not read stored listing building matches: {e}")
+            return None
+        if len(stored) != expected_rows:
+            return None
+        return stored
+
+    def _store(self, listings_version: str, buildings_version: str, listing_ids: pd.Series,
+               matches: pd.DataFrame, building_ids: np.ndarray) -> None:
+        if self.matches_db_path is None:
+            return
+        rows = pd.DataFrame({
+            'listings_version': listings_version,
+            'buildings_version': buildings_version,
+            'method': self.method,
+            'listing_row': np.arange(len(matches), dtype=np.int64),
+            'listing_id': listing_ids.astype(str).to_numpy(),
+            'building_pos': matches['building_pos'].to_numpy(),
+            'building_id': building_ids,
+            'match_type': matches['match_type'].to_numpy(),
+            'distance_m': matches['distance_m'].to_numpy(),
+        })
+        try:
+            Path(self.matches_db_path).parent.mkdir(parents=True, exist_ok=True)
+            # Closed right after the write, so other dashboards can read and write the file too
+            con = duckdb.connect(self.matches_db_path)
+            try:
+                con.begin()
+                self._ensure_table(con)
+                con.register('new_listing_building_matches', rows)
+                try:
+                    con.execute("""
+                        INSERT OR REPLACE INTO listing_building_matches
+                        (listings_version, buildings_version, method, listing_row, listing_id,
+                         building_pos, building_id, match_type, distance_m)
+                        SELECT listings_version, buildings_version, method, listing_row, listing_id,
+                               building_pos, building_id, match_type, distance_m
+                        FROM new_listing_building_matches
+                    """)
+                finally:
+                    con.unregister('new_listing_building_matches')
+                # Older snapshots are never read again once the inputs have moved on
+                con.execute("""
+                    DELETE FROM listing_building_matches
+                    WHERE method = ? AND listings_version || '/' || buildings_version NOT IN (
+                        SELECT listings_version || '/' || buildings_version
+                        FROM listing_building_matches
+                        WHERE method = ?
+                        GROUP BY listings_version, buildings_version
+                        ORDER BY max(computed_at) DESC
+                        LIMIT ?
+                    )
+                """, [self.method, self.method, self.keep_snapshots])
+                con.commit()
+            finally:
+                con.close()
+        except Exception as e:
+            logger.warning(f"Could not store listing building matches: {e}")
+
+    def get_matches(self, listings_df: pd.DataFrame, buildings_gdf: gpd.GeoDataFrame,
+                    id_col: str = 'id', buildings_version: Optional[str] = None) -> pd.DataFrame:
+        """
+        Matches of every listing, aligned with ``listings_df``.
+
+        Args:
+            listings_df: Listings with ``id_col``, ``latitude`` and ``longitude``
+            buildings_gdf: Building polygons in EPSG:4326 with optional osm_id/name/fclass
+            id_col: Listing identifier column
+            buildings_version: Known version of the buildings (e.g. file name and mtime);
+                               computed from the geometries when omitted
+
+        Returns:
+            DataFrame with ``match_type`` (direct/buffer/none), ``building_id``,
+            ``building_name``, ``building_type``, ``distance_m`` and ``matched``
+        """
+        listings_version = listings_snapshot_version(listings_df, id_col)
+        buildings_version = buildings_version or buildings_snapshot_version(buildings_gdf)
+        key = (listings_version, buildings_version)
+
+        with self._lock:
+            matches = self._memo.get(key)
+            if matches is not None:
+                self._memo.move_to_end(key)
+                self.stats['memory_hits'] += 1
+
+        if matches is None:
+            matches = self._load(listings_version, buildings_version, len(listings_df))
+            if matches is not None:
+                self.stats['table_hits'] += 1
+            else:
+                points = gpd.GeoSeries(gpd.points_from_xy(listings_df['longitude'], listings_df['latitude']),
+                                       crs=buildings_gdf.crs or "EPSG:4326")
+                matches = match_to_buildings(points, buildings_gdf, self.buffer_distance).reset_index(drop=True)
+                matches['distance_m'] = np.where(matches['match_type'] == 'buffer',
+                                                 matches['distance'] * METERS_PER_DEGREE, matches['distance'])
+                self._store(listings_version, buildings_version, listings_df[id_col], matches,
+                            self._attribute(buildings_gdf, 'osm_id', 'N/A', matches['building_pos'].to_numpy(),
+                                            as_text=True))
+                self.stats['computed'] += 1
+                logger.info(f"Matched {len(matches)} listings to buildings "
+                            f"(snapshots {listings_version}/{buildings_version})")
+            with self._lock:
+                self._memo[key] = matches
+                while len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+
+        building_pos = matches['building_pos'].to_numpy()
+        result = pd.DataFrame({
+            'match_type': matches['match_type'].to_numpy(),
+            'building_id': self._attribute(buildings_gdf, 'osm_id', 'N/A', building_pos),
+            'building_name': self._attribute(buildings_gdf, 'name', '', building_pos),
+            'building_type': self._attribute(buildings_gdf, 'fclass', '', building_pos),
+            'distance_m': matches['distance_m'].to_numpy(),
+            'matched': building_pos >= 0,
+        }, index=listings_df.index)
+        return result
+
+    @staticmethod
+    def _attribute(buildings_gdf: gpd.GeoDataFrame, column: str, default, building_pos: np.ndarray,
+                   as_text: bool = False) -> np.ndarray:
+        """A building attribute per match, ``default`` when the column is missing and None without a match."""
+        values = np.full(len(building_pos), None, dtype=object)
+        matched = building_pos >= 0
+        if column in buildings_gdf.columns:
+            values[matched] = buildings_gdf[column].to_numpy(dtype=object)[building_pos[matched]]
+        else:
+            values[matched] = default
+        if as_text:
+            values[matched] = [str(value) for value in values[matched]]
+        return values
+
+    def clear_memory(self) -> None:
+        """Forget matches held in memory; stored matches stay in the matches database."""
+        with self._lock:
+            self._memo.clear()
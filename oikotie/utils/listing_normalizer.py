@@ -0,0 +1,101 @@
+"""
+Vectorized normalization of scraped listing details.
+
+Parses the raw Finnish ``details`` dicts of a whole batch of listings into typed
+columns in one pass using pyarrow string kernels, instead of running the regex
+based helpers row by row.
+"""
+
+import json
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_encode_json = json.JSONEncoder(ensure_ascii=False).encode
+
+# Detail keys stored in dedicated columns; everything else goes to other_details_json
+CORE_DETAIL_KEYS = (
+    'sijainti', 'rakennuksen_tyyppi', 'velaton_hinta', 'myyntihinta',
+    'asuinpinta-ala', 'huoneita', 'rakennusvuosi',
+)
+
+NORMALIZED_COLUMNS = [
+    'address', 'postal_code', 'listing_type', 'price_eur', 'size_m2',
+    'rooms', 'year_built', 'other_details_json',
+]
+
+
+def _string_array(values: Sequence[Any]) -> pa.Array:
+    """Build an Arrow string array, stringifying any non-string values."""
+    try:
+        return pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array([v if v is None or isinstance(v, str) else str(v) for v in values], type=pa.string())
+
+
+def parse_numbers(values: Sequence[Any], target_type: str = 'float') -> pd.Series:
+    """Vectorized equivalent of ``_clean_and_convert`` for a sequence of strings.
+
+    Thousands separators (spaces and non-breaking spaces) are removed, the first
+    run of digits/commas/dots is taken and a decimal comma becomes a dot.
+    Unparseable values become NaN (float) or <NA> (int).
+    """
+    cleaned = pc.replace_substring_regex(_string_array(values), pattern='[\u00a0 ]', replacement='')
+    number = pc.struct_field(pc.extract_regex(cleaned, pattern=r'(?P<number>[\d,.]+)'), [0])
+    number = pc.replace_substring(number, pattern=',', replacement='.')
+    # Leave only strings float() would accept (e.g. not "1.2.3") before casting
+    number = pc.if_else(pc.match_substring_regex(number, pattern=r'^(\d+\.?\d*|\.\d+)$'), number, None)
+    parsed = pd.Series(pc.cast(number, pa.float64()).to_numpy(zero_copy_only=False), dtype='float64')
+
+    if target_type == 'int':
+        return np.trunc(parsed).astype('Int64')
+    return parsed
+
+
+def extract_postal_codes(addresses: Sequence[Any]) -> pd.Series:
+    """Vectorized equivalent of ``extract_postal_code`` (first 5-digit token)."""
+    codes = pc.struct_field(pc.extract_regex(_string_array(addresses), pattern=r'\b(?P<code>\d{5})\b'), [0])
+    return pd.Series(codes.to_numpy(zero_copy_only=False), dtype=object)
+
+
+def normalize_listing_details(details_list: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Normalize a batch of raw ``details`` dicts into typed columns.
+
+    Returns a DataFrame aligned with the input order with the columns in
+    ``NORMALIZED_COLUMNS``: string columns use None for missing values,
+    ``price_eur``/``size_m2`` are float64 and ``rooms``/``year_built`` are Int64.
+    """
+    if not details_list:
+        return pd.DataFrame(columns=NORMALIZED_COLUMNS)
+
+    # Gather the raw columns in a single pass over the dicts
+    address, listing_type, price, size, rooms, year_built, other_details_json = [], [], [], [], [], [], []
+    for details in details_list:
+        address.append(details.get('sijainti'))
+        listing_type.append(details.get('rakennuksen_tyyppi'))
+        price.append(details.get('velaton_hinta') or details.get('myyntihinta'))
+        size.append(details.get('asuinpinta-ala'))
+        rooms.append(details.get('huoneita'))
+        year_built.append(details.get('rakennusvuosi'))
+        other_details_json.append(_encode_json({k: v for k, v in details.items() if k not in CORE_DETAIL_KEYS}))
+
+    return pd.DataFrame({
+        'address': pd.Series(address, dtype=object),
+        'postal_code': extract_postal_codes(address),
+        'listing_type': pd.Series(listing_type, dtype=object),
+        'price_eur': parse_numbers(price, 'float'),
+        'size_m2': parse_numbers(size, 'float'),
+        'rooms': parse_numbers(rooms, 'int'),
+        'year_built': parse_numbers(year_built, 'int'),
+        'other_details_json': pd.Series(other_details_json, dtype=object),
+    })
+
+
+def to_python_rows(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert a normalized frame to dicts of plain Python values (None for missing)."""
+    columns = list(frame.columns)
+    values = [frame[column].astype(object).where(frame[column].notna(), None).tolist() for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*values)]
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Edit-distance kernels for address matching
+Scores one query string against many candidates at once, using rapidfuzz when
+it is installed and a NumPy two-row dynamic program otherwise
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+try:
+    from rapidfuzz.distance import Levenshtein
+    from rapidfuzz.process import cdist
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+
+def levenshtein_distance(text1: str, text2: str) -> int:
+    """Levenshtein distance of two strings, keeping only two rows of the DP matrix."""
+    if RAPIDFUZZ_AVAILABLE:
+        return Levenshtein.distance(text1, text2)
+    if len(text1) < len(text2):
+        text1, text2 = text2, text1
+    previous = list(range(len(text2) + 1))
+    for i, char1 in enumerate(text1, 1):
+        current = [i]
+        for j, char2 in enumerate(text2, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char1 != char2)))
+        previous = current
+    return previous[-1]
+
+
+def levenshtein_distances(query: str, candidates: Sequence[str]) -> np.ndarray:
+    """Levenshtein distance from ``query`` to every candidate."""
+    count = len(candidates)
+    if count == 0:
+        return np.zeros(0, dtype=np.int64)
+    if RAPIDFUZZ_AVAILABLE:
+        return cdist([query], list(candidates), scorer=Levenshtein.distance, dtype=np.int64)[0]
+
+    lengths = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=count)
+    width = int(lengths.max())
+    if not query or width == 0:
+        return np.maximum(lengths, len(query))
+
+    # One row of code points per candidate; the zero padding past a candidate's end
+    # never influences the DP cells up to its own length
+    codes = np.array(candidates, dtype=f'<U{width}').view(np.uint32).reshape(count, width)
+    columns = np.arange(width + 1, dtype=np.int64)
+    previous = np.broadcast_to(columns, (count, width + 1)).copy()
+    step = np.empty_like(previous)
+    for i, char in enumerate(query, 1):
+        step[:, 0] = i
+        np.minimum(previous[:, 1:] + 1, previous[:, :-1] + (codes != ord(char)), out=step[:, 1:])
+        # Insertions chain left to right: row[j] = min over k <= j of step[k] + (j - k)
+        previous = np.minimum.accumulate(step - columns, axis=1) + columns
+    return previous[np.arange(count), lengths]
+
+
+def levenshtein_similarities(query: str, candidates: Sequence[str]) -> np.ndarray:
+    """``1 - distance / longer length`` for every candidate; 0.0 where either string is empty."""
+    if len(candidates) == 0 or not query:
+        return np.zeros(len(candidates))
+    lengths = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=len(candidates))
+    distances = levenshtein_distances(query, candidates)
+    longest = np.maximum(lengths, len(query))
+    similarities = np.maximum(0.0, 1.0 - distances / longest)
+    similarities[lengths == 0] = 0.0
+    return similarities
@@ -8,7 +8,7 @@ Addresses user feedback on building property display and UI improvements
 import geopandas as gpd
 import pandas as pd
 import folium
-import duckdb
+from ...database.connection import get_reader_connection
 import json
 from datetime import datetime
 from pathlib import Path
@@ -91,7 +91,7 @@ class DashboardBuilder:
     
     def _load_vanhanlinnankuja_listings(self, database_file: str) -> pd.DataFrame:
         """Load Vanhanlinnankuja listings from database"""
-        conn = duckdb.connect(database_file)
+        conn = get_reader_connection(database_file)
         query = """
         SELECT l.url as id, l.address, al.lat as latitude, al.lon as longitude,
                l.price_eur as price, l.rooms, l.size_m2, l.listing_type
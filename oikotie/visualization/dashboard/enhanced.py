@@ -7,10 +7,9 @@ Part of the Oikotie visualization package
 
 import geopandas as gpd
 import pandas as pd
-from shapely.geometry import Point
 import folium
 from folium import plugins
-import duckdb
+from ...database.connection import get_reader_connection
 from pathlib import Path
 import random
 from datetime import datetime
@@ -19,6 +18,8 @@ import numpy as np
 import branca.colormap as cm
 from jinja2 import Template
 
+from ...utils.listing_building_matches import ListingBuildingMatchService, file_snapshot_version
+
 class EnhancedDashboard:
     """Enhanced interactive dashboard with building highlighting and multi-mode views"""
     
@@ -42,6 +43,9 @@ class EnhancedDashboard:
             'listing_opacity': 0.9
         }
         
+        # Shared listing-to-building matches, persisted per data snapshot
+        self.match_service = ListingBuildingMatchService(db_path)
+        
     def load_data_for_dashboard(self):
         """Load and prepare data for dashboard"""
         print("=" * 60)
@@ -50,7 +54,7 @@ class EnhancedDashboard:
         
         # Load listings
         try:
-            conn = duckdb.connect(self.db_path)
+            conn = get_reader_connection(self.db_path)
             query = """
             SELECT l.url as id, l.address, al.lat as latitude, al.lon as longitude,
                    l.price_eur as price, l.rooms, l.size_m2, l.listing_type, l.city
@@ -75,95 +79,22 @@ class EnhancedDashboard:
             return None, None, None
         
         # Perform spatial matching for dashboard
-        results_df = self.perform_spatial_matching_for_dashboard(listings_df, buildings_gdf)
+        results_df = self.perform_spatial_matching_for_dashboard(
+            listings_df, buildings_gdf, buildings_version=file_snapshot_version(self.osm_buildings_path)
+        )
         
         return listings_df, buildings_gdf, results_df
     
-    def perform_spatial_matching_for_dashboard(self, listings_df, buildings_gdf):
+    def perform_spatial_matching_for_dashboard(self, listings_df, buildings_gdf, buildings_version=None):
         """Perform spatial matching optimized for dashboard display"""
         print(f"🔍 Performing spatial matching for {len(listings_df):,} listings...")
         
-        results = []
+        # Computed once per listings/buildings snapshot pair, then served from the matches table
+        matches = self.match_service.get_matches(listings_df, buildings_gdf, buildings_version=buildings_version)
+        listing_columns = ['id', 'address', 'latitude', 'longitude', 'price', 'rooms', 'size_m2', 'listing_type']
+        results_df = (listings_df[listing_columns].rename(columns={'id': 'listing_id'})
+                      .join(matches).reset_index(drop=True))
         
-        for idx, listing in listings_df.iterrows():
-            if idx % 1000 == 0:
-                print(f"   Progress: {idx:,}/{len(listings_df):,}")
-            
-            point = Point(listing['longitude'], listing['latitude'])
-            
-            # Direct containment check
-            containing_buildings = buildings_gdf[buildings_gdf.contains(point)]
-            
-            if not containing_buildings.empty:
-                building = containing_buildings.iloc[0]
-                results.append({
-                    'listing_id': listing['id'],
-                    'address': listing['address'],
-                    'latitude': listing['latitude'],
-                    'longitude': listing['longitude'],
-                    'price': listing['price'],
-                    'rooms': listing['rooms'],
-                    'size_m2': listing['size_m2'],
-                    'listing_type': listing['listing_type'],
-                    'match_type': 'direct',
-                    'building_id': building.get('osm_id', 'N/A'),
-                    'building_name': building.get('name', ''),
-                    'building_type': building.get('fclass', ''),
-                    'distance_m': 0.0,
-                    'matched': True
-                })
-            else:
-                # Buffer search
-                buffer_distance = 0.001  # ~100m
-                buffered_point = point.buffer(buffer_distance)
-                intersecting_buildings = buildings_gdf[buildings_gdf.intersects(buffered_point)]
-                
-                if not intersecting_buildings.empty:
-                    # Find closest building
-                    import warnings
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore", UserWarning)
-                        distances = intersecting_buildings.geometry.distance(point)
-                    
-                    closest_idx = distances.idxmin()
-                    closest_building = intersecting_buildings.loc[closest_idx]
-                    closest_distance = distances.loc[closest_idx] * 111000
-                    
-                    results.append({
-                        'listing_id': listing['id'],
-                        'address': listing['address'],
-                        'latitude': listing['latitude'],
-                        'longitude': listing['longitude'],
-                        'price': listing['price'],
-                        'rooms': listing['rooms'],
-                        'size_m2': listing['size_m2'],
-                        'listing_type': listing['listing_type'],
-                        'match_type': 'buffer',
-                        'building_id': closest_building.get('osm_id', 'N/A'),
-                        'building_name': closest_building.get('name', ''),
-                        'building_type': closest_building.get('fclass', ''),
-                        'distance_m': closest_distance,
-                        'matched': True
-                    })
-                else:
-                    results.append({
-                        'listing_id': listing['id'],
-                        'address': listing['address'],
-                        'latitude': listing['latitude'],
-                        'longitude': listing['longitude'],
-                        'price': listing['price'],
-                        'rooms': listing['rooms'],
-                        'size_m2': listing['size_m2'],
-                        'listing_type': listing['listing_type'],
-                        'match_type': 'none',
-                        'building_id': None,
-                        'building_name': None,
-                        'building_type': None,
-                        'distance_m': float('inf'),
-                        'matched': False
-                    })
-        
-        results_df = pd.DataFrame(results)
         print(f"✅ Spatial matching complete: {len(results_df[results_df['matched']]):,}/{len(results_df):,} matched")
         
         return results_df
@@ -12,7 +12,7 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from datetime import datetime
 from pathlib import Path
-import duckdb
+from ...database.connection import get_reader_connection
 from shapely.geometry import Point, shape
 from shapely import wkt
 import numpy as np
@@ -20,7 +20,7 @@ import numpy as np
 class EnhancedFinnishDashboard:
     def __init__(self, db_path="data/real_estate.duckdb"):
         self.db_path = db_path
-        self.conn = duckdb.connect(db_path)
+        self.conn = get_reader_connection(db_path)
         
         # Load spatial extension
         self.conn.execute("INSTALL spatial;")
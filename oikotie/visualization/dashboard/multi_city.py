@@ -7,10 +7,9 @@ Part of the Oikotie visualization package
 
 import geopandas as gpd
 import pandas as pd
-from shapely.geometry import Point
 import folium
 from folium import plugins
-import duckdb
+from ...database.connection import get_reader_connection
 from pathlib import Path
 import random
 from datetime import datetime
@@ -21,6 +20,7 @@ from jinja2 import Template
 from typing import Dict, List, Optional, Tuple, Any
 
 from ..utils.config import get_city_config, CityConfig, OutputConfig
+from ...utils.listing_building_matches import ListingBuildingMatchService, file_snapshot_version
 
 
 class MultiCityDashboard:
@@ -40,12 +40,15 @@ class MultiCityDashboard:
             'listing_opacity': 0.9
         }
         
+        # Shared listing-to-building matches, persisted per data snapshot
+        self.match_service = ListingBuildingMatchService(db_path)
+        
     def load_city_data(self, city: str, sample_size: Optional[int] = None) -> pd.DataFrame:
         """Load listings data for a specific city"""
         print(f"📊 Loading data for {city}")
         
         try:
-            conn = duckdb.connect(self.db_path)
+            conn = get_reader_connection(self.db_path)
             
             # Debug: Check if city exists in database
             city_check = conn.execute("SELECT COUNT(*) FROM listings WHERE city = ?", [city]).fetchone()[0]
@@ -113,6 +116,9 @@ class MultiCityDashboard:
                 min_lon, min_lat, max_lon, max_lat = bbox
                 buildings_gdf = buildings_gdf.cx[min_lon:max_lon, min_lat:max_lat]
             
+            # Lets the matches be looked up without hashing every footprint
+            buildings_gdf.attrs['snapshot_version'] = file_snapshot_version(building_file, bbox)
+            
             print(f"✅ Loaded {len(buildings_gdf):,} building footprints for {city}")
             return buildings_gdf
             
@@ -135,69 +141,11 @@ class MultiCityDashboard:
         
         print(f"🔍 Performing spatial matching for {len(listings_df):,} listings...")
         
-        results = []
-        
-        for idx, listing in listings_df.iterrows():
-            if idx % 100 == 0 and idx > 0:
-                print(f"   Progress: {idx:,}/{len(listings_df):,}")
-            
-            point = Point(listing['longitude'], listing['latitude'])
-            
-            # Direct containment check
-            containing_buildings = buildings_gdf[buildings_gdf.contains(point)]
-            
-            if not containing_buildings.empty:
-                building = containing_buildings.iloc[0]
-                result = listing.to_dict()
-                result.update({
-                    'match_type': 'direct',
-                    'building_id': building.get('osm_id', 'N/A'),
-                    'building_name': building.get('name', ''),
-                    'building_type': building.get('fclass', ''),
-                    'distance_m': 0.0,
-                    'matched': True
-                })
-                results.append(result)
-            else:
-                # Buffer search
-                buffer_distance = 0.001  # ~100m
-                buffered_point = point.buffer(buffer_distance)
-                intersecting_buildings = buildings_gdf[buildings_gdf.intersects(buffered_point)]
-                
-                if not intersecting_buildings.empty:
-                    # Find closest building
-                    import warnings
-                    with warnings.catch_warnings():
-                        warnings.simplefilter("ignore", UserWarning)
-                        distances = intersecting_buildings.geometry.distance(point)
-                    
-                    closest_idx = distances.idxmin()
-                    closest_building = intersecting_buildings.loc[closest_idx]
-                    closest_distance = distances.loc[closest_idx] * 111000
-                    
-                    result = listing.to_dict()
-                    result.update({
-                        'match_type': 'buffer',
-                        'building_id': closest_building.get('osm_id', 'N/A'),
-                        'building_name': closest_building.get('name', ''),
-                        'building_type': closest_building.get('fclass', ''),
-                        'distance_m': closest_distance,
-                        'matched': True
-                    })
-                    results.append(result)
-                else:
-                    result = listing.to_dict()
-                    result.update({
-                        'match_type': 'none',
-                        'building_id': None,
-                        'building_name': None,
-                        'building_type': None,
-                        'distance_m': float('inf'),
-                        'matched': False
-                    })
-                    results.append(result)
-        
-        results_df = pd.DataFrame(results)
+        # Computed once per listings/buildings snapshot pair, then served from the matches table
+        matches = self.match_service.get_matches(
+            listings_df, buildings_gdf, buildings_version=buildings_gdf.attrs.get('snapshot_version')
+        )
+        results_df = listings_df.drop(columns=matches.columns, errors='ignore').join(matches).reset_index(drop=True)
         matched_count = len(results_df[results_df['matched']])
         print(f"✅ Spatial matching complete: {matched_count:,}/{len(results_df):,} matched")
         
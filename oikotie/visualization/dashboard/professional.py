@@ -10,7 +10,7 @@ import pandas as pd
 from shapely.geometry import Point
 import folium
 from folium import plugins
-import duckdb
+from ...database.connection import get_reader_connection
 from pathlib import Path
 import random
 from datetime import datetime
@@ -80,7 +80,7 @@ class ProfessionalRealEstateDashboard:
         
         # Load ALL Helsinki listings (including historical) with enhanced query
         try:
-            conn = duckdb.connect(self.db_path)
+            conn = get_reader_connection(self.db_path)
             query = """
             SELECT l.url as id, l.address, al.lat as latitude, al.lon as longitude,
                    l.price_eur as price, l.rooms, l.size_m2, l.listing_type, l.city,
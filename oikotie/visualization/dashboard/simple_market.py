@@ -10,13 +10,13 @@ import pandas as pd
 import plotly.express as px
 from datetime import datetime
 from pathlib import Path
-import duckdb
+from ...database.connection import get_reader_connection
 import numpy as np
 
 class SimpleMarketDashboard:
     def __init__(self, db_path="data/real_estate.duckdb"):
         self.db_path = db_path
-        self.conn = duckdb.connect(db_path)
+        self.conn = get_reader_connection(db_path)
         
     def load_listings_with_coordinates(self):
         """Load listings with their geocoded coordinates - FAST & SIMPLE"""
@@ -16,6 +16,7 @@ from functools import lru_cache
 import logging
 
 from .config import DatabaseConfig
+from ...database.connection import get_reader_connection
 
 
 class DataLoader:
@@ -41,7 +42,7 @@ class DataLoader:
         """Establish database connection."""
         if self.connection is None:
             try:
-                self.connection = duckdb.connect(
+                self.connection = get_reader_connection(
                     str(self.config.duckdb_path),
                     read_only=self.config.read_only
                 )
@@ -0,0 +1,169 @@
+"""
+Pool of reusable browser sessions for the scraper.
+
+Starting Chrome costs seconds and hundreds of MB, so scraper sessions are kept
+alive between chunks of work. Sessions are checked out and back in, recycled
+after a number of page loads or when the browser's resident memory grows too
+large, and warmed up (cookie consent accepted) once when they are created.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import psutil
+from loguru import logger
+
+
+class WebDriverPool:
+    """Bounded pool of browser sessions created by ``factory``.
+
+    Sessions are expected to provide ``close()``, and optionally ``warm_up()``,
+    ``pages_loaded`` and ``driver`` (used to measure the browser's RSS).
+    """
+
+    def __init__(self, factory: Callable[[], Any], max_size: int = 5, max_pages: int = 200,
+                 max_rss_mb: Optional[float] = 1500.0, warm_up: bool = True):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.warm_up = warm_up
+
+        self._idle: List[Any] = []
+        self._size = 0
+        self._generation = 0
+        self._session_generation: Dict[int, int] = {}
+        self._condition = threading.Condition()
+
+        self._stats = {
+            'created': 0,
+            'checkouts': 0,
+            'recycled_pages': 0,
+            'recycled_memory': 0,
+            'recycled_errors': 0,
+            'total_wait_seconds': 0.0,
+            'max_wait_seconds': 0.0,
+        }
+
+    def _create_session(self) -> Any:
+        session = self.factory()
+        if self.warm_up and hasattr(session, 'warm_up'):
+            try:
+                session.warm_up()
+            except Exception as e:
+                logger.warning(f"Browser session warm-up failed: {e}")
+        return session
+
+    def checkout(self, timeout: Optional[float] = None) -> Any:
+        """Borrow a session, creating one if the pool is below ``max_size``."""
+        start = time.perf_counter()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not self._idle and self._size >= self.max_size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No browser session available within {timeout}s")
+                self._condition.wait(remaining)
+            session = self._idle.pop() if self._idle else None
+            if session is None:
+                self._size += 1
+            generation = self._generation
+
+        if session is None:
+            try:
+                session = self._create_session()
+            except Exception:
+                with self._condition:
+                    self._size -= 1
+                    self._condition.notify()
+                raise
+            with self._condition:
+                self._session_generation[id(session)] = generation
+                self._stats['created'] += 1
+
+        waited = time.perf_counter() - start
+        with self._condition:
+            self._stats['checkouts'] += 1
+            self._stats['total_wait_seconds'] += waited
+            self._stats['max_wait_seconds'] = max(self._stats['max_wait_seconds'], waited)
+        return session
+
+    def checkin(self, session: Any, failed: bool = False) -> None:
+        """Return a session; it is closed instead if it is stale, worn out or failed."""
+        reason = self._recycle_reason(session, failed)
+        with self._condition:
+            if self._session_generation.get(id(session)) != self._generation and reason is None:
+                reason = 'closed'
+            if reason is None:
+                self._idle.append(session)
+            else:
+                self._size -= 1
+                self._session_generation.pop(id(session), None)
+                if reason != 'closed':
+                    self._stats[f'recycled_{reason}'] += 1
+            self._condition.notify()
+
+        if reason is not None:
+            logger.debug(f"Recycling browser session ({reason})")
+            self._close_session(session)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Borrow a session for the duration of a ``with`` block."""
+        session = self.checkout(timeout)
+        failed = False
+        try:
+            yield session
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.checkin(session, failed=failed)
+
+    def _recycle_reason(self, session: Any, failed: bool) -> Optional[str]:
+        if failed:
+            return 'errors'
+        if self.max_pages and getattr(session, 'pages_loaded', 0) >= self.max_pages:
+            return 'pages'
+        if self.max_rss_mb and self._session_rss_mb(session) > self.max_rss_mb:
+            return 'memory'
+        return None
+
+    def _session_rss_mb(self, session: Any) -> float:
+        """Resident memory of the driver process and its browser children."""
+        try:
+            process = psutil.Process(session.driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def _close_session(self, session: Any) -> None:
+        try:
+            session.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser session: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get checkout, wait time and recycling statistics."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['size'] = self._size
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._size - len(self._idle)
+        stats['avg_wait_seconds'] = stats['total_wait_seconds'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Close idle sessions; sessions in use are closed when checked back in."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._generation += 1
+            for session in idle:
+                self._session_generation.pop(id(session), None)
+            self._condition.notify_all()
+        for session in idle:
+            self._close_session(session)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark: exhaustive vs indexed fuzzy address matching
+
+Scores N queries against a synthetic WMS-shaped address set, once by scanning
+every address (the previous ``_find_best_address_match`` behaviour) and once
+through the blocked ``AddressIndex``, and checks that both pick the same match.
+
+Usage:
+    uv run python quickcheck/benchmark_address_index.py --addresses 5000 --queries 20
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+from shapely.geometry import Point
+
+from oikotie.utils.enhanced_geocoding_service import AddressNormalizer, UnifiedGeocodingService
+
+STREETS = ['Mannerheimintie', 'Aleksanterinkatu', 'Fleminginkatu', 'Hämeentie', 'Bulevardi',
+           'Runeberginkatu', 'Töölönkatu', 'Itämerenkatu', 'Kalevankatu', 'Iso Roobertinkatu',
+           'Sturenkatu', 'Porvoonkatu', 'Mäkelänkatu', 'Kustaankatu', 'Vironkatu', 'Vuorikatu',
+           'Kaisaniemenkatu', 'Siltasaarenkatu', 'Pohjoisesplanadi', 'Lapinlahdenkatu']
+
+
+def make_addresses(count, rng):
+    """Create synthetic address points with WMS column names."""
+    rows = []
+    for i in range(count):
+        street = rng.choice(STREETS) + ('' if i % 4 else f" {'ABCD'[i % 3]}")
+        rows.append({
+            'street_name': street,
+            'address_number': str(rng.randint(1, 80)),
+            'postal_code': f"00{rng.randint(100, 990)}",
+            'admin_unit_4': 'Helsinki',
+            'geometry': Point(24.9 + rng.random() * 0.1, 60.15 + rng.random() * 0.1),
+        })
+    return gpd.GeoDataFrame(rows, crs='EPSG:4326')
+
+
+def make_queries(addresses, count, rng):
+    """Listing-style queries: exact, misspelled, and with a wrong postal code."""
+    queries = []
+    for _, row in addresses.sample(count, random_state=rng.randint(0, 10000)).iterrows():
+        street = row['street_name']
+        cut = rng.randrange(len(street))
+        typo = street[:cut] + street[cut + 1:]
+        queries.append(rng.choice([
+            f"{street} {row['address_number']}, {row['postal_code']} Helsinki",
+            f"{typo} {row['address_number']}, {row['postal_code']} Helsinki",
+            f"{typo} {row['address_number']}, 00{rng.randint(100, 990)} Helsinki",
+        ]))
+    return queries
+
+
+def exhaustive_match(service, normalized_query, full_addresses):
+    best_score, best_row = 0, None
+    for row, address in enumerate(full_addresses):
+        candidate = service.normalizer.normalize_address(address.lower().strip())
+        score = service._calculate_text_similarity(normalized_query, candidate)
+        if score > best_score and score > 0.6:
+            best_score, best_row = score, row
+    return best_row, best_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--addresses', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # The matcher only needs the normalizer and a logger; skip the data sources
+    service = UnifiedGeocodingService.__new__(UnifiedGeocodingService)
+    service.normalizer = AddressNormalizer()
+    service.logger = logging.getLogger(__name__)
+
+    addresses = make_addresses(args.addresses, rng)
+    queries = [service.normalizer.normalize_address(q) for q in make_queries(addresses, args.queries, rng)]
+    full_addresses = (addresses['street_name'] + ' ' + addresses['address_number'] + ' ' +
+                      addresses['postal_code'] + ' ' + addresses['admin_unit_4']).tolist()
+
+    start = time.perf_counter()
+    expected = [exhaustive_match(service, query, full_addresses) for query in queries]
+    exhaustive_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = service._build_address_index(addresses, 'wms_national')
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [service._find_best_address_match(query, index, 'wms_national') for query in queries]
+    indexed_seconds = time.perf_counter() - start
+
+    for (row, score), result in zip(expected, results):
+        if row is None:
+            assert result is None, "indexed matcher found a match the scan did not"
+        else:
+            assert result is not None and abs(result.quality_score - score) < 1e-9, "indexed match differs"
+            assert result.latitude == addresses.geometry.y.iloc[row], "indexed match differs"
+
+    candidates = []
+    for query in queries:
+        components = service._prepare_components(service._preprocess_address_for_matching(query))
+        candidates.append(len(index.candidates(components['postal_code'], components['street_normalized'])))
+
+    print(f"addresses:             {args.addresses}")
+    print(f"queries:               {args.queries}")
+    print(f"mean candidates/query: {sum(candidates) / len(candidates):.0f}")
+    print(f"exhaustive:            {exhaustive_seconds / args.queries * 1000:.1f} ms/query")
+    print(f"index build (once):    {build_seconds:.3f} s")
+    print(f"indexed:               {indexed_seconds / args.queries * 1000:.1f} ms/query  "
+          f"({exhaustive_seconds / indexed_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
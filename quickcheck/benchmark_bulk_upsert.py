@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row vs bulk upsert in EnhancedDatabaseManager.upsert_with_deduplication
+
+Runs each path against a fresh temporary DuckDB file, first inserting N synthetic
+listings and then updating the same N listings, and prints the timings.
+
+Usage:
+    uv run python quickcheck/benchmark_bulk_upsert.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from loguru import logger
+
+from oikotie.database.manager import EnhancedDatabaseManager
+
+
+def make_listings(count, price='250 000 €'):
+    """Create synthetic listings shaped like scraper output."""
+    return [
+        {
+            'url': f'https://asunnot.oikotie.fi/myytavat-asunnot/helsinki/{i}',
+            'source': 'oikotie',
+            'title': f'Benchmark listing {i}',
+            'overview': 'Valoisa koti hyvällä sijainnilla',
+            'full_description': 'Kuvaus ' * 20,
+            'details': {
+                'sijainti': f'Testikatu {i % 200 + 1}, 00{100 + i % 900:03d} Helsinki',
+                'rakennuksen_tyyppi': 'Kerrostalo',
+                'velaton_hinta': price,
+                'asuinpinta-ala': f'{30 + i % 90},5 m²',
+                'huoneita': str(1 + i % 5),
+                'rakennusvuosi': str(1950 + i % 70),
+                'hissi': 'Kyllä',
+                'kunto': 'Hyvä',
+            },
+        }
+        for i in range(count)
+    ]
+
+
+def time_path(db_path, listings, updated_listings, bulk):
+    manager = EnhancedDatabaseManager(db_path=str(db_path))
+
+    start = time.perf_counter()
+    insert_result = manager.upsert_with_deduplication(listings, 'Helsinki', 'bench-insert', bulk=bulk)
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    update_result = manager.upsert_with_deduplication(updated_listings, 'Helsinki', 'bench-update', bulk=bulk)
+    update_seconds = time.perf_counter() - start
+
+    assert insert_result.new_records == len(listings), insert_result.errors[:3]
+    assert update_result.updated_records == len(updated_listings), update_result.errors[:3]
+    return insert_seconds, update_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    print(f"{'listings':>10} | {'path':>8} | {'insert s':>9} | {'update s':>9} | {'rows/s':>9}")
+    print("-" * 58)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            listings = make_listings(size)
+            updated_listings = make_listings(size, price='260 000 €')
+            timings = {}
+            for bulk in (False, True):
+                path = 'bulk' if bulk else 'per-row'
+                insert_s, update_s = time_path(Path(tmp) / f"{path}_{size}.duckdb", listings, updated_listings, bulk)
+                timings[path] = insert_s + update_s
+                rate = 2 * size / (insert_s + update_s)
+                print(f"{size:>10} | {path:>8} | {insert_s:>9.2f} | {update_s:>9.2f} | {rate:>9.0f}")
+            print(f"{'':>10}   speedup: {timings['per-row'] / timings['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
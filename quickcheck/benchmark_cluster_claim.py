@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-item round trips vs Lua scripts for cluster work items
+
+Queues N work items for one node, claims them in batches with
+get_work_for_node, then completes nine in ten and fails the rest. The loop
+coordinator reproduces the previous ClusterCoordinator: one RPOP and one HSET
+per claimed item and three to four commands per completed or failed item.
+The script coordinator claims a batch in one call and completes or fails it
+in one pipelined call.
+
+Runs against an in-memory fakeredis by default, which has no network round
+trips, so the speedup against a real Redis server (--redis-url) is larger.
+
+Usage:
+    uv run python quickcheck/benchmark_cluster_claim.py --sizes 10000 100000
+    uv run python quickcheck/benchmark_cluster_claim.py --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import redis
+from loguru import logger
+
+from oikotie.automation.cluster import ClusterCoordinator, WorkItem, WorkItemStatus
+
+NODE_ID = "bench-node"
+
+
+class LoopCoordinator(ClusterCoordinator):
+    """The previous per-item work item handling, kept here as the baseline."""
+
+    def get_work_for_node(self, node_id, count=1):
+        queue_key = f"{self.work_queue_key}:{node_id}"
+        work_items = []
+        for _ in range(count):
+            work_data = self.redis.rpop(queue_key)
+            if not work_data:
+                break
+            work_item = WorkItem.from_dict(json.loads(work_data))
+            work_item.status = WorkItemStatus.IN_PROGRESS
+            work_item.started_at = datetime.now(timezone.utc)
+            active_key = f"{self.active_work_key}:{node_id}"
+            self.redis.hset(active_key, work_item.work_id, json.dumps(work_item.to_dict()))
+            work_items.append(work_item)
+        return work_items
+
+    def complete_work_items(self, work_items):
+        for work_item in work_items:
+            work_item.status = WorkItemStatus.COMPLETED
+            work_item.completed_at = datetime.now(timezone.utc)
+            self.redis.hdel(f"{self.active_work_key}:{work_item.assigned_node}", work_item.work_id)
+            completed_key = f"{self.completed_work_key}:{work_item.assigned_node}"
+            self.redis.hset(completed_key, work_item.work_id, json.dumps(work_item.to_dict()))
+            self.redis.expire(completed_key, 86400)
+        return True
+
+    def fail_work_items(self, work_items, error_message):
+        for work_item in work_items:
+            work_item.error_message = error_message
+            work_item.retry_count += 1
+            self.redis.hdel(f"{self.active_work_key}:{work_item.assigned_node}", work_item.work_id)
+            work_item.status = WorkItemStatus.RETRYING
+            retry_time = time.time() + min(300, 30 * (2 ** work_item.retry_count))
+            retry_data = {'work_item': work_item.to_dict(), 'retry_time': retry_time}
+            self.redis.zadd(self.retry_queue_key, {json.dumps(retry_data): retry_time})
+        return True
+
+
+def queue_work(client, count):
+    client.flushdb()
+    queue_key = f"scraper:work_queue:{NODE_ID}"
+    items = [
+        json.dumps(WorkItem(work_id=f"work-{i}", city="Helsinki", url=f"https://example.com/listing/{i}",
+                            assigned_node=NODE_ID).to_dict())
+        for i in range(count)
+    ]
+    for offset in range(0, count, 10000):
+        client.lpush(queue_key, *items[offset:offset + 10000])
+
+
+def time_coordinator(coordinator, batch_size):
+    claim_seconds = settle_seconds = 0.0
+    claimed = 0
+    while True:
+        start = time.perf_counter()
+        work_items = coordinator.get_work_for_node(NODE_ID, count=batch_size)
+        claim_seconds += time.perf_counter() - start
+        if not work_items:
+            break
+        claimed += len(work_items)
+
+        start = time.perf_counter()
+        failed = work_items[::10]
+        coordinator.complete_work_items([item for item in work_items if item not in failed])
+        coordinator.fail_work_items(failed, "benchmark failure")
+        settle_seconds += time.perf_counter() - start
+    return claim_seconds, settle_seconds, claimed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--redis-url', help="Redis server to use instead of fakeredis; its database is flushed")
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    if args.redis_url:
+        client = redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+        client = fakeredis.FakeRedis()
+
+    print(f"{'items':>8} | {'coordinator':>11} | {'claim s':>8} | {'settle s':>8} | {'items/s':>9}")
+    print("-" * 56)
+    for size in args.sizes:
+        timings = {}
+        for name, coordinator_class in (('loop', LoopCoordinator), ('script', ClusterCoordinator)):
+            queue_work(client, size)
+            coordinator = coordinator_class(client, node_id=NODE_ID)
+            claim_s, settle_s, claimed = time_coordinator(coordinator, args.batch_size)
+            timings[name] = claim_s + settle_s
+
+            assert claimed == size
+            assert client.hlen(f"scraper:active_work:{NODE_ID}") == 0
+            assert client.hlen(f"scraper:completed_work:{NODE_ID}") + client.zcard("scraper:retry_queue") == size
+            print(f"{size:>8} | {name:>11} | {claim_s:>8.2f} | {settle_s:>8.2f} | {size / timings[name]:>9.0f}")
+        print(f"{'':>8}   speedup: {timings['loop'] / timings['script']:.1f}x")
+    client.flushdb()
+
+
+if __name__ == "__main__":
+    main()
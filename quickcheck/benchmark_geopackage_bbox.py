@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: full-layer vs bbox-pushdown GeoPackage reads
+
+Fetches buildings for typical listing bboxes (a postal code area, a few city
+blocks) with GeoPackageDataSource, whose reads go through the GeoPackage
+R-tree, and with the previous approach of reading the whole ``rakennus``
+layer and filtering it with ``.cx``, and checks that both return the same
+buildings.
+
+Uses data/helsinki_topographic_data.gpkg when available, otherwise (or with
+--synthetic) a synthetic GeoPackage with Helsinki-sized building coverage.
+
+Usage:
+    uv run python quickcheck/benchmark_geopackage_bbox.py
+    uv run python quickcheck/benchmark_geopackage_bbox.py --synthetic --buildings 60000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import box
+
+from oikotie.data_sources import GeoPackageDataSource
+
+# Listing bboxes in WGS84: a postal code area, a neighbourhood block and a single street
+BBOXES = {
+    'postal code area': (24.930, 60.160, 24.960, 60.175),
+    'city blocks': (24.940, 60.165, 24.950, 60.170),
+    'single address': (24.9440, 60.1680, 24.9455, 60.1688),
+}
+
+
+def make_synthetic_gpkg(path, building_count, seed=42):
+    """Building footprints over the Helsinki extent in the national grid."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(375000, 400000, building_count)
+    y = rng.uniform(6665000, 6690000, building_count)
+    size = rng.uniform(8, 60, building_count)
+    gpd.GeoDataFrame({
+        'mtk_id': np.arange(building_count),
+        'kohdeluokka': rng.integers(42210, 42270, building_count),
+        'kayttotarkoitus': rng.integers(1, 20, building_count),
+        'kerrosluku': rng.integers(1, 12, building_count),
+    }, geometry=[box(a, b, a + s, b + s) for a, b, s in zip(x, y, size)], crs='EPSG:3067').to_file(path, layer='rakennus')
+
+
+def legacy_fetch_buildings(source, bbox):
+    """fetch_buildings as it was before bbox pushdown."""
+    gdf = gpd.read_file(str(source.gpkg_path), layer="rakennus")
+    bbox_gdf = gpd.GeoDataFrame(
+        [{'geometry': gpd.GeoSeries.from_xy([bbox[0], bbox[2]], [bbox[1], bbox[3]]).union_all().envelope}],
+        crs=source.target_crs
+    )
+    bbox_native = bbox_gdf.to_crs(gdf.crs).geometry[0].bounds
+    gdf = gdf.cx[bbox_native[0]:bbox_native[2], bbox_native[1]:bbox_native[3]]
+    gdf = source.standardize_columns(gdf, source.BUILDING_COLUMN_MAPPING)
+    return source.transform_to_target_crs(gdf)
+
+
+def best_of(repeats, func, *args):
+    """Fastest of several runs and the last result."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', action='store_true', help='Use a synthetic GeoPackage even if real data exists')
+    parser.add_argument('--buildings', type=int, default=60000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    gpkg_path = Path("data/helsinki_topographic_data.gpkg")
+    tmp_dir = None
+    if args.synthetic or not gpkg_path.exists():
+        tmp_dir = tempfile.TemporaryDirectory()
+        gpkg_path = Path(tmp_dir.name) / "synthetic_topographic.gpkg"
+        make_synthetic_gpkg(gpkg_path, args.buildings)
+    label = 'synthetic' if tmp_dir else 'Helsinki topographic'
+
+    source = GeoPackageDataSource(str(gpkg_path))
+    print(f"data:       {label} ({source.get_layer_info('rakennus').get('record_count', '?'):,} buildings)")
+
+    for name, bbox in BBOXES.items():
+        full_seconds, expected = best_of(args.repeats, legacy_fetch_buildings, source, bbox)
+        bbox_seconds, result = best_of(args.repeats, source.fetch_buildings, bbox)
+
+        assert result['feature_id'].tolist() == expected['feature_id'].tolist(), f"{name}: buildings differ"
+
+        print(f"{name + ':':<20} {len(result):>6,} buildings  "
+              f"full layer {full_seconds * 1000:8.1f} ms  bbox {bbox_seconds * 1000:7.1f} ms  "
+              f"({full_seconds / bbox_seconds:.0f}x)")
+
+    if tmp_dir:
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
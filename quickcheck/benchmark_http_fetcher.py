@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark: detail-page throughput of the pooled HTTP fetch mode
+
+Starts the local fixture server (with simulated response latency) and scrapes N
+listings through worker_scrape_details_http at several connection pool sizes.
+The per-host rate limit is lifted so the pool itself is measured.
+
+Usage:
+    uv run python quickcheck/benchmark_http_fetcher.py --listings 500 --latency-ms 50
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from loguru import logger
+
+from oikotie.scraper import worker_scrape_details_http
+from fixture_server import FixtureServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=50.0)
+    parser.add_argument('--connections', type=int, nargs='+', default=[1, 5, 10, 20])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    server = FixtureServer(latency_ms=args.latency_ms).start()
+    try:
+        print(f"{'connections':>11} | {'seconds':>8} | {'pages/s':>8} | {'sockets':>7}")
+        print("-" * 44)
+        for connections in args.connections:
+            summaries = [{'url': f"{server.base_url}/listing/{i}", 'title': f'Listing {i}'} for i in range(args.listings)]
+            server.requests.clear()
+
+            start = time.perf_counter()
+            results = worker_scrape_details_http(
+                summaries, cookies={'consent': 'yes'},
+                max_connections=connections, requests_per_second=1e6, burst=connections,
+            )
+            seconds = time.perf_counter() - start
+
+            assert len(results) == args.listings and all('sijainti' in r['details'] for r in results)
+            sockets = len({client_port for _, _, client_port, _ in server.requests})
+            print(f"{connections:>11} | {seconds:>8.2f} | {args.listings / seconds:>8.0f} | {sockets:>7}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
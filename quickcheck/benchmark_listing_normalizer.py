@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row vs vectorized parsing of listing details
+
+Compares the per-row ``_clean_and_convert``/``extract_postal_code`` helpers with
+``normalize_listing_details`` on N synthetic ``details`` dicts.
+
+Usage:
+    uv run python quickcheck/benchmark_listing_normalizer.py --rows 100000
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from oikotie.scraper import DatabaseManager
+from oikotie.utils import extract_postal_code
+from oikotie.utils.listing_normalizer import CORE_DETAIL_KEYS, normalize_listing_details, to_python_rows
+
+
+def make_details(count):
+    """Create synthetic details dicts shaped like scraper output."""
+    return [
+        {
+            'sijainti': f'Testikatu {i % 200 + 1}, 00{100 + i % 900:03d} Helsinki',
+            'rakennuksen_tyyppi': 'Kerrostalo',
+            'velaton_hinta': f'{100 + i % 900} {i % 1000:03d} €',
+            'asuinpinta-ala': f'{30 + i % 90},5 m²',
+            'huoneita': str(1 + i % 5),
+            'rakennusvuosi': str(1950 + i % 70),
+            'hissi': 'Kyllä',
+            'kunto': 'Hyvä',
+        }
+        for i in range(count)
+    ]
+
+
+def parse_per_row(parser, details_list):
+    rows = []
+    for details in details_list:
+        address = details.get('sijainti')
+        rows.append({
+            'address': address,
+            'postal_code': extract_postal_code(address) if address else None,
+            'listing_type': details.get('rakennuksen_tyyppi'),
+            'price_eur': parser._clean_and_convert(details.get('velaton_hinta') or details.get('myyntihinta'), 'float'),
+            'size_m2': parser._clean_and_convert(details.get('asuinpinta-ala'), 'float'),
+            'rooms': parser._clean_and_convert(details.get('huoneita'), 'int'),
+            'year_built': parser._clean_and_convert(details.get('rakennusvuosi'), 'int'),
+            'other_details_json': json.dumps(
+                {k: v for k, v in details.items() if k not in CORE_DETAIL_KEYS}, ensure_ascii=False
+            ),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    # _clean_and_convert does not touch the database; skip __init__ so no file is created
+    scalar_parser = DatabaseManager.__new__(DatabaseManager)
+    details_list = make_details(args.rows)
+
+    start = time.perf_counter()
+    expected = parse_per_row(scalar_parser, details_list)
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = normalize_listing_details(details_list)
+    vectorized_seconds = time.perf_counter() - start
+    actual = to_python_rows(frame)
+    rows_seconds = time.perf_counter() - start
+
+    assert actual == expected, "vectorized output differs from per-row output"
+
+    print(f"rows:                  {args.rows}")
+    print(f"per-row:               {per_row_seconds:.3f} s")
+    print(f"vectorized (frame):    {vectorized_seconds:.3f} s  ({per_row_seconds / vectorized_seconds:.1f}x)")
+    print(f"vectorized (+ dicts):  {rows_seconds:.3f} s  ({per_row_seconds / rows_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark: listing page parse throughput per parser backend
+
+Parses the saved fixture pages in ``tests/fixtures/listing_pages`` repeatedly
+with every available backend and reports pages per second. Each backend's output
+is checked against the BeautifulSoup reference first.
+
+Usage:
+    uv run python quickcheck/benchmark_listing_parsers.py --iterations 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from oikotie.listing_parsers import LXML_AVAILABLE, get_listing_parser
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'listing_pages'
+
+
+def parse_page(parser, html):
+    """Run the extraction the scraper performs on one page."""
+    return parser.parse_summaries(html), parser.parse_page_count(html), parser.parse_details(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+
+    pages = [path.read_text(encoding='utf-8') for path in sorted(FIXTURES.glob('*.html'))]
+    backends = ['beautifulsoup'] + (['lxml'] if LXML_AVAILABLE else [])
+    reference = [parse_page(get_listing_parser('beautifulsoup'), html) for html in pages]
+
+    print(f"pages: {len(pages)} fixtures x {args.iterations} iterations")
+    baseline = None
+    for name in backends:
+        backend = get_listing_parser(name)
+        assert [parse_page(backend, html) for html in pages] == reference, f"{name} output differs"
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            for html in pages:
+                parse_page(backend, html)
+        seconds = time.perf_counter() - start
+        rate = len(pages) * args.iterations / seconds
+        baseline = baseline or rate
+        print(f"{name:14s} {seconds:.3f} s  {rate:8.0f} pages/s  ({rate / baseline:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
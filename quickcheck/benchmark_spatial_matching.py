@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-point vs bulk nearest-building matching
+
+Matches every geocoded Helsinki listing against the full OSM building footprint
+set, once with the previous per-point loop of ``enhanced_spatial_match`` (a
+buffer intersects scan over all buildings for each listing) and once with the
+bulk STRtree query, and checks that both produce the same matches.
+
+Uses the latest data/helsinki_buildings_*.geojson and the listings database
+when available, otherwise (or with --synthetic) a synthetic footprint set.
+
+Usage:
+    uv run python quickcheck/benchmark_spatial_matching.py
+    uv run python quickcheck/benchmark_spatial_matching.py --synthetic --buildings 80000 --points 8000
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+
+from oikotie.utils import EnhancedSpatialMatcher
+
+
+def legacy_match(points_proj, buildings_proj, tolerance_m, point_id_col='address', building_id_col='osm_id'):
+    """The per-point matching loop as it was before the bulk query."""
+    results = []
+    for _, point_row in points_proj.iterrows():
+        point_geom = point_row.geometry
+        potential_matches = buildings_proj[buildings_proj.geometry.intersects(point_geom.buffer(tolerance_m))]
+        if len(potential_matches) == 0:
+            results.append({point_id_col: point_row[point_id_col], building_id_col: None,
+                            'match_type': 'no_match', 'distance_m': np.inf,
+                            'is_direct_match': False, 'is_tolerance_match': False})
+            continue
+        distances = potential_matches.geometry.distance(point_geom)
+        closest_idx = distances.idxmin()
+        closest_distance = distances.loc[closest_idx]
+        closest_building = potential_matches.loc[closest_idx]
+        is_direct_match = closest_building.geometry.contains(point_geom)
+        is_tolerance_match = closest_distance <= tolerance_m
+        match_type = ('direct_contains' if is_direct_match else
+                      'tolerance_buffer' if is_tolerance_match else 'no_match')
+        results.append({point_id_col: point_row[point_id_col],
+                        building_id_col: closest_building[building_id_col] if is_tolerance_match else None,
+                        'match_type': match_type, 'distance_m': closest_distance,
+                        'is_direct_match': is_direct_match, 'is_tolerance_match': is_tolerance_match})
+    return pd.DataFrame(results)
+
+
+def load_helsinki_data():
+    """OSM footprints and geocoded Helsinki listings, or None when either is missing."""
+    geojson_files = list(Path("data").glob("helsinki_buildings_*.geojson"))
+    if not geojson_files:
+        return None
+    try:
+        from oikotie.visualization.utils.data_loader import DataLoader
+
+        loader = DataLoader()
+        listings = loader.get_full_listings(city_filter="Helsinki")
+        addresses = loader.get_address_geocoded()
+        listings = listings.merge(addresses[['address', 'lat', 'lon']], on='address', how='inner')
+    except Exception as e:
+        print(f"Could not load listings: {e}")
+        return None
+
+    buildings = gpd.read_file(max(geojson_files, key=lambda f: f.stat().st_mtime))
+    if 'osm_id' not in buildings.columns:
+        buildings['osm_id'] = np.arange(len(buildings))
+    points = gpd.GeoDataFrame(listings[['address']],
+                              geometry=gpd.points_from_xy(listings.lon, listings.lat), crs='EPSG:4326')
+    return points, buildings
+
+
+def make_synthetic_data(building_count, point_count, seed=42):
+    """Square footprints over the Helsinki extent and listings near a sample of them."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(375000, 400000, building_count)
+    y = rng.uniform(6670000, 6690000, building_count)
+    size = rng.uniform(8, 60, building_count)
+    buildings = gpd.GeoDataFrame({'osm_id': np.arange(building_count)},
+                                 geometry=[box(a, b, a + s, b + s) for a, b, s in zip(x, y, size)],
+                                 crs='EPSG:3067')
+    near = rng.choice(building_count, point_count // 2, replace=False)
+    px = np.r_[x[near] + rng.uniform(-15, 40, len(near)), rng.uniform(375000, 400000, point_count - len(near))]
+    py = np.r_[y[near] + rng.uniform(-15, 40, len(near)), rng.uniform(6670000, 6690000, point_count - len(near))]
+    points = gpd.GeoDataFrame({'address': [f"Listing {i}" for i in range(point_count)]},
+                              geometry=gpd.points_from_xy(px, py), crs='EPSG:3067')
+    return points.to_crs('EPSG:4326'), buildings.to_crs('EPSG:4326')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--synthetic', action='store_true', help='Use synthetic data even if real data exists')
+    parser.add_argument('--buildings', type=int, default=80000)
+    parser.add_argument('--points', type=int, default=8000)
+    parser.add_argument('--legacy-points', type=int, default=500,
+                        help='Points timed with the per-point loop (it is too slow for the full set)')
+    parser.add_argument('--tolerance', type=float, default=20.0)
+    args = parser.parse_args()
+
+    data = None if args.synthetic else load_helsinki_data()
+    label = 'Helsinki OSM' if data is not None else 'synthetic'
+    points, buildings = data if data is not None else make_synthetic_data(args.buildings, args.points)
+
+    matcher = EnhancedSpatialMatcher(tolerance_m=args.tolerance)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        results = matcher.enhanced_spatial_match(points, buildings)
+        bulk_seconds = time.perf_counter() - start
+
+    sample = points.iloc[:args.legacy_points]
+    points_proj, buildings_proj = sample.to_crs(matcher.target_crs), buildings.to_crs(matcher.target_crs)
+    start = time.perf_counter()
+    expected = legacy_match(points_proj, buildings_proj, args.tolerance)
+    legacy_seconds = time.perf_counter() - start
+
+    got = results.iloc[:len(sample)].reset_index(drop=True)
+    assert (got['match_type'] == expected['match_type']).all(), "match types differ"
+    assert ((got['osm_id'] == expected['osm_id']) | (got['osm_id'].isna() & expected['osm_id'].isna())).all(), \
+        "matched buildings differ"
+
+    legacy_per_point = legacy_seconds / len(sample)
+    print(f"data:                 {label}")
+    print(f"buildings:            {len(buildings):,}")
+    print(f"points:               {len(points):,}")
+    print(f"match types:          {results['match_type'].value_counts().to_dict()}")
+    print(f"per-point loop:       {legacy_per_point * 1000:.2f} ms/point "
+          f"(~{legacy_per_point * len(points):.0f} s for all points)")
+    print(f"bulk query:           {bulk_seconds:.2f} s for all points "
+          f"({legacy_per_point * len(points) / bulk_seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
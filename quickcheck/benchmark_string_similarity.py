@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: address similarity scoring on 10k address pairs
+
+Compares the former list-of-lists Levenshtein with the two-row and batched
+kernels in ``oikotie.utils.string_similarity``, then full address scoring one
+pair at a time against one batched call for all candidates. Results must match.
+
+Usage:
+    uv run python quickcheck/benchmark_string_similarity.py --pairs 10000
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from oikotie.utils.enhanced_geocoding_service import AddressNormalizer, UnifiedGeocodingService
+from oikotie.utils.string_similarity import (RAPIDFUZZ_AVAILABLE, levenshtein_distance,
+                                             levenshtein_distances)
+
+STREETS = ['Mannerheimintie', 'Aleksanterinkatu', 'Fleminginkatu', 'Hämeentie', 'Bulevardi',
+           'Runeberginkatu', 'Töölönkatu', 'Itämerenkatu', 'Kalevankatu', 'Iso Roobertinkatu']
+
+
+def list_matrix_levenshtein(text1, text2):
+    """The previous implementation: a full (n+1) x (m+1) matrix per comparison."""
+    distances = [[0] * (len(text2) + 1) for _ in range(len(text1) + 1)]
+    for i in range(len(text1) + 1):
+        distances[i][0] = i
+    for j in range(len(text2) + 1):
+        distances[0][j] = j
+    for i in range(1, len(text1) + 1):
+        for j in range(1, len(text2) + 1):
+            cost = 0 if text1[i - 1] == text2[j - 1] else 1
+            distances[i][j] = min(distances[i - 1][j] + 1, distances[i][j - 1] + 1, distances[i - 1][j - 1] + cost)
+    return distances[len(text1)][len(text2)]
+
+
+def make_address(rng):
+    return (f"{rng.choice(STREETS)} {rng.randint(1, 80)}{rng.choice(['', ' A 4', 'b'])}, "
+            f"00{rng.randint(100, 990)} Helsinki")
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # Scoring only needs the normalizer and a logger; skip the data sources
+    service = UnifiedGeocodingService.__new__(UnifiedGeocodingService)
+    service.normalizer = AddressNormalizer()
+    service.logger = logging.getLogger(__name__)
+
+    query = service.normalizer.normalize_address(make_address(rng))
+    candidates = [service.normalizer.normalize_address(make_address(rng)) for _ in range(args.pairs)]
+    clean_query = service._preprocess_address_for_matching(query)
+    clean_candidates = [service._preprocess_address_for_matching(c) for c in candidates]
+
+    print(f"pairs: {args.pairs}  (rapidfuzz: {'yes' if RAPIDFUZZ_AVAILABLE else 'no, NumPy kernel'})")
+
+    matrix, matrix_seconds = timed(lambda: [list_matrix_levenshtein(clean_query, c) for c in clean_candidates])
+    two_row, two_row_seconds = timed(lambda: [levenshtein_distance(clean_query, c) for c in clean_candidates])
+    batched, batched_seconds = timed(lambda: levenshtein_distances(clean_query, clean_candidates))
+    assert matrix == two_row == batched.tolist(), "Levenshtein kernels disagree"
+
+    print(f"levenshtein, list matrix:   {matrix_seconds:.3f} s")
+    print(f"levenshtein, two-row:       {two_row_seconds:.3f} s  ({matrix_seconds / two_row_seconds:.1f}x)")
+    print(f"levenshtein, batched:       {batched_seconds:.3f} s  ({matrix_seconds / batched_seconds:.1f}x)")
+
+    per_pair, per_pair_seconds = timed(lambda: [service._calculate_text_similarity(query, c) for c in candidates])
+    scores, batch_seconds = timed(lambda: service._calculate_text_similarities(query, candidates))
+    assert np.array_equal(np.array(per_pair), scores), "batched scores differ from per-pair scores"
+
+    print(f"address score, per pair:    {per_pair_seconds:.3f} s")
+    print(f"address score, batched:     {batch_seconds:.3f} s  ({per_pair_seconds / batch_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark: list scan vs heap TaskQueue in the TaskScheduler
+
+Queues N task executions with mixed priorities and scheduled times, cancels a
+tenth of them by execution_id, then drains every due execution. The list queue
+reproduces the previous TaskQueue with its priority lookup wired up: a linear
+insertion scan in put, a scan for the first due task in get and a linear
+remove_task.
+
+Usage:
+    uv run python quickcheck/benchmark_task_queue.py --sizes 1000 10000
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from threading import Lock
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from loguru import logger
+
+from oikotie.automation.scheduler import TaskExecution, TaskPriority, TaskQueue, TaskStatus
+
+
+class ListTaskQueue:
+    """The previous list-backed queue, kept here as the baseline."""
+
+    def __init__(self, priority_of):
+        self._queue = []
+        self._lock = Lock()
+        self._priority_of = priority_of
+
+    def put(self, task):
+        with self._lock:
+            new_priority = self._priority_of(task.task_id).value
+            for i, existing_task in enumerate(self._queue):
+                existing_priority = self._priority_of(existing_task.task_id).value
+                if (new_priority > existing_priority or
+                        (new_priority == existing_priority and task.scheduled_time < existing_task.scheduled_time)):
+                    self._queue.insert(i, task)
+                    return
+            self._queue.append(task)
+
+    def get(self, timeout=None):
+        with self._lock:
+            current_time = datetime.now(timezone.utc)
+            for i, task in enumerate(self._queue):
+                if task.scheduled_time <= current_time:
+                    return self._queue.pop(i)
+            return None
+
+    def remove_task(self, execution_id):
+        with self._lock:
+            for i, task in enumerate(self._queue):
+                if task.execution_id == execution_id:
+                    self._queue.pop(i)
+                    return True
+            return False
+
+
+def make_executions(count, seed=7):
+    """Executions of 50 tasks, spread an hour either side of now."""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [
+        TaskExecution(
+            execution_id=f"exec-{i}",
+            task_id=f"task-{rng.randrange(50)}",
+            status=TaskStatus.QUEUED,
+            scheduled_time=now + timedelta(seconds=rng.uniform(-3600, 3600))
+        )
+        for i in range(count)
+    ]
+
+
+def time_queue(queue, executions, cancelled):
+    start = time.perf_counter()
+    for execution in executions:
+        queue.put(execution)
+    put_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for execution_id in cancelled:
+        queue.remove_task(execution_id)
+    remove_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    drained = []
+    while (task := queue.get()) is not None:
+        drained.append(task)
+    get_seconds = time.perf_counter() - start
+    return put_seconds, remove_seconds, get_seconds, drained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    args = parser.parse_args()
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    priorities = list(TaskPriority)
+    priority_of = lambda task_id: priorities[int(task_id.split('-')[1]) % len(priorities)]
+
+    print(f"{'executions':>10} | {'queue':>5} | {'put s':>8} | {'remove s':>8} | {'drain s':>8} | {'drained':>7}")
+    print("-" * 62)
+    for size in args.sizes:
+        executions = make_executions(size)
+        cancelled = [execution.execution_id for execution in executions[::10]]
+        timings, drained = {}, {}
+        for name, queue in (('list', ListTaskQueue(priority_of)), ('heap', TaskQueue(priority_of=priority_of))):
+            put_s, remove_s, get_s, tasks = time_queue(queue, executions, cancelled)
+            timings[name] = put_s + remove_s + get_s
+            drained[name] = tasks
+            print(f"{size:>10} | {name:>5} | {put_s:>8.3f} | {remove_s:>8.3f} | {get_s:>8.3f} | {len(tasks):>7}")
+
+        # The heap queue hands out due executions by priority first
+        assert {t.execution_id for t in drained['list']} == {t.execution_id for t in drained['heap']}
+        heap_order = [(-priority_of(t.task_id).value, t.scheduled_time) for t in drained['heap']]
+        assert heap_order == sorted(heap_order)
+        print(f"{'':>10}   speedup: {timings['list'] / timings['heap']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
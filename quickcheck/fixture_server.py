@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Local fixture server imitating Oikotie listing detail pages.
+
+Serves generated static detail pages so the HTTP detail fetcher can be tested
+and benchmarked offline:
+
+    /listing/<id>   static detail page (details-grid markup)
+    /js-only/<id>   page whose details are rendered by JavaScript only
+    anything else   404
+
+Usage:
+    uv run python quickcheck/fixture_server.py --port 8765 --latency-ms 50
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DETAIL_PAGE = """<html><head><title>Listing {listing_id}</title></head><body>
+<div class="listing-overview"><p>Valoisa koti {listing_id}</p></div>
+<div class="details-grid">
+  <div class="details-grid__item"><dl><dt>Sijainti</dt><dd>Testikatu {listing_id}, 00100 Helsinki</dd></dl></div>
+  <div class="details-grid__item"><dl><dt>Rakennuksen tyyppi</dt><dd>Kerrostalo</dd></dl></div>
+  <div class="details-grid__item"><dl><dt>Velaton hinta</dt><dd>{price}&nbsp;000 €</dd></dl></div>
+  <div class="details-grid__item"><dl><dt>Asuinpinta-ala</dt><dd>54,5 m²</dd></dl></div>
+  <div class="details-grid__item"><dl><dt>Huoneita</dt><dd>2</dd></dl></div>
+  <div class="details-grid__item"><dl><dt>Rakennusvuosi</dt><dd>1965</dd></dl></div>
+</div>
+<div class="listing-description"><p>Kuvaus {listing_id}</p></div>
+</body></html>"""
+
+JS_ONLY_PAGE = """<html><head><title>Listing</title></head><body>
+<div id="app"></div><script src="/bundle.js"></script>
+<noscript>Ota JavaScript käyttöön</noscript>
+</body></html>"""
+
+
+class FixtureServer:
+    """Threaded HTTP/1.1 server that records the requests it receives."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0):
+        self.latency_seconds = latency_ms / 1000
+        self.requests = []  # (path, cookie header, client port, time)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def do_GET(self):
+                with fixture._lock:
+                    fixture.requests.append((self.path, self.headers.get('Cookie'), self.client_address[1], time.monotonic()))
+                if fixture.latency_seconds:
+                    time.sleep(fixture.latency_seconds)
+
+                parts = self.path.strip('/').split('/')
+                if len(parts) == 2 and parts[0] == 'listing':
+                    body, status = DETAIL_PAGE.format(listing_id=parts[1], price=100 + len(parts[1])), 200
+                elif len(parts) == 2 and parts[0] == 'js-only':
+                    body, status = JS_ONLY_PAGE, 200
+                elif len(parts) == 2 and parts[0] == 'status' and parts[1].isdigit():
+                    body, status = "Status", int(parts[1])
+                else:
+                    body, status = "Not found", 404
+
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FixtureServer(port=args.port, latency_ms=args.latency_ms).start()
+    print(f"Serving fixture listings at {server.base_url}/listing/<id> (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import logging
+import random
+import pytest
+from unittest.mock import MagicMock
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+from shapely.geometry import Point
+from oikotie.utils.address_index import AddressIndex, street_key
+from oikotie.utils.enhanced_geocoding_service import AddressNormalizer, UnifiedGeocodingService
+
+STREETS = ['Mannerheimintie', 'Aleksanterinkatu', 'Fleminginkatu', 'Hämeentie', 'Bulevardi',
+           'Runeberginkatu', 'Töölönkatu', 'Itämerenkatu', 'Kalevankatu', 'Porvoonkatu']
+
+
+@pytest.fixture
+def service():
+    service = UnifiedGeocodingService.__new__(UnifiedGeocodingService)
+    service.normalizer = AddressNormalizer()
+    service.logger = logging.getLogger(__name__)
+    service.helsinki_bbox = (24.7, 60.1, 25.3, 60.3)
+    service._address_indexes = {}
+    service._address_index_lock = __import__('threading').Lock()
+    return service
+
+
+@pytest.fixture
+def wms_addresses():
+    rng = random.Random(7)
+    rows = [
+        {
+            'street_name': rng.choice(STREETS),
+            'address_number': str(rng.randint(1, 60)),
+            'postal_code': f"00{rng.randint(100, 990)}",
+            'admin_unit_4': 'Helsinki',
+            'geometry': Point(24.9 + i * 1e-5, 60.15 + i * 1e-5),
+        }
+        for i in range(150)
+    ]
+    return gpd.GeoDataFrame(rows, crs='EPSG:4326')
+
+
+def exhaustive_match(service, normalized_query, addresses):
+    """Score every address, as the matcher did before it was indexed."""
+    full_addresses = (addresses['street_name'] + ' ' + addresses['address_number'] + ' ' +
+                      addresses['postal_code'] + ' ' + addresses['admin_unit_4'])
+    best_score, best_row = 0, None
+    for row, address in enumerate(full_addresses):
+        candidate = service.normalizer.normalize_address(address.lower().strip())
+        score = service._calculate_text_similarity(normalized_query, candidate)
+        if score > best_score and score > 0.6:
+            best_score, best_row = score, row
+    return best_row, best_score
+
+
+def test_index_matches_exhaustive_scan(service, wms_addresses):
+    rng = random.Random(3)
+    index = service._build_address_index(wms_addresses, 'wms_national')
+    assert len(index) == len(wms_addresses)
+
+    queries = []
+    for _, row in wms_addresses.sample(8, random_state=1).iterrows():
+        street = row['street_name']
+        typo = street[:3] + street[4:]
+        queries += [
+            f"{street} {row['address_number']}, {row['postal_code']} Helsinki",
+            f"{typo} {row['address_number']}, {row['postal_code']} Helsinki",
+            f"{typo} {row['address_number']}, 00{rng.randint(100, 990)} Helsinki",
+            f"{street} {row['address_number']}",
+        ]
+
+    for query in queries:
+        normalized = service.normalizer.normalize_address(query)
+        best_row, best_score = exhaustive_match(service, normalized, wms_addresses)
+        result = service._find_best_address_match(normalized, index, 'wms_national')
+        if best_row is None:
+            assert result is None, query
+        else:
+            assert result.quality_score == pytest.approx(best_score), query
+            assert result.latitude == pytest.approx(wms_addresses.geometry.y.iloc[best_row]), query
+
+
+def test_candidates_are_a_small_block(service, wms_addresses):
+    index = service._build_address_index(wms_addresses, 'wms_national')
+    query = service._prepare_components('fleminginkatu 5 00530 helsinki')
+
+    candidates = index.candidates(query['postal_code'], query['street_normalized'])
+
+    assert 0 < len(candidates) < len(index)
+    streets = {row: street_key(index.street_normalized[row]) for row in candidates}
+    assert 'fleminginkatu' in streets.values()
+    unrelated = [row for row, street in streets.items() if street in ('bulevardi', 'hameentie')]
+    assert all(index.postal_code[row] == '00530' for row in unrelated)
+
+
+def test_index_skips_rows_without_address_or_coordinates(service):
+    addresses = gpd.GeoDataFrame({
+        'address': ['Bulevardi 1, 00120 Helsinki', None, '  '],
+        'geometry': [Point(24.94, 60.16), Point(24.95, 60.17), Point(24.96, 60.18)],
+    }, crs='EPSG:4326')
+
+    index = AddressIndex(addresses, 'address', service.normalizer, service._preprocess_address_for_matching)
+
+    assert len(index) == 1
+    assert index.postal_code[0] == '00120'
+
+
+def test_index_is_built_once_per_source(service, wms_addresses):
+    service.manager = MagicMock()
+    service.manager.fetch_addresses.return_value = wms_addresses
+
+    for address in ['Bulevardi 3, 00120 Helsinki', 'Hämeentie 10, 00530 Helsinki']:
+        service._geocode_with_wms_addresses(address, service.normalizer.normalize_address(address))
+
+    service.manager.fetch_addresses.assert_called_once()
+    assert list(service._address_indexes) == ['wms_national']
@@ -0,0 +1,102 @@
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import Point
+from oikotie.data_sources.address_tiles import AddressTileCache
+from oikotie.data_sources.unified_manager import UnifiedDataManager
+
+
+class PagedAddressSource:
+    """In-memory stand-in for the WFS, paging a fixed set of address points."""
+
+    target_crs = 'EPSG:4326'
+
+    def __init__(self, count=300):
+        rng = np.random.default_rng(3)
+        lon = rng.uniform(24.90, 25.00, count)
+        lat = rng.uniform(60.15, 60.21, count)
+        self.addresses = gpd.GeoDataFrame({
+            'inspire_id_local': [f'addr-{i}' for i in range(count)],
+            'street_name': ['Mannerheimintie' if i % 3 == 0 else 'Hämeentie' for i in range(count)],
+            'address_number': [str(i % 50 + 1) for i in range(count)],
+            'postal_code': ['00100' if i % 2 == 0 else '00500' for i in range(count)],
+            'geometry': [Point(x, y) for x, y in zip(lon, lat)],
+        }, crs='EPSG:4326')
+        self.requests = []
+
+    def fetch_address_page(self, bbox, start_index=0, count=None):
+        self.requests.append((bbox, start_index, count))
+        inside = self.addresses.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
+        return inside.iloc[start_index:start_index + count].reset_index(drop=True)
+
+
+@pytest.fixture
+def source():
+    return PagedAddressSource()
+
+
+def test_tiles_are_key_stable_and_fetched_once(tmp_path, source):
+    cache = AddressTileCache(source, cache_dir=tmp_path, tile_size=0.05, page_size=40)
+    bbox = (24.90, 60.15, 25.00, 60.21)
+
+    assert cache.tiles_for_bbox((24.91, 60.16, 24.94, 60.17)) == cache.tiles_for_bbox((24.901, 60.151, 24.949, 60.199))
+
+    result = cache.query(bbox)
+    requests = len(source.requests)
+
+    assert set(result['inspire_id_local']) == set(source.addresses['inspire_id_local'])
+    assert all(start % 40 == 0 for _, start, _ in source.requests)
+    assert max(start for _, start, _ in source.requests) > 0  # tiles needed several pages
+
+    # Smaller bboxes and attribute filters over the same area are served from disk
+    subset = cache.query((24.92, 60.16, 24.97, 60.19), postal_code='00100', street_name='HÄMEENTIE')
+    fresh = AddressTileCache(source, cache_dir=tmp_path, tile_size=0.05, page_size=40).query(bbox, limit=25)
+
+    assert len(source.requests) == requests
+    assert len(fresh) == 25
+    expected = source.addresses.cx[24.92:24.97, 60.16:60.19]
+    expected = expected[(expected['postal_code'] == '00100') & (expected['street_name'] == 'Hämeentie')]
+    assert sorted(subset['inspire_id_local']) == sorted(expected['inspire_id_local'])
+
+
+def test_failed_page_is_not_cached(tmp_path, source):
+    cache = AddressTileCache(source, cache_dir=tmp_path, tile_size=0.05, page_size=40)
+    calls = {'count': 0}
+    original = source.fetch_address_page
+
+    def flaky(bbox, start_index=0, count=None):
+        calls['count'] += 1
+        if calls['count'] == 2:
+            raise ConnectionError("WFS unavailable")
+        return original(bbox, start_index, count)
+
+    source.fetch_address_page = flaky
+    tile = cache.tiles_for_bbox((24.91, 60.16, 24.92, 60.17))[0]
+
+    with pytest.raises(ConnectionError):
+        cache.get_tile(tile)
+    assert not cache.tile_path(tile).exists()
+    assert len(cache.get_tile(tile)) > 0
+
+
+def test_manager_filters_do_not_trigger_downloads(tmp_path, source):
+    manager = UnifiedDataManager(cache_dir=str(tmp_path), enable_logging=False)
+    manager.address_tiles.source = source
+
+    everything = manager.fetch_addresses(bbox=(24.95, 60.17, 24.99, 60.20), limit=5000)
+    requests = len(source.requests)
+    for postal_code in ('00100', '00500'):
+        filtered = manager.fetch_addresses(bbox=(24.95, 60.17, 24.99, 60.20), limit=5000,
+                                           postal_code=postal_code, address_query='ignored')
+        assert set(filtered['postal_code']) == {postal_code}
+
+    assert len(source.requests) == requests
+    assert set(everything['data_source']) == {'wms'}
+    assert manager.address_tiles.get_stats()['tiles_downloaded'] == len(manager.address_tiles.tiles_for_bbox(
+        (24.95, 60.17, 24.99, 60.20)))
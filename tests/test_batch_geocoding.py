@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import MagicMock
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+from shapely.geometry import Point
+from oikotie.rate_control import AdaptiveLimiter
+from oikotie.utils.enhanced_geocoding_service import UnifiedGeocodingService
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = UnifiedGeocodingService(geopackage_path=str(tmp_path / 'missing.gpkg'),
+                                      db_path=str(tmp_path / 'db.duckdb'),
+                                      cache_dir=str(tmp_path / 'cache'), enable_logging=False)
+    with service.connections.connection() as con:
+        con.execute("CREATE TABLE address_locations (address VARCHAR PRIMARY KEY, lat DOUBLE, lon DOUBLE)")
+        con.execute("INSERT INTO address_locations VALUES ('Tapiontori 3 02100 Espoo', 60.175, 24.805)")
+
+    service.manager = MagicMock()
+    service.manager.fetch_addresses.return_value = gpd.GeoDataFrame({
+        'street_name': ['Fleminginkatu', 'Bulevardi'],
+        'address_number': ['12', '3'],
+        'postal_code': ['00530', '00120'],
+        'admin_unit_4': ['Helsinki', 'Helsinki'],
+        'geometry': [Point(24.95, 60.19), Point(24.94, 60.16)],
+    }, crs='EPSG:4326')
+    service.manager.fetch_topographic_layer.return_value = gpd.GeoDataFrame(columns=['geometry'])
+    service.nominatim = MagicMock()
+    service.nominatim.geocode.return_value = None
+    return service
+
+
+def test_batch_resolves_each_stage_once(service):
+    addresses = ['Tapiontori 3, 02100 Espoo', 'Fleminginkatu 12, 00530 Helsinki',
+                 'Fleminginkatu 12, 00530 Helsinki ', 'Tuntematon tie 99', '']
+    progress = []
+
+    results = service.batch_geocode_addresses(addresses, progress_callback=lambda *args: progress.append(args))
+
+    assert results['Tapiontori 3, 02100 Espoo'].source == 'database_exact'
+    assert results['Fleminginkatu 12, 00530 Helsinki'].source == 'wms_national'
+    assert results['Fleminginkatu 12, 00530 Helsinki '].latitude == pytest.approx(60.19)
+    assert results['Fleminginkatu 12, 00530 Helsinki'].original_address == 'Fleminginkatu 12, 00530 Helsinki'
+    assert results['Tuntematon tie 99'] is None and results[''] is None
+
+    stages = service.last_batch_stats['stages']
+    assert stages['database_exact']['hits'] == 1
+    assert stages['wms_national']['hits'] == 1  # both spellings normalize the same
+    service.manager.fetch_addresses.assert_called_once()
+    # Nominatim's fixed quality is below the default threshold, so it is not queried
+    service.nominatim.geocode.assert_not_called()
+    # Every input address is reported once, misses after the last stage
+    assert [(index, total) for index, total, _ in progress] == [(i, 5) for i in range(5)]
+    assert {address for _, _, address in progress[3:]} == {'Tuntematon tie 99', ''}
+
+
+def test_second_batch_is_served_from_cache(service):
+    addresses = ['Tapiontori 3, 02100 Espoo', 'Bulevardi 3, 00120 Helsinki']
+    first = service.batch_geocode_addresses(addresses)
+
+    second = service.batch_geocode_addresses(addresses)
+
+    assert second == first
+    assert service.last_batch_stats['stages']['cache']['hits'] == 2
+
+
+def test_nominatim_queue_takes_remaining_misses(service):
+    service.nominatim.geocode.return_value = MagicMock(latitude=60.2, longitude=24.9)
+    service.nominatim_limiter = AdaptiveLimiter("nominatim-test")
+
+    results = service.batch_geocode_addresses(['Tuntematon tie 99'], quality_threshold=0.5)
+
+    assert results['Tuntematon tie 99'].source == 'nominatim'
+    assert service.last_batch_stats['stages']['nominatim']['hits'] == 1
+    service.nominatim.geocode.assert_called_once_with('Tuntematon tie 99, Helsinki, Finland', timeout=10)
@@ -46,6 +46,7 @@ def mock_redis():
     mock_client.zadd.return_value = 1
     mock_client.zrangebyscore.return_value = []
     mock_client.zremrangebyscore.return_value = 0
+    mock_client.register_script.side_effect = lambda script: Mock(return_value=[])
     return mock_client
 
 
@@ -270,18 +271,21 @@ class TestClusterCoordinator:
             'priority': 1,
             'max_retries': 3,
             'retry_count': 0,
-            'status': 'pending',
+            'status': 'in_progress',
             'assigned_node': None,
             'created_at': datetime.now(timezone.utc).isoformat(),
-            'started_at': None,
+            'started_at': datetime.now(timezone.utc).isoformat(),
             'completed_at': None,
             'error_message': None
         })
         
-        mock_redis.rpop.return_value = work_data
+        coordinator._claim_script.return_value = [work_data]
         
         work_items = coordinator.get_work_for_node("test-node", count=1)
         
+        call = coordinator._claim_script.call_args
+        assert call.kwargs['keys'] == ["scraper:work_queue:test-node", "scraper:active_work:test-node"]
+        assert call.kwargs['args'][0] == 1
         assert len(work_items) == 1
         assert work_items[0].work_id == "work-1"
         assert work_items[0].status == WorkItemStatus.IN_PROGRESS
@@ -302,8 +306,10 @@ class TestClusterCoordinator:
         assert result is True
         assert work_item.status == WorkItemStatus.COMPLETED
         assert work_item.completed_at is not None
-        mock_redis.hdel.assert_called()
-        mock_redis.hset.assert_called()
+        call = coordinator._complete_script.call_args
+        assert call.kwargs['keys'] == ["scraper:active_work:test-node-1", "scraper:completed_work:test-node-1"]
+        assert call.kwargs['args'][:2] == [86400, "work-1"]
+        mock_redis.execute.assert_called()
     
     def test_fail_work_item_with_retry(self, coordinator, mock_redis):
         """Test failing a work item that should be retried"""
@@ -323,7 +329,9 @@ class TestClusterCoordinator:
         assert work_item.status == WorkItemStatus.RETRYING
         assert work_item.retry_count == 1
         assert work_item.error_message == "Network error"
-        mock_redis.zadd.assert_called()
+        work_id, retry_data, retry_time = coordinator._fail_script.call_args.kwargs['args']
+        assert work_id == "work-1"
+        assert json.loads(retry_data)['retry_time'] == float(retry_time)
     
     def test_fail_work_item_max_retries(self, coordinator, mock_redis):
         """Test failing a work item that has exceeded max retries"""
@@ -342,7 +350,9 @@ class TestClusterCoordinator:
         assert result is True
         assert work_item.status == WorkItemStatus.FAILED
         assert work_item.retry_count == 4
-        mock_redis.hset.assert_called()
+        work_id, work_data, retry_time = coordinator._fail_script.call_args.kwargs['args']
+        assert json.loads(work_data)['status'] == "failed"
+        assert retry_time == ""
     
     def test_process_retry_queue(self, coordinator, mock_redis):
         """Test processing retry queue"""
@@ -526,7 +536,7 @@ class TestClusterCoordinatorIntegration:
                 
                 # Simulate getting work for a node
                 work_data = json.dumps(sample_work_items[0].to_dict())
-                mock_redis.rpop.return_value = work_data
+                coordinator._claim_script.return_value = [work_data]
                 
                 work_items = coordinator.get_work_for_node("node-1", count=1)
                 assert len(work_items) == 1
@@ -650,5 +660,68 @@ class TestClusterCoordinatorHealthMonitoring:
             mock_redis.delete.assert_called()
 
 
+@pytest.fixture
+def fake_redis():
+    """In-memory Redis that runs the coordinator's Lua scripts"""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis()
+
+
+class TestAtomicWorkClaiming:
+    """Lua work item scripts against an in-memory Redis"""
+    
+    def queue_work(self, client, node_id, count):
+        items = [WorkItem(work_id=f"work-{i}", city="Helsinki", url=f"https://example.com/{i}",
+                          assigned_node=node_id) for i in range(count)]
+        client.lpush(f"scraper:work_queue:{node_id}", *[json.dumps(item.to_dict()) for item in items])
+        return items
+    
+    def test_claims_batch_into_active_work(self, fake_redis):
+        coordinator = ClusterCoordinator(fake_redis, node_id="node-1")
+        self.queue_work(fake_redis, "node-1", 5)
+        
+        claimed = coordinator.get_work_for_node("node-1", count=3)
+        
+        assert [item.work_id for item in claimed] == ["work-0", "work-1", "work-2"]
+        assert all(item.status == WorkItemStatus.IN_PROGRESS and item.started_at for item in claimed)
+        assert fake_redis.llen("scraper:work_queue:node-1") == 2
+        active = coordinator.get_active_work_for_node("node-1")
+        assert sorted(item.work_id for item in active) == ["work-0", "work-1", "work-2"]
+        assert active[0].url.startswith("https://example.com/")
+        assert len(coordinator.get_work_for_node("node-1", count=10)) == 2
+        assert coordinator.get_work_for_node("node-1", count=10) == []
+    
+    def test_completes_and_fails_batches(self, fake_redis):
+        coordinator = ClusterCoordinator(fake_redis, node_id="node-1")
+        self.queue_work(fake_redis, "node-1", 3)
+        self.queue_work(fake_redis, "node-2", 2)
+        claimed = coordinator.get_work_for_node("node-1", count=3) + coordinator.get_work_for_node("node-2", count=2)
+        claimed[4].retry_count = claimed[4].max_retries
+        
+        assert coordinator.complete_work_items(claimed[:2] + claimed[3:4])
+        assert coordinator.fail_work_items([claimed[2], claimed[4]], "Network error")
+        
+        assert fake_redis.hlen("scraper:active_work:node-1") == 0
+        assert fake_redis.hlen("scraper:active_work:node-2") == 0
+        assert sorted(fake_redis.hkeys("scraper:completed_work:node-1")) == [b"work-0", b"work-1"]
+        assert fake_redis.ttl("scraper:completed_work:node-2") > 0
+        assert fake_redis.hkeys("scraper:failed_work:node-2") == [b"work-1"]
+        retry = json.loads(fake_redis.zrange("scraper:retry_queue", 0, -1)[0])
+        assert retry['work_item']['work_id'] == "work-2"
+        assert retry['work_item']['status'] == "retrying"
+    
+    def test_claimed_work_of_failed_node_is_redistributed(self, fake_redis):
+        coordinator = ClusterCoordinator(fake_redis, node_id="node-2")
+        self.queue_work(fake_redis, "node-1", 4)
+        coordinator.get_work_for_node("node-1", count=3)
+        
+        with patch.object(coordinator, 'get_healthy_nodes', return_value=["node-2"]):
+            coordinator._redistribute_work_from_failed_node("node-1")
+        
+        claimed = coordinator.get_work_for_node("node-2", count=10)
+        assert sorted(item.work_id for item in claimed) == [f"work-{i}" for i in range(4)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,125 @@
+import pytest
+import threading
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.database.connection import (
+    get_connection_manager,
+    get_database_connection,
+    get_reader_connection,
+    add_acquire_observer,
+)
+import duckdb
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = get_connection_manager(str(tmp_path / "test_connection.duckdb"))
+    with manager.connection() as con:
+        con.execute("CREATE TABLE items (id INTEGER)")
+    yield manager
+    manager.close()
+
+
+def test_manager_is_shared_per_path(tmp_path):
+    db_path = tmp_path / "shared.duckdb"
+    assert get_connection_manager(str(db_path)) is get_connection_manager(str(tmp_path / "." / "shared.duckdb"))
+    assert get_connection_manager(str(db_path)) is not get_connection_manager(str(tmp_path / "other.duckdb"))
+
+
+def test_connection_reuses_thread_cursor(manager):
+    with manager.connection() as first:
+        pass
+    with manager.connection() as second:
+        pass
+    assert first is second
+    assert manager.get_stats()['cursors_created'] == 1
+
+
+def test_threads_get_separate_cursors(manager):
+    cursors = []
+
+    def worker(i):
+        with manager.connection() as con:
+            con.execute("INSERT INTO items VALUES (?)", [i])
+            cursors.append(con)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(cursor) for cursor in cursors}) == 4
+    with manager.connection() as con:
+        assert con.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 4
+
+
+def test_uncommitted_transaction_rolled_back_on_exit(manager):
+    with manager.connection() as con:
+        con.begin()
+        con.execute("INSERT INTO items VALUES (1)")
+
+    with manager.connection() as con:
+        assert con.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_transaction_commits_and_rolls_back(manager):
+    with manager.transaction() as con:
+        con.execute("INSERT INTO items VALUES (1)")
+
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as con:
+            con.execute("INSERT INTO items VALUES (2)")
+            raise RuntimeError("boom")
+
+    with manager.connection() as con:
+        assert con.execute("SELECT id FROM items").fetchall() == [(1,)]
+
+
+def test_dedicated_cursor_can_be_closed(manager):
+    cursor = get_database_connection(manager.db_path)
+    cursor.execute("INSERT INTO items VALUES (7)")
+    cursor.close()
+
+    with manager.connection() as con:
+        assert con.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+
+
+def test_reopen_after_close(manager):
+    manager.close()
+    with manager.connection() as con:
+        assert con.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+
+
+def test_acquire_latency_reported(manager):
+    samples = []
+    add_acquire_observer(lambda db_path, seconds: samples.append((db_path, seconds)))
+
+    with manager.connection():
+        pass
+
+    stats = manager.get_stats()
+    assert stats['acquisitions'] >= 2
+    assert stats['avg_acquire_ms'] >= 0
+    assert stats['max_acquire_ms'] >= stats['p95_acquire_ms']
+    assert any(db_path == manager.db_path for db_path, _ in samples)
+
+
+def test_reader_connection_is_read_only_unless_writer_is_open(manager):
+    manager.close()
+    reader = get_reader_connection(manager.db_path)
+    assert reader.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    with pytest.raises(duckdb.Error):
+        reader.execute("INSERT INTO items VALUES (1)")
+    reader.close()
+
+    # With the reader closed, the writer can open the file again
+    with manager.connection() as con:
+        con.execute("INSERT INTO items VALUES (1)")
+    cursor = get_reader_connection(manager.db_path)
+    assert cursor.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+    cursor.close()
@@ -0,0 +1,93 @@
+import pytest
+from pathlib import Path
+import duckdb
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.database.manager import EnhancedDatabaseManager
+
+
+def make_listing(i, price='100 000 €'):
+    return {
+        'url': f'http://example.com/{i}', 'source': 'oikotie', 'title': f'Test Listing {i}',
+        'overview': 'Overview', 'full_description': 'Desc',
+        'details': {
+            'sijainti': 'Test address 1, 00100 Helsinki',
+            'rakennuksen_tyyppi': 'Kerrostalo',
+            'velaton_hinta': price,
+            'asuinpinta-ala': '50 m²',
+            'huoneita': '2',
+            'rakennusvuosi': '2000',
+            'hissi': 'Kyllä',
+        }
+    }
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Fixture for an EnhancedDatabaseManager using a temporary database."""
+    return EnhancedDatabaseManager(db_path=str(tmp_path / "test_enhanced.duckdb"))
+
+
+def fetch_rows(db_manager):
+    with duckdb.connect(str(db_manager.db_path)) as con:
+        return con.execute("""
+            SELECT url, city, address, postal_code, listing_type, price_eur, size_m2, rooms,
+                   year_built, other_details_json, check_count, execution_id, data_quality_score
+            FROM listings ORDER BY url
+        """).fetchall()
+
+
+class TestBulkUpsert:
+    def test_bulk_insert_counts(self, db_manager):
+        listings = [make_listing(i) for i in range(5)]
+        result = db_manager.upsert_with_deduplication(listings, "Helsinki", "exec-1", bulk=True)
+        assert result.total_processed == 5
+        assert result.new_records == 5
+        assert result.updated_records == 0
+        assert result.failed_records == 0
+
+    def test_bulk_update_counts_and_check_count(self, db_manager):
+        listings = [make_listing(i) for i in range(3)]
+        db_manager.upsert_with_deduplication(listings, "Helsinki", "exec-1", bulk=True)
+
+        changed = [make_listing(i, price='200 000 €') for i in range(2)] + [make_listing(3)]
+        result = db_manager.upsert_with_deduplication(changed, "Helsinki", "exec-2", bulk=True)
+        assert result.new_records == 1
+        assert result.updated_records == 2
+
+        rows = {row[0]: row for row in fetch_rows(db_manager)}
+        assert rows['http://example.com/0'][5] == 200000.0
+        assert rows['http://example.com/0'][10] == 2
+        assert rows['http://example.com/0'][11] == "exec-2"
+        assert rows['http://example.com/2'][10] == 1
+
+    def test_bulk_matches_per_row_path(self, tmp_path):
+        listings = [make_listing(i) for i in range(4)]
+        per_row = EnhancedDatabaseManager(db_path=str(tmp_path / "per_row.duckdb"))
+        bulk = EnhancedDatabaseManager(db_path=str(tmp_path / "bulk.duckdb"))
+
+        per_row_result = per_row.upsert_with_deduplication(listings, "Helsinki", "exec-1")
+        bulk_result = bulk.upsert_with_deduplication(listings, "Helsinki", "exec-1", bulk=True)
+
+        assert per_row_result.new_records == bulk_result.new_records
+        assert fetch_rows(per_row) == fetch_rows(bulk)
+
+    def test_bulk_invalid_and_duplicate_listings(self, db_manager):
+        listings = [
+            make_listing(1),
+            make_listing(1, price='300 000 €'),
+            {'title': 'No URL', 'details': {}},
+            {'url': 'http://example.com/err', 'details': {'error': 'timeout'}},
+        ]
+        result = db_manager.upsert_with_deduplication(listings, "Helsinki", "exec-1", bulk=True)
+        assert result.new_records == 1
+        assert result.skipped_records == 1
+        assert result.failed_records == 2
+        assert len(result.errors) == 2
+
+        rows = fetch_rows(db_manager)
+        assert len(rows) == 1
+        assert rows[0][5] == 300000.0
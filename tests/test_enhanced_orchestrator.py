@@ -288,6 +288,24 @@ class TestOrchestratorFactory:
         assert 'Helsinki' in cities
         assert 'Tampere' in cities
         assert 'Turku' not in cities
+    
+    def test_task_parser_backend_falls_back_to_global_settings(self, tmp_path):
+        """Test that tasks without a parser_backend use the global setting."""
+        config_data = {
+            'global_settings': {'parser_backend': 'lxml'},
+            'tasks': [
+                {'city': 'Helsinki', 'url': 'https://example.com/helsinki', 'enabled': True},
+                {'city': 'Espoo', 'url': 'https://example.com/espoo', 'enabled': True,
+                 'parser_backend': 'bs4'}
+            ]
+        }
+        config_path = tmp_path / 'test_config.json'
+        config_path.write_text(json.dumps(config_data), encoding='utf-8')
+        
+        orchestrators = load_config_and_create_orchestrators(str(config_path))
+        
+        backends = {orch.config.city: orch.config.parser_backend for orch in orchestrators}
+        assert backends == {'Helsinki': 'lxml', 'Espoo': 'bs4'}
 
 
 class TestIntegrationWithExistingComponents:
@@ -304,6 +322,21 @@ class TestIntegrationWithExistingComponents:
             if table in table_info:
                 assert table_info[table]['exists'] is True
     
+    def test_retry_manager_reads_through_the_shared_connection(self, tmp_path):
+        """Test that retries are found while the manager holds the writer connection."""
+        enhanced_db_manager = EnhancedDatabaseManager(str(tmp_path / 'retries.duckdb'))
+        with enhanced_db_manager.connections.connection() as con:
+            con.execute("""
+                INSERT INTO listings (url, city, retry_count, last_error, last_check_ts)
+                VALUES ('https://example.com/retry', 'Helsinki', 1, 'timeout', ?)
+            """, [datetime.now() - timedelta(hours=2)])
+
+        retry_manager = RetryManager(enhanced_db_manager)
+
+        assert retry_manager.get_ready_retries('Helsinki') == ['https://example.com/retry']
+        assert retry_manager.reset_retry_count('https://example.com/retry') is True
+        assert retry_manager.get_ready_retries('Helsinki') == []
+    
     def test_osm_building_footprint_integration(self, orchestrator):
         """Test integration with OSM building footprint validation system."""
         # This is a placeholder test for OSM integration
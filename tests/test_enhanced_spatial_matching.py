@@ -0,0 +1,66 @@
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point, box
+from oikotie.utils.enhanced_spatial_matching import EnhancedSpatialMatcher
+
+
+@pytest.fixture
+def buildings():
+    return gpd.GeoDataFrame({'osm_id': [101, 102, 103, 104]}, geometry=[
+        box(0, 0, 10, 10),
+        box(10, 0, 20, 10),    # shares an edge with 101
+        box(100, 100, 120, 120),
+        box(100, 100, 120, 120),  # duplicate footprint of 103
+    ], crs='EPSG:3067')
+
+
+def test_bulk_match_types_and_stats(buildings):
+    points = gpd.GeoDataFrame({'address': ['inside', 'edge', 'near', 'far', 'duplicate']}, geometry=[
+        Point(5, 5), Point(10, 5), Point(35, 5), Point(500, 500), Point(110, 110),
+    ], crs='EPSG:3067')
+    matcher = EnhancedSpatialMatcher(tolerance_m=20.0)
+
+    results = matcher.enhanced_spatial_match(points, buildings)
+
+    assert list(results.columns) == ['address', 'osm_id', 'match_type', 'distance_m',
+                                     'is_direct_match', 'is_tolerance_match']
+    assert results['match_type'].tolist() == ['direct_contains', 'tolerance_buffer', 'tolerance_buffer',
+                                              'no_match', 'direct_contains']
+    # Ties go to the first building in input order
+    assert results['osm_id'].tolist()[:3] == [101, 101, 102]
+    assert results['osm_id'].iloc[4] == 103
+    assert pd.isna(results['osm_id'].iloc[3]) and np.isinf(results['distance_m'].iloc[3])
+    assert results['distance_m'].iloc[2] == pytest.approx(15.0)
+
+    stats = matcher.get_statistics()
+    assert (stats['total_processed'], stats['direct_matches'], stats['tolerance_matches'], stats['no_matches']) == (5, 2, 2, 1)
+
+
+def test_bulk_match_agrees_with_per_point_scan():
+    rng = np.random.default_rng(7)
+    corners = rng.uniform(0, 2000, (400, 2))
+    sizes = rng.uniform(5, 40, 400)
+    buildings = gpd.GeoDataFrame({'osm_id': np.arange(400)},
+                                 geometry=[box(x, y, x + s, y + s) for (x, y), s in zip(corners, sizes)],
+                                 crs='EPSG:3067')
+    points = gpd.GeoDataFrame({'address': [f'a{i}' for i in range(300)]},
+                              geometry=gpd.points_from_xy(*rng.uniform(0, 2000, (2, 300))), crs='EPSG:3067')
+
+    results = EnhancedSpatialMatcher(tolerance_m=20.0).enhanced_spatial_match(points.to_crs(4326), buildings.to_crs(4326))
+
+    projected = buildings.to_crs(4326).to_crs(3067)
+    for point, (_, row) in zip(points.to_crs(4326).to_crs(3067).geometry, results.iterrows()):
+        distances = projected.distance(point)
+        if distances.min() > 20.0:
+            assert row['match_type'] == 'no_match'
+        else:
+            assert row['osm_id'] == projected['osm_id'].iloc[int(np.argmin(distances.to_numpy()))]
+            assert row['distance_m'] == pytest.approx(distances.min())
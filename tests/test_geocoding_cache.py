@@ -0,0 +1,95 @@
+import json
+import os
+import time
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.utils.enhanced_geocoding_service import GeocodeResult, UnifiedGeocodingService
+from oikotie.utils.geocoding_cache import GeocodingCache
+
+
+def make_result(address='bulevardi 1 00120 helsinki', source='wms_national'):
+    return GeocodeResult(60.16, 24.94, 0.9, source, 'address_matching', address, address, 0.9)._asdict()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GeocodingCache(str(tmp_path / 'cache.sqlite'), lru_size=2)
+
+
+def test_batch_put_and_get_round_trip(cache, tmp_path):
+    entries = {f'key{i}': make_result(f'address {i}') for i in range(5)}
+    assert cache.put_many(entries) == 5
+
+    reopened = GeocodingCache(str(tmp_path / 'cache.sqlite'))
+    found = reopened.get_many(['key0', 'key3', 'missing'])
+
+    assert found == {'key0': entries['key0'], 'key3': entries['key3']}
+    assert len(reopened) == 5
+    stats = reopened.get_stats()
+    assert stats['store_hits'] == 2 and stats['misses'] == 1
+
+
+def test_lru_front_serves_repeated_lookups(cache):
+    cache.put('a', make_result())
+    cache.get('a')
+    cache.get('a')
+    cache.put_many({'b': make_result(), 'c': make_result()})
+
+    stats = cache.get_stats()
+    assert stats['memory_hits'] == 2
+    assert stats['memory_entries'] == 2  # 'a' was evicted by the bounded LRU
+    assert cache.get('a') is not None
+    assert cache.get_stats()['store_hits'] == 1
+
+
+def test_entries_expire_per_source(tmp_path):
+    cache = GeocodingCache(str(tmp_path / 'ttl.sqlite'), source_ttl_seconds={'nominatim': 60})
+    old = time.time() - 120
+    cache.put_many({'external': make_result(source='nominatim'), 'local': make_result()},
+                   cached_at={'external': old, 'local': old})
+
+    assert set(cache.get_many(['external', 'local'])) == {'local'}
+    assert cache.get_stats()['expired'] == 1
+    assert cache.purge_expired() == 1
+    assert len(cache) == 1
+
+
+def test_import_json_dir(cache, tmp_path):
+    legacy = tmp_path / 'legacy'
+    legacy.mkdir()
+    (legacy / 'abc123.json').write_text(json.dumps(make_result(), indent=2), encoding='utf-8')
+    (legacy / 'broken.json').write_text('{not json', encoding='utf-8')
+    os.utime(legacy / 'abc123.json', (1_000_000, 1_000_000))
+
+    counts = cache.import_json_dir(str(legacy), remove=True)
+
+    assert counts == {'imported': 1, 'failed': 1}
+    assert cache.get('abc123') == make_result()
+    assert not (legacy / 'abc123.json').exists() and (legacy / 'broken.json').exists()
+
+
+def test_service_migrates_legacy_files_and_batch_uses_cache(tmp_path):
+    cache_dir = tmp_path / 'geocoding'
+    cache_dir.mkdir()
+    address = 'Bulevardi 1, 00120 Helsinki'
+
+    service = UnifiedGeocodingService(geopackage_path=str(tmp_path / 'missing.gpkg'),
+                                      db_path=str(tmp_path / 'db.duckdb'),
+                                      cache_dir=str(cache_dir), enable_logging=False)
+    key = service._generate_specific_cache_key(service.normalizer.normalize_address(address))
+    (cache_dir / f'{key}.json').write_text(json.dumps(make_result()), encoding='utf-8')
+    service.cache.close()
+
+    service = UnifiedGeocodingService(geopackage_path=str(tmp_path / 'missing.gpkg'),
+                                      db_path=str(tmp_path / 'db.duckdb'),
+                                      cache_dir=str(cache_dir), enable_logging=False)
+    results = service.batch_geocode_addresses([address])
+
+    assert results[address] == GeocodeResult(**make_result())._replace(original_address=address)
+    assert service.last_batch_stats['stages']['cache']['hits'] == 1
+    assert service.cache.get_stats()['hits'] == 1
@@ -0,0 +1,85 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import box
+from oikotie.data_sources import geopackage_source
+from oikotie.data_sources.geopackage_source import GeoPackageDataSource
+
+# Roughly central Helsinki, in WGS84
+BBOX = (24.92, 60.16, 24.96, 60.18)
+
+
+@pytest.fixture(scope='module')
+def gpkg_path(tmp_path_factory):
+    """GeoPackage with building polygons and address points in the national grid."""
+    rng = np.random.default_rng(11)
+    x = rng.uniform(382000, 390000, 2000)
+    y = rng.uniform(6670000, 6676000, 2000)
+    size = rng.uniform(10, 400, 2000)
+    path = tmp_path_factory.mktemp('gpkg') / 'topographic.gpkg'
+    gpd.GeoDataFrame({
+        'mtk_id': np.arange(2000),
+        'kerrosluku': rng.integers(1, 12, 2000),
+        'kayttotarkoitus': rng.integers(1, 20, 2000),
+    }, geometry=[box(a, b, a + s, b + s) for a, b, s in zip(x, y, size)], crs='EPSG:3067').to_file(path, layer='rakennus')
+    gpd.GeoDataFrame({
+        'mtk_id': np.arange(2000),
+        'katunimi': [f'Katu {i % 40}' for i in range(2000)],
+        'postinumero': ['00100' if i % 2 else '00500' for i in range(2000)],
+    }, geometry=gpd.points_from_xy(x, y), crs='EPSG:3067').to_file(path, layer='osoitepiste')
+    return path
+
+
+def full_read(source, layer, bbox, mapping):
+    """Whole-layer read filtered in memory, as the source did before bbox pushdown."""
+    gdf = gpd.read_file(str(source.gpkg_path), layer=layer)
+    native = gpd.GeoSeries(gpd.points_from_xy([bbox[0], bbox[2]], [bbox[1], bbox[3]]), crs=source.target_crs)
+    bounds = native.union_all().envelope
+    minx, miny, maxx, maxy = gpd.GeoSeries([bounds], crs=source.target_crs).to_crs(gdf.crs).total_bounds
+    gdf = gdf.cx[minx:maxx, miny:maxy].reset_index(drop=True)
+    return source.transform_to_target_crs(source.standardize_columns(gdf, mapping))
+
+
+@pytest.mark.parametrize('layer, method, mapping', [
+    ('rakennus', 'fetch_buildings', GeoPackageDataSource.BUILDING_COLUMN_MAPPING),
+    ('osoitepiste', 'fetch_addresses', GeoPackageDataSource.ADDRESS_COLUMN_MAPPING),
+])
+def test_bbox_reads_match_full_layer_reads(gpkg_path, layer, method, mapping):
+    source = GeoPackageDataSource(str(gpkg_path))
+
+    result = getattr(source, method)(bbox=BBOX)
+    expected = full_read(source, layer, BBOX, mapping)
+
+    assert 0 < len(result) < 2000
+    assert result['feature_id'].tolist() == expected['feature_id'].tolist()
+    assert result.geometry.geom_equals_exact(expected.geometry, tolerance=1e-9).all()
+    assert result.crs == expected.crs
+
+
+def test_limit_and_projection_are_pushed_down(gpkg_path):
+    source = GeoPackageDataSource(str(gpkg_path))
+
+    limited = source.fetch_buildings(limit=5)
+    subset = source.fetch_layer('rakennus', bbox=BBOX, columns=['mtk_id'], where='kerrosluku > 6')
+
+    assert limited['feature_id'].tolist() == [0, 1, 2, 3, 4]
+    assert list(subset.columns) == ['mtk_id', 'geometry']
+    expected = full_read(source, 'rakennus', BBOX, {})
+    assert subset['mtk_id'].tolist() == expected.loc[expected['kerrosluku'] > 6, 'mtk_id'].tolist()
+
+
+def test_full_read_fallback_without_pyogrio(gpkg_path):
+    source = GeoPackageDataSource(str(gpkg_path))
+    expected = source.fetch_addresses(bbox=BBOX, limit=20)
+
+    with patch.object(geopackage_source, 'PYOGRIO_AVAILABLE', False):
+        result = source.fetch_addresses(bbox=BBOX, limit=20)
+
+    assert result['feature_id'].tolist() == expected['feature_id'].tolist()
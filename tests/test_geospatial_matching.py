@@ -0,0 +1,107 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import box
+from oikotie.geospatial.base import GeospatialIntegrator
+from oikotie.geospatial.matching import BuildingMatchEngine
+
+
+class StubIntegrator(GeospatialIntegrator):
+    """City integrator whose buildings come from memory."""
+
+    def __init__(self, buildings_gdf):
+        super().__init__("Espoo")
+        self.coordinate_bounds = (24.5, 60.1, 24.9, 60.35)
+        self.buildings_gdf = buildings_gdf
+        self.fetch_calls = 0
+
+    def geocode_addresses(self, addresses):
+        return []
+
+    def fetch_building_data(self, bbox=None):
+        self.fetch_calls += 1
+        return self.buildings_gdf
+
+
+@pytest.fixture
+def buildings():
+    # Footprints in the Finnish national grid around Tapiola, stored in WGS84
+    footprints = gpd.GeoDataFrame({'building_id': ['a', 'b', 'c']}, geometry=[
+        box(374000, 6671000, 374020, 6671020),
+        box(374020, 6671000, 374040, 6671020),
+        box(374200, 6671000, 374220, 6671020),
+    ], crs='EPSG:3067')
+    return footprints.to_crs('EPSG:4326').set_index(pd.Index([10, 11, 12]))
+
+
+def listing_points(offsets):
+    """WGS84 coordinates of points given in the national grid."""
+    points = gpd.GeoSeries(gpd.points_from_xy([x for x, _ in offsets], [y for _, y in offsets]), crs='EPSG:3067')
+    points = points.to_crs('EPSG:4326')
+    return points.y.to_numpy(), points.x.to_numpy()
+
+
+def test_engine_matches_within_then_nearest(buildings):
+    lat, lon = listing_points([(374010, 6671010), (374100, 6671010), (374060, 6671010), (375000, 6672000)])
+    lat = np.append(lat, np.nan)
+    lon = np.append(lon, np.nan)
+
+    matches = BuildingMatchEngine(max_distance_m=50.0).match(lat, lon, buildings)
+
+    assert matches['match_type'].iloc[[0, 2]].tolist() == ['within_polygon', 'near_polygon']
+    assert matches['building_id'].iloc[[0, 2]].tolist() == ['a', 'b']
+    assert matches[~matches['building_match']][['match_type', 'building_id']].isna().all().all()
+    assert matches['building_match'].tolist() == [True, False, True, False, False]
+    assert matches['distance_m'].iloc[2] == pytest.approx(20.0, abs=0.01)
+
+
+def test_engine_falls_back_to_index_labels(buildings):
+    lat, lon = listing_points([(374030, 6671005)])
+
+    matches = BuildingMatchEngine().match(lat, lon, buildings.drop(columns='building_id'))
+
+    assert matches['building_id'].tolist() == ['11']
+
+
+def test_integrator_matches_column_wise(buildings):
+    integrator = StubIntegrator(buildings)
+    lat, lon = listing_points([(374010, 6671010), (374060, 6671010), (374100, 6671010)])
+    listings = pd.DataFrame({'url': ['u1', 'u2', 'u3'], 'address': ['x', 'y', 'z'],
+                             'latitude': lat, 'longitude': lon}, index=[5, 6, 7])
+
+    with patch.object(integrator, 'update_database_with_matches') as update:
+        result = integrator.match_listings_to_buildings(listings)
+
+    assert integrator.fetch_calls == 1
+    assert result.index.tolist() == [5, 6, 7]
+    assert result['match_type'].tolist()[:2] == ['within_polygon', 'near_polygon']
+    assert pd.isna(result['match_type'].iloc[2])
+    expected = [integrator.calculate_quality_score({'latitude': la, 'longitude': lo},
+                                                   {'building_match': True, 'address_components_match': False})
+                for la, lo in zip(lat[:2], lon[:2])]
+    assert result['geospatial_quality_score'].tolist() == expected + [0.0]
+    assert [m['listing_url'] for m in update.call_args[0][0]] == ['u1', 'u2']
+
+
+def test_vectorized_quality_scores_match_scalar():
+    integrator = StubIntegrator(gpd.GeoDataFrame(geometry=[]))
+    lat = np.array([60.2, 60.2, 59.0, np.nan])
+    lon = np.array([24.7, 24.7, 24.7, 24.7])
+    building_match = np.array([True, False, True, True])
+    components = np.array([False, True, True, False])
+
+    scores = integrator.calculate_quality_scores(lat, lon, building_match, components)
+
+    assert scores.tolist() == [
+        integrator.calculate_quality_score({'latitude': la, 'longitude': lo},
+                                           {'building_match': bm, 'address_components_match': cm})
+        for la, lo, bm, cm in zip(lat, lon, building_match, components)
+    ]
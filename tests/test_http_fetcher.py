@@ -0,0 +1,107 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.http_fetcher import HttpDetailFetcher, TokenBucket
+from oikotie.rate_control import AdaptiveLimiter
+from oikotie.scraper import ScraperOrchestrator, worker_scrape_details_http
+from quickcheck.fixture_server import FixtureServer
+
+
+@pytest.fixture
+def fixture_server():
+    server = FixtureServer().start()
+    yield server
+    server.stop()
+
+
+def make_summaries(base_url, paths):
+    return [{'url': f"{base_url}{path}", 'source': 'oikotie', 'title': path} for path in paths]
+
+
+def test_http_mode_parses_static_pages_with_session_cookies(fixture_server):
+    summaries = make_summaries(fixture_server.base_url, ['/listing/1', '/listing/2'])
+
+    results = worker_scrape_details_http(summaries, cookies={'consent': 'accepted'},
+                                         requests_per_second=1000, burst=10)
+
+    assert len(results) == 2
+    details = {r['url']: r['details'] for r in results}
+    assert details[f"{fixture_server.base_url}/listing/1"]['sijainti'] == 'Testikatu 1, 00100 Helsinki'
+    assert results[0]['overview'].startswith('Valoisa koti')
+    assert all(cookie == 'consent=accepted' for _, cookie, _, _ in fixture_server.requests)
+
+
+def test_http_errors_and_js_only_fallback(fixture_server):
+    summaries = make_summaries(fixture_server.base_url, ['/listing/1', '/missing/1', '/js-only/1'])
+
+    def fake_selenium(chunk, result_queue=None, pool=None, limiter=None):
+        return [dict(summary, details={'sijainti': 'from browser'}) for summary in chunk]
+
+    with patch('oikotie.scraper.worker_scrape_details', side_effect=fake_selenium) as selenium_worker:
+        results = worker_scrape_details_http(summaries, requests_per_second=1000, burst=10)
+
+    by_url = {r['url']: r['details'] for r in results}
+    assert 'error' in by_url[f"{fixture_server.base_url}/missing/1"]
+    assert by_url[f"{fixture_server.base_url}/js-only/1"] == {'sijainti': 'from browser'}
+    assert [s['url'] for s in selenium_worker.call_args[0][0]] == [f"{fixture_server.base_url}/js-only/1"]
+
+
+def test_connections_are_pooled(fixture_server):
+    urls = [f"{fixture_server.base_url}/listing/{i}" for i in range(20)]
+    pages = []
+
+    fetcher = HttpDetailFetcher(max_connections=2, requests_per_second=1000, burst=20)
+    fetcher.fetch_pages(urls, lambda url, html, error: pages.append(url))
+
+    assert sorted(pages) == sorted(urls)
+    assert len({client_port for _, _, client_port, _ in fixture_server.requests}) <= 2
+
+
+def test_limiter_backs_off_on_overload_but_not_on_missing_pages(fixture_server):
+    limiter = AdaptiveLimiter("http-details", max_limit=4, initial_limit=4, rate=1000.0)
+    fetcher = HttpDetailFetcher(max_connections=4, requests_per_second=1000, burst=10, limiter=limiter)
+
+    fetcher.fetch_pages([f"{fixture_server.base_url}/listing/{i}" for i in range(3)] +
+                        [f"{fixture_server.base_url}/missing/1"], lambda url, html, error: None)
+    assert (limiter.requests, limiter.backoffs, limiter.in_flight) == (4, 0, 0)
+
+    fetcher.fetch_pages([f"{fixture_server.base_url}/status/503"], lambda url, html, error: None)
+    assert limiter.backoffs == 1
+    assert limiter.limit == 2
+    assert limiter.get_stats().error_rate == pytest.approx(1 / 5)
+
+
+def test_zero_rate_limit_leaves_http_requests_unpaced(fixture_server):
+    orchestrator = ScraperOrchestrator.__new__(ScraperOrchestrator)
+    orchestrator.driver_pool, orchestrator.parser_backend = None, None
+    task = {'city': 'Kotka', 'fetch_mode': 'http', 'rate_limit_seconds': 0}
+
+    with patch('oikotie.scraper.worker_scrape_details_http', return_value=[]) as http_worker:
+        orchestrator._scrape_details([], 1, dict(task, http_requests_per_second=5.0))
+        orchestrator._scrape_details([], 1, task)
+    assert [call.kwargs['requests_per_second'] for call in http_worker.call_args_list] == [5.0, None]
+
+    pages = []
+    HttpDetailFetcher(requests_per_second=None).fetch_pages(
+        [f"{fixture_server.base_url}/listing/1"], lambda url, html, error: pages.append(error))
+    assert pages == [None]
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, capacity=1)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    start = time.monotonic()
+    asyncio.run(take(5))
+    # The first token is available immediately, the remaining four arrive at 20/s
+    assert time.monotonic() - start >= 0.18
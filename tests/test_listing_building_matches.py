@@ -0,0 +1,153 @@
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import duckdb
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.geometry import Point, box
+from oikotie.database.connection import get_connection_manager
+from oikotie.utils.listing_building_matches import (
+    ListingBuildingMatchService, file_snapshot_version, match_to_buildings
+)
+from oikotie.visualization.dashboard.multi_city import MultiCityDashboard
+
+
+def make_buildings(count=300, seed=1):
+    rng = np.random.default_rng(seed)
+    corners = rng.uniform([24.90, 60.15], [24.96, 60.19], (count, 2))
+    sizes = rng.uniform(0.0001, 0.0006, count)
+    return gpd.GeoDataFrame({
+        'osm_id': np.arange(1000, 1000 + count),
+        'name': [f'Building {i}' for i in range(count)],
+        'fclass': 'building',
+    }, geometry=[box(x, y, x + s, y + s) for (x, y), s in zip(corners, sizes)], crs='EPSG:4326')
+
+
+def make_listings(count=200, seed=2):
+    rng = np.random.default_rng(seed)
+    lon, lat = rng.uniform([24.90, 60.15], [24.96, 60.19], (count, 2)).T
+    return pd.DataFrame({'id': [f'https://example.com/{i}' for i in range(count)], 'address': 'x',
+                         'latitude': lat, 'longitude': lon, 'price': rng.uniform(1e5, 9e5, count)})
+
+
+def per_listing_reference(listings_df, buildings_gdf, buffer_distance=0.001):
+    """The per-listing loop the dashboards used before."""
+    results = []
+    for _, listing in listings_df.iterrows():
+        point = Point(listing['longitude'], listing['latitude'])
+        containing = buildings_gdf[buildings_gdf.contains(point)]
+        if not containing.empty:
+            results.append(('direct', containing.iloc[0]['osm_id'], 0.0))
+            continue
+        near = buildings_gdf[buildings_gdf.intersects(point.buffer(buffer_distance))]
+        if near.empty:
+            results.append(('none', None, float('inf')))
+            continue
+        distances = near.geometry.distance(point)
+        results.append(('buffer', near.loc[distances.idxmin()]['osm_id'], distances.min() * 111000))
+    return results
+
+
+def test_bulk_matches_agree_with_per_listing_loop():
+    buildings, listings = make_buildings(), make_listings()
+    service = ListingBuildingMatchService(db_path=':memory:')
+
+    matches = service.get_matches(listings, buildings)
+    expected = per_listing_reference(listings, buildings)
+
+    assert matches['match_type'].tolist() == [match_type for match_type, _, _ in expected]
+    assert [None if pd.isna(b) else b for b in matches['building_id']] == [b for _, b, _ in expected]
+    assert np.allclose(matches['distance_m'], [d for _, _, d in expected])
+    assert (matches['matched'] == (matches['match_type'] != 'none')).all()
+    assert set(matches['match_type']) == {'direct', 'buffer', 'none'}
+
+
+def test_points_on_an_edge_are_buffer_matches():
+    buildings = gpd.GeoDataFrame({'osm_id': [1, 2]}, geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)])
+    points = gpd.GeoSeries([Point(0.5, 0.5), Point(1, 0.5), Point(1.5, 5)])
+
+    matches = match_to_buildings(points, buildings)
+
+    assert matches['match_type'].tolist() == ['direct', 'buffer', 'none']
+    assert matches['building_pos'].tolist() == [0, 0, -1]
+    assert matches['distance'].tolist() == [0.0, 0.0, float('inf')]
+
+
+def test_matches_are_stored_per_snapshot_pair(tmp_path):
+    db_path = str(tmp_path / 'matches.duckdb')
+    buildings, listings = make_buildings(), make_listings()
+
+    first = ListingBuildingMatchService(db_path).get_matches(listings, buildings)
+
+    service = ListingBuildingMatchService(db_path)
+    again = service.get_matches(listings, buildings)
+    service.get_matches(listings, buildings)
+    assert service.stats == {'memory_hits': 1, 'table_hits': 1, 'computed': 0}
+    pd.testing.assert_frame_equal(first, again)
+
+    moved = listings.assign(latitude=listings['latitude'] + 0.0005)
+    service.get_matches(moved, buildings)
+    service.get_matches(listings, buildings.iloc[::-1])
+    assert service.stats['computed'] == 2
+
+
+def test_dashboard_matching_uses_the_service(tmp_path):
+    dashboard = MultiCityDashboard(db_path=str(tmp_path / 'dashboard.duckdb'), output_dir=str(tmp_path / 'out'))
+    listings = make_listings(50).assign(rooms=2, size_m2=50.0)
+
+    results = dashboard.perform_spatial_matching(listings, make_buildings())
+    dashboard.perform_spatial_matching(listings, make_buildings())
+
+    assert list(results.columns) == list(listings.columns) + ['match_type', 'building_id', 'building_name',
+                                                              'building_type', 'distance_m', 'matched']
+    assert dashboard.match_service.stats['computed'] == 1
+    assert dashboard.match_service.stats['memory_hits'] == 1
+
+
+def test_old_snapshots_are_pruned_and_memory_is_bounded(tmp_path):
+    db_path = str(tmp_path / 'matches.duckdb')
+    service = ListingBuildingMatchService(db_path, keep_snapshots=2, memo_size=2)
+    buildings, listings = make_buildings(50), make_listings(20)
+
+    for shift in range(4):
+        service.get_matches(listings.assign(latitude=listings['latitude'] + shift * 1e-4), buildings,
+                            buildings_version='buildings.geojson:1')
+
+    con = duckdb.connect(service.matches_db_path, read_only=True)
+    try:
+        versions = con.execute("SELECT COUNT(DISTINCT listings_version), COUNT(*) "
+                               "FROM listing_building_matches").fetchone()
+    finally:
+        con.close()
+    assert versions == (2, 40)
+    assert len(service._memo) == 2
+
+
+def test_matching_never_holds_the_listings_database(tmp_path):
+    db_path = tmp_path / 'real_estate.duckdb'
+    duckdb.connect(str(db_path)).close()
+    service = ListingBuildingMatchService(str(db_path))
+
+    service.get_matches(make_listings(20), make_buildings(50))
+
+    assert service.matches_db_path == str(tmp_path / 'listing_building_matches.duckdb')
+    assert not get_connection_manager(str(db_path)).is_open
+    duckdb.connect(str(db_path)).close()
+    reader = ListingBuildingMatchService(str(db_path))
+    reader.get_matches(make_listings(20), make_buildings(50))
+    assert reader.stats['table_hits'] == 1
+
+
+def test_file_snapshot_version_changes_with_file_and_bbox(tmp_path):
+    path = tmp_path / 'buildings.geojson'
+    path.write_text('{}')
+    version = file_snapshot_version(str(path))
+
+    assert file_snapshot_version(str(path)) == version
+    assert file_snapshot_version(str(path), (24.9, 60.1, 25.0, 60.2)) != version
+    path.write_text('{"type": "FeatureCollection"}')
+    assert file_snapshot_version(str(path)) != version
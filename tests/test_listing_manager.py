@@ -0,0 +1,114 @@
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.automation.listing_manager import ListingBatch, ListingManager, ListingPriority
+from oikotie.database.manager import UpsertResult
+from oikotie.scraper import ListingUnavailableError
+from oikotie.webdriver_pool import WebDriverPool
+
+
+class RecordingDatabase:
+    """Stands in for EnhancedDatabaseManager, recording every upsert."""
+
+    def __init__(self):
+        self.saves = []
+
+    def upsert_with_deduplication(self, listings, city_name, execution_id, bulk=False):
+        self.saves.append([listing['url'] for listing in listings])
+        return UpsertResult(len(listings), len(listings), 0, 0, 0, [])
+
+
+class Fetcher:
+    """Detail fetcher that records call order and concurrency."""
+
+    def __init__(self, delay=0.02, failing=()):
+        self.delay, self.failing = delay, set(failing)
+        self.calls, self.active, self.peak = [], 0, 0
+        self.lock = threading.Lock()
+
+    def __call__(self, listing):
+        with self.lock:
+            self.calls.append(listing['url'])
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if listing['url'] in self.failing:
+            listing['details'] = {'error': 'timeout'}
+        else:
+            listing['details'] = {'Rakennusvuosi': '1990'}
+        return listing
+
+
+def make_batch(name, priority, count, city='Helsinki'):
+    return ListingBatch(
+        batch_id=name,
+        urls=[f"https://asunnot.oikotie.fi/{name}/{i}" for i in range(count)],
+        priority=priority,
+        city=city,
+        created_at=datetime.now()
+    )
+
+
+def test_batches_run_by_priority_and_save_incrementally():
+    db, fetcher = RecordingDatabase(), Fetcher(failing={"https://asunnot.oikotie.fi/high/1"})
+    manager = ListingManager(db, None, max_concurrent_batches=1, max_workers=1,
+                             save_batch_size=2, detail_fetcher=fetcher)
+    batches = [make_batch('low', ListingPriority.LOW, 2),
+               make_batch('high', ListingPriority.HIGH, 3),
+               make_batch('medium', ListingPriority.MEDIUM, 2)]
+
+    stats = manager.execute_processing_plan(batches, 'exec-1')
+
+    assert [url.split('/')[3] for url in fetcher.calls] == ['high'] * 3 + ['medium'] * 2 + ['low'] * 2
+    assert (stats.processed_urls, stats.successful_urls, stats.failed_urls) == (7, 6, 1)
+    assert stats.new_urls == 6
+    # Listings are written every save_batch_size results, not once per run
+    assert [len(urls) for urls in db.saves] == [2, 2, 2]
+    assert len(stats.url_times) == 7
+    assert stats.average_time_per_url >= 0.02
+    assert manager.processing_stats['high'].failed_urls == 1
+
+
+def test_concurrent_batches_share_the_city_worker_limit():
+    fetcher = Fetcher(delay=0.05)
+    manager = ListingManager(RecordingDatabase(), None, max_concurrent_batches=3,
+                             max_workers=6, city_workers={'Espoo': 2}, detail_fetcher=fetcher)
+    batches = [make_batch(f'espoo{i}', ListingPriority.MEDIUM, 4, city='Espoo') for i in range(3)]
+
+    started = time.perf_counter()
+    stats = manager.execute_processing_plan(batches, 'exec-2')
+
+    assert stats.successful_urls == 12
+    assert fetcher.peak == 2
+    assert time.perf_counter() - started < 12 * 0.05
+
+
+
+class RemovedListingScraper:
+    """Browser session whose every page lacks a details grid."""
+
+    def fetch_listing_details(self, listing):
+        raise ListingUnavailableError(f"No details grid on {listing['url']}")
+
+    def close(self):
+        pass
+
+
+def test_removed_listings_keep_the_session_and_do_not_back_off():
+    pool = WebDriverPool(RemovedListingScraper, max_size=1)
+    manager = ListingManager(RecordingDatabase(), None, max_workers=2, requests_per_second=100.0,
+                             driver_pool=pool)
+
+    stats = manager.execute_processing_plan([make_batch('removed', ListingPriority.LOW, 3, city='Kerava')], 'exec-3')
+
+    assert stats.failed_urls == 3
+    assert pool.get_stats()['recycled_errors'] == 0
+    assert manager.get_city_limiter('Kerava').backoffs == 0
@@ -0,0 +1,70 @@
+import json
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.scraper import DatabaseManager
+from oikotie.utils import extract_postal_code
+from oikotie.utils.listing_normalizer import normalize_listing_details, to_python_rows
+
+
+RAW_DETAILS = [
+    {
+        'sijainti': 'Testikatu 1, 00100 Helsinki',
+        'rakennuksen_tyyppi': 'Kerrostalo',
+        'velaton_hinta': '2 500 000 €',
+        'asuinpinta-ala': '45,5 m²',
+        'huoneita': '2',
+        'rakennusvuosi': '1965',
+        'hissi': 'Kyllä',
+    },
+    {
+        'sijainti': 'Katu ilman postinumeroa',
+        'velaton_hinta': '',
+        'myyntihinta': '123 456,78 €',
+        'asuinpinta-ala': 'Invalid',
+        'huoneita': '3,5',
+    },
+    {
+        'kunto': 'Hyvä',
+    },
+]
+
+
+@pytest.fixture
+def scalar_parser(tmp_path):
+    return DatabaseManager(db_path=str(tmp_path / 'normalizer.duckdb'))
+
+
+def test_matches_scalar_parsing(scalar_parser):
+    rows = to_python_rows(normalize_listing_details(RAW_DETAILS))
+
+    for details, row in zip(RAW_DETAILS, rows):
+        address = details.get('sijainti')
+        assert row['address'] == address
+        assert row['postal_code'] == extract_postal_code(address)
+        assert row['listing_type'] == details.get('rakennuksen_tyyppi')
+        price = details.get('velaton_hinta') or details.get('myyntihinta')
+        assert row['price_eur'] == scalar_parser._clean_and_convert(price, 'float')
+        assert row['size_m2'] == scalar_parser._clean_and_convert(details.get('asuinpinta-ala'), 'float')
+        assert row['rooms'] == scalar_parser._clean_and_convert(details.get('huoneita'), 'int')
+        assert row['year_built'] == scalar_parser._clean_and_convert(details.get('rakennusvuosi'), 'int')
+
+
+def test_typed_values_and_other_details():
+    rows = to_python_rows(normalize_listing_details(RAW_DETAILS))
+
+    assert rows[0]['price_eur'] == 2500000.0
+    assert rows[0]['rooms'] == 2 and isinstance(rows[0]['rooms'], int)
+    assert rows[1]['price_eur'] == 123456.78
+    assert rows[1]['size_m2'] is None
+    assert rows[2]['address'] is None and rows[2]['postal_code'] is None
+    assert json.loads(rows[0]['other_details_json']) == {'hissi': 'Kyllä'}
+    assert json.loads(rows[2]['other_details_json']) == {'kunto': 'Hyvä'}
+
+
+def test_empty_batch():
+    assert to_python_rows(normalize_listing_details([])) == []
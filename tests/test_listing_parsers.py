@@ -0,0 +1,52 @@
+import json
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+from oikotie.listing_parsers import (BeautifulSoupListingParser, LXML_AVAILABLE, LxmlListingParser,
+                                     get_listing_parser)
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'listing_pages'
+PAGES = sorted(path.stem for path in FIXTURES.glob('*.html'))
+BACKENDS = ['beautifulsoup'] + (['lxml'] if LXML_AVAILABLE else [])
+
+
+def parse_everything(parser, html):
+    details, overview, full_description = parser.parse_details(html)
+    return {
+        'summaries': parser.parse_summaries(html),
+        'page_count': parser.parse_page_count(html),
+        'is_js_only': parser.is_js_only(html),
+        'details': details,
+        'overview': overview,
+        'full_description': full_description,
+    }
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('page', PAGES)
+def test_backend_matches_golden_output(backend, page):
+    html = (FIXTURES / f"{page}.html").read_text(encoding='utf-8')
+    expected = json.loads((FIXTURES / f"{page}.json").read_text(encoding='utf-8'))
+
+    assert parse_everything(get_listing_parser(backend), html) == expected
+
+
+@pytest.mark.skipif(not LXML_AVAILABLE, reason="lxml is not installed")
+def test_lxml_accepts_parsed_soup_and_encoded_documents():
+    html = (FIXTURES / 'detail_page.html').read_text(encoding='utf-8')
+    parser = LxmlListingParser()
+
+    assert parser.parse_details(BeautifulSoup(html, 'html.parser')) == parser.parse_details(html)
+    declared = '<?xml version="1.0" encoding="utf-8"?>' + html
+    assert parser.parse_details(declared) == parser.parse_details(html)
+    assert parser.parse_details('') == ({}, '', '')
+
+
+def test_unknown_backend_falls_back_to_beautifulsoup():
+    assert isinstance(get_listing_parser('selectolax'), BeautifulSoupListingParser)
+    assert isinstance(get_listing_parser(None), BeautifulSoupListingParser)
@@ -0,0 +1,121 @@
+import threading
+import time
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from oikotie.automation.circuit_breaker import CircuitBreaker, CircuitBreakerOpenException
+from oikotie.rate_control import AdaptiveLimiter, get_limiter, is_overload
+
+
+def status_error(code):
+    request = httpx.Request("GET", "http://wfs.test/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(code, request=request))
+
+
+def test_overload_signals():
+    assert is_overload(429) and is_overload(503) and not is_overload(404)
+    assert is_overload(status_error(429)) and not is_overload(status_error(404))
+    assert is_overload(httpx.ReadTimeout("slow")) and is_overload(TimeoutError())
+    assert is_overload(CircuitBreakerOpenException("open"))
+    assert not is_overload(ValueError("bad page")) and not is_overload(None)
+
+
+def test_limit_grows_additively_and_is_cut_once_per_round():
+    limiter = AdaptiveLimiter("test", max_limit=8, initial_limit=2, window=10)
+    for _ in range(20):
+        with limiter.slot():
+            pass
+    assert 4 < limiter.limit <= 8
+
+    grown = limiter.limit
+    # Three overloaded requests in flight together cut the limit only once
+    starts = [limiter.acquire() for _ in range(3)]
+    for started in starts:
+        limiter.release(started, error=status_error(503))
+    assert limiter.limit == pytest.approx(grown / 2)
+    assert limiter.get_stats().backoffs == 1
+
+    with limiter.slot() as slot:
+        slot.fail(429)
+    assert limiter.limit == pytest.approx(grown / 4)
+
+
+def test_limits_hold_when_latency_is_over_target():
+    limiter = AdaptiveLimiter("slow", max_limit=8, initial_limit=2, target_p95=0.01)
+    for _ in range(5):
+        with limiter.slot():
+            time.sleep(0.02)
+    assert limiter.limit == 2
+
+
+def test_concurrency_and_rate_are_enforced():
+    limiter = AdaptiveLimiter("paced", max_limit=2, initial_limit=2, rate=20.0, max_rate=20.0)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def request():
+        with limiter.slot():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.1)
+            with lock:
+                active[0] -= 1
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=request) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+    # Ten starts at 20 per second take at least nine intervals
+    assert time.perf_counter() - started >= 0.45
+
+
+def test_jitter_only_lengthens_the_interval():
+    limiter = AdaptiveLimiter("jittered", rate=20.0, max_rate=20.0, jitter=0.5)
+    starts = []
+    for _ in range(10):
+        with limiter.slot():
+            starts.append(time.monotonic())
+
+    gaps = [later - earlier for earlier, later in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.05 - 0.002
+
+
+def test_settings_of_unused_limiter_apply_until_it_learns():
+    limiter = get_limiter("listing_details", city="Lahti")
+    assert get_limiter("listing_details", city="Lahti", max_limit=5, initial_limit=5, rate=1.5) is limiter
+    assert (limiter.limit, limiter.max_limit, limiter.rate) == (5, 5, 1.5)
+
+    limiter.release(limiter.acquire())
+    learned = limiter.limit
+    get_limiter("listing_details", city="Lahti", initial_limit=2, rate=0.5)
+    assert limiter.limit == learned
+    assert limiter.rate > 1.5
+
+
+def test_circuit_breaker_trip_backs_off_and_metrics_are_exported():
+    limiter = get_limiter("listing_details", city="Vantaa", max_limit=6, initial_limit=6, rate=2.0)
+    breaker = CircuitBreaker(failure_threshold=2)
+    limiter.watch(breaker)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    assert limiter.limit == 3
+    assert limiter.rate == 1.0
+    assert get_limiter("listing_details", city="Vantaa", initial_limit=6) is limiter
+    assert limiter.limit == 3
+
+    pytest.importorskip("prometheus_client")
+    from oikotie.automation.monitoring import PrometheusMetricsExporter
+    text = PrometheusMetricsExporter().get_metrics_text()
+    assert 'scraper_limiter_concurrency_limit{city="Vantaa",limiter="listing_details"} 3.0' in text
+    assert 'scraper_limiter_backoffs_total{city="Vantaa",limiter="listing_details"} 1.0' in text
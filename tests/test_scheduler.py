@@ -164,6 +164,72 @@ class TestTaskQueue:
         # Try to remove non-existent task
         removed = queue.remove_task("non-existent")
         assert removed is False
+    
+    def test_task_queue_priority_order_among_due_tasks(self):
+        """Test that due tasks come out by priority, then scheduled time"""
+        priorities = {"low": TaskPriority.LOW, "high": TaskPriority.HIGH, "critical": TaskPriority.CRITICAL}
+        queue = TaskQueue(priority_of=priorities.get)
+        now = datetime.now(timezone.utc)
+        
+        def execution(execution_id, task_id, offset_minutes):
+            return TaskExecution(
+                execution_id=execution_id,
+                task_id=task_id,
+                status=TaskStatus.QUEUED,
+                scheduled_time=now + timedelta(minutes=offset_minutes)
+            )
+        
+        queue.put(execution("low-early", "low", -10))
+        queue.put(execution("normal", "unknown", -8))
+        queue.put(execution("high-late", "high", -1))
+        queue.put(execution("high-early", "high", -5))
+        queue.put(execution("critical-future", "critical", 10))
+        queue.put(execution("low-override", "low", -3), priority=TaskPriority.CRITICAL)
+        
+        order = [queue.get().execution_id for _ in range(5)]
+        assert order == ["low-override", "high-early", "high-late", "normal", "low-early"]
+        assert queue.get() is None
+        assert queue.size() == 1
+        assert queue.next_due_time() == datetime.fromtimestamp(
+            (now + timedelta(minutes=10)).timestamp(), timezone.utc)
+    
+    def test_task_queue_get_waits_until_task_is_due(self):
+        """Test that a blocking get wakes when the next task becomes due"""
+        queue = TaskQueue()
+        queue.put(TaskExecution(
+            execution_id="soon",
+            task_id="task-1",
+            status=TaskStatus.QUEUED,
+            scheduled_time=datetime.now(timezone.utc) + timedelta(seconds=0.3)
+        ))
+        
+        started = time.monotonic()
+        retrieved = queue.get(timeout=5)
+        
+        assert retrieved.execution_id == "soon"
+        assert 0.25 <= time.monotonic() - started < 2
+        assert queue.get(timeout=0.05) is None
+    
+    def test_task_queue_requeue_and_clear(self):
+        """Test that requeuing replaces an execution and clear empties the queue"""
+        queue = TaskQueue()
+        now = datetime.now(timezone.utc)
+        task = TaskExecution(
+            execution_id="requeued",
+            task_id="task-1",
+            status=TaskStatus.QUEUED,
+            scheduled_time=now - timedelta(minutes=1)
+        )
+        
+        queue.put(task)
+        task.scheduled_time = now + timedelta(minutes=1)
+        queue.put(task)
+        
+        assert queue.size() == 1
+        assert queue.get() is None
+        assert [t.execution_id for t in queue.clear()] == ["requeued"]
+        assert queue.size() == 0
+        assert queue.next_due_time() is None
 
 
 class TestResourceMonitor:
@@ -565,6 +631,82 @@ class TestTaskScheduler:
         # Queue should be cleared (in a real implementation)
 
 
+class TestSchedulerEventLoop:
+    """Test the event-driven scheduler core"""
+    
+    def test_cron_timers_are_precomputed_and_advanced(self):
+        """Test that a fired timer queues its execution and advances the same croniter"""
+        scheduler = TaskScheduler(ScraperConfig())
+        task_def = TaskDefinition(task_id="every-5", name="Every 5", cron_expression="*/5 * * * *")
+        scheduler.add_task(task_def)
+        
+        start = datetime(2026, 1, 1, 6, 1, tzinfo=timezone.utc)
+        scheduler._arm_timer(task_def, after=start)
+        cron = scheduler._crons["every-5"]
+        first_fire = datetime(2026, 1, 1, 6, 5, tzinfo=timezone.utc)
+        assert scheduler._next_fire["every-5"] == first_fire.timestamp()
+        
+        # Nothing fires before the deadline
+        scheduler._fire_due_timers(first_fire.timestamp() - 1)
+        assert scheduler.task_queue.size() == 0
+        
+        # Firing late skips the runs that were missed in between
+        scheduler._fire_due_timers((first_fire + timedelta(minutes=11)).timestamp())
+        pending = scheduler.task_queue.get_pending_tasks()
+        assert [t.scheduled_time for t in pending] == [first_fire]
+        assert scheduler._crons["every-5"] is cron
+        assert scheduler._next_fire["every-5"] == datetime(2026, 1, 1, 6, 20, tzinfo=timezone.utc).timestamp()
+        
+        # Disabled tasks drop their timer
+        scheduler.disable_task("every-5")
+        assert scheduler._seconds_until_next_deadline(slots_free=False) == scheduler.MAX_IDLE_WAIT
+    
+    def test_loop_runs_tasks_concurrently_up_to_limit(self):
+        """Test that queued executions run concurrently under the concurrency limit"""
+        config = ScraperConfig(scheduling=SchedulingConfig(concurrent_tasks=2))
+        scheduler = TaskScheduler(config)
+        active, peak = [0], [0]
+        
+        def run_daily_scrape():
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            time.sleep(0.3)
+            active[0] -= 1
+            return Mock()
+        
+        orchestrator = Mock()
+        orchestrator.run_daily_scrape = run_daily_scrape
+        scheduler.resource_monitor.check_resource_availability = Mock(return_value=True)
+        scheduler._create_orchestrator_for_task = Mock(return_value=orchestrator)
+        
+        for i in range(4):
+            scheduler.add_task(TaskDefinition(task_id=f"task-{i}", name=f"Task {i}",
+                                              cron_expression="0 6 * * *", city="Helsinki"))
+        
+        with patch('oikotie.automation.scheduler.signal.signal'):
+            scheduler.start()
+            try:
+                started = time.monotonic()
+                for i in range(4):
+                    scheduler.schedule_task_now(f"task-{i}")
+                while len(scheduler.get_execution_history()) < 4 and time.monotonic() - started < 5:
+                    time.sleep(0.02)
+                elapsed = time.monotonic() - started
+            finally:
+                scheduler.stop(timeout=2)
+        
+        assert len(scheduler.get_execution_history()) == 4
+        assert all(ex.status == TaskStatus.COMPLETED for ex in scheduler.get_execution_history())
+        assert peak[0] == 2
+        assert 0.55 < elapsed < 1.5
+        
+        scheduler._update_stats()
+        stats = scheduler.get_stats()
+        assert 0 <= stats.average_scheduling_latency <= stats.max_scheduling_latency
+        assert stats.max_scheduling_latency >= 0.25  # The last two waited for a free slot
+        assert not scheduler.scheduler_thread.is_alive()
+
+
 class TestSchedulerIntegration:
     """Integration tests for the scheduler system"""
     
@@ -607,6 +749,23 @@ class TestSchedulerIntegration:
         assert helsinki_task.max_execution_time == 7200
         assert helsinki_task.max_retries == 3
     
+    def test_orchestrator_uses_global_parser_backend(self, tmp_path):
+        """Test that scheduled orchestrators get the parser backend of global_settings"""
+        config_path = tmp_path / "config.json"
+        config_path.write_text(json.dumps({"global_settings": {"parser_backend": "lxml"}}), encoding="utf-8")
+        config = ScraperConfig(
+            tasks=[ScrapingTaskConfig(city="Helsinki", url="http://example.com", enabled=True)],
+            loaded_from=["default", f"file:{config_path}"]
+        )
+        scheduler = TaskScheduler(config)
+        task_def = TaskDefinition(task_id="helsinki", name="Helsinki", cron_expression="0 6 * * *",
+                                  city="Helsinki")
+        
+        with patch('oikotie.automation.scheduler.EnhancedScraperOrchestrator') as orchestrator_class:
+            scheduler._create_orchestrator_for_task(task_def)
+        
+        assert orchestrator_class.call_args[0][0].parser_backend == "lxml"
+    
     def test_scheduler_lifecycle(self):
         """Test complete scheduler lifecycle"""
         config = ScraperConfig(
@@ -3,13 +3,15 @@ from unittest.mock import MagicMock, patch
 from pathlib import Path
 import duckdb
 import json
+import time
 from bs4 import BeautifulSoup
 
 # Add the project root to the path so that we can import the scraper
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from oikotie.scraper import DatabaseManager, OikotieScraper, normalize_key
+from oikotie.listing_parsers import normalize_key
+from oikotie.scraper import DatabaseManager, OikotieScraper, ScraperOrchestrator, StreamingListingWriter
 
 
 @pytest.fixture
@@ -111,4 +113,167 @@ def test_parse_oikotie_details_page():
         scraper = OikotieScraper(headless=True)
         details, _, _ = scraper._parse_oikotie_details_page(soup)
         assert 'my_key' in details
-        assert details['my_key'] == 'My Value'
\ No newline at end of file
+        assert details['my_key'] == 'My Value'
+
+def make_detailed_listing(i):
+    return {
+        'url': f'http://example.com/{i}', 'source': 'oikotie', 'title': f'Listing {i}',
+        'details': {'sijainti': 'Katu 1, 00100 Helsinki', 'velaton_hinta': '100 000 €'}
+    }
+
+
+class TestStreamingSave:
+    def test_save_listings_batch_does_not_soft_delete(self, db_manager):
+        db_manager.save_listings([make_detailed_listing(1), make_detailed_listing(2)], "Helsinki")
+        assert db_manager.save_listings_batch([make_detailed_listing(3)], "Helsinki")
+        with duckdb.connect(str(db_manager.db_path)) as con:
+            active = con.execute("SELECT COUNT(*) FROM listings WHERE deleted_ts IS NULL").fetchone()[0]
+            assert active == 3
+
+    def test_save_listings_batch_revives_deleted_listing(self, db_manager):
+        db_manager.save_listings([make_detailed_listing(1), make_detailed_listing(2)], "Helsinki")
+        db_manager.soft_delete_missing("Helsinki", {'http://example.com/2'})
+        assert db_manager.save_listings_batch([make_detailed_listing(1)], "Helsinki")
+        with duckdb.connect(str(db_manager.db_path)) as con:
+            deleted = con.execute("SELECT deleted_ts FROM listings WHERE url = 'http://example.com/1'").fetchone()[0]
+            assert deleted is None
+
+    def test_soft_delete_missing(self, db_manager):
+        db_manager.save_listings([make_detailed_listing(i) for i in range(3)], "Helsinki")
+        deleted = db_manager.soft_delete_missing("Helsinki", {'http://example.com/0'})
+        assert deleted == 2
+
+    def test_writer_flushes_by_batch_size_and_on_close(self):
+        db = MagicMock()
+        db.save_listings_batch.return_value = True
+        writer = StreamingListingWriter(db, "Helsinki", batch_size=2, flush_interval=60).start()
+        for i in range(5):
+            writer.put(make_detailed_listing(i))
+        writer.close()
+
+        batch_sizes = [len(call.args[0]) for call in db.save_listings_batch.call_args_list]
+        assert batch_sizes == [2, 2, 1]
+        assert writer.saved_count == 5
+        assert writer.failed_batches == 0
+
+    def test_writer_flushes_by_interval(self):
+        db = MagicMock()
+        db.save_listings_batch.return_value = True
+        writer = StreamingListingWriter(db, "Helsinki", batch_size=100, flush_interval=0.05).start()
+        writer.put(make_detailed_listing(1))
+        time.sleep(0.3)
+        assert db.save_listings_batch.call_count == 1
+        writer.close()
+
+    def test_streaming_run_resumes_and_reconciles(self, db_manager, tmp_path):
+        with patch('oikotie.scraper.load_config', return_value=[]), \
+             patch('oikotie.scraper.DatabaseManager', return_value=db_manager):
+            orchestrator = ScraperOrchestrator()
+        orchestrator.checkpoint_dir = tmp_path / "checkpoints"
+
+        db_manager.save_listings([make_detailed_listing(9)], "Helsinki")
+        summaries = [{'url': f'http://example.com/{i}', 'source': 'oikotie', 'title': f'Listing {i}'} for i in range(4)]
+
+        # First run saves listing 0 then "crashes"
+        orchestrator._start_or_resume_run("Helsinki")
+        db_manager.save_listings_batch([make_detailed_listing(0)], "Helsinki")
+
+        scraped = []
+
+        def fake_worker(chunk, result_queue=None, pool=None, limiter=None):
+            for summary in chunk:
+                scraped.append(summary['url'])
+                result_queue.put(make_detailed_listing(summary['url'].rsplit('/', 1)[1]))
+            return []
+
+        with patch('oikotie.scraper.worker_scrape_details', side_effect=fake_worker):
+            orchestrator._scrape_details_streaming("Helsinki", summaries, 2, {'stream_batch_size': 2})
+
+        assert sorted(scraped) == [f'http://example.com/{i}' for i in range(1, 4)]
+        assert not orchestrator._checkpoint_path("Helsinki").exists()
+        with duckdb.connect(str(db_manager.db_path)) as con:
+            active = {row[0] for row in con.execute("SELECT url FROM listings WHERE deleted_ts IS NULL").fetchall()}
+        assert active == {f'http://example.com/{i}' for i in range(4)}
+
+
+class TestParallelDiscovery:
+    SEARCH_URL = 'https://asunnot.oikotie.fi/myytavat-asunnot?locations=%5B%5B64,6,%22Helsinki%22%5D%5D&cardType=100'
+
+    def make_page(self, page, per_page=2, pagination='<div class="pagination">1 2 3 Seuraava</div>'):
+        cards = ''.join(
+            f'<a href="/myytavat-asunnot/helsinki/{page}{i}" class="ot-card-v2">'
+            f'<div class="card-v2-text-container__text"><strong>Listing {page}{i}</strong></div></a>'
+            for i in range(per_page)
+        )
+        return f'<html><body><div class="cards-v2">{cards}</div>{pagination}</body></html>'
+
+    def make_scraper(self, first_page_html):
+        with patch('oikotie.scraper.OikotieScraper._init_driver', return_value=(MagicMock(), MagicMock())):
+            scraper = OikotieScraper(headless=True)
+        scraper.driver.page_source = first_page_html
+        return scraper
+
+    def test_summary_page_url(self):
+        from urllib.parse import parse_qs, urlsplit
+        from oikotie.scraper import summary_page_url
+        query = parse_qs(urlsplit(summary_page_url(self.SEARCH_URL, 3)).query)
+        assert query['pagination'] == ['3']
+        assert query['locations'] == ['[[64,6,"Helsinki"]]']
+        assert 'pagination' not in summary_page_url(summary_page_url(self.SEARCH_URL, 3), 1)
+
+    def test_parse_page_count(self):
+        scraper = self.make_scraper('')
+        assert scraper._parse_page_count(BeautifulSoup(self.make_page(1), 'html.parser')) == 3
+        assert scraper._parse_page_count(BeautifulSoup('<div class="pagination__pages">1 / 45</div>', 'html.parser')) == 45
+        assert scraper._parse_page_count(BeautifulSoup(self.make_page(1, pagination=''), 'html.parser')) is None
+
+    def test_pages_fetched_in_parallel_and_merged_in_order(self):
+        from oikotie.scraper import summary_page_url
+        scraper = self.make_scraper(self.make_page(1))
+        scraper._accept_cookies = MagicMock()
+        calls = []
+
+        def fake_worker(chunk, rate_limiter=None, pool=None):
+            calls.append(chunk)
+            pages = {}
+            for page_url in chunk:
+                page = int(page_url.rsplit('=', 1)[1])
+                pages[page_url] = scraper._parse_listing_summaries(BeautifulSoup(self.make_page(page), 'html.parser'))
+                if page == 3:
+                    # A listing that moved from page 2 to page 3 while scraping
+                    pages[page_url].insert(0, {'source': 'oikotie', 'title': 'Listing 21',
+                                               'url': 'https://asunnot.oikotie.fi/myytavat-asunnot/helsinki/21'})
+            return pages
+
+        with patch('oikotie.scraper.worker_scrape_summaries', side_effect=fake_worker):
+            summaries = scraper.get_all_listing_summaries(self.SEARCH_URL, max_workers=2, rate_limit_seconds=0)
+
+        assert sorted(chunk for chunks in calls for chunk in chunks) == [summary_page_url(self.SEARCH_URL, p) for p in (2, 3)]
+        assert len(calls) == 2
+        assert [s['title'] for s in summaries] == ['Listing 10', 'Listing 11', 'Listing 20', 'Listing 21', 'Listing 30', 'Listing 31']
+
+    def test_limit_reduces_pages_fetched(self):
+        scraper = self.make_scraper(self.make_page(1))
+        scraper._accept_cookies = MagicMock()
+        with patch('oikotie.scraper.worker_scrape_summaries', return_value={}) as worker:
+            summaries = scraper.get_all_listing_summaries(self.SEARCH_URL, limit=2, max_workers=4)
+        assert len(summaries) == 2
+        worker.assert_not_called()
+
+    def test_rate_limiter_spaces_threads(self):
+        from oikotie.scraper import RateLimiter
+        import threading
+        limiter = RateLimiter(0.05)
+        stamps = []
+
+        def worker():
+            limiter.wait()
+            stamps.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stamps.sort()
+        assert all(b - a >= 0.045 for a, b in zip(stamps, stamps[1:]))
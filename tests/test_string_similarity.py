@@ -0,0 +1,61 @@
+import logging
+import random
+import pytest
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.utils.enhanced_geocoding_service import AddressNormalizer, UnifiedGeocodingService
+from oikotie.utils.string_similarity import (levenshtein_distance, levenshtein_distances,
+                                             levenshtein_similarities)
+
+
+def reference_distance(text1, text2):
+    distances = [[i + j if i * j == 0 else 0 for j in range(len(text2) + 1)] for i in range(len(text1) + 1)]
+    for i in range(1, len(text1) + 1):
+        for j in range(1, len(text2) + 1):
+            cost = 0 if text1[i - 1] == text2[j - 1] else 1
+            distances[i][j] = min(distances[i - 1][j] + 1, distances[i][j - 1] + 1, distances[i - 1][j - 1] + cost)
+    return distances[-1][-1]
+
+
+def test_batched_distances_match_reference():
+    rng = random.Random(0)
+    alphabet = 'akt äö1'
+    for _ in range(200):
+        query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        candidates = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 15))) for _ in range(rng.randint(1, 10))]
+
+        expected = [reference_distance(query, candidate) for candidate in candidates]
+
+        assert levenshtein_distances(query, candidates).tolist() == expected
+        assert [levenshtein_distance(query, candidate) for candidate in candidates] == expected
+
+
+def test_similarities_handle_empty_strings():
+    similarities = levenshtein_similarities('katu', ['katu', 'kato', '', 'x'])
+    assert similarities.tolist() == [1.0, 0.75, 0.0, 0.0]
+    assert levenshtein_similarities('', ['katu']).tolist() == [0.0]
+    assert levenshtein_similarities('katu', []).size == 0
+
+
+@pytest.fixture
+def service():
+    service = UnifiedGeocodingService.__new__(UnifiedGeocodingService)
+    service.normalizer = AddressNormalizer()
+    service.logger = logging.getLogger(__name__)
+    return service
+
+
+def test_batched_address_scores_match_pairwise_scores(service):
+    query = service.normalizer.normalize_address('Fleminginkatu 12 A 5, 00530 Helsinki')
+    candidates = ['Fleminginkatu 12, 00530 Helsinki', 'Flemingink 14\n00530 Helsinki', 'Bulevardi 1, 00120 Hki',
+                  'Hämeentie 12', '', '00530']
+
+    scores = service._calculate_text_similarities(query, candidates)
+
+    assert scores.tolist() == [service._calculate_text_similarity(query, c) for c in candidates]
+    assert scores[0] == scores.max() and scores[0] > 0.6
+    assert scores[4] == 0.0
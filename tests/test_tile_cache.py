@@ -0,0 +1,124 @@
+from pathlib import Path
+import os
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+import numpy as np
+from shapely.geometry import box
+from oikotie.data_sources.tile_cache import GeoTileCache
+from oikotie.data_sources.unified_manager import UnifiedDataManager
+
+
+class CountingSource:
+    """In-memory polygons, some of them spanning several 0.01 degree tiles."""
+
+    def __init__(self, count=400):
+        rng = np.random.default_rng(5)
+        lon = rng.uniform(24.90, 24.96, count)
+        lat = rng.uniform(60.16, 60.19, count)
+        size = rng.uniform(0.0005, 0.006, count)
+        self.features = gpd.GeoDataFrame({
+            'feature_id': np.arange(count),
+            'floor_count': rng.integers(1, 10, count),
+            'building_use_code': rng.integers(1, 20, count),
+        }, geometry=[box(x, y, x + s, y + s / 2) for x, y, s in zip(lon, lat, size)], crs='EPSG:4326')
+        self.requests = []
+
+    def load(self, bbox):
+        self.requests.append(bbox)
+        return self.features.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]].reset_index(drop=True)
+
+    def fetch_buildings(self, bbox=None, limit=None):
+        return self.load(bbox)
+
+
+def test_overlapping_bboxes_share_tiles(tmp_path):
+    source = CountingSource()
+    cache = GeoTileCache(tmp_path, tile_size=0.01)
+    first, second = (24.905, 60.165, 24.935, 60.185), (24.925, 60.170, 24.955, 60.188)
+
+    results = [cache.query('buildings', bbox, source.load) for bbox in (first, second)]
+
+    assert len(source.requests) == len(set(cache.tiles_for_bbox(first)) | set(cache.tiles_for_bbox(second)))
+    for bbox, result in zip((first, second), results):
+        expected = source.features.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
+        assert sorted(result['feature_id']) == sorted(expected['feature_id'])
+        assert result['feature_id'].is_unique
+
+    # Rows are recognised across tiles without an identifier column too
+    anonymous = GeoTileCache(tmp_path / 'anonymous', tile_size=0.01).query(
+        'buildings', first, lambda bbox: source.load(bbox).drop(columns='feature_id'))
+    assert len(anonymous) == len(results[0])
+
+
+def test_columns_are_projected_when_read_from_disk(tmp_path):
+    source = CountingSource()
+    bbox = (24.91, 60.17, 24.93, 60.18)
+    GeoTileCache(tmp_path, tile_size=0.01).query('buildings', bbox, source.load)
+    requests = len(source.requests)
+
+    cache = GeoTileCache(tmp_path, tile_size=0.01)
+    result = cache.query('buildings', bbox, source.load, columns=['floor_count'], limit=10)
+
+    assert len(source.requests) == requests
+    assert list(result.columns) == ['floor_count', 'geometry']
+    assert len(result) == 10
+    assert cache.get_stats()['loads'] == 0
+
+
+def test_small_limit_reads_only_the_tiles_it_needs(tmp_path):
+    source = CountingSource()
+    cache = GeoTileCache(tmp_path, tile_size=0.01)
+    bbox = (24.905, 60.165, 24.955, 60.185)
+
+    probe = cache.query('buildings', bbox, source.load, limit=1)
+    assert len(probe) == 1
+    assert len(source.requests) == 1
+
+    full = cache.query('buildings', bbox, source.load, unique_by='feature_id')
+    assert len(source.requests) == len(cache.tiles_for_bbox(bbox))
+    assert full['feature_id'].is_unique
+    # Tile locks are dropped once no thread holds them
+    assert len(cache._locks) == 0
+
+
+def test_least_recently_read_tiles_are_evicted(tmp_path):
+    source = CountingSource()
+    cache = GeoTileCache(tmp_path, tile_size=0.01)
+    tiles = [(2491, 6017), (2492, 6017), (2493, 6017)]
+    for tile in tiles[:2]:
+        cache.get_tile('buildings', tile, source.load)
+    sizes = [cache.tile_path('buildings', tile).stat().st_size for tile in tiles[:2]]
+
+    # Reading the first tile makes the second one the least recently used
+    first = cache.tile_path('buildings', tiles[0])
+    os.utime(first, (first.stat().st_atime + 60, first.stat().st_mtime))
+    cache.max_bytes = sum(sizes) + min(sizes) // 2
+    cache.get_tile('buildings', tiles[2], source.load)
+
+    assert [cache.tile_path('buildings', tile).exists() for tile in tiles] == [True, False, True]
+    assert cache.get_stats()['evictions'] == 1
+
+
+def test_manager_caches_buildings_as_tiles(tmp_path):
+    manager = UnifiedDataManager(cache_dir=str(tmp_path), enable_logging=False, tile_size=0.01)
+    source = CountingSource()
+    manager.sources = {'geopackage': source}
+    bbox = (24.905, 60.165, 24.935, 60.185)
+
+    uncached = manager.fetch_buildings(bbox=bbox, use_cache=False)
+    cached = manager.fetch_buildings(bbox=bbox)
+    requests = len(source.requests)
+    subset = manager.fetch_buildings(bbox=(24.91, 60.17, 24.92, 60.18), columns=['floor_count'])
+
+    assert sorted(cached['feature_id']) == sorted(uncached['feature_id'])
+    assert set(cached['data_source']) == {'geopackage'}
+    assert len(source.requests) == requests
+    assert list(subset.columns) == ['floor_count', 'geometry']
+    assert manager.get_metadata()['cache_files_count'] == len(manager.tile_cache.tiles_for_bbox(bbox))
+
+    manager.clear_cache()
+    assert manager.tile_cache.get_stats()['stored_tiles'] == 0
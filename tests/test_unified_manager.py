@@ -0,0 +1,134 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import geopandas as gpd
+from shapely.geometry import box
+from oikotie.data_sources.unified_manager import UnifiedDataManager
+
+
+def buildings(ids):
+    return gpd.GeoDataFrame(
+        {'feature_id': ids},
+        geometry=[box(24.9 + i * 0.001, 60.17, 24.9005 + i * 0.001, 60.1705) for i in ids],
+        crs='EPSG:4326'
+    )
+
+
+class LocalSource:
+    """Blocking source standing in for a GeoPackage."""
+
+    def __init__(self, ids, delay=0.0, error=None):
+        self.ids, self.delay, self.error = ids, delay, error
+
+    def fetch_buildings(self, bbox=None, limit=None):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return buildings(self.ids[:limit] if limit else self.ids)
+
+    def test_connection(self):
+        return True
+
+    def get_metadata(self):
+        return {}
+
+
+class RemoteSource(LocalSource):
+    """Source with an async fetch, standing in for the WFS."""
+
+    def __init__(self, ids, delay=0.0, error=None):
+        super().__init__(ids, delay, error)
+        self.calls = 0
+
+    async def fetch_buildings_async(self, bbox=None, limit=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return buildings(self.ids[:limit] if limit else self.ids)
+
+
+def make_manager(tmp_path, geopackage, wms, **kwargs):
+    manager = UnifiedDataManager(cache_dir=str(tmp_path), enable_logging=False, **kwargs)
+    manager.sources = {'geopackage': geopackage, 'wms': wms}
+    return manager
+
+
+def test_combined_sources_are_fetched_concurrently(tmp_path):
+    wms = RemoteSource([10, 11], delay=0.3)
+    manager = make_manager(tmp_path, LocalSource([1, 2, 3], delay=0.3), wms)
+
+    started = time.perf_counter()
+    result = manager.fetch_buildings(bbox=(24.9, 60.17, 24.91, 60.18), use_cache=False, combine_sources=True)
+
+    assert time.perf_counter() - started < 0.55
+    # Results are ordered by source priority whichever arrived first
+    assert list(result['feature_id']) == [1, 2, 3, 10, 11]
+    assert list(result['data_source']) == ['geopackage'] * 3 + ['wms'] * 2
+    assert wms.calls == 1
+
+
+def test_fallback_prefers_primary_source_unless_first_result_wins(tmp_path):
+    bbox = (24.9, 60.17, 24.91, 60.18)
+    manager = make_manager(tmp_path, LocalSource([1, 2], delay=0.2), RemoteSource([10]))
+    assert list(manager.fetch_buildings(bbox=bbox, use_cache=False)['data_source']) == ['geopackage'] * 2
+
+    eager = make_manager(tmp_path, LocalSource([1, 2], delay=0.5), RemoteSource([10]), first_result_wins=True)
+    started = time.perf_counter()
+    result = eager.fetch_buildings(bbox=bbox, use_cache=False)
+    assert time.perf_counter() - started < 0.4
+    assert list(result['data_source']) == ['wms']
+
+
+def test_failed_source_falls_back_and_latency_is_reported(tmp_path):
+    manager = make_manager(tmp_path, LocalSource([1], error=OSError("locked")), RemoteSource([10, 11], delay=0.05))
+
+    result = manager.fetch_buildings(bbox=(24.9, 60.17, 24.91, 60.18), use_cache=False)
+    status = manager.get_source_status()
+
+    assert list(result['feature_id']) == [10, 11]
+    assert status['geopackage']['latency']['errors'] == 1
+    assert status['wms']['latency']['calls'] == 1
+    assert status['wms']['latency']['last_ms'] >= 50
+
+
+def test_fetches_share_one_loop_and_work_inside_a_running_loop(tmp_path):
+    manager = make_manager(tmp_path, LocalSource([1, 2]), RemoteSource([10]))
+    bbox = (24.9, 60.17, 24.91, 60.18)
+
+    async def fetch_from_coroutine():
+        return manager.fetch_buildings(bbox=bbox, use_cache=False)
+
+    first = asyncio.run(fetch_from_coroutine())
+    loop = manager._loop
+    loop_threads = lambda: sum(thread.name == "geodata-loop" for thread in threading.enumerate())
+    threads = loop_threads()
+    for _ in range(5):
+        manager.fetch_buildings(bbox=bbox, use_cache=False)
+
+    assert list(first['feature_id']) == [1, 2]
+    assert manager._loop is loop
+    assert loop_threads() == threads
+    manager.close()
+    assert loop.is_closed()
+
+
+def test_empty_tiles_are_cached_but_failed_loads_are_not(tmp_path):
+    bbox = (24.9, 60.17, 24.91, 60.18)
+    sea = RemoteSource([])
+    manager = make_manager(tmp_path / "sea", LocalSource([]), sea)
+    assert len(manager.fetch_buildings(bbox=bbox)) == 0
+    assert len(manager.fetch_buildings(bbox=bbox)) == 0
+    assert sea.calls == 1
+
+    down = RemoteSource([], error=OSError("WFS down"))
+    manager = make_manager(tmp_path / "down", LocalSource([]), down)
+    assert len(manager.fetch_buildings(bbox=bbox)) == 0
+    assert len(manager.fetch_buildings(bbox=bbox)) == 0
+    assert down.calls == 2
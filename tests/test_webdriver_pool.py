@@ -0,0 +1,123 @@
+import threading
+import pytest
+from unittest.mock import patch
+from pathlib import Path
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from selenium.common.exceptions import WebDriverException
+from oikotie.rate_control import AdaptiveLimiter
+from oikotie.scraper import OikotieScraper, worker_scrape_details
+from oikotie.webdriver_pool import WebDriverPool
+
+
+class FakeSession:
+    def __init__(self):
+        self.pages_loaded = 0
+        self.warm_ups = 0
+        self.closed = False
+
+    def warm_up(self):
+        self.warm_ups += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    return WebDriverPool(FakeSession, max_size=2, max_pages=10, max_rss_mb=None)
+
+
+def test_sessions_are_reused_and_warmed_up_once(pool):
+    with pool.session() as first:
+        first.pages_loaded += 3
+    with pool.session() as second:
+        pass
+
+    assert first is second
+    assert first.warm_ups == 1
+    stats = pool.get_stats()
+    assert stats['created'] == 1
+    assert stats['checkouts'] == 2
+    assert stats['idle'] == 1 and stats['in_use'] == 0
+
+
+def test_checkout_waits_when_pool_is_exhausted(pool):
+    first, second = pool.checkout(), pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.05)
+
+    threading.Timer(0.1, pool.checkin, args=(first,)).start()
+    third = pool.checkout(timeout=2)
+
+    assert third is first
+    assert pool.get_stats()['max_wait_seconds'] >= 0.05
+    pool.checkin(second)
+    pool.checkin(third)
+
+
+def test_recycles_after_max_pages(pool):
+    with pool.session() as session:
+        session.pages_loaded = 10
+    with pool.session() as replacement:
+        pass
+
+    assert session.closed
+    assert replacement is not session
+    assert pool.get_stats()['recycled_pages'] == 1
+
+
+def test_recycles_when_rss_exceeds_threshold():
+    pool = WebDriverPool(FakeSession, max_size=1, max_rss_mb=100)
+    with patch.object(pool, '_session_rss_mb', return_value=250.0):
+        with pool.session() as session:
+            pass
+    assert session.closed
+    assert pool.get_stats()['recycled_memory'] == 1
+
+
+def test_session_discarded_after_error(pool):
+    with pytest.raises(RuntimeError):
+        with pool.session() as session:
+            raise RuntimeError("driver crashed")
+    assert session.closed
+    assert pool.get_stats()['recycled_errors'] == 1
+    assert pool.get_stats()['size'] == 0
+
+
+class CrashingScraper(FakeSession):
+    """Browser session that crashes on the page named ``crash``."""
+    get_single_listing_details = OikotieScraper.get_single_listing_details
+
+    def fetch_listing_details(self, listing):
+        if listing['url'] == 'crash':
+            raise WebDriverException("invalid session id")
+        listing['details'] = {'ok': True}
+        return listing
+
+
+def test_worker_recycles_crashed_session_and_finishes_chunk():
+    pool = WebDriverPool(CrashingScraper, max_size=1, max_rss_mb=None)
+    summaries = [{'url': url} for url in ('first', 'crash', 'after')]
+
+    results = worker_scrape_details(summaries, pool=pool, limiter=AdaptiveLimiter("worker-test"))
+
+    assert [result['details'] for result in results] == [
+        {'ok': True}, {'error': 'Message: invalid session id\n'}, {'ok': True}
+    ]
+    assert pool.get_stats()['recycled_errors'] == 1
+    assert pool.get_stats()['created'] == 2
+
+
+def test_close_closes_idle_and_returned_sessions(pool):
+    idle, in_use = pool.checkout(), pool.checkout()
+    pool.checkin(idle)
+    pool.close()
+    assert idle.closed and not in_use.closed
+
+    pool.checkin(in_use)
+    assert in_use.closed
+    assert pool.get_stats()['size'] == 0
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Add the project root to the path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from oikotie.data_sources.wfs_client import FeatureStreamParser, WFSClient
+from oikotie.data_sources.wms_source import WMSDataSource
+
+
+class StubWFS(BaseHTTPRequestHandler):
+    """GeoJSON GetFeature endpoint paging a fixed set of points, written in small pieces."""
+
+    features = [
+        {'type': 'Feature', 'id': f'AD.{i}',
+         'geometry': {'type': 'Point', 'coordinates': [24.9 + i * 0.0001, 60.17]},
+         'properties': {'inspireId_localId': f'addr-{i}', 'component_ThoroughfareName': 'Hämeentie'}}
+        for i in range(250)
+    ]
+    max_count = 100
+    requests = []
+    failures = []
+
+    def do_GET(self):
+        params = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        self.requests.append(params)
+        if self.failures:
+            self.send_response(self.failures.pop(0))
+            self.end_headers()
+            return
+
+        start = int(params.get('startIndex', 0))
+        count = min(int(params.get('count', self.max_count)), self.max_count)
+        body = json.dumps({
+            'type': 'FeatureCollection',
+            'features': self.features[start:start + count],
+            'numberMatched': len(self.features),
+        }).encode()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        for offset in range(0, len(body), 1000):
+            piece = body[offset:offset + 1000]
+            self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def wfs_url():
+    StubWFS.requests, StubWFS.failures = [], []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubWFS)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/wfs"
+    server.shutdown()
+
+
+def test_parser_handles_features_split_across_pieces():
+    text = json.dumps({'type': 'FeatureCollection', 'features': StubWFS.features[:5], 'totalFeatures': 5})
+    parser = FeatureStreamParser()
+    parsed = [feature for i in range(0, len(text), 7) for feature in parser.feed(text[i:i + 7])]
+    parser.close()
+
+    assert parsed == StubWFS.features[:5]
+    with pytest.raises(ValueError):
+        truncated = FeatureStreamParser()
+        truncated.feed(text[:len(text) // 2])
+        truncated.close()
+
+
+def test_pages_until_short_page_and_yields_chunks(wfs_url):
+    with WFSClient(page_size=80) as client:
+        chunks = list(client.iter_chunks(wfs_url, 'AD.Address', bbox=(24.8, 60.1, 25.0, 60.3), chunk_size=60))
+        limited = client.fetch(wfs_url, 'AD.Address', limit=130, start_index=10)
+
+    assert [len(chunk) for chunk in chunks] == [60, 60, 60, 60, 10]
+    assert [params.get('startIndex', '0') for params in StubWFS.requests[:4]] == ['0', '80', '160', '240']
+    assert StubWFS.requests[0]['bbox'] == '24.8,60.1,25.0,60.3,EPSG:4326'
+    assert str(chunks[0].crs) == 'EPSG:4326'
+    assert list(limited['inspireId_localId']) == [f'addr-{i}' for i in range(10, 140)]
+
+
+def test_transient_errors_are_retried(wfs_url):
+    StubWFS.failures = [503, 502]
+    with WFSClient(page_size=100, backoff=0.01) as client:
+        gdf = client.fetch(wfs_url, 'AD.Address')
+        assert len(gdf) == 250
+        assert client.get_stats()['retries'] == 2
+
+    StubWFS.failures = [404]
+    with WFSClient(backoff=0.01) as client, pytest.raises(Exception):
+        client.fetch(wfs_url, 'AD.Address')
+
+
+def test_wms_source_is_not_truncated_at_the_server_page_size(wfs_url):
+    source = WMSDataSource(wfs=WFSClient(page_size=100))
+    source.address_wfs_url = wfs_url
+
+    addresses = source.fetch_addresses(bbox=(24.8, 60.1, 25.0, 60.3))
+
+    assert len(addresses) == 250
+    assert set(addresses['street_name']) == {'Hämeentie'}
+
+
+def test_async_wms_buildings_are_paged_through_the_shared_client(wfs_url):
+    source = WMSDataSource(wfs=WFSClient(page_size=100))
+    source.building_wfs_url = wfs_url
+
+    buildings = asyncio.run(source.fetch_buildings_async(bbox=(24.8, 60.1, 25.0, 60.3)))
+
+    assert len(buildings) == 250
+    assert [params.get('startIndex', '0') for params in StubWFS.requests] == ['0', '100', '200']
+    assert source.wfs.get_stats()['requests'] == 3